@@ -120,6 +120,29 @@ protected function recordResult(int $size, string $scenario, int $iteration, arr
         $this->outputResultToTerminal(array_slice($row, 0, 6)); // Don't show spec/result in terminal
     }
 
+    protected function decodeSpec(string $specHash): ?LotterySpec
+    {
+        $data = json_decode($specHash, true);
+
+        if ($data === null) {
+            $this->warn("JSON decode failed: " . json_last_error_msg());
+            $this->warn("Spec hash (first 200 chars): " . substr($specHash, 0, 200));
+            return null;
+        }
+
+        // Accept 'preferences' as primary, 'families' for backwards compatibility
+        $preferences = $data['preferences'] ?? $data['families'] ?? null;
+        $units = $data['units'] ?? null;
+
+        if ($preferences === null || $units === null) {
+            $this->warn("Missing units or preferences in decoded data");
+            $this->warn("Available keys: " . implode(', ', array_keys($data)));
+            return null;
+        }
+
+        return new LotterySpec($preferences, $units);
+    }
+
     protected function generateSpecJson(LotterySpec $spec): string
     {
         $data = [
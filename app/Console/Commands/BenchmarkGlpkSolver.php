@@ -15,6 +15,10 @@
  * Usage:
  *   php artisan benchmark:glpk --size=5 --scenario=random --iterations=1000
  *   php artisan benchmark:glpk --size=20 --scenario=realistic --iterations=100 --timeout=60
+ *   php artisan benchmark:glpk glpk_random_20_plan.csv --size=20 --scenario=random --iterations=50 --first-iteration=101
+ *
+ * --first-iteration numbers the runs from that value, so an extra shard of a size that was
+ * already benchmarked continues its iteration numbers instead of repeating them.
  *
  * Scenarios:
  *   - identical: All families have identical preferences (worst-case for tie-breaking)
@@ -46,6 +50,7 @@ class BenchmarkGlpkSolver extends BenchmarkGlpkBase
                             {--size= : Problem size (NxN)}
                             {--scenario= : Scenario type (identical|random|opposite|realistic)}
                             {--iterations=1 : Number of iterations to run}
+                            {--first-iteration=1 : Iteration number of the first run}
                             {--timeout=30 : Solver timeout in seconds}';
 
     protected $description = 'Benchmark GLPK solver performance across different problem sizes and scenarios';
@@ -55,10 +60,16 @@ public function handle(): int
         $size = $this->getRequiredOption('size');
         $scenario = $this->getRequiredOption('scenario');
         $iterations = (int) $this->option('iterations');
+        $firstIteration = (int) $this->option('first-iteration');
         $timeout = (int) $this->option('timeout');
 
         $this->validateInputs($size, $scenario, $iterations, $timeout);
 
+        if ($firstIteration <= 0) {
+            $this->error('First iteration must be a positive integer');
+            exit(1);
+        }
+
         $outputPath = $this->getOutputPath($size, $scenario);
 
         $this->configureSolver($timeout);
@@ -69,7 +80,7 @@ public function handle(): int
         $this->info("Output file: {$outputPath}");
         $this->newLine();
 
-        $this->runBenchmark($size, $scenario, $iterations);
+        $this->runBenchmark($size, $scenario, $iterations, $firstIteration);
 
         $this->cleanup();
 
@@ -127,13 +138,13 @@ private function validateInputs(string $size, string $scenario, int $iterations,
         }
     }
 
-    private function runBenchmark(string $size, string $scenario, int $iterations): void
+    private function runBenchmark(string $size, string $scenario, int $iterations, int $firstIteration = 1): void
     {
         $sizeInt = (int) $size;
 
         $this->displayTableHeader();
 
-        for ($i = 1; $i <= $iterations; $i++) {
+        for ($i = $firstIteration; $i < $firstIteration + $iterations; $i++) {
             $this->runSingleIteration($sizeInt, $scenario, $i);
         }
 
@@ -0,0 +1,108 @@
+<?php
+
+// Copilot - Pending review
+
+namespace App\Console\Commands;
+
+/**
+ * Re-run one recorded GLPK benchmark spec in isolation.
+ *
+ * Solves a spec taken from a benchmark CSV (the JSON of its spec column, with units and
+ * preferences) a number of times in a fresh process and appends one row per run to the
+ * output CSV under the original iteration number, so the variance of that single instance
+ * can be measured without the rest of the benchmark around it.
+ *
+ * With --dump, the spec is solved once more before the timed runs to keep its GLPK model
+ * and data files in that directory, numbered in solve order, together with a glpsol.sh that
+ * repeats the exact solver calls. They can then be profiled offline with glpsol, outside the
+ * application. That extra solve pays for the file copies and is not recorded, so every row
+ * of the output CSV is timed without them.
+ *
+ * Usage:
+ *   php artisan benchmark:glpk:replay spec.json runs.csv --size=30 --scenario=random \
+ *       --iteration=412 --iterations=5 --timeout=60 --dump=storage/benchmarks/replay/glpk_random_30_it412/model
+ *
+ * Usually driven by `scripts/benchmark_analysis/cli.py replay`, which picks the slowest or
+ * timed-out specs of a benchmark file and runs this command once per spec.
+ *
+ * @see BenchmarkGlpkSolverRetry For re-running every failure of a benchmark file
+ */
+class BenchmarkGlpkSolverReplay extends BenchmarkGlpkBase
+{
+    protected $signature = 'benchmark:glpk:replay
+                            {spec : Path to a JSON file with units and preferences}
+                            {output : Output CSV file path}
+                            {--size= : Problem size recorded in the output (default: number of families)}
+                            {--scenario=replay : Scenario recorded in the output}
+                            {--iteration=0 : Original iteration number recorded in the output}
+                            {--iterations=1 : Number of times to solve the spec}
+                            {--timeout=30 : Solver timeout in seconds}
+                            {--dump= : Directory for the GLPK model/data files (extra untimed solve)}';
+
+    protected $description = 'Re-run a single GLPK benchmark spec and dump its model files';
+
+    public function handle(): int
+    {
+        $specFile = $this->argument('spec');
+        $outputPath = $this->argument('output');
+        $iterations = (int) $this->option('iterations');
+        $timeout = (int) $this->option('timeout');
+        $dumpDir = $this->option('dump') ?: null;
+
+        if (!file_exists($specFile)) {
+            $this->error("File not found: {$specFile}");
+            return self::FAILURE;
+        }
+
+        $spec = $this->decodeSpec(file_get_contents($specFile));
+
+        if ($spec === null) {
+            $this->error("Failed to decode spec from {$specFile}");
+            return self::FAILURE;
+        }
+
+        if ($iterations <= 0 || $timeout <= 0) {
+            $this->error('Iterations and timeout must be positive integers');
+            return self::FAILURE;
+        }
+
+        $size = (int) ($this->option('size') ?: count($spec->families));
+        $scenario = $this->option('scenario');
+        $iteration = (int) $this->option('iteration');
+
+        $this->configureSolver($timeout);
+        $this->initializeSolver();
+        $this->createOutputFile($outputPath);
+
+        $this->info("GLPK Replay: {$specFile} x{$iterations} (timeout: {$timeout}s)");
+        $this->info("Output file: {$outputPath}");
+        $this->newLine();
+
+        if ($dumpDir) {
+            // Copying the model files slows the solve down, so this run is not recorded
+            config()->set('lottery.solvers.glpk.config.dump_dir', $dumpDir);
+            $this->executeSolver($spec);
+            config()->set('lottery.solvers.glpk.config.dump_dir', null);
+        }
+
+        $this->displayTableHeader();
+
+        for ($i = 1; $i <= $iterations; $i++) {
+            $result = $this->executeSolver($spec);
+            $this->recordResult($size, $scenario, $iteration, $result, $spec);
+        }
+
+        $this->displaySummary();
+
+        $this->cleanup();
+
+        $this->newLine();
+        $this->info("Results saved to: {$outputPath}");
+
+        if ($dumpDir) {
+            $this->info("GLPK model files saved to: {$dumpDir} (run glpsol.sh to replay)");
+        }
+
+        return self::SUCCESS;
+    }
+}
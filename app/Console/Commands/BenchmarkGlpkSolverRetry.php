@@ -4,8 +4,6 @@
 
 namespace App\Console\Commands;
 
-use App\Services\Lottery\DataObjects\LotterySpec;
-
 /**
  * Retry failed GLPK benchmark cases from a previous benchmark run.
  *
@@ -207,27 +205,4 @@ private function retryFailure(array $failure, int $retryNumber): void
             $spec
         );
     }
-
-    private function decodeSpec(string $specHash): ?LotterySpec
-    {
-        $data = json_decode($specHash, true);
-
-        if ($data === null) {
-            $this->warn("JSON decode failed: " . json_last_error_msg());
-            $this->warn("Spec hash (first 200 chars): " . substr($specHash, 0, 200));
-            return null;
-        }
-
-        // Accept 'preferences' as primary, 'families' for backwards compatibility
-        $preferences = $data['preferences'] ?? $data['families'] ?? null;
-        $units = $data['units'] ?? null;
-
-        if ($preferences === null || $units === null) {
-            $this->warn("Missing units or preferences in decoded data");
-            $this->warn("Available keys: " . implode(', ', array_keys($data)));
-            return null;
-        }
-
-        return new LotterySpec($preferences, $units);
-    }
 }
@@ -19,6 +19,7 @@ abstract class TaskRunner
     abstract protected Task $task { get; }
 
     protected string $glpsolPath;
+    protected ?string $dumpDir;
     protected Files $files;
     protected $context = [];
 
@@ -30,6 +31,7 @@ public function __construct(
         $config = config('lottery.solvers.glpk.config');
 
         $this->glpsolPath = $config['glpsol_path'] ?? '/usr/bin/glpsol';
+        $this->dumpDir = $config['dump_dir'] ?? null;
         $this->files = new Files($config['temp_dir'] ?? sys_get_temp_dir());
     }
 
@@ -75,6 +77,10 @@ protected function runGlpk(int $timeout, string $modFile, string $datFile, ?Clos
             escapeshellarg($solFile)
         );
 
+        if ($this->dumpDir) {
+            $this->dumpFiles($modFile, $datFile, $process->getGlpkTimeout());
+        }
+
         try {
             $process->execute($command);
             $this->files->ensureReadable($solFile);
@@ -85,6 +91,36 @@ protected function runGlpk(int $timeout, string $modFile, string $datFile, ?Clos
         }
     }
 
+    /**
+     * Keep a copy of the model and data files of a GLPK run for offline profiling.
+     *
+     * Files are numbered in solve order and the matching glpsol call is appended
+     * to glpsol.sh in the dump directory. Best-effort: failures are ignored.
+     */
+    protected function dumpFiles(string $modFile, string $datFile, int $timeout): void
+    {
+        if (! is_dir($this->dumpDir) && ! @mkdir($this->dumpDir, 0755, true)) {
+            return;
+        }
+
+        $step = sprintf('%02d', count(glob("{$this->dumpDir}/*.mod") ?: []) + 1);
+        $mod = "{$step}_" . basename($modFile);
+        $dat = "{$step}_" . basename($datFile);
+
+        @copy($modFile, "{$this->dumpDir}/{$mod}");
+        @copy($datFile, "{$this->dumpDir}/{$dat}");
+
+        $script = "{$this->dumpDir}/glpsol.sh";
+        $header = file_exists($script) ? '' : "#!/bin/sh\ncd \"$(dirname \"$0\")\"\n";
+        @file_put_contents($script, $header . sprintf(
+            "glpsol --scale --model %s --data %s --tmlim %d --output %s\n",
+            $mod,
+            $dat,
+            $timeout,
+            "{$step}.sol"
+        ), FILE_APPEND);
+    }
+
     /**
      * Helper to build TaskResult with automatic timing and artifacts collection.
      */
@@ -63,6 +63,13 @@
                 'temp_dir'    => env('GLPK_TEMP_DIR', sys_get_temp_dir()),
                 'timeout'     => env('GLPK_TIMEOUT', 30),
 
+                /**
+                 * Directory that receives a numbered copy of every GLPK model/data
+                 * file pair plus a glpsol.sh replaying the calls (null = disabled).
+                 * Used by benchmark:glpk:replay to profile slow specs offline.
+                 */
+                'dump_dir'    => env('GLPK_DUMP_DIR'),
+
                 /**
                  * Controls GLPK Phase 1 maximum timeout and maximum problem size.
                  * Problems larger than this size always use binary search fallback,
@@ -11,11 +11,14 @@ from pathlib import Path
 from typing import List
 import sys
 
-# Add lib directory to path
+# Add lib directory to path. Analysis modules (pandas, matplotlib) are imported
+# inside the commands that need them so quick commands like `list` start fast.
 sys.path.insert(0, str(Path(__file__).parent / 'lib'))
 
-from benchmark_stats import BenchmarkAnalyzer, compare_sizes
-from benchmark_viz import BenchmarkVisualizer
+
+def _fmt(value, spec: str) -> str:
+    """Format a possibly missing (None/NaN) number for a table cell."""
+    return 'n/a' if value is None or value != value else format(value, spec)
 
 
 @click.group()
@@ -28,15 +31,20 @@ def cli():
 @cli.command()
 @click.argument('csv_file', type=click.Path(exists=True))
 @click.option('--json', 'json_output', type=click.Path(), help='Export stats as JSON')
-def analyze(csv_file: str, json_output: str):
+@click.option('--timeout', type=float, default=None,
+              help='Solver timeout in seconds used for the run (censoring point for timeouts)')
+def analyze(csv_file: str, json_output: str, timeout: float):
     """
     Analyze a single benchmark CSV file and display statistics.
 
     Example:
         python cli.py analyze storage/benchmarks/glpk_random_30.csv
+        python cli.py analyze glpk_random_200.csv --timeout 30
     """
     try:
-        analyzer = BenchmarkAnalyzer(csv_file)
+        from benchmark_stats import BenchmarkAnalyzer
+        timeout_ms = timeout * 1000 if timeout else None
+        analyzer = BenchmarkAnalyzer(csv_file, timeout_ms=timeout_ms)
 
         # Print summary
         click.echo(analyzer.get_summary_text())
@@ -56,7 +64,10 @@ def analyze(csv_file: str, json_output: str):
 @click.option('--output', '-o', type=click.Path(), help='Output file for comparison table')
 @click.option('--format', 'output_format', type=click.Choice(['table', 'csv', 'markdown']),
               default='table', help='Output format')
-def compare(csv_files: tuple, output: str, output_format: str):
+@click.option('--merge', 'merge_policy', type=click.Choice(['first', 'last', 'best']), default=None,
+              help='Merge shards/_retry files per scenario and size with this retry policy '
+                   '(default: pool shards, skip _retry files of loaded shards)')
+def compare(csv_files: tuple, output: str, output_format: str, merge_policy: str):
     """
     Compare statistics across multiple benchmark files.
 
@@ -65,6 +76,7 @@ def compare(csv_files: tuple, output: str, output_format: str):
         python cli.py compare file1.csv file2.csv file3.csv --format markdown
     """
     try:
+        from benchmark_stats import compare_sizes
         # Handle glob expansion
         files = list(csv_files)
 
@@ -73,7 +85,7 @@ def compare(csv_files: tuple, output: str, output_format: str):
             sys.exit(1)
 
         # Perform comparison
-        comparison_df = compare_sizes(files)
+        comparison_df = compare_sizes(files, merge_policy=merge_policy)
 
         # Select key columns for display
         display_cols = [
@@ -139,6 +151,7 @@ def report(csv_file: str, output_dir: str, compare_with: tuple):
         python cli.py report glpk_random_30.csv -o reports/ -c glpk_random_20.csv -c glpk_random_10.csv
     """
     try:
+        from benchmark_viz import BenchmarkVisualizer
         viz = BenchmarkVisualizer(csv_file)
 
         # Generate full report
@@ -158,14 +171,22 @@ def report(csv_file: str, output_dir: str, compare_with: tuple):
 @click.argument('csv_file', type=click.Path(exists=True))
 @click.option('--export', '-e', type=click.Path(), help='Export timeout data to CSV')
 @click.option('--details/--no-details', default=False, help='Show detailed iteration list')
-def timeouts(csv_file: str, export: str, details: bool):
+@click.option('--raster', type=click.Path(), help='Save a timeout raster plot')
+def timeouts(csv_file: str, export: str, details: bool, raster: str):
     """
     Analyze timeout patterns in benchmark data.
 
+    Besides gap statistics, tests timeouts against independent runs: the
+    longest run of consecutive timeouts, dense bursts (scan test), block
+    dispersion, periodicity (FFT periodogram) and dependence on iteration
+    order (runs and trend tests).
+
     Example:
         python cli.py timeouts storage/benchmarks/glpk_random_30.csv --details
+        python cli.py timeouts glpk_random_30.csv --raster timeouts.png
     """
     try:
+        from benchmark_stats import BenchmarkAnalyzer
         analyzer = BenchmarkAnalyzer(csv_file)
         timeout_info = analyzer.analyze_timeouts()
         stats = analyzer.compute_stats()
@@ -188,6 +209,21 @@ def timeouts(csv_file: str, export: str, details: bool):
             click.echo(f"  Min gap: {timeout_info['timeout_gaps_min']} iterations")
             click.echo(f"  Max gap: {timeout_info['timeout_gaps_max']} iterations")
 
+        patterns = timeout_info.get('patterns')
+        if patterns and patterns['testable']:
+            from benchmark_stats import format_timeout_patterns
+            click.echo(f"\nPatterns (null: each run times out independently at {patterns['rate']:.2%}):")
+            click.echo(format_timeout_patterns(patterns).rstrip())
+            for burst in patterns['bursts'][:10]:
+                click.echo(f"    burst {burst['first_iteration']}-{burst['last_iteration']}: "
+                           f"{burst['timeouts']} timeouts in {burst['span']} runs ({burst['rate']:.0%}, "
+                           f"p={burst['p_value']:.2g})")
+
+        if raster:
+            from benchmark_viz import BenchmarkVisualizer
+            BenchmarkVisualizer(csv_file).plot_timeout_raster(save_path=raster, show=False)
+            click.echo(f"\n✓ Timeout raster saved to: {raster}")
+
         if details:
             click.echo(f"\nTimeout iterations ({len(timeout_info['timeout_iterations'])} total):")
             iterations = timeout_info['timeout_iterations']
@@ -209,30 +245,1510 @@ def timeouts(csv_file: str, export: str, details: bool):
         sys.exit(1)
 
 
+@cli.command()
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--scenario', default='random', help='Scenario to model')
+@click.option('--timeout', type=float, default=None,
+              help='Solver timeout in seconds (inferred from TIMEOUT rows if omitted)')
+@click.option('--predict', 'predict_sizes', multiple=True, type=int,
+              help='Size(s) to predict timeout probability for')
+@click.option('--confidence', type=float, default=0.90, help='Confidence level for intervals')
+@click.option('--merge', 'merge_policy', type=click.Choice(['first', 'last', 'best']), default=None,
+              help='Merge shards/_retry files per scenario and size with this retry policy '
+                   '(default: pool shards, skip _retry files of loaded shards)')
+def survival(csv_files: tuple, scenario: str, timeout: float, predict_sizes: tuple, confidence: float,
+             merge_policy: str):
+    """
+    Censoring-aware analysis treating TIMEOUT rows as right-censored.
+
+    Example:
+        python cli.py survival storage/benchmarks/glpk_random_*.csv --predict 300
+        python cli.py survival glpk_random_*.csv --timeout 30 --predict 250 --predict 300
+    """
+    try:
+        from benchmark_compare import BenchmarkComparer
+        from benchmark_survival import predict_timeout_probability
+        timeout_ms = timeout * 1000 if timeout else None
+        comparer = BenchmarkComparer(list(csv_files), timeout_ms=timeout_ms, merge_policy=merge_policy)
+        result = comparer.analyze_survival(scenario)
+        fit = result['fit']
+
+        click.echo(f"=== Survival Analysis ({scenario}) ===")
+        click.echo(f"Censoring point: {result['timeout_ms']:.0f}ms")
+        click.echo(f"Observations: {fit['n_observations']} ({fit['n_censored']} censored)")
+        click.echo(f"Log-normal AFT: log(T) = {fit['coeffs'][0]:.3f} + {fit['coeffs'][1]:.3f}*log(size), "
+                   f"sigma = {fit['sigma']:.3f}")
+
+        from tabulate import tabulate
+        rows = []
+        for stats in comparer.dataset(scenario=scenario).stats().to_dict('records'):
+            size = int(stats['size'])
+            fitted = next(s for s in result['per_size'] if s['size'] == size)
+            rows.append([
+                size,
+                stats['time_p50'], stats['time_km_p50'],
+                stats['time_p99'], stats['time_km_p99'],
+                f"{fitted['observed_timeout_rate']:.2%}",
+                f"{fitted['fitted_timeout_rate']:.2%}",
+            ])
+        click.echo()
+        click.echo(tabulate(rows, headers=['size', 'p50', 'KM p50', 'p99', 'KM p99',
+                                           'timeouts', 'fitted'],
+                            tablefmt='grid', floatfmt='.2f', missingval='> timeout'))
+
+        if predict_sizes:
+            click.echo(f"\nPredicted timeout probability ({confidence:.0%} interval):")
+            for size in predict_sizes:
+                p = predict_timeout_probability(fit, size, result['timeout_ms'], confidence)
+                click.echo(f"  {size}x{size}: {p['probability']:.2%} "
+                           f"[{p['lower']:.2%}, {p['upper']:.2%}]")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command('timeout-plan')
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--target', type=float, default=0.99, help='Required success rate (e.g. 0.995)')
+@click.option('--timeout', type=float, default=None,
+              help='Timeout in seconds the benchmark ran with (inferred if omitted)')
+@click.option('--min', 'min_timeout', type=float, default=None, help='Smallest candidate timeout (s)')
+@click.option('--max', 'max_timeout', type=float, default=None,
+              help='Largest candidate timeout (s, default 4x the benchmark timeout)')
+@click.option('--steps', type=int, default=2000, help='Number of candidate timeouts')
+@click.option('--retries', type=int, default=2, help='Evaluate up to this many same-timeout retries')
+@click.option('--escalation', type=float, default=2.0,
+              help='Timeout multiplier for the escalating retry strategy')
+@click.option('--output', '-o', type=click.Path(), help='Export the full sweep as CSV')
+def timeout_plan(csv_files: tuple, target: float, timeout: float, min_timeout: float,
+                 max_timeout: float, steps: int, retries: int, escalation: float, output: str):
+    """
+    Recommend a solver timeout that meets a target success rate.
+
+    Sweeps candidate timeouts against the censoring-aware time distribution of
+    each file and reports the smallest timeout per retry strategy.
+
+    Example:
+        python cli.py timeout-plan storage/benchmarks/glpk_random_200.csv --target 0.995
+        python cli.py timeout-plan glpk_*_300.csv --timeout 30 --max 300 -o plan.csv
+    """
+    try:
+        from benchmark_stats import BenchmarkAnalyzer
+        from benchmark_survival import infer_timeout_ms
+        from benchmark_timeout_plan import TimeoutPlanner, recommend_timeout
+        import numpy as np
+        import pandas as pd
+        from tabulate import tabulate
+
+        sweeps = []
+        retry_counts = list(range(1, retries + 1))
+
+        for csv_file in csv_files:
+            analyzer = BenchmarkAnalyzer(csv_file)
+            df = analyzer.df
+            run_timeout_ms = timeout * 1000 if timeout else infer_timeout_ms(df)
+
+            low = min_timeout * 1000 if min_timeout else run_timeout_ms * 0.01
+            high = max_timeout * 1000 if max_timeout else run_timeout_ms * 4
+            candidates = np.linspace(low, high, steps)
+
+            planner = TimeoutPlanner(df, run_timeout_ms)
+            plan = planner.sweep(candidates, retry_counts, escalation)
+
+            size, scenario = int(df['size'].iloc[0]), df['scenario'].iloc[0]
+            click.echo(f"\n=== Timeout Plan: {size}x{size} {scenario} "
+                       f"(benchmark timeout {run_timeout_ms / 1000:.1f}s, target {target:.2%}) ===")
+
+            strategies = [('no retry', 'success_rate', 'expected_time_ms')]
+            strategies += [(f'{k} retr{"y" if k == 1 else "ies"}', f'success_rate_retry{k}',
+                            f'expected_time_retry{k}_ms') for k in retry_counts]
+            strategies.append((f'escalate x{escalation:g}', 'success_rate_escalate',
+                               'expected_time_escalate_ms'))
+
+            rows = []
+            for label, success_col, time_col in strategies:
+                best = recommend_timeout(plan, target, success_col)
+                if best is None:
+                    rows.append([label, 'not reachable', '', '', ''])
+                else:
+                    rows.append([
+                        label,
+                        f"{best['timeout_ms'] / 1000:.2f}s",
+                        f"{best[success_col]:.3%}",
+                        f"{best[time_col] / 1000:.2f}s",
+                        'yes' if best['extrapolated'] else 'no',
+                    ])
+            click.echo(tabulate(rows, headers=['strategy', 'timeout', 'success', 'E[wall time]',
+                                               'extrapolated'], tablefmt='grid'))
+
+            if planner.other_failure_rate > 0:
+                click.echo(f"Note: {planner.other_failure_rate:.2%} of runs FAILED/INFEASIBLE regardless "
+                           f"of timeout; success rate is capped at {1 - planner.other_failure_rate:.2%}")
+
+            plan.insert(0, 'scenario', scenario)
+            plan.insert(0, 'size', size)
+            sweeps.append(plan)
+
+        if output:
+            pd.concat(sweeps, ignore_index=True).to_csv(output, index=False)
+            click.echo(f"\n✓ Sweep exported to: {output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--p50', type=float, default=None, help='SLO: max median time (s)')
+@click.option('--p95', type=float, default=None, help='SLO: max P95 time (s)')
+@click.option('--p99', type=float, default=None, help='SLO: max P99 time (s)')
+@click.option('--timeout-rate', type=float, default=None, help='SLO: max timeout rate (e.g. 0.005)')
+@click.option('--timeout', type=float, default=None,
+              help='Solver timeout in seconds the benchmarks ran with (inferred if omitted)')
+@click.option('--confidence', type=float, default=0.90, help='One-sided confidence of the bounds')
+@click.option('--sizes', type=str, default=None,
+              help='Comma-separated sizes for the feasibility matrix (e.g. 50,100,200,300)')
+@click.option('--output', '-o', type=click.Path(),
+              help='Export the feasibility matrix (.csv tidy table, .md published table)')
+@click.option('--merge', 'merge_policy', type=click.Choice(['first', 'last', 'best']), default=None,
+              help='Merge shards/_retry files per scenario and size with this retry policy '
+                   '(default: pool shards, skip _retry files of loaded shards)')
+def capacity(csv_files: tuple, p50: float, p95: float, p99: float, timeout_rate: float,
+             timeout: float, confidence: float, sizes: str, output: str, merge_policy: str):
+    """
+    Find the largest lottery size per scenario that meets a latency SLO.
+
+    Example:
+        python cli.py capacity storage/benchmarks/glpk_*.csv --p99 30 --timeout-rate 0.005
+        python cli.py capacity glpk_*.csv --p95 10 --sizes 100,200,300 -o capacity.md
+    """
+    try:
+        from benchmark_compare import BenchmarkComparer
+        from benchmark_capacity import feasibility_table, plan_capacity
+        from tabulate import tabulate
+
+        slo = {}
+        for key, seconds in (('p50', p50), ('p95', p95), ('p99', p99)):
+            if seconds is not None:
+                slo[key] = seconds * 1000
+        if timeout_rate is not None:
+            slo['timeout_rate'] = timeout_rate
+
+        if not slo:
+            click.echo("Error: define at least one SLO limit (--p50/--p95/--p99/--timeout-rate)", err=True)
+            sys.exit(1)
+
+        timeout_ms = timeout * 1000 if timeout else None
+        size_grid = [int(s) for s in sizes.split(',')] if sizes else None
+
+        comparer = BenchmarkComparer(list(csv_files), timeout_ms=timeout_ms, merge_policy=merge_policy)
+        plan = plan_capacity(comparer, slo, sizes=size_grid, confidence=confidence)
+
+        slo_text = ', '.join(
+            f"{key} < {limit:.2%}" if key == 'timeout_rate' else f"{key} < {limit / 1000:g}s"
+            for key, limit in slo.items()
+        )
+        click.echo(f"=== Capacity Plan (SLO: {slo_text}; {confidence:.0%} confidence) ===\n")
+
+        rows = []
+        for scenario, result in plan['scenarios'].items():
+            if result['max_safe_size'] is None:
+                reason = result.get('error') or (f"limited by {', '.join(result['limited_by'])} "
+                                                 f"already at {result['min_observed_size']} (smallest benchmarked)")
+                rows.append([scenario, 'none', reason])
+                continue
+            size = result['max_safe_size']
+            note = f"limited by {', '.join(result['limited_by'])}" if result['limited_by'] else 'no limit in range'
+            if result['extrapolated']:
+                note += f" (extrapolated beyond {result['max_observed_size']})"
+            rows.append([scenario, f"{size}x{size}", note])
+        click.echo(tabulate(rows, headers=['scenario', 'max safe size', 'notes'], tablefmt='grid'))
+
+        table = feasibility_table(plan['matrix'])
+        click.echo("\nFeasibility matrix (* = extrapolated):")
+        click.echo(tabulate(table, headers='keys', tablefmt='grid'))
+
+        if output:
+            if output.endswith('.md'):
+                with open(output, 'w') as f:
+                    f.write(f"# Lottery capacity (SLO: {slo_text}; {confidence:.0%} confidence)\n\n")
+                    f.write(table.to_markdown())
+                    f.write("\n\n`*` = outside the benchmarked sizes (extrapolated)\n")
+            else:
+                plan['matrix'].to_csv(output, index=False)
+            click.echo(f"\n✓ Feasibility matrix saved to: {output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--metric', '-m', 'metrics', multiple=True, default=('time_p95', 'timeout_rate'),
+              help='Metric(s) to print as size x scenario tables (any compute_stats key)')
+@click.option('--timeout', type=float, default=None,
+              help='Solver timeout in seconds the benchmarks ran with (censoring point)')
+@click.option('--output', '-o', type=click.Path(), help='Export the tidy matrix (one row per cell) as CSV')
+@click.option('--heatmap', type=click.Path(), help='Save annotated heatmaps (p50, p95, p99, timeout rate, CV)')
+@click.option('--merge', 'merge_policy', type=click.Choice(['first', 'last', 'best']), default=None,
+              help='Merge shards/_retry files per scenario and size with this retry policy '
+                   '(default: pool shards, skip _retry files of loaded shards)')
+def matrix(csv_files: tuple, metrics: tuple, timeout: float, output: str, heatmap: str, merge_policy: str):
+    """
+    Compute every metric for every (scenario, size) cell in one pass.
+
+    Example:
+        python cli.py matrix storage/benchmarks/glpk_*.csv
+        python cli.py matrix glpk_*.csv -m time_p99 -o matrix.csv --heatmap matrix.png
+    """
+    try:
+        from benchmark_dataset import BenchmarkDataset
+        from benchmark_matrix import matrix_pivot, plot_matrix_heatmaps
+        from tabulate import tabulate
+
+        timeout_ms = timeout * 1000 if timeout else None
+        cells = BenchmarkDataset(list(csv_files), timeout_ms=timeout_ms, merge_policy=merge_policy).aggregate()
+
+        for metric in metrics:
+            if metric not in cells.columns:
+                click.echo(f"Error: unknown metric '{metric}'", err=True)
+                sys.exit(1)
+            table = matrix_pivot(cells, metric)
+            if metric.endswith('_rate'):
+                table = table.apply(lambda col: col.map(lambda v: f"{v:.2%}"))
+            else:
+                table = table.round(2)
+            click.echo(f"\n=== {metric} (size x scenario) ===")
+            click.echo(tabulate(table, headers='keys', tablefmt='grid'))
+
+        if output:
+            cells.to_csv(output, index=False)
+            click.echo(f"\n✓ Matrix saved to: {output}")
+
+        if heatmap:
+            plot_matrix_heatmaps(cells, save_path=heatmap, show=False)
+            click.echo(f"✓ Heatmaps saved to: {heatmap}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('paths', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--group-by', type=click.Choice(['scenario', 'size', 'cell', 'none']), default='scenario',
+              help='Merge summaries per scenario, per size, per (scenario, size) or all together')
+@click.option('--percentile', '-p', 'percentiles', multiple=True, type=float,
+              default=(50, 90, 95, 99, 99.9), help='Percentile(s) to report')
+@click.option('--digits', type=int, default=3, help='Significant digits of the histograms (1-5)')
+@click.option('--refresh', is_flag=True, help='Rebuild cached histograms of CSV inputs')
+@click.option('--output', '-o', type=click.Path(), help='Save the merge of all inputs as a histogram JSON')
+def percentiles(paths: tuple, group_by: str, percentiles: tuple, digits: int, refresh: bool, output: str):
+    """
+    Percentiles of any union of files, shards or hosts via merged histograms.
+
+    PATHS may be benchmark CSVs (summarized once, cached in .benchmark_cache/hdr/)
+    or histogram JSON files saved with -o, e.g. by other benchmark workers.
+
+    Example:
+        python cli.py percentiles storage/benchmarks/glpk_*.csv
+        python cli.py percentiles glpk_random_*.csv --group-by none -p 99 -p 99.9
+        python cli.py percentiles glpk_random_50.csv -o worker1_random_50.json
+        python cli.py percentiles worker*_random_50.json --group-by cell
+    """
+    try:
+        from tabulate import tabulate
+        from benchmark_hdr import LatencyHistogram, load_histogram, merge_histograms
+
+        histograms = [
+            LatencyHistogram.load(p) if p.endswith('.json') else load_histogram(p, digits, refresh=refresh)
+            for p in paths
+        ]
+
+        def label(hist):
+            if group_by == 'none':
+                return 'all'
+            keys = {(s['scenario'], s['size']) for s in hist.sources}
+            if group_by == 'scenario':
+                values = {scenario for scenario, _ in keys}
+            elif group_by == 'size':
+                values = {size for _, size in keys}
+            else:
+                values = {f"{scenario}_{size}" for scenario, size in keys}
+            return str(values.pop()) if len(values) == 1 else 'mixed'
+
+        groups = {}
+        for hist in histograms:
+            groups.setdefault(label(hist), []).append(hist)
+
+        rows = []
+        for name, members in sorted(groups.items(), key=lambda kv: (not kv[0].isdigit(), int(kv[0]) if kv[0].isdigit() else 0, kv[0])):
+            merged = merge_histograms(members)
+            runs = sum(merged.status_counts.values())
+            timeouts = merged.status_counts.get('TIMEOUT', 0)
+            rows.append([name, len(merged.sources), runs, merged.total]
+                        + merged.percentiles(percentiles)
+                        + [f"{timeouts / runs:.2%}" if runs else '-'])
+
+        click.echo(f"=== Percentiles of merged histograms ({digits} significant digits, ms) ===\n")
+        click.echo(tabulate(rows, headers=[group_by if group_by != 'none' else '', 'files', 'runs', 'solved']
+                            + [f"p{q:g}" for q in percentiles] + ['timeouts'],
+                            tablefmt='grid', floatfmt='.2f', missingval='-'))
+
+        if output:
+            merge_histograms(histograms).save(output)
+            click.echo(f"\n✓ Histogram saved to: {output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('shards', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--output', '-o', required=True, type=click.Path(),
+              help='Output CSV (one scenario/size) or directory (several)')
+@click.option('--policy', type=click.Choice(['first', 'last', 'best']), default='first',
+              help='Which attempt of a retried run to keep')
+def merge(shards: tuple, output: str, policy: str):
+    """
+    Merge benchmark shards and retry output into one CSV per scenario/size.
+
+    Shards of the same glpk_<scenario>_<size> (e.g. glpk_random_300_w1.csv,
+    glpk_random_300_w2.csv, glpk_random_300_retry.csv) are merged by
+    iteration. Retry rows are collapsed with the run of the same (iteration,
+    spec) using the retry policy; every row of a regular shard is kept,
+    except a row repeated verbatim (same iteration, spec, time and status)
+    in another regular shard.
+    Source/attempts/retry columns record provenance.
+    Analysis commands accept --merge to use the same view without a copy.
+
+    Example:
+        python cli.py merge glpk_random_300*.csv -o merged/glpk_random_300.csv
+        python cli.py merge storage/benchmarks/glpk_*.csv -o merged/ --policy best
+    """
+    try:
+        from tabulate import tabulate
+        from benchmark_shards import group_shards, write_merged
+
+        groups = group_shards(list(shards))
+        output_path = Path(output)
+        if len(groups) > 1 or output_path.is_dir() or output.endswith('/'):
+            output_path.mkdir(parents=True, exist_ok=True)
+            targets = {key: output_path / f"glpk_{key[0]}_{key[1]}.csv" for key in groups}
+        else:
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            targets = {key: output_path for key in groups}
+
+        rows = []
+        for key, paths in groups.items():
+            if targets[key].resolve() in [p.resolve() for p in paths]:
+                raise ValueError(f"Output {targets[key]} would overwrite one of its shards")
+            stats = write_merged([str(p) for p in paths], str(targets[key]), policy)
+            rows.append([f"{key[0]}_{key[1]}", len(paths), stats['rows_in'], stats['rows_out'],
+                         stats['duplicates'], stats['retry_attempts'], stats['retried'], targets[key].name])
+
+        click.echo(f"=== Merged shards (policy: {policy}) ===\n")
+        click.echo(tabulate(rows, headers=['cell', 'shards', 'rows in', 'rows out',
+                                           'duplicates', 'retry attempts', 'retried runs', 'output'],
+                               tablefmt='grid'))
+        click.echo(f"\n✓ Merged benchmark(s) saved to: {output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command('list')
+@click.argument('paths', nargs=-1, type=click.Path(exists=True))
+@click.option('--scenario', default=None, help='Only list this scenario')
+@click.option('--refresh', is_flag=True, help='Rescan every file instead of using the index')
+@click.option('--cache-dir', type=click.Path(), default=None,
+              help='Directory of the persisted index (default: ~/.cache/benchmark_analysis)')
+@click.option('--no-cache', is_flag=True, help='Scan every file and do not persist the index')
+@click.option('--json', 'json_output', type=click.Path(), help='Export the index entries as JSON')
+def list_files(paths: tuple, scenario: str, refresh: bool, cache_dir: str, no_cache: bool, json_output: str):
+    """
+    List benchmark files with row counts and status summary.
+
+    PATHS may be CSV files or directories (default: storage/benchmarks).
+    Uses the index in the user cache directory (nothing is written next to
+    the benchmarks), rescanning only files whose size or modification time
+    changed.
+
+    Example:
+        python cli.py list
+        python cli.py list ../../storage/benchmarks --scenario random
+    """
+    try:
+        from benchmark_catalog import DEFAULT_INDEX_DIR, index_directory, load_index
+        from datetime import datetime
+        from tabulate import tabulate
+
+        if not paths:
+            paths = (str(Path(__file__).parent / '../../storage/benchmarks'),)
+        cache_dir = None if no_cache else (cache_dir or DEFAULT_INDEX_DIR)
+
+        entries = []
+        files = [p for p in paths if not Path(p).is_dir()]
+        for directory in (p for p in paths if Path(p).is_dir()):
+            entries.extend(index_directory(directory, refresh=refresh, cache_dir=cache_dir))
+        entries.extend(load_index(files, refresh=refresh, cache_dir=cache_dir))
+
+        if scenario:
+            entries = [e for e in entries if e['scenario'] == scenario]
+
+        if not entries:
+            click.echo("No benchmark files found")
+            return
+
+        entries.sort(key=lambda e: (e['scenario'] or '', e['size'] or 0, e['file']))
+        statuses = ['SUCCESS', 'TIMEOUT', 'FAILED', 'INFEASIBLE']
+        rows = []
+        for e in entries:
+            iterations = (f"{e['iteration_min']}-{e['iteration_max']}"
+                          if e['rows'] else '-')
+            rows.append([e['file'], e['scenario'], e['size'], e['rows'], iterations]
+                        + [e['status_counts'].get(s, 0) for s in statuses]
+                        + [f"{e['bytes'] / 1024:.1f}",
+                           datetime.fromtimestamp(e['mtime_ns'] / 1e9).strftime('%Y-%m-%d %H:%M')])
+
+        click.echo(tabulate(rows, headers=['file', 'scenario', 'size', 'rows', 'iterations']
+                            + [s.lower() for s in statuses] + ['KB', 'modified'],
+                            tablefmt='simple'))
+        click.echo(f"\n{len(entries)} file(s), {sum(e['rows'] for e in entries)} runs")
+
+        if json_output:
+            import json
+            with open(json_output, 'w') as f:
+                json.dump([{k: v for k, v in e.items() if k != 'path'} for e in entries], f, indent=2)
+            click.echo(f"✓ Index saved to: {json_output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--timeout', type=float, default=None,
+              help='Timeout in seconds the original benchmark ran with (inferred if omitted)')
+@click.option('--max-retries', type=int, default=None,
+              help='Largest retry budget to evaluate (default: most retries recorded)')
+@click.option('--output', '-o', type=click.Path(), help='Export every run with its retry class as CSV')
+def retries(csv_files: tuple, timeout: float, max_retries: int, output: str):
+    """
+    Retry-aware success rates, costs and flakiness.
+
+    Pass original benchmark files together with their benchmark:glpk:retry
+    output (<name>_retry.csv). Retry rows are linked to their original run by
+    iteration and spec, failed runs are classified (solved-on-retry, flaky,
+    deterministic-timeout, ...), and every retry budget is set against
+    raising the timeout to the same success rate.
+
+    Example:
+        python cli.py retries storage/benchmarks/glpk_random_200*.csv
+        python cli.py retries glpk_*_300.csv glpk_*_300_retry.csv --timeout 30 -o retries.csv
+    """
+    try:
+        from benchmark_retry import (RETRY_CLASSES, classify_runs, compare_with_timeout,
+                                     link_attempts, load_retry_pairs, retry_budgets, retry_summary)
+        from benchmark_survival import infer_timeout_ms
+        import pandas as pd
+        from tabulate import tabulate
+
+        def ms(value):
+            return f"{value / 1000:.2f}s" if value is not None and pd.notna(value) else 'n/a'
+
+        exports = []
+        for (scenario, size), (original, retry_rows) in load_retry_pairs(list(csv_files)).items():
+            attempts, unmatched = link_attempts(original, retry_rows)
+            runs = classify_runs(attempts)
+            summary = retry_summary(runs)
+            budgets = retry_budgets(attempts, max_retries)
+            run_timeout_ms = timeout * 1000 if timeout else infer_timeout_ms(original)
+
+            click.echo(f"\n=== Retry Analysis: {size}x{size} {scenario} "
+                       f"(benchmark timeout {run_timeout_ms / 1000:.1f}s) ===")
+            if summary['retried_runs'] == 0:
+                click.echo("No retry rows for this benchmark (run benchmark:glpk:retry first)")
+                continue
+
+            rows = [
+                ['Runs', summary['total_runs']],
+                ['First-attempt success', f"{summary['first_attempt_success_rate']:.2%}"],
+                ['Effective success (all retries)', f"{summary['effective_success_rate']:.2%}"],
+                ['Failed runs retried', f"{summary['retried_runs']}/{summary['failed_runs']}"],
+                ['Retry attempts', summary['retry_attempts']],
+                ['Per-retry success', f"{summary['retry_success_rate']:.2%}"],
+            ]
+            rows += [[f"  {name}", summary[name.replace('-', '_')]] for name in RETRY_CLASSES]
+            click.echo(tabulate(rows, tablefmt='simple'))
+            if unmatched:
+                click.echo(f"Warning: {unmatched} retry rows match no original run (iteration and spec)")
+
+            click.echo("\nRetry path latency (solved runs):")
+            click.echo(tabulate([
+                ['first attempt only'] + [ms(summary[f'first_attempt_p{q}_ms']) for q in (50, 95, 99)],
+                ['with retries'] + [ms(summary[f'with_retries_p{q}_ms']) for q in (50, 95, 99)],
+            ], headers=['', 'p50', 'p95', 'p99'], tablefmt='grid'))
+            click.echo(f"Added by failed attempts before a retry succeeded: "
+                       f"mean {ms(summary['added_latency_mean_ms'])}, p50 {ms(summary['added_latency_p50_ms'])}, "
+                       f"p95 {ms(summary['added_latency_p95_ms'])} ({summary['solved_via_retry']} runs)")
+
+            click.echo("\nRetry budget vs raising the timeout (same success rate, no retries):")
+            try:
+                alternatives = compare_with_timeout(original, budgets, run_timeout_ms)
+            except ValueError:
+                alternatives = [dict(b, timeout_ms=None) for b in budgets.to_dict('records')]
+
+            rows = []
+            for alt in alternatives:
+                if alt['timeout_ms'] is None:
+                    timeout_cols = ['not reachable', '', '']
+                else:
+                    cheaper = ('-' if alt['retries'] == 0 else
+                               'retry' if alt['expected_time_ms'] <= alt['timeout_expected_time_ms'] else 'timeout')
+                    timeout_cols = [ms(alt['timeout_ms']) + ('*' if alt['timeout_extrapolated'] else ''),
+                                    ms(alt['timeout_expected_time_ms']), cheaper]
+                rows.append([alt['retries'], f"{alt['success_rate']:.2%}", ms(alt['expected_time_ms'])]
+                            + timeout_cols)
+            click.echo(tabulate(rows, headers=['retries', 'success', 'E[time/run]', 'equivalent timeout',
+                                               'E[time/run]', 'cheaper'], tablefmt='grid'))
+            click.echo("* beyond the benchmark timeout (log-normal tail extrapolation)")
+
+            runs.insert(0, 'scenario', scenario)
+            runs.insert(0, 'size', size)
+            exports.append(runs)
+
+        if output and exports:
+            pd.concat(exports, ignore_index=True).to_csv(output, index=False)
+            click.echo(f"\n✓ Retry classification saved to: {output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--workers', '-j', type=int, default=None, help='Decoding processes (default: CPU count)')
+@click.option('--refresh', is_flag=True, help='Decode every file regardless of the feature store')
+@click.option('--output', '-o', type=click.Path(), help='Export every row with its features as CSV')
+def features(csv_files: tuple, workers: int, refresh: bool, output: str):
+    """
+    Decode spec/result JSON into per-run instance features.
+
+    Builds (or reuses) the feature store in .benchmark_cache/features/ and
+    prints the mean spec features per scenario and size: preference density,
+    first-choice entropy and contention, rank agreement, tie structure and
+    pick ranks.
+
+    Example:
+        python cli.py features ../../storage/benchmarks/glpk_*.csv -j 8
+        python cli.py features glpk_random_50.csv -o random_50_features.csv
+    """
+    try:
+        from benchmark_features import feature_frame
+        from benchmark_spec import RESULT_FEATURES, SPEC_FEATURES
+        from tabulate import tabulate
+
+        df = feature_frame(list(csv_files), refresh=refresh, workers=workers)
+
+        shown = ['first_choice_entropy', 'first_choice_max_share', 'rank_agreement',
+                 'duplicate_list_share', 'largest_tie_share', 'pref_density', 'pick_rank_mean']
+        cells = df.groupby(['scenario', 'size'], observed=True).agg(
+            runs=('spec_hash', 'size'), specs=('spec_hash', 'nunique'), **{c: (c, 'mean') for c in shown})
+
+        click.echo(f"=== Spec features ({len(df)} runs, {df['spec_hash'].nunique()} distinct specs) ===\n")
+        click.echo(tabulate(cells.reset_index(), headers=['scenario', 'size', 'runs', 'specs', 'fc entropy',
+                                                          'fc max share', 'rank agree', 'dup lists',
+                                                          'tie group', 'density', 'pick rank'],
+                            tablefmt='grid', floatfmt='.3f', showindex=False))
+        click.echo(f"\nFeatures: {', '.join(SPEC_FEATURES + RESULT_FEATURES)}")
+
+        if output:
+            df.to_csv(output, index=False)
+            click.echo(f"\n✓ Features saved to: {output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--scenario', help='Only this scenario')
+@click.option('--size', type=int, help='Only this size')
+@click.option('--top', type=int, default=8, help='Features to show per model')
+@click.option('--folds', type=int, default=5, help='Cross-validation folds')
+@click.option('--rounds', type=int, default=300, help='Boosting rounds')
+@click.option('--plot', 'plot_path', type=click.Path(), help='Save partial-dependence plots')
+@click.option('--output', '-o', type=click.Path(), help='Export importances and effects as CSV')
+@click.option('--workers', '-j', type=int, default=None, help='Processes for decoding spec JSON')
+def explain(csv_files: tuple, scenario: str, size: int, top: int, folds: int, rounds: int,
+            plot_path: str, output: str, workers: int):
+    """
+    Explain solve time and timeouts by instance (spec) features.
+
+    Fits gradient-boosted stump models of log(time_ms) within each
+    scenario/size and of timeout probability on the decoded spec features,
+    and reports cross-validated fit, permutation and gain importances, and
+    the effect of moving each feature from its 10th to its 90th percentile.
+
+    Example:
+        python cli.py explain ../../storage/benchmarks/glpk_random_*.csv
+        python cli.py explain glpk_*.csv --scenario realistic --size 50 --plot pd.png
+    """
+    try:
+        from benchmark_explain import explain as explain_features, plot_partial_dependence
+        from benchmark_features import feature_frame
+        import pandas as pd
+        from tabulate import tabulate
+
+        df = feature_frame(list(csv_files), workers=workers)
+        if scenario:
+            df = df[df['scenario'] == scenario]
+        if size:
+            df = df[df['size'] == size]
+        if df.empty:
+            raise ValueError("No runs match the selected scenario/size")
+
+        results = explain_features(df, folds=folds, n_rounds=rounds)
+        cells = df.groupby(['scenario', 'size'], observed=True).ngroups
+        click.echo(f"=== Instance difficulty: {len(df)} runs in {cells} scenario/size cell(s) ===")
+
+        exports = []
+        for key, title in (('time', 'log(time_ms) within scenario/size'), ('timeout', 'P(timeout)')):
+            result = results[key]
+            click.echo(f"\n{title}:")
+            if result is None:
+                click.echo(f"  skipped: {results['skipped'][key]}")
+                continue
+
+            cv = result['cv']
+            if key == 'time':
+                click.echo(f"  {result['rows']} solved runs, cross-validated R^2 {cv['r2']:.3f} "
+                           f"(log-time std {cv['std']:.2f})")
+                effect_label, effect_fmt = 'time x (p10->p90)', '{:.2f}x'
+            else:
+                click.echo(f"  {result['rows']} runs, timeout rate {cv['rate']:.2%}, cross-validated AUC "
+                           f"{cv['auc']:.3f}, log loss {cv['log_loss']:.3f} (base {cv['base_log_loss']:.3f})")
+                effect_label, effect_fmt = 'P(timeout) change', '{:+.2%}'
+
+            table = result['importance'].head(top)
+            rows = [[r.feature, f"{r.permutation:.3f}", f"{r.gain:.1%}", f"{r.p10:.3g} -> {r.p90:.3g}",
+                     effect_fmt.format(r.effect)] for r in table.itertuples()]
+            click.echo(tabulate(rows, headers=['feature', 'permutation', 'gain', 'p10 -> p90', effect_label],
+                                tablefmt='grid'))
+            exports.append(result['importance'].assign(target=key))
+
+        if plot_path:
+            plot_partial_dependence(results, top=min(top, 4), save_path=plot_path, show=False)
+            click.echo(f"\n✓ Partial-dependence plots saved to: {plot_path}")
+
+        if output and exports:
+            pd.concat(exports, ignore_index=True).to_csv(output, index=False)
+            click.echo(f"✓ Importances saved to: {output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command('train-risk')
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--output', '-o', type=click.Path(), default='risk_model.json', show_default=True,
+              help='Model artifact to write')
+@click.option('--folds', type=int, default=5, help='Cross-validation folds')
+@click.option('--rounds', type=int, default=300, help='Boosting rounds')
+@click.option('--threshold', type=float, default=None,
+              help='Decision threshold on P(timeout) (default: best out-of-fold F1)')
+@click.option('--workers', '-j', type=int, default=None, help='Processes for decoding spec JSON')
+def train_risk(csv_files: tuple, output: str, folds: int, rounds: int, threshold: float, workers: int):
+    """
+    Train a timeout-risk classifier on the spec features of benchmark runs.
+
+    Prints a cross-validated evaluation (AUC, log loss, Brier score,
+    calibration by decile, precision/recall at the threshold) and writes a
+    small JSON model for `predict-risk`.
+
+    Example:
+        python cli.py train-risk ../../storage/benchmarks/glpk_*.csv -o risk_model.json
+    """
+    try:
+        from benchmark_features import feature_frame
+        from benchmark_risk import save_risk_model, train_risk_model
+        from tabulate import tabulate
+
+        df = feature_frame(list(csv_files), workers=workers)
+        artifact = train_risk_model(df, folds=folds, n_rounds=rounds, threshold=threshold)
+        report = artifact['evaluation']
+
+        click.echo(f"=== Timeout risk model: {report['runs']} runs, {report['timeouts']} timeouts, "
+                   f"{len(artifact['model']['features'])} features ===\n")
+        precision = f"{report['precision']:.2%}" if report['precision'] is not None else 'n/a'
+        click.echo(tabulate([
+            [f'{folds}-fold AUC', f"{report['auc']:.3f}"],
+            ['Log loss', f"{report['log_loss']:.4f} (base rate {report['base_log_loss']:.4f})"],
+            ['Brier score', f"{report['brier']:.4f}"],
+            ['Threshold', f"{artifact['threshold']:.3f}"],
+            ['Precision', precision],
+            ['Recall', f"{report['recall']:.2%}"],
+            ['Flagged runs', f"{report['flagged_rate']:.2%}"],
+        ], tablefmt='simple'))
+
+        click.echo("\nCalibration (out-of-fold, by decile of predicted risk):")
+        click.echo(tabulate([[f"{c['predicted']:.3f}", f"{c['observed']:.3f}", c['runs']]
+                             for c in report['calibration']],
+                            headers=['predicted', 'observed', 'runs'], tablefmt='grid'))
+
+        save_risk_model(artifact, output)
+        click.echo(f"\n✓ Risk model saved to: {output} ({Path(output).stat().st_size / 1024:.1f} KB)")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command('predict-risk')
+@click.argument('specs', nargs=-1, type=click.Path(allow_dash=True), required=True)
+@click.option('--model', '-m', 'model_path', type=click.Path(exists=True), default='risk_model.json',
+              show_default=True, help='Model artifact from train-risk')
+@click.option('--explain', 'explain_top', type=int, default=0, help='Show the N features driving each prediction')
+@click.option('--json', 'json_output', is_flag=True, help='Print JSON lines instead of text')
+def predict_risk(specs: tuple, model_path: str, explain_top: int, json_output: bool):
+    """
+    Predict the timeout probability of lottery specs before solving them.
+
+    SPECS are JSON files with {"units": [...], "preferences": {...}} as in the
+    benchmark CSV spec column ('-' reads one spec from stdin). Inference uses
+    only the standard library: no pandas, numpy or matplotlib.
+
+    Example:
+        python cli.py predict-risk spec.json
+        php artisan ... | python cli.py predict-risk - --model risk_model.json --json
+    """
+    try:
+        import json
+        import time
+        from benchmark_risk import RiskModel
+        from benchmark_spec import loads
+
+        model = RiskModel.load(model_path)
+        for spec_path in specs:
+            text = sys.stdin.read() if spec_path == '-' else Path(spec_path).read_text()
+            spec = loads(text)
+
+            start = time.perf_counter()
+            probability = model.predict(spec)
+            elapsed_us = (time.perf_counter() - start) * 1e6
+
+            risky = probability >= model.threshold
+            drivers = model.explain(spec, explain_top) if explain_top else []
+            if json_output:
+                click.echo(json.dumps({'spec': spec_path, 'timeout_probability': probability,
+                                       'risky': risky, 'threshold': model.threshold,
+                                       'inference_us': elapsed_us, 'drivers': drivers}))
+                continue
+
+            click.echo(f"{spec_path}: P(timeout) = {probability:.3f} -> {'HIGH' if risky else 'low'} risk "
+                       f"(threshold {model.threshold:.3f}, {elapsed_us:.0f} µs)")
+            for driver in drivers:
+                click.echo(f"    {driver['feature']} = {driver['value']:.3g} "
+                           f"({driver['contribution']:+.2f} log-odds)")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--metric', type=click.Choice(['satisfaction_mean', 'satisfaction_min', 'satisfaction_gini',
+                                             'rank_mean', 'first_choice_share']),
+              default='satisfaction_mean', show_default=True, help='Quality metric for the trade-off')
+@click.option('--plot', 'plot_path', type=click.Path(), help='Save quality vs time plots with Pareto frontiers')
+@click.option('--output', '-o', type=click.Path(), help='Export per-run quality scores as CSV')
+@click.option('--workers', '-j', type=int, default=None, help='Processes for scoring')
+def quality(csv_files: tuple, metric: str, plot_path: str, output: str, workers: int):
+    """
+    Score solution quality from the result column and relate it to solve time.
+
+    Each solved run's picks are scored against its spec: per-family
+    satisfaction by preference rank (1 = first choice, 0 = last), the
+    worst-off family and the Gini coefficient of satisfaction. Per scenario,
+    size and file it reports the mean quality, the rank correlation between
+    time and quality, and the Pareto frontier of time vs quality, so solver
+    variants can be compared on fairness as well as speed.
+
+    Example:
+        python cli.py quality ../../storage/benchmarks/glpk_*.csv --plot quality.png
+        python cli.py quality glpk_random_50.csv glpk_random_50_fast.csv --metric satisfaction_min
+    """
+    try:
+        from benchmark_quality import plot_quality_tradeoff, quality_frame, quality_tradeoff
+        from tabulate import tabulate
+
+        df = quality_frame(list(csv_files), workers=workers)
+        if df.empty:
+            raise ValueError("No solved runs with a result to score")
+
+        table = quality_tradeoff(df, metric)
+        click.echo(f"=== Solution quality: {len(df)} solved runs ({metric}) ===\n")
+        rows = [[r.scenario, r.size, r.file, r.runs, f"{r.satisfaction_mean:.3f}", f"{r.satisfaction_min:.3f}",
+                 f"{r.worst_off_min:.3f}", f"{r.satisfaction_gini:.3f}", f"{r.first_choice_share:.1%}",
+                 'n/a' if r.time_quality_spearman is None or r.time_quality_spearman != r.time_quality_spearman
+                 else f"{r.time_quality_spearman:+.2f}",
+                 r.frontier_runs, f"{r.frontier_time_median:.1f}"] for r in table.itertuples()]
+        click.echo(tabulate(rows, headers=['scenario', 'size', 'file', 'runs', 'satisfaction', 'worst-off',
+                                           'worst-off min', 'gini', 'first choice', 'time~quality',
+                                           'frontier', 'frontier ms'],
+                            tablefmt='grid'))
+        click.echo("\ntime~quality: Spearman correlation of time_ms and the metric "
+                   "(positive: slower runs score higher)")
+
+        if plot_path:
+            plot_quality_tradeoff(df, metric, save_path=plot_path, show=False)
+            click.echo(f"\n✓ Quality plots saved to: {plot_path}")
+
+        if output:
+            df.to_csv(output, index=False)
+            click.echo(f"✓ Quality scores saved to: {output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--status', 'statuses', multiple=True, default=['FAILED'], show_default=True,
+              help='Statuses to include (repeatable)')
+@click.option('--all-statuses', is_flag=True, help='Include every row with an error message')
+@click.option('--top', type=int, default=15, help='Signatures to show')
+@click.option('--output', '-o', type=click.Path(), help='Export signatures (.json or .csv)')
+def errors(csv_files: tuple, statuses: tuple, all_statuses: bool, top: int, output: str):
+    """
+    Cluster error messages of failed runs into signatures.
+
+    Messages are normalized (paths, ids and numbers masked, messages cut
+    at 100 characters trimmed to a common length) and grouped by hash.
+    Each signature gets its count, first/last iteration and per-size
+    distribution across all given files.
+
+    Example:
+        python cli.py errors ../../storage/benchmarks/glpk_*.csv
+        python cli.py errors glpk_*.csv --status FAILED --status INFEASIBLE -o errors.json
+    """
+    try:
+        from benchmark_errors import corpus_error_signatures, signature_size_table, signatures_to_records
+        from tabulate import tabulate
+        import json
+
+        signatures = corpus_error_signatures(csv_files, None if all_statuses else list(statuses))
+        included = 'all statuses' if all_statuses else ', '.join(statuses)
+        if signatures.empty:
+            click.echo(f"No error messages for {included} in {len(csv_files)} file(s)")
+            return
+
+        total = int(signatures['count'].sum())
+        click.echo(f"=== Error signatures: {len(signatures)} signature(s) in {total} run(s) ({included}) ===\n")
+        shown = signatures.head(top)
+        rows = [[r.signature_id, r.count, f"{r.share:.1%}", ', '.join(f"{k}:{v}" for k, v in r.statuses.items()),
+                 f"{r.first_iteration}-{r.last_iteration}", r.signature[:70]] for r in shown.itertuples()]
+        click.echo(tabulate(rows, headers=['id', 'count', 'share', 'statuses', 'iterations', 'signature'],
+                            tablefmt='grid'))
+
+        click.echo("\nBy size:")
+        click.echo(tabulate(signature_size_table(shown), headers='keys', tablefmt='grid'))
+        if len(signatures) > top:
+            click.echo(f"\n... {len(signatures) - top} more signature(s)")
+
+        if output:
+            if output.endswith('.csv'):
+                signatures.to_csv(output, index=False)
+            else:
+                with open(output, 'w') as f:
+                    json.dump(signatures_to_records(signatures), f, indent=2)
+            click.echo(f"\n✓ Error signatures saved to: {output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--duplicates', type=int, default=10, help='Most repeated specs to show')
+@click.option('--output', '-o', type=click.Path(), help='Export the spec index as CSV')
+@click.option('--workers', '-j', type=int, default=None, help='Processes for decoding spec JSON')
+def noise(csv_files: tuple, duplicates: int, output: str, workers: int):
+    """
+    Index specs across files and estimate measurement noise from repeats.
+
+    Runs of the same spec (same hash, in any file) differ only by
+    measurement noise. Per size, log solve time is split into within-spec
+    (noise) and between-spec (instance) variance; the noise floor is the CV
+    of repeats and the time ratio 95% of repeat pairs stay within.
+
+    Example:
+        python cli.py noise ../../storage/benchmarks/glpk_*.csv
+        python cli.py noise glpk_identical_*.csv glpk_random_*.csv -o spec_index.csv
+    """
+    try:
+        from benchmark_features import feature_frame
+        from benchmark_noise import duplicate_specs, noise_floor, spec_index
+        from tabulate import tabulate
+
+        df = feature_frame(list(csv_files), workers=workers)
+        index = spec_index(df)
+        repeated = duplicate_specs(index)
+
+        click.echo(f"=== Spec index: {len(df)} runs, {len(index)} distinct specs, "
+                   f"{len(repeated)} repeated ({int(repeated['runs'].sum())} runs) ===\n")
+
+        floor = noise_floor(df)
+        rows = [[r.size, r.runs, r.specs, r.repeated_specs, r.repeat_runs, _fmt(r.sd_within, '.3f'),
+                 _fmt(r.sd_between, '.3f'), _fmt(r.icc, '.2f'), _fmt(r.noise_cv, '.1%'), _fmt(r.noise_ratio, '.2f')]
+                for r in floor.itertuples()]
+        click.echo("Noise floor by size (log time_ms of solved runs):")
+        click.echo(tabulate(rows, headers=['size', 'solved', 'specs', 'repeated', 'repeat runs', 'sd within',
+                                           'sd between', 'ICC', 'noise CV', '95% ratio'], tablefmt='grid'))
+        click.echo("\nICC: share of time variance explained by the instance; "
+                   "95% ratio: repeats of one spec stay within this time ratio")
+
+        if len(repeated):
+            click.echo(f"\nMost repeated specs:")
+            shown = repeated.head(duplicates)
+            rows = [[r.spec_hash, r.size, r.runs, r.files, r.scenarios, f"{r.first_file}:{r.first_iteration}",
+                     _fmt(r.time_median, '.1f'), _fmt(r.log_sd, '.3f')] for r in shown.itertuples()]
+            click.echo(tabulate(rows, headers=['spec', 'size', 'runs', 'files', 'scenarios', 'first seen',
+                                               'median ms', 'log sd'], tablefmt='grid'))
+
+        if output:
+            index.to_csv(output, index=False)
+            click.echo(f"\n✓ Spec index saved to: {output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('base', type=click.Path(exists=True))
+@click.argument('new', type=click.Path(exists=True))
+@click.option('--no-noise', is_flag=True, help='Do not apply the measurement noise floor')
+@click.option('--merge', 'merge_policy', type=click.Choice(['first', 'last', 'best']), default='first',
+              show_default=True, help='How shards and retry files are merged per cell')
+@click.option('--output', '-o', type=click.Path(), help='Export the comparison as CSV')
+def diff(base: str, new: str, no_noise: bool, merge_policy: str, output: str):
+    """
+    Compare two benchmark runs (files or directories) cell by cell.
+
+    A cell counts as slower or faster only if the change of its geometric
+    mean solve time is statistically significant and larger than the
+    measurement noise floor of its size, estimated from repeated specs in
+    both runs (see the noise command).
+
+    Example:
+        python cli.py diff baseline/ ../../storage/benchmarks/
+        python cli.py diff old/glpk_random_50.csv glpk_random_50.csv
+    """
+    try:
+        from benchmark_catalog import DEFAULT_INDEX_DIR, index_directory
+        from benchmark_noise import diff_benchmarks, load_noise_floor
+        from tabulate import tabulate
+
+        def expand(path):
+            if Path(path).is_dir():
+                return [str(entry['path']) for entry in index_directory(path, cache_dir=DEFAULT_INDEX_DIR)
+                        if entry['rows'] > 0]
+            return [path]
+
+        base_paths, new_paths = expand(base), expand(new)
+        floor = None if no_noise else load_noise_floor(base_paths + new_paths)
+        result = diff_benchmarks(base_paths, new_paths, floor, merge_policy)
+        if result.empty:
+            raise ValueError("No scenario/size cell is present in both runs")
+
+        rows = [[r.scenario, r.size, f"{r.base_runs}/{r.new_runs}", _fmt(r.base_median, '.2f'),
+                 _fmt(r.new_median, '.2f'), f"{r.base_timeout_rate:.1%} -> {r.new_timeout_rate:.1%}",
+                 _fmt(r.ratio, '.3f'), _fmt(r.significance_ratio, '.3f'), _fmt(r.noise_ratio, '.3f'),
+                 r.verdict.upper() if r.verdict in ('slower', 'faster') else r.verdict]
+                for r in result.itertuples()]
+        click.echo(f"=== Benchmark diff: {Path(base).name} -> {Path(new).name} ===\n")
+        click.echo(tabulate(rows, headers=['scenario', 'size', 'runs', 'base p50', 'new p50', 'timeouts',
+                                           'time ratio', 'signif. x', 'noise x', 'verdict'], tablefmt='grid'))
+        click.echo("\ntime ratio: new / base geometric mean; changes inside the significance (1.96 SE) "
+                   "or noise band count as noise")
+        if floor is not None and floor['noise_ratio'].isna().all():
+            click.echo("⚠ No repeated specs in either run: no noise floor applied")
+
+        counts = result['verdict'].value_counts()
+        click.echo(f"\nSlower: {counts.get('slower', 0)}, faster: {counts.get('faster', 0)}, "
+                   f"noise: {counts.get('noise', 0)}")
+
+        if output:
+            result.to_csv(output, index=False)
+            click.echo(f"\n✓ Diff saved to: {output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
 @cli.command()
 @click.argument('csv_file', type=click.Path(exists=True))
-@click.option('--method', type=click.Choice(['iqr', 'zscore']), default='iqr',
+@click.option('--top', type=int, default=10, help='Number of distinct specs to replay')
+@click.option('--select', 'selection', type=click.Choice(['any', 'slowest', 'timeouts', 'failed']), default='any',
+              help='Runs to pick from: any (slowest first), solved, timed out or all failures')
+@click.option('--repeat', type=int, default=5, help='Times each spec is solved')
+@click.option('--timeout', type=int, default=None,
+              help='Solver timeout in seconds for the repeats (default: the one the file ran with)')
+@click.option('--output-dir', '-o', type=click.Path(), default='storage/benchmarks/replay', show_default=True,
+              help='Folder for the specs, repeats and model files')
+@click.option('--dump/--no-dump', default=True, help='Keep the GLPK model/data files (one extra, untimed solve)')
+@click.option('--command', 'command', default='php artisan benchmark:glpk:replay', show_default=True,
+              help='Command running the replay artisan command')
+@click.option('--dry-run', is_flag=True, help='Print the selected specs and commands without running them')
+def replay(csv_file: str, top: int, selection: str, repeat: int, timeout: int, output_dir: str, dump: bool,
+           command: str, dry_run: bool):
+    """
+    Re-run the slowest or timed-out specs of a benchmark in isolation.
+
+    Each of the --top slowest distinct specs is solved --repeat times in a
+    fresh benchmark:glpk:replay process. The variance of the repeats shows
+    whether a slow run is a slow instance or a one-off, and whether a timeout
+    is deterministic. With --dump, one extra solve before the repeats keeps
+    the GLPK model/data files with a glpsol.sh, to profile the instance
+    offline with glpsol; it is not timed, so the copies do not skew the repeats.
+
+    Run from the project root (where artisan lives).
+
+    Example:
+        python scripts/benchmark_analysis/cli.py replay storage/benchmarks/glpk_random_30.csv --top 5
+        python scripts/benchmark_analysis/cli.py replay glpk_random_30.csv --select timeouts --timeout 300
+    """
+    try:
+        import subprocess
+        from benchmark_replay import replay_command, replay_spec, select_specs, solver_timeout_s, write_summary
+        from tabulate import tabulate
+
+        specs = select_specs(csv_file, top, selection)
+        timeout = timeout or solver_timeout_s(csv_file)
+        prefix = command.split()
+
+        click.echo(f"=== Replay: {len(specs)} specs of {Path(csv_file).name} x{repeat} "
+                   f"(timeout {timeout}s) ===\n")
+        if dry_run:
+            for entry in specs.to_dict('records'):
+                click.echo(f"# iteration {entry['iteration']}: {entry['status']} in {entry['time_ms']:.1f} ms")
+                click.echo(' '.join(replay_command(entry, Path(output_dir) / entry['label'], repeat, timeout,
+                                                   dump, prefix)))
+            return
+
+        results = []
+        for entry in specs.to_dict('records'):
+            click.echo(f"  iteration {entry['iteration']} ({entry['status']}, {entry['time_ms']:.1f} ms)...")
+            try:
+                result = replay_spec(entry, output_dir, repeat, timeout, dump, prefix)
+            except subprocess.TimeoutExpired:
+                click.echo(f"  ✗ iteration {entry['iteration']}: replay did not finish, skipped", err=True)
+                continue
+            if result['exit_code'] != 0:
+                click.echo(f"  ✗ iteration {entry['iteration']}: exit status {result['exit_code']} "
+                           f"(see {result['folder'] / 'replay.log'})", err=True)
+            results.append(result)
+
+        if not results:
+            raise RuntimeError("No spec could be replayed")
+
+        rows = [[r['label'], r['original_status'], _fmt(r['original_ms'], '.1f'), f"{r['solved']}/{r['runs']}",
+                 _fmt(r['time_min'], '.1f'), _fmt(r['time_median'], '.1f'), _fmt(r['time_max'], '.1f'),
+                 _fmt(r['cv'], '.2f'), r['verdict']]
+                for r in results]
+        click.echo('\n' + tabulate(rows, headers=['spec', 'original', 'orig. ms', 'solved', 'min ms', 'median ms',
+                                                  'max ms', 'CV', 'verdict'], tablefmt='simple'))
+
+        summary = write_summary(results, output_dir, Path(csv_file).name)
+        click.echo(f"\n✓ Replay summary saved to: {summary}")
+        models = [r['model'] for r in results if r['model'] is not None]
+        if models:
+            click.echo(f"✓ GLPK model files saved to: {models[0].parent.parent}/*/model (run glpsol.sh to profile)")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('matrix_file', type=click.Path(exists=True))
+@click.option('--concurrency', '-j', type=int, default=None, help='Jobs running at once (overrides the file)')
+@click.option('--dry-run', is_flag=True, help='Print the jobs and their commands without running them')
+@click.option('--analyze/--no-analyze', default=True, help='Analyze each cell as soon as its shards are complete')
+@click.option('--progress', type=float, default=30, help='Seconds between live progress tables')
+def campaign(matrix_file: str, concurrency: int, dry_run: bool, analyze: bool, progress: float):
+    """
+    Run a benchmark matrix as a pool of benchmark:glpk processes.
+
+    MATRIX_FILE (YAML or JSON) lists scenarios, sizes, iterations, timeout,
+    shards per cell, concurrency, CPU pinning, job limits and retries (see
+    lib/benchmark_campaign.py). Every job writes its own shard; hung or
+    failed jobs are killed and restarted for their missing iterations.
+    Progress is tailed from the shards into live per-cell percentiles, and
+    every completed cell is added to campaign_<name>_matrix.csv in the
+    output directory. Re-running a campaign resumes it.
+
+    Run from the project root (where artisan lives).
+
+    Example:
+        python scripts/benchmark_analysis/cli.py campaign nightly.yaml --dry-run
+        python scripts/benchmark_analysis/cli.py campaign nightly.yaml -j 4
+    """
+    try:
+        from benchmark_campaign import Campaign, job_command, load_campaign
+        from tabulate import tabulate
+
+        config = load_campaign(matrix_file)
+        if concurrency:
+            config['concurrency'] = concurrency
+
+        if dry_run:
+            runner = Campaign(config, analyze=False)
+            for job in runner.jobs:
+                job['tail'].read()
+            click.echo(f"=== Campaign {config['name']}: {len(runner.jobs)} jobs, "
+                       f"{config['concurrency']} at a time ===\n")
+            for job in runner.jobs:
+                remaining = max(job['iterations'] - job['tail'].rows, 0)
+                command = ' '.join(job_command(config, job, remaining))
+                click.echo(f"# {job['id']} complete" if remaining == 0 else command)
+            return
+
+        def show(event):
+            kind = event['event']
+            job = event.get('job')
+            if kind == 'start':
+                cpu = f" on CPU {job['cpu']}" if job['cpu'] is not None else ''
+                click.echo(f"  start {job['id']}: {event['iterations']} iterations{cpu} (attempt {job['attempts']})")
+            elif kind == 'kill':
+                click.echo(f"  ✗ killed {job['id']}: {event['reason']}")
+            elif kind == 'exit':
+                if event['remaining'] == 0:
+                    click.echo(f"  ✓ {job['id']} done ({job['tail'].rows} runs)")
+                else:
+                    click.echo(f"  {job['id']} exited with status {event['code']}, "
+                               f"{event['remaining']} iterations missing (log: {job['log']})")
+            elif kind == 'restart':
+                click.echo(f"  restarting {job['id']} for {event['remaining']} iterations")
+            elif kind == 'failed':
+                click.echo(f"  ✗ gave up on {job['id']} after {job['attempts']} attempts", err=True)
+            elif kind == 'progress':
+                rows = [[r['scenario'], r['size'], r['jobs'], r['running'], f"{r['runs']}/{r['target']}",
+                         _fmt(r['timeout_rate'], '.2%'), _fmt(r['p50'], '.1f'), _fmt(r['p95'], '.1f'),
+                         _fmt(r['p99'], '.1f')]
+                        for r in event['aggregates'].to_dict('records')]
+                click.echo('\n' + tabulate(rows, headers=['scenario', 'size', 'jobs', 'running', 'runs',
+                                                          'timeouts', 'p50 ms', 'p95 ms', 'p99 ms'],
+                                           tablefmt='simple') + '\n')
+            elif kind == 'cell':
+                stats = event['stats'].iloc[0]
+                converged = event['convergence']['converged']
+                click.echo(f"  ✓ {event['scenario']}/{event['size']} analyzed: "
+                           f"p95 {_fmt(stats['time_p95'], '.1f')} ms, "
+                           f"timeouts {_fmt(stats['timeout_rate'], '.2%')}, "
+                           + ('metrics converged' if converged else
+                              f"not converged (about {event['convergence']['runs_needed'] or '?'} runs needed)"))
+
+        runner = Campaign(config, on_event=show, analyze=analyze, progress_s=progress)
+        cpus = f", pinned to CPUs {config['cpus']}" if config['cpus'] else ''
+        click.echo(f"=== Campaign {config['name']}: {len(runner.jobs)} jobs, "
+                   f"{config['concurrency']} at a time{cpus} ===\n")
+        result = runner.run()
+
+        click.echo(f"\n{result['done']} jobs done, {result['failed']} failed")
+        if result['matrix']:
+            click.echo(f"✓ Campaign matrix saved to: {result['matrix']}")
+        if result['failed']:
+            sys.exit(1)
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--target-size', type=int, required=True, help='Size whose prediction should get more precise')
+@click.option('--budget', type=float, required=True, help='Compute budget in hours of benchmark runs')
+@click.option('--scenario', 'scenarios', multiple=True, help='Scenario to plan (repeatable; default: all)')
+@click.option('--metric', type=click.Choice(['mean', 'median', 'p95', 'p99']), default='p95',
+              help='Predicted metric to improve')
+@click.option('--sizes', type=str, default=None, help='Comma-separated candidate sizes (e.g. 50,100,200)')
+@click.option('--iterations', type=str, default='25,50,100,200',
+              help='Comma-separated iteration counts per benchmark')
+@click.option('--overhead', type=float, default=1.0, help='Seconds per run besides the solve')
+@click.option('--timeout', type=float, default=None,
+              help='Solver timeout in seconds the benchmarks ran with (inferred if omitted)')
+@click.option('--confidence', type=float, default=0.90, help='Coverage of the reported precision')
+@click.option('--merge', 'merge_policy', type=click.Choice(['first', 'last', 'best']), default=None,
+              help='Merge shards/_retry files per scenario and size with this retry policy '
+                   '(default: pool shards, skip _retry files of loaded shards)')
+@click.option('--output', '-o', type=click.Path(), help='Write the commands as a shell script')
+def plan(csv_files: tuple, target_size: int, budget: float, scenarios: tuple, metric: str, sizes: str,
+         iterations: str, overhead: float, timeout: float, confidence: float, merge_policy: str, output: str):
+    """
+    Plan the next benchmarks for a more precise prediction at a target size.
+
+    Picks (scenario, size, iterations) greedily by how much each shrinks the
+    confidence interval of the scaling prediction at --target-size per
+    second of benchmark time, within --budget hours, and prints the
+    benchmark:glpk commands (run from the project root). Each writes a
+    _plan shard next to the existing files.
+
+    Example:
+        python cli.py plan glpk_*.csv --target-size 300 --budget 4
+        python cli.py plan glpk_random_*.csv --target-size 200 --budget 2 --metric p99 -o plan.sh
+    """
+    try:
+        from benchmark_compare import BenchmarkComparer
+        from benchmark_planner import plan_experiments
+        from tabulate import tabulate
+
+        comparer = BenchmarkComparer(list(csv_files), timeout_ms=timeout * 1000 if timeout else None,
+                                     merge_policy=merge_policy)
+        result = plan_experiments(
+            comparer, target_size, budget * 3600, scenarios=scenarios or None, metric=metric,
+            sizes=[int(s) for s in sizes.split(',')] if sizes else None,
+            iterations=[int(i) for i in iterations.split(',')], overhead_s=overhead, confidence=confidence,
+        )
+
+        click.echo(f"=== Experiment Plan: {metric} at size {target_size} "
+                   f"({result['spent_s'] / 3600:.2f} of {budget:g} h) ===\n")
+        rows = [[scenario, r['model'], f"+/-{r['precision_before']:.1%}", f"+/-{r['precision_after']:.1%}"]
+                for scenario, r in result['scenarios'].items()]
+        click.echo(tabulate(rows, headers=['scenario', 'model', f'{confidence:.0%} CI now', 'after plan'],
+                            tablefmt='simple'))
+        for scenario, reason in result['skipped'].items():
+            click.echo(f"  skipped {scenario}: {reason}")
+
+        if not result['commands']:
+            click.echo("\nNo benchmark fits the budget.")
+            return
+
+        click.echo("\nRuns (most useful per hour first):")
+        rows = [[c['scenario'], c['size'], c['iterations'], f"{c['cost_s'] / 60:.0f} min"]
+                for c in result['commands']]
+        click.echo(tabulate(rows, headers=['scenario', 'size', 'iterations', 'est. time'], tablefmt='simple'))
+        click.echo()
+        for command in result['commands']:
+            click.echo(command['command'])
+
+        if output:
+            lines = ['#!/bin/sh', f"# Plan for {metric} at size {target_size}, budget {budget:g} h", 'set -e']
+            Path(output).write_text('\n'.join(lines + [c['command'] for c in result['commands']]) + '\n')
+            click.echo(f"\n✓ Plan saved to: {output}")
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('csv_file', type=click.Path())
+@click.option('--target', type=float, default=0.05, help='Target relative CI half-width (0.05 = +/-5%)')
+@click.option('--confidence', type=float, default=0.95, help='Overall confidence across all scheduled looks')
+@click.option('--metric', 'metrics', multiple=True,
+              type=click.Choice(['median', 'p95', 'p99', 'timeout_rate']),
+              help='Metric to check (repeatable; default: median, p95, timeout_rate)')
+@click.option('--min-runs', type=int, default=30,
+              help='Runs of the first look (looks at min-runs x 1, 2, 4, ...)')
+@click.option('--rate-tolerance', type=float, default=0.005,
+              help='Absolute timeout-rate half-width that is always precise enough')
+@click.option('--watch', is_flag=True, help='Poll the file until every metric converged')
+@click.option('--interval', type=float, default=30, help='Seconds between polls with --watch')
+@click.option('--max-wait', type=float, default=None, help='Give up watching after this many seconds')
+@click.option('--detect-change', type=float, default=None,
+              help='Power calculator: relative change to detect between two runs (e.g. 0.05)')
+@click.option('--power', type=float, default=0.8, help='Power of the calculator (with --detect-change)')
+def converge(csv_file: str, target: float, confidence: float, metrics: tuple, min_runs: int,
+             rate_tolerance: float, watch: bool, interval: float, max_wait: float,
+             detect_change: float, power: float):
+    """
+    Tell a running benchmark when it has enough iterations.
+
+    Reads the CSV benchmark:glpk is appending to and checks, with sequential
+    confidence intervals, whether the median, P95 and timeout rate are known
+    to within --target. Projects the total runs each metric still needs.
+
+    Metrics are only evaluated at scheduled looks, when the run count reaches
+    --min-runs x 1, 2, 4, 8, ... (on exactly that many runs). Checking in
+    between repeats the last look, so polling the file does not stop the
+    benchmark early by chance. Percentiles treat timeouts as censored.
+
+    Exit status: 0 when every metric converged, 3 when not (yet), 1 on errors.
+
+    With --detect-change, the file is pilot data for a power calculation:
+    iterations per benchmark run to detect that change between two runs.
+
+    Example:
+        python cli.py converge glpk_random_30.csv --target 0.05
+        python cli.py converge glpk_random_200.csv --watch --interval 60 --max-wait 14400
+        python cli.py converge glpk_random_30.csv --detect-change 0.05
+
+        # Stop the benchmark as soon as the numbers are good enough
+        php artisan benchmark:glpk --size=200 --scenario=random --iterations=5000 &
+        python cli.py converge storage/benchmarks/glpk_random_200.csv --watch && kill $!
+    """
+    try:
+        import time
+        from benchmark_converge import (
+            DEFAULT_METRICS, EXIT_CONVERGED, EXIT_NOT_CONVERGED, METRICS,
+            load_progress, precision_status, runs_to_detect,
+        )
+        from tabulate import tabulate
+
+        metrics = metrics or DEFAULT_METRICS
+        started = time.monotonic()
+        last_runs = None
+
+        while True:
+            if Path(csv_file).exists():
+                df = load_progress(csv_file)
+                status = precision_status(df, target, confidence, metrics, min_runs, rate_tolerance)
+            elif watch:
+                df, status = None, None
+            else:
+                raise FileNotFoundError(f"{csv_file} does not exist")
+
+            if status and status['runs'] != last_runs:
+                last_runs = status['runs']
+                click.echo(f"=== Convergence: {Path(csv_file).name} ({status['runs']} runs, "
+                           f"{status['solved']} of the look solved, effective n {status['ess']:.0f}) ===")
+                click.echo(f"Look {status['look']} of the doubling schedule: first {status['evaluated']} runs, "
+                           f"{status['confidence']:.2%} intervals (next look at {status['next_look']} runs)\n")
+                rows = []
+                for metric, r in status['metrics'].items():
+                    spec = '.2%' if metric == 'timeout_rate' else '.2f'
+                    goal = f"+/-{r['target']:.2%}" if metric == 'timeout_rate' else f"+/-{r['target']:.1%}"
+                    precision = ('n/a' if r['precision'] == float('inf') else f"+/-{r['precision']:.2%}"
+                                 if metric == 'timeout_rate' else f"+/-{r['precision']:.1%}")
+                    rows.append([metric, _fmt(r['estimate'], spec),
+                                 f"{_fmt(r['lower'], spec)} - {_fmt(r['upper'], spec)}", precision, goal,
+                                 '✓ converged' if r['converged'] else 'running',
+                                 _fmt(r['runs_needed'], 'd')])
+                click.echo(tabulate(rows, headers=['metric', 'estimate', 'interval', 'precision', 'target',
+                                                   'status', 'runs needed'], tablefmt='simple'))
+                click.echo()
+
+                if detect_change is not None:
+                    click.echo(f"Iterations per run to detect a {detect_change:.0%} change "
+                               f"({confidence:.0%} confidence, {power:.0%} power):")
+                    rows = []
+                    for metric in METRICS:
+                        plan = runs_to_detect(df, detect_change, metric, confidence, power)
+                        spec = '.2%' if metric == 'timeout_rate' else '.2f'
+                        rows.append([metric, _fmt(plan['estimate'], spec), _fmt(plan['runs_per_side'], 'd')])
+                    click.echo(tabulate(rows, headers=['metric', 'pilot value', 'runs per side'], tablefmt='simple'))
+                    click.echo()
+
+            if status and status['converged']:
+                click.echo("✓ All metrics converged: the benchmark can stop.")
+                sys.exit(EXIT_CONVERGED)
+            if not watch or (max_wait is not None and time.monotonic() - started >= max_wait):
+                needed = status['runs_needed'] if status else None
+                click.echo("Not converged" + (f": about {needed} runs needed." if needed else "."))
+                sys.exit(EXIT_NOT_CONVERGED)
+            time.sleep(interval)
+
+    except Exception as e:
+        click.echo(f"Error: {e}", err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.argument('csv_files', nargs=-1, type=click.Path(exists=True), required=True)
+@click.option('--method', type=click.Choice(['iqr', 'zscore', 'mad', 'rolling']), default='iqr',
               help='Outlier detection method')
-@click.option('--threshold', type=float, default=1.5,
-              help='Threshold for outlier detection (1.5 for IQR, 3 for zscore)')
+@click.option('--threshold', type=float, default=None,
+              help='Threshold for outlier detection (default 1.5 for IQR, 3 for zscore, 3.5 for mad/rolling)')
+@click.option('--log', 'log_space', is_flag=True, help='Detect on log(time_ms)')
+@click.option('--window', type=int, default=51, help='Sliding-window length (runs) for the rolling method')
+@click.option('--agreement', is_flag=True, help='Compare the runs flagged by all methods')
 @click.option('--top', type=int, default=10, help='Number of top outliers to show')
 @click.option('--export', '-e', type=click.Path(), help='Export outliers to CSV')
-def outliers(csv_file: str, method: str, threshold: float, top: int, export: str):
+@click.option('--noise-from', multiple=True, type=click.Path(exists=True),
+              help='Files with repeated specs to estimate the noise floor from (repeatable)')
+@click.option('--merge', 'merge_policy', type=click.Choice(['first', 'last', 'best']), default=None,
+              help='Merge shards/_retry files per scenario and size with this retry policy '
+                   '(default: pool shards, skip _retry files of loaded shards)')
+def outliers(csv_files: tuple, method: str, threshold: float, log_space: bool, window: int, agreement: bool,
+             top: int, export: str, noise_from: tuple, merge_policy: str):
     """
     Detect and analyze outlier execution times.
 
+    Methods: iqr (Tukey fences), zscore, mad (robust z from the median
+    absolute deviation) and rolling (robust z against a sliding-window
+    median along iteration). With several files, runs are compared within
+    their (scenario, size) only.
+
+    With --noise-from, runs within the measurement noise floor of their
+    size (estimated from repeated specs, see the noise command) are never
+    reported.
+
     Example:
         python cli.py outliers storage/benchmarks/glpk_random_30.csv --top 20
-        python cli.py outliers file.csv --method zscore --threshold 3
+        python cli.py outliers file.csv --method mad --log
+        python cli.py outliers glpk_*.csv --method rolling --log --agreement
+        python cli.py outliers glpk_random_30.csv --noise-from glpk_identical_30.csv
     """
     try:
-        analyzer = BenchmarkAnalyzer(csv_file)
-        outliers_df = analyzer.detect_outliers(method=method, threshold=threshold)
+        from benchmark_dataset import BenchmarkDataset
+        from benchmark_outliers import DEFAULT_THRESHOLDS, detect_outliers, method_agreement
+        from tabulate import tabulate
 
-        click.echo(f"=== Outlier Analysis ({method.upper()}, threshold={threshold}) ===")
-        click.echo(f"File: {Path(csv_file).name}")
+        df = BenchmarkDataset(list(csv_files), merge_policy=merge_policy).df
+        by = ['scenario', 'size']
+        threshold = DEFAULT_THRESHOLDS[method] if threshold is None else threshold
+
+        noise_ratio = None
+        if noise_from:
+            from benchmark_noise import load_noise_floor, noise_ratio_for
+            floor = load_noise_floor(list(dict.fromkeys(csv_files + noise_from)))
+            noise_ratio = {int(size): noise_ratio_for(floor, int(size)) for size in df['size'].unique()}
+            noise_ratio = {size: ratio for size, ratio in noise_ratio.items() if ratio is not None}
+        outliers_df = detect_outliers(df, method, threshold, log_space, window, by, noise_ratio or None)
+
+        space = ', log time' if log_space else ''
+        click.echo(f"=== Outlier Analysis ({method.upper()}, threshold={threshold:g}{space}) ===")
+        click.echo(f"Files: {', '.join(Path(f).name for f in csv_files)}")
+        if noise_from:
+            click.echo("Noise floor: " + (', '.join(f"{size}: x{ratio:.2f}" for size, ratio in sorted(noise_ratio.items()))
+                                          + " around the expected time" if noise_ratio
+                                          else "no repeated specs, not applied"))
         click.echo(f"Total outliers detected: {len(outliers_df)}")
 
+        groups = df.groupby(by, observed=True).size()
+        if len(groups) > 1:
+            flagged = outliers_df.groupby(by, observed=True).size()
+            rows = [[scenario, size, runs, int(flagged.get((scenario, size), 0))]
+                    for (scenario, size), runs in groups.items()]
+            click.echo("\n" + tabulate(rows, headers=['scenario', 'size', 'runs', 'outliers'], tablefmt='simple'))
+
+        if agreement:
+            result = method_agreement(df, log_space=log_space, window=window, by=by,
+                                      thresholds={method: threshold})
+            click.echo("\nMethod agreement (Jaccard overlap of flagged runs):")
+            table = result['jaccard'].map(lambda x: f"{x:.2f}")
+            table.insert(0, 'flagged', [result['counts'][m] for m in table.index])
+            click.echo(tabulate(table, headers='keys', tablefmt='simple'))
+            click.echo(f"  Flagged by any: {result['any']}, by a majority: {result['majority']}, "
+                       f"by all: {result['all']}")
+
         if len(outliers_df) == 0:
             click.echo("\n✓ No outliers detected!")
             return
@@ -240,9 +1756,8 @@ def outliers(csv_file: str, method: str, threshold: float, top: int, export: str
         # Show top N outliers
         click.echo(f"\nTop {min(top, len(outliers_df))} outliers by execution time:")
 
-        from tabulate import tabulate
-        display_df = outliers_df.head(top)[['iteration', 'time_ms', 'size', 'scenario']]
-        table = tabulate(display_df, headers='keys', tablefmt='grid', showindex=False)
+        display_df = outliers_df.head(top)[['iteration', 'time_ms', 'expected_ms', 'outlier_score', 'size', 'scenario']]
+        table = tabulate(display_df, headers='keys', tablefmt='grid', showindex=False, floatfmt='.2f')
         click.echo(table)
 
         # Statistics about outliers
@@ -265,7 +1780,7 @@ def outliers(csv_file: str, method: str, threshold: float, top: int, export: str
 @cli.command()
 @click.argument('csv_file', type=click.Path(exists=True))
 @click.option('--plot-type', type=click.Choice([
-    'distribution', 'status', 'timeseries', 'scatter', 'all'
+    'distribution', 'status', 'timeseries', 'scatter', 'raster', 'acf', 'all'
 ]), default='distribution', help='Type of plot to generate')
 @click.option('--output', '-o', type=click.Path(), help='Output file path for the plot')
 @click.option('--log-scale/--no-log-scale', default=False, help='Use log scale (for distribution)')
@@ -278,6 +1793,7 @@ def plot(csv_file: str, plot_type: str, output: str, log_scale: bool):
         python cli.py plot file.csv --plot-type timeseries
     """
     try:
+        from benchmark_viz import BenchmarkVisualizer
         viz = BenchmarkVisualizer(csv_file)
 
         show = output is None
@@ -307,6 +1823,18 @@ def plot(csv_file: str, plot_type: str, output: str, log_scale: bool):
                 show=show
             )
 
+        if plot_type == 'raster' or plot_type == 'all':
+            viz.plot_timeout_raster(
+                save_path=output if plot_type == 'raster' else None,
+                show=show
+            )
+
+        if plot_type == 'acf' or plot_type == 'all':
+            viz.plot_autocorrelation(
+                save_path=output if plot_type == 'acf' else None,
+                show=show
+            )
+
         if output and plot_type != 'all':
             click.echo(f"✓ Plot saved to: {output}")
 
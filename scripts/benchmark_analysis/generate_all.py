@@ -6,8 +6,10 @@ Generate ALL benchmark analysis artifacts at once.
 This script:
 1. Finds all benchmark CSV files in storage/benchmarks/
 2. Generates individual statistics and visualizations for each file
-3. Generates comparison reports across all files
-4. Outputs everything to output/ directory
+3. Aggregates every metric for every (scenario, size) cell in one pass
+4. Clusters the error messages of failed runs into signatures
+5. Generates comparison reports across all files from that matrix
+6. Outputs everything to output/ directory
 
 Usage: python3 generate_all.py
 """
@@ -28,15 +30,16 @@ sys.path.insert(0, str(Path(__file__).parent / 'lib'))
 from benchmark_stats import BenchmarkAnalyzer
 from benchmark_viz import BenchmarkVisualizer
 from benchmark_compare import BenchmarkComparer
+from benchmark_matrix import plot_matrix_heatmaps
+from benchmark_catalog import DEFAULT_INDEX_DIR, index_directory
+from benchmark_errors import corpus_error_signatures, signature_size_table, signatures_to_records
 
 def find_benchmark_files(base_dir):
-    """Find all benchmark CSV files."""
-    benchmark_dir = Path(base_dir)
-    csv_files = sorted(benchmark_dir.glob('glpk_*.csv'))
-    return csv_files
+    """Find all benchmark CSV files with at least one data row (via the persisted catalog index)."""
+    return [entry['path'] for entry in index_directory(base_dir, cache_dir=DEFAULT_INDEX_DIR) if entry['rows'] > 0]
 
-def generate_individual_analysis(csv_file, output_dir):
-    """Generate all analysis artifacts for a single benchmark file."""
+def generate_individual_analysis(csv_file, output_dir, analyzer):
+    """Generate all analysis artifacts for a single benchmark file (already loaded by its analyzer)."""
     print(f"\n{'='*70}")
     print(f"Processing: {csv_file.name}")
     print(f"{'='*70}")
@@ -44,9 +47,8 @@ def generate_individual_analysis(csv_file, output_dir):
     file_output_dir = output_dir / csv_file.stem
     file_output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Initialize analyzer and visualizer
-    analyzer = BenchmarkAnalyzer(str(csv_file))
-    visualizer = BenchmarkVisualizer(str(csv_file))
+    # The visualizer plots the analyzer's DataFrame instead of reading the file again
+    visualizer = BenchmarkVisualizer(str(csv_file), analyzer=analyzer)
 
     # 1. Generate statistics
     print("  → Computing statistics...")
@@ -94,7 +96,18 @@ def generate_individual_analysis(csv_file, output_dir):
     else:
         print(f"    ✓ No outliers detected")
 
-    # 4. Generate visualizations
+    # 4. Cluster error messages
+    print("  → Clustering error messages...")
+    signatures = analyzer.error_signatures()
+    if len(signatures) > 0:
+        errors_file = file_output_dir / 'error_signatures.json'
+        with open(errors_file, 'w') as f:
+            json.dump(signatures_to_records(signatures), f, indent=2)
+        print(f"    ✓ Found {len(signatures)} error signature(s), saved: {errors_file.name}")
+    else:
+        print(f"    ✓ No failed runs")
+
+    # 5. Generate visualizations
     print("  → Generating visualizations...")
 
     viz_count = 0
@@ -129,11 +142,66 @@ def generate_individual_analysis(csv_file, output_dir):
     print(f"    ✓ {viz_file.name}")
     viz_count += 1
 
+    # ACF/PACF of solve times over iterations
+    viz_file = file_output_dir / 'autocorrelation.png'
+    visualizer.plot_autocorrelation(save_path=str(viz_file), show=False)
+    print(f"    ✓ {viz_file.name}")
+    viz_count += 1
+
+    # Timeout raster (bursts and periodicity), only if there are timeouts
+    if timeout_stats['timeout_count'] > 0:
+        viz_file = file_output_dir / 'timeout_raster.png'
+        visualizer.plot_timeout_raster(save_path=str(viz_file), show=False)
+        print(f"    ✓ {viz_file.name}")
+        viz_count += 1
+
     print(f"  → Generated {viz_count} visualizations")
 
     return stats
 
-def generate_comparison_analysis(csv_files, output_dir):
+def generate_matrix_analysis(matrix, output_dir):
+    """Export the (scenario, size) matrix as a tidy table and annotated heatmaps."""
+    print(f"\n{'='*70}")
+    print(f"Generating Benchmark Matrix")
+    print(f"{'='*70}")
+
+    matrix_dir = output_dir / 'matrix'
+    matrix_dir.mkdir(parents=True, exist_ok=True)
+
+    matrix_csv = matrix_dir / 'benchmark_matrix.csv'
+    matrix.to_csv(matrix_csv, index=False)
+    print(f"    ✓ Saved: {matrix_csv.name} ({len(matrix)} cells)")
+
+    viz_file = matrix_dir / 'heatmaps.png'
+    plot_matrix_heatmaps(matrix, save_path=str(viz_file), show=False)
+    print(f"    ✓ {viz_file.name}")
+
+def generate_error_analysis(csv_files, output_dir):
+    """Cluster the error messages of failed runs across all files into signatures."""
+    print(f"\n{'='*70}")
+    print(f"Generating Error Signatures")
+    print(f"{'='*70}")
+
+    signatures = corpus_error_signatures(csv_files)
+    if signatures.empty:
+        print(f"    ✓ No failed runs")
+        return
+
+    errors_dir = output_dir / 'errors'
+    errors_dir.mkdir(parents=True, exist_ok=True)
+
+    errors_json = errors_dir / 'error_signatures.json'
+    with open(errors_json, 'w') as f:
+        json.dump(signatures_to_records(signatures), f, indent=2)
+    print(f"    ✓ Saved: {errors_json.name} ({len(signatures)} signatures, {signatures['count'].sum()} runs)")
+
+    by_size_csv = errors_dir / 'error_signatures_by_size.csv'
+    table = signature_size_table(signatures)
+    table.insert(0, 'signature', signatures['signature'].tolist())
+    table.to_csv(by_size_csv)
+    print(f"    ✓ Saved: {by_size_csv.name}")
+
+def generate_comparison_analysis(csv_files, output_dir, comparer, matrix):
     """Generate comparison analysis across all benchmark files, grouped by scenario."""
     print(f"\n{'='*70}")
     print(f"Generating Comparison Analysis")
@@ -142,16 +210,9 @@ def generate_comparison_analysis(csv_files, output_dir):
     comparison_dir = output_dir / 'comparisons'
     comparison_dir.mkdir(parents=True, exist_ok=True)
 
-    # Group files by scenario
-    scenarios = {}
-    for csv_file in csv_files:
-        # Extract scenario from filename (e.g., glpk_random_10.csv -> random)
-        parts = csv_file.stem.split('_')
-        if len(parts) >= 2:
-            scenario = parts[1]
-            if scenario not in scenarios:
-                scenarios[scenario] = []
-            scenarios[scenario].append(csv_file)
+    # Group files by scenario (resolved from filenames by the comparer's catalog)
+    scenarios = {scenario: comparer.catalog.paths(scenario=scenario)
+                 for scenario in comparer.catalog.scenarios}
 
     print(f"  → Found {len(scenarios)} scenario(s): {', '.join(sorted(scenarios.keys()))}")
     print(f"  → Total files: {len(csv_files)}")
@@ -160,18 +221,14 @@ def generate_comparison_analysis(csv_files, output_dir):
     for scenario in sorted(scenarios.keys()):
         scenario_files = sorted(scenarios[scenario])
         print(f"\n  Scenario: {scenario} ({len(scenario_files)} sizes)")
-        generate_scenario_comparison(scenario, scenario_files, comparison_dir)
+        generate_scenario_comparison(scenario, scenario_files, comparison_dir, comparer, matrix)
 
-def generate_scenario_comparison(scenario, csv_files, comparison_dir):
-    """Generate comparison analysis for a single scenario."""
-    # Convert to strings for comparer
+def generate_scenario_comparison(scenario, csv_files, comparison_dir, comparer, matrix):
+    """Generate comparison analysis for a single scenario (plots load its files through the comparer)."""
     file_paths = [str(f) for f in csv_files]
 
-    comparer = BenchmarkComparer(file_paths)
-    comparison_df = comparer.compare_all()
-
-    # Convert to list of dicts for JSON serialization
-    comparison = comparison_df.to_dict('records')
+    # Slice the precomputed matrix instead of re-analyzing the files
+    comparison = matrix[matrix['scenario'] == scenario].sort_values('size').to_dict('records')
 
     # Create scenario-specific subdirectory
     scenario_dir = comparison_dir / scenario
@@ -208,8 +265,10 @@ def generate_scenario_comparison(scenario, csv_files, comparison_dir):
     if len(csv_files) > 1:
         # Box plot comparison
         viz_file = scenario_dir / 'box_comparison.png'
-        visualizer = BenchmarkVisualizer(str(csv_files[0]))
-        comparison_files = [str(f) for f in csv_files[1:]]
+        # One scenario's analyzers, from the comparer's LRU, are held only while its plots are drawn
+        analyzers = [comparer.analyzers[f] for f in csv_files]
+        visualizer = BenchmarkVisualizer(str(csv_files[0]), analyzer=analyzers[0])
+        comparison_files = analyzers[1:]
         visualizer.plot_box_comparison(comparison_files, save_path=str(viz_file), show=False)
         print(f"    ✓ {viz_file.name}")
 
@@ -231,7 +290,7 @@ def generate_scenario_comparison(scenario, csv_files, comparison_dir):
     # Generate scaling analysis if we have enough data points
     if len(csv_files) >= 3:
         try:
-            scaling = comparer.analyze_scaling()
+            scaling = comparer.analyze_size_scaling(scenario)
 
             scaling_file = scenario_dir / 'scaling_analysis.json'
             with open(scaling_file, 'w') as f:
@@ -251,13 +310,17 @@ def generate_scenario_comparison(scenario, csv_files, comparison_dir):
                 for size, mean_time in zip(scaling['sizes'], scaling['mean_times']):
                     f.write(f"  {size}x{size}: {mean_time:.2f} ms\n")
 
-                if 'poly_coeffs' in scaling:
-                    f.write(f"\nPolynomial coefficients: {scaling['poly_coeffs']}\n")
+                if 'models' in scaling:
+                    f.write("\nSelected models (by AICc):\n")
+                    for metric, selection in scaling['models'].items():
+                        best = selection['candidates'][0]
+                        f.write(f"  {metric}: {best['model']} "
+                                f"(AICc {best['aicc']:.2f}, LOO-CV log RMSE {best['loocv_rmse']:.3f})\n")
             print(f"    ✓ Saved: {scaling_txt.name}")
         except Exception as e:
             print(f"    ⚠ Scaling analysis skipped: {e}")
 
-def generate_by_size_analysis(csv_files, output_dir):
+def generate_by_size_analysis(csv_files, output_dir, comparer, matrix):
     """Generate comparison analysis across all benchmark files, grouped by size."""
     print(f"\n{'='*70}")
     print(f"Generating By-Size Comparison Analysis")
@@ -266,19 +329,8 @@ def generate_by_size_analysis(csv_files, output_dir):
     by_size_dir = output_dir / 'by_size'
     by_size_dir.mkdir(parents=True, exist_ok=True)
 
-    # Group files by size
-    sizes = {}
-    for csv_file in csv_files:
-        # Extract size from filename (e.g., glpk_random_10.csv -> 10)
-        parts = csv_file.stem.split('_')
-        if len(parts) >= 3:
-            try:
-                size = int(parts[2])
-                if size not in sizes:
-                    sizes[size] = []
-                sizes[size].append(csv_file)
-            except ValueError:
-                continue
+    # Group files by size (resolved from filenames by the comparer's catalog)
+    sizes = {size: comparer.catalog.paths(size=size) for size in comparer.catalog.sizes()}
 
     print(f"  → Found {len(sizes)} size(s): {', '.join(map(str, sorted(sizes.keys())))}")
 
@@ -286,15 +338,17 @@ def generate_by_size_analysis(csv_files, output_dir):
     for size in sorted(sizes.keys()):
         size_files = sorted(sizes[size])
         print(f"\n  Size: {size}x{size} ({len(size_files)} scenarios)")
-        generate_size_comparison(size, size_files, by_size_dir)
+        generate_size_comparison(size, size_files, by_size_dir, comparer, matrix)
 
-def generate_size_comparison(size, csv_files, by_size_dir):
+def generate_size_comparison(size, csv_files, by_size_dir, comparer, matrix):
     """Generate comparison analysis for a single size across all scenarios."""
-    # Convert to strings for comparer
-    file_paths = [str(f) for f in csv_files]
-
-    comparer = BenchmarkComparer(file_paths)
-    comparison_data = comparer.get_size_comparison(size)
+    # Slice the precomputed matrix instead of re-analyzing the files
+    rows = matrix[matrix['size'] == size].sort_values('scenario')
+    comparison_data = {
+        'size': size,
+        'scenarios': [{k: v for k, v in row.items() if k != 'size'} for row in rows.to_dict('records')],
+        'scenario_names': sorted(str(name) for name in rows['scenario']),
+    }
 
     # Create size-specific subdirectory
     size_dir = by_size_dir / f'size_{size}'
@@ -382,30 +436,61 @@ def main():
     # Create output directory
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    # Generate individual analysis for each file
+    # The comparer loads files on demand and keeps only a few analyzers in memory
+    comparer = None
+    if len(csv_files) > 1:
+        try:
+            # Shards and _retry files count once per run, as originally measured
+            comparer = BenchmarkComparer([str(f) for f in csv_files], merge_policy='first')
+        except Exception as e:
+            print(f"\n✗ Error indexing benchmark files: {e}")
+            import traceback
+            traceback.print_exc()
+
+    # Generate individual analysis for each file (loaded once, then left to the LRU)
     all_stats = {}
     for csv_file in csv_files:
         try:
-            stats = generate_individual_analysis(csv_file, output_dir)
+            analyzer = comparer.analyzers[csv_file] if comparer is not None else BenchmarkAnalyzer(str(csv_file))
+            stats = generate_individual_analysis(csv_file, output_dir, analyzer)
             all_stats[csv_file.stem] = stats
         except Exception as e:
             print(f"\n✗ Error processing {csv_file.name}: {e}")
             import traceback
             traceback.print_exc()
 
+    # Aggregate the whole corpus once: every metric for every (scenario, size)
+    matrix = None
+    if comparer is not None:
+        try:
+            matrix = comparer.compare_all()
+            generate_matrix_analysis(matrix, output_dir)
+        except Exception as e:
+            print(f"\n✗ Error generating benchmark matrix: {e}")
+            import traceback
+            traceback.print_exc()
+
+    # Error signatures across the corpus
+    try:
+        generate_error_analysis(csv_files, output_dir)
+    except Exception as e:
+        print(f"\n✗ Error clustering error messages: {e}")
+        import traceback
+        traceback.print_exc()
+
     # Generate comparison analysis (by scenario)
-    if len(csv_files) > 1:
+    if matrix is not None:
         try:
-            generate_comparison_analysis(csv_files, output_dir)
+            generate_comparison_analysis(csv_files, output_dir, comparer, matrix)
         except Exception as e:
             print(f"\n✗ Error generating comparison: {e}")
             import traceback
             traceback.print_exc()
 
     # Generate by-size comparison analysis
-    if len(csv_files) > 1:
+    if matrix is not None:
         try:
-            generate_by_size_analysis(csv_files, output_dir)
+            generate_by_size_analysis(csv_files, output_dir, comparer, matrix)
         except Exception as e:
             print(f"\n✗ Error generating by-size comparison: {e}")
             import traceback
@@ -422,6 +507,8 @@ def main():
     print(f"    ├── glpk_random_5/      (individual analysis per file)")
     print(f"    ├── glpk_random_10/")
     print(f"    ├── ... (one folder per benchmark)")
+    print(f"    ├── matrix/             (every metric for every scenario x size)")
+    print(f"    ├── errors/             (error signatures of failed runs, if any)")
     print(f"    ├── comparisons/        (scenario-grouped comparisons)")
     print(f"    │   ├── random/         (all sizes for random scenario)")
     print(f"    │   ├── identical/")
@@ -436,7 +523,14 @@ def main():
     print(f"  • statistics.json/txt    (all metrics)")
     print(f"  • timeout_analysis.json  (if timeouts found)")
     print(f"  • outliers.json          (if outliers found)")
-    print(f"  • 5 visualization PNG files")
+    print(f"  • error_signatures.json  (if failed runs found)")
+    print(f"  • 6 visualization PNG files (+ timeout_raster.png if timeouts found)")
+    print(f"\nThe matrix folder contains:")
+    print(f"  • benchmark_matrix.csv           (tidy table, one row per scenario x size)")
+    print(f"  • heatmaps.png                   (P50/P95/P99/timeout rate/CV heatmaps)")
+    print(f"\nThe errors folder contains:")
+    print(f"  • error_signatures.json          (normalized messages, counts, iterations, sizes)")
+    print(f"  • error_signatures_by_size.csv   (signature x size counts)")
     print(f"\nEach scenario comparison folder contains:")
     print(f"  • size_comparison.json/txt       (statistics by size)")
     print(f"  • scaling_analysis.json/txt      (predictions)")
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Gradient-Boosted Stumps
+
+A small histogram gradient-boosting model with depth-1 trees (stumps), used
+to relate benchmark outcomes to instance features:
+
+  - loss 'squared' for continuous targets (e.g. log solve time)
+  - loss 'logistic' for binary targets (e.g. timed out)
+
+Features are binned once at their quantiles. Every round scans all
+(feature, bin) splits at once with bincount over the binned matrix and adds
+the best stump. Stumps on the same feature add up, so the fitted model is
+additive: prediction = intercept + sum over features of shape[feature][bin].
+That makes partial dependence exact and cheap, and the model can be exported
+as plain lists (bin edges plus one table per feature) for inference without
+numpy.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence
+
+
+class StumpBooster:
+    """
+    Additive gradient-boosted stump model.
+    """
+
+    def __init__(
+        self,
+        loss: str = 'squared',
+        n_rounds: int = 300,
+        learning_rate: float = 0.1,
+        n_bins: int = 32,
+        min_leaf: int = 10,
+        l2: float = 1.0
+    ):
+        """
+        Configure the model.
+
+        Args:
+            loss: 'squared' (regression) or 'logistic' (binary classification)
+            n_rounds: Boosting rounds (stumps)
+            learning_rate: Shrinkage applied to every stump
+            n_bins: Maximum quantile bins per feature
+            min_leaf: Minimum rows on each side of a split
+            l2: L2 regularization of leaf values
+        """
+        if loss not in ('squared', 'logistic'):
+            raise ValueError(f"Unknown loss: {loss}")
+
+        self.loss = loss
+        self.n_rounds = n_rounds
+        self.learning_rate = learning_rate
+        self.n_bins = n_bins
+        self.min_leaf = min_leaf
+        self.l2 = l2
+
+    def _bin(self, X: np.ndarray) -> np.ndarray:
+        """Bin index of every value (NaN goes to bin 0)."""
+        binned = np.zeros(X.shape, dtype=np.int64)
+        for j, edges in enumerate(self.edges_):
+            column = X[:, j]
+            binned[:, j] = np.where(np.isnan(column), 0, np.searchsorted(edges, column, side='right'))
+        return binned
+
+    def fit(self, X: np.ndarray, y: np.ndarray, feature_names: Optional[Sequence[str]] = None) -> 'StumpBooster':
+        """
+        Fit the model.
+
+        Args:
+            X: Feature matrix (rows x features), NaN allowed
+            y: Target (0/1 for the logistic loss)
+            feature_names: Names of the feature columns
+
+        Returns:
+            self
+        """
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float)
+        n, n_features = X.shape
+        self.feature_names_ = list(feature_names) if feature_names is not None else [
+            f'x{j}' for j in range(n_features)]
+
+        quantiles = np.linspace(0, 1, self.n_bins + 1)[1:-1]
+        self.edges_ = [np.unique(np.nanquantile(X[:, j], quantiles)) if np.isfinite(X[:, j]).any()
+                       else np.array([]) for j in range(n_features)]
+        widths = np.array([len(edges) + 1 for edges in self.edges_])
+        offsets = np.concatenate(([0], np.cumsum(widths)[:-1]))
+        binned = self._bin(X)
+        flat = (binned + offsets).ravel()
+        total_bins = int(widths.sum())
+
+        if self.loss == 'squared':
+            self.intercept_ = float(y.mean())
+        else:
+            rate = np.clip(y.mean(), 1e-6, 1 - 1e-6)
+            self.intercept_ = float(np.log(rate / (1 - rate)))
+
+        self.shapes_ = [np.zeros(w) for w in widths]
+        self.gains_ = np.zeros(n_features)
+        raw = np.full(n, self.intercept_)
+        feature_of_bin = np.repeat(np.arange(n_features), widths)
+        counts = np.bincount(flat, minlength=total_bins).astype(float)
+
+        for _ in range(self.n_rounds):
+            if self.loss == 'squared':
+                grad, hess = y - raw, np.ones(n)
+            else:
+                p = 1.0 / (1.0 + np.exp(-raw))
+                grad, hess = y - p, np.maximum(p * (1 - p), 1e-12)
+
+            G = np.bincount(flat, weights=np.repeat(grad, n_features), minlength=total_bins)
+            H = np.bincount(flat, weights=np.repeat(hess, n_features), minlength=total_bins)
+
+            # Cumulative sums within each feature: left side of a split after bin b
+            GL, HL, NL = (self._cumulative(a, widths, offsets) for a in (G, H, counts))
+            G_total = np.add.reduceat(G, offsets)[feature_of_bin]
+            H_total = np.add.reduceat(H, offsets)[feature_of_bin]
+            GR, HR, NR = G_total - GL, H_total - HL, n - NL
+
+            gain = GL**2 / (HL + self.l2) + GR**2 / (HR + self.l2) - G_total**2 / (H_total + self.l2)
+            gain[(NL < self.min_leaf) | (NR < self.min_leaf)] = -np.inf
+            best = int(np.argmax(gain))
+            if not np.isfinite(gain[best]) or gain[best] <= 1e-12:
+                break
+
+            j = int(feature_of_bin[best])
+            split = best - offsets[j]
+            left = self.learning_rate * GL[best] / (HL[best] + self.l2)
+            right = self.learning_rate * GR[best] / (HR[best] + self.l2)
+            self.shapes_[j][:split + 1] += left
+            self.shapes_[j][split + 1:] += right
+            self.gains_[j] += gain[best]
+            raw += np.where(binned[:, j] <= split, left, right)
+
+        return self
+
+    @staticmethod
+    def _cumulative(values: np.ndarray, widths: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """Running sum of per-bin values, restarting at every feature."""
+        running = np.cumsum(values)
+        starts = np.concatenate(([0.0], running))[offsets]
+        return running - np.repeat(starts, widths)
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """Raw additive score (target scale for 'squared', log-odds for 'logistic')."""
+        binned = self._bin(np.asarray(X, dtype=float))
+        raw = np.full(len(binned), self.intercept_)
+        for j, shape in enumerate(self.shapes_):
+            raw += shape[binned[:, j]]
+        return raw
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predicted target ('squared') or probability ('logistic')."""
+        raw = self.decision_function(X)
+        return raw if self.loss == 'squared' else 1.0 / (1.0 + np.exp(-raw))
+
+    @property
+    def importances_(self) -> Dict[str, float]:
+        """Share of total split gain per feature."""
+        total = self.gains_.sum()
+        shares = self.gains_ / total if total > 0 else self.gains_
+        return dict(zip(self.feature_names_, shares.tolist()))
+
+    def partial_dependence(self, X: np.ndarray, feature: int, grid: np.ndarray) -> np.ndarray:
+        """
+        Mean prediction over the rows of X with one feature set to each grid value.
+
+        Args:
+            X: Reference rows
+            feature: Column index
+            grid: Values to set the feature to
+
+        Returns:
+            Mean prediction per grid value
+        """
+        raw = self.decision_function(X) - self.shapes_[feature][self._bin(X)[:, feature]]
+        grid_bins = np.searchsorted(self.edges_[feature], np.asarray(grid, dtype=float), side='right')
+        values = raw[:, None] + self.shapes_[feature][grid_bins][None, :]
+        if self.loss == 'logistic':
+            values = 1.0 / (1.0 + np.exp(-values))
+        return values.mean(axis=0)
+
+    def to_dict(self) -> Dict:
+        """Plain-list representation (edges and shape table per feature)."""
+        return {
+            'loss': self.loss,
+            'intercept': self.intercept_,
+            'features': [
+                {'name': name, 'edges': edges.tolist(), 'shape': shape.tolist()}
+                for name, edges, shape in zip(self.feature_names_, self.edges_, self.shapes_)
+            ],
+        }
+
+
+def r2_score(y: np.ndarray, predicted: np.ndarray) -> float:
+    """Coefficient of determination."""
+    residual = np.sum((y - predicted) ** 2)
+    total = np.sum((y - np.mean(y)) ** 2)
+    return float(1 - residual / total) if total > 0 else 0.0
+
+
+def log_loss(y: np.ndarray, p: np.ndarray) -> float:
+    """Mean binary cross-entropy."""
+    p = np.clip(p, 1e-12, 1 - 1e-12)
+    return float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p)))
+
+
+def roc_auc(y: np.ndarray, scores: np.ndarray) -> Optional[float]:
+    """Area under the ROC curve (rank formulation, ties averaged)."""
+    y = np.asarray(y, dtype=bool)
+    positives, negatives = int(y.sum()), int((~y).sum())
+    if positives == 0 or negatives == 0:
+        return None
+
+    order = np.argsort(scores, kind='mergesort')
+    ranks = np.empty(len(scores))
+    sorted_scores = np.asarray(scores)[order]
+    # Average ranks over ties
+    _, starts, counts = np.unique(sorted_scores, return_index=True, return_counts=True)
+    average = starts + (counts + 1) / 2.0
+    ranks[order] = np.repeat(average, counts)
+    return float((ranks[y].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+def kfold_indices(n: int, folds: int, seed: int = 0) -> List[np.ndarray]:
+    """Shuffled fold assignment: list of test-index arrays."""
+    order = np.random.default_rng(seed).permutation(n)
+    return [order[k::folds] for k in range(folds)]
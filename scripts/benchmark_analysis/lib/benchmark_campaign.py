@@ -0,0 +1,502 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Campaigns
+
+Runs a whole benchmark matrix (scenarios x sizes) from one YAML file as a
+pool of isolated `benchmark:glpk` processes:
+
+  - Every job is one process writing its own shard,
+    glpk_<scenario>_<size>_<name>_w<k>.csv, so shards of a cell can run in
+    parallel and are merged at analysis time (see benchmark_shards).
+  - At most `concurrency` jobs run at once. With `cpus`, the process of pool
+    slot k (and everything it starts, e.g. glpsol) is pinned to cpus[k], so
+    parallel jobs do not migrate between cores and disturb each other.
+  - A job is killed when it exceeds its wall-time limit or writes no row for
+    `stall_timeout` seconds (a hung solve), and is restarted up to `retries`
+    times for the iterations its shard is still missing. The restart appends
+    to the same shard (a new iteration segment). Re-running a campaign
+    resumes it the same way: complete shards are skipped.
+  - Completed rows are tailed from the shards as they are flushed and fed
+    into live per-cell latency histograms (benchmark_hdr), so percentiles
+    and timeout rates are available while the campaign runs.
+  - When all shards of a cell are complete, the cell is analyzed right away:
+    its shard histograms are cached, its merged statistics are added to the
+    campaign matrix CSV (one row per cell, see benchmark_matrix) and the
+    convergence of the metrics is checked (see benchmark_converge).
+
+Matrix file (YAML, or JSON with the same keys):
+
+    name: nightly                       # shard tag (default: file name)
+    scenarios: [random, realistic]
+    sizes: [10, 20, 50, 100, 200]
+    iterations: {default: 1000, 200: 300}   # or one number for all sizes
+    timeout: 30                         # solver timeout (s)
+    shards: 2                           # jobs (and files) per cell
+    concurrency: 4
+    cpus: [0, 1, 2, 3]                  # or 'auto'; omit to not pin
+    job_timeout: null                   # wall s per job (default: from runs)
+    stall_timeout: null                 # s without a new row (default: 2 x timeout + 60)
+    retries: 2
+    output_dir: storage/benchmarks
+    command: [php, artisan, benchmark:glpk]
+    merge: first                        # retry policy of the analysis
+
+Commands run in the current directory (the project root for artisan); the
+output directory is resolved from there, both for the command and for
+reading the shards.
+"""
+
+import csv
+import io
+import json
+import os
+import re
+import signal
+import subprocess
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from benchmark_hdr import LatencyHistogram, load_histogram
+
+
+DEFAULT_COMMAND = ('php', 'artisan', 'benchmark:glpk')
+
+DEFAULTS = {
+    'name': None,
+    'scenarios': None,
+    'sizes': None,
+    'iterations': None,
+    'timeout': 30,
+    'shards': 1,
+    'concurrency': 1,
+    'cpus': None,
+    'job_timeout': None,
+    'stall_timeout': None,
+    'retries': 2,
+    'output_dir': 'storage/benchmarks',
+    'command': list(DEFAULT_COMMAND),
+    'merge': 'first',
+}
+
+# Seconds per run besides the solve, for the default job wall-time limit
+RUN_OVERHEAD_S = 10
+
+# Seconds a killed job gets to exit after SIGTERM before SIGKILL
+KILL_GRACE_S = 5
+
+MATRIX_SUFFIX = '_matrix.csv'
+
+
+def load_campaign(path: str) -> Dict:
+    """
+    Read and validate a campaign matrix file.
+
+    Args:
+        path: YAML (.yaml/.yml, needs PyYAML) or JSON file
+
+    Returns:
+        Campaign configuration with every key of DEFAULTS; 'iterations' is a
+        dictionary size -> iterations and 'cpus' a list (or None)
+    """
+    path = Path(path)
+    text = path.read_text()
+    if path.suffix in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("Reading YAML campaigns needs PyYAML (pip install pyyaml); "
+                              "a JSON file with the same keys works without it")
+        data = yaml.safe_load(text) or {}
+    else:
+        data = json.loads(text)
+
+    unknown = set(data) - set(DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown campaign key(s): {', '.join(sorted(unknown))}")
+    config = {**DEFAULTS, **data}
+    for key in ('scenarios', 'sizes', 'iterations'):
+        if not config[key]:
+            raise ValueError(f"Campaign needs '{key}'")
+
+    config['name'] = re.sub(r'[^A-Za-z0-9]+', '-', str(config['name'] or path.stem)).strip('-').lower()
+    if 'retry' in config['name']:
+        raise ValueError("Campaign name must not contain 'retry' (it marks retry shards)")
+    config['scenarios'] = [str(s) for s in config['scenarios']]
+    config['sizes'] = [int(s) for s in config['sizes']]
+
+    iterations = config['iterations']
+    if isinstance(iterations, dict):
+        default = iterations.get('default')
+        iterations = {size: int(iterations.get(size, iterations.get(str(size), default)) or 0)
+                      for size in config['sizes']}
+    else:
+        iterations = {size: int(iterations) for size in config['sizes']}
+    missing = [size for size, count in iterations.items() if count <= 0]
+    if missing:
+        raise ValueError(f"No iterations for size(s): {missing}")
+    config['iterations'] = iterations
+
+    if config['cpus'] == 'auto':
+        config['cpus'] = sorted(os.sched_getaffinity(0))
+    elif config['cpus'] is not None:
+        config['cpus'] = [int(c) for c in config['cpus']]
+    if isinstance(config['command'], str):
+        config['command'] = config['command'].split()
+    for key in ('shards', 'concurrency'):
+        if int(config[key]) < 1:
+            raise ValueError(f"'{key}' must be at least 1")
+    return config
+
+
+def expand_jobs(config: Dict) -> List[Dict]:
+    """
+    One job per shard of every (scenario, size) cell.
+
+    The iterations of a cell are split as evenly as possible over its shards.
+    Jobs are ordered largest size first, so the longest jobs do not end up
+    alone at the end of the campaign.
+
+    Returns:
+        List of job dictionaries: id, scenario, size, shard, iterations,
+        path (shard CSV relative to the working directory) and log path
+    """
+    output_dir = Path(config['output_dir'])
+    shards = int(config['shards'])
+    jobs = []
+    for size in sorted(config['sizes'], reverse=True):
+        total = config['iterations'][size]
+        for scenario in config['scenarios']:
+            for shard in range(1, shards + 1):
+                iterations = total // shards + (1 if shard <= total % shards else 0)
+                if iterations == 0:
+                    continue
+                stem = f"glpk_{scenario}_{size}_{config['name']}_w{shard}"
+                jobs.append({
+                    'id': f"{scenario}/{size}/w{shard}",
+                    'scenario': scenario,
+                    'size': size,
+                    'shard': shard,
+                    'iterations': iterations,
+                    'path': output_dir / f"{stem}.csv",
+                    'log': output_dir / 'logs' / f"{stem}.log",
+                })
+    return jobs
+
+
+def job_command(config: Dict, job: Dict, iterations: int) -> List[str]:
+    """benchmark:glpk argv running some iterations of a job into its shard."""
+    return list(config['command']) + [
+        str(job['path']), f"--size={job['size']}", f"--scenario={job['scenario']}",
+        f"--iterations={iterations}", f"--timeout={int(config['timeout'])}",
+    ]
+
+
+def job_limits(config: Dict, iterations: int) -> Dict:
+    """Wall-time and stall limits (s) of a job running some iterations."""
+    timeout = float(config['timeout'])
+    wall = config['job_timeout']
+    stall = config['stall_timeout']
+    return {
+        'wall': float(wall) if wall else iterations * (timeout + RUN_OVERHEAD_S) + 60,
+        'stall': float(stall) if stall else 2 * timeout + 60,
+    }
+
+
+def matrix_path(config: Dict) -> Path:
+    """Campaign matrix CSV (statistics of the completed cells)."""
+    return Path(config['output_dir']) / f"campaign_{config['name']}{MATRIX_SUFFIX}"
+
+
+class ShardTail:
+    """
+    Incremental reader of a shard that is still being written.
+
+    Only complete CSV records are consumed (a quoted error message may span
+    lines), so a row half-flushed by the benchmark is read on the next call.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.offset = 0
+        self.rows = 0
+        self.columns = None
+
+    def read(self) -> List:
+        """New complete rows since the last call as (status, time_ms) pairs."""
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+
+        # A line ends a record when the quotes since the last record are balanced
+        end = position = quotes = 0
+        for line in data.splitlines(keepends=True):
+            position += len(line)
+            quotes += line.count(b'"')
+            if quotes % 2 == 0 and line.endswith(b'\n'):
+                end = position
+        if end == 0:
+            return []
+        self.offset += end
+
+        rows = []
+        for record in csv.reader(io.StringIO(data[:end].decode(errors='replace'), newline='')):
+            if self.columns is None:
+                self.columns = (record.index('status'), record.index('time_ms'))
+                continue
+            status, time_ms = self.columns
+            if len(record) > max(status, time_ms):
+                rows.append((record[status], record[time_ms]))
+        self.rows += len(rows)
+        return rows
+
+
+class Campaign:
+    """
+    Scheduler of a campaign's jobs.
+
+    Progress is reported through an event callback receiving dictionaries
+    with an 'event' key: start, exit, kill, restart, failed, progress, cell
+    (a cell was analyzed) and done.
+    """
+
+    def __init__(self, config: Dict, on_event: Optional[Callable[[Dict], None]] = None,
+                 analyze: bool = True, poll_s: float = 1.0, progress_s: float = 30.0):
+        """
+        Prepare the jobs of a campaign.
+
+        Args:
+            config: Output of load_campaign()
+            on_event: Callback for progress events (default: ignore)
+            analyze: Analyze each cell as soon as its shards are complete
+            poll_s: Seconds between checks of the running jobs
+            progress_s: Seconds between 'progress' events
+        """
+        self.config = config
+        self.on_event = on_event or (lambda event: None)
+        self.analyze = analyze
+        self.poll_s = poll_s
+        self.progress_s = progress_s
+        self.jobs = expand_jobs(config)
+        for job in self.jobs:
+            job.update(attempts=0, state='pending', tail=ShardTail(job['path']), process=None)
+        self.histograms = {}
+        self.cells = {}
+        self.analyzed = {}
+        for job in self.jobs:
+            self.cells.setdefault((job['scenario'], job['size']), []).append(job)
+            self.histograms.setdefault((job['scenario'], job['size']), LatencyHistogram())
+
+    def _emit(self, event: str, **fields):
+        self.on_event({'event': event, **fields})
+
+    def _consume(self, job: Dict) -> int:
+        """Feed a job's new shard rows into the live histogram of its cell."""
+        rows = job['tail'].read()
+        if rows:
+            hist = self.histograms[(job['scenario'], job['size'])]
+            hist.add_statuses(status for status, _ in rows)
+            hist.record([float(t) for status, t in rows if status == 'SUCCESS'])
+            job['last_row'] = time.monotonic()
+        return len(rows)
+
+    def _remaining(self, job: Dict) -> int:
+        return max(job['iterations'] - job['tail'].rows, 0)
+
+    def _start(self, job: Dict, slot: int):
+        """Launch the benchmark process of a job in a pool slot."""
+        remaining = self._remaining(job)
+        job['path'].parent.mkdir(parents=True, exist_ok=True)
+        job['log'].parent.mkdir(parents=True, exist_ok=True)
+        cpus = self.config['cpus']
+        cpu = cpus[slot % len(cpus)] if cpus else None
+
+        log = open(job['log'], 'a')
+        preexec = (lambda: os.sched_setaffinity(0, {cpu})) if cpu is not None else None
+        job['process'] = subprocess.Popen(
+            job_command(self.config, job, remaining), stdout=log, stderr=subprocess.STDOUT,
+            stdin=subprocess.DEVNULL, start_new_session=True, preexec_fn=preexec,
+        )
+        log.close()
+        now = time.monotonic()
+        job.update(state='running', slot=slot, cpu=cpu, started=now, last_row=now,
+                   limits=job_limits(self.config, remaining), attempts=job['attempts'] + 1)
+        self._emit('start', job=job, iterations=remaining)
+
+    def _kill(self, job: Dict):
+        """Terminate a job's process group (SIGKILL after a grace period)."""
+        process = job['process']
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+            process.wait(timeout=KILL_GRACE_S)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+        except ProcessLookupError:
+            process.wait()
+
+    def _check(self, job: Dict):
+        """Handle a running job that exited or exceeded its limits."""
+        now = time.monotonic()
+        code = job['process'].poll()
+        if code is None:
+            if now - job['started'] > job['limits']['wall']:
+                reason = f"exceeded {job['limits']['wall']:.0f} s"
+            elif now - job['last_row'] > job['limits']['stall']:
+                reason = f"no row for {job['limits']['stall']:.0f} s"
+            else:
+                return
+            self._kill(job)
+            self._emit('kill', job=job, reason=reason)
+            code = job['process'].returncode
+
+        self._consume(job)
+        job['process'] = None
+        remaining = self._remaining(job)
+        self._emit('exit', job=job, code=code, remaining=remaining)
+        if remaining == 0:
+            job['state'] = 'done'
+            self._cell_progress(job)
+        elif job['attempts'] <= int(self.config['retries']):
+            job['state'] = 'pending'
+            self._emit('restart', job=job, remaining=remaining)
+        else:
+            job['state'] = 'failed'
+            self._emit('failed', job=job, remaining=remaining)
+            self._cell_progress(job)
+
+    def _cell_progress(self, job: Dict):
+        """Analyze a cell once none of its jobs is pending or running."""
+        key = (job['scenario'], job['size'])
+        if self.analyze and key not in self.analyzed and all(j['state'] in ('done', 'failed') for j in self.cells[key]):
+            paths = [j['path'] for j in self.cells[key] if j['path'].exists()]
+            if paths:
+                self.analyzed[key] = analyze_cell(paths, self.config)
+                self._emit('cell', scenario=key[0], size=key[1], **self.analyzed[key])
+                write_matrix(self.analyzed, matrix_path(self.config))
+
+    def live_aggregates(self) -> pd.DataFrame:
+        """
+        Statistics of the rows written so far, one row per cell.
+
+        Returns:
+            DataFrame with scenario, size, jobs (done/total), runs, target,
+            solved, timeout_rate, p50/p95/p99 (ms, from the live histograms)
+        """
+        rows = []
+        for (scenario, size), jobs in self.cells.items():
+            hist = self.histograms[(scenario, size)]
+            runs = sum(hist.status_counts.values())
+            p50, p95, p99 = hist.percentiles([50, 95, 99])
+            rows.append({
+                'scenario': scenario, 'size': size,
+                'jobs': f"{sum(j['state'] == 'done' for j in jobs)}/{len(jobs)}",
+                'running': sum(j['state'] == 'running' for j in jobs),
+                'runs': runs, 'target': sum(j['iterations'] for j in jobs),
+                'solved': hist.status_counts.get('SUCCESS', 0),
+                'timeout_rate': hist.status_counts.get('TIMEOUT', 0) / runs if runs else None,
+                'p50': p50, 'p95': p95, 'p99': p99,
+            })
+        return pd.DataFrame(rows).sort_values(['scenario', 'size']).reset_index(drop=True)
+
+    def run(self) -> Dict:
+        """
+        Run every job to completion.
+
+        Jobs whose shard already holds all their iterations are skipped;
+        partial shards continue where they stopped. On an interrupt, the
+        running processes are killed before the exception propagates.
+
+        Returns:
+            Dictionary with done and failed job counts, the per-cell
+            analysis results and the campaign matrix path
+        """
+        for job in self.jobs:
+            self._consume(job)
+            if self._remaining(job) == 0:
+                job['state'] = 'done'
+        for job in self.jobs:
+            if job['state'] == 'done':
+                self._cell_progress(job)
+
+        concurrency = int(self.config['concurrency'])
+        last_progress = time.monotonic()
+        try:
+            while True:
+                running = [job for job in self.jobs if job['state'] == 'running']
+                busy = {job['slot'] for job in running}
+                for job in self.jobs:
+                    if len(busy) >= concurrency:
+                        break
+                    if job['state'] == 'pending':
+                        slot = min(set(range(concurrency)) - busy)
+                        self._start(job, slot)
+                        busy.add(slot)
+
+                if not any(job['state'] in ('pending', 'running') for job in self.jobs):
+                    break
+                time.sleep(self.poll_s)
+                for job in self.jobs:
+                    if job['state'] == 'running':
+                        self._consume(job)
+                        self._check(job)
+
+                if time.monotonic() - last_progress >= self.progress_s:
+                    last_progress = time.monotonic()
+                    self._emit('progress', aggregates=self.live_aggregates())
+        except BaseException:
+            for job in self.jobs:
+                if job['state'] == 'running':
+                    self._kill(job)
+                    job['state'] = 'pending'
+            raise
+
+        result = {
+            'done': sum(job['state'] == 'done' for job in self.jobs),
+            'failed': sum(job['state'] == 'failed' for job in self.jobs),
+            'cells': self.analyzed,
+            'matrix': matrix_path(self.config) if self.analyzed else None,
+        }
+        self._emit('done', **result)
+        return result
+
+
+def analyze_cell(paths: List[Path], config: Dict) -> Dict:
+    """
+    Incremental analysis of a completed cell.
+
+    Caches the histogram of every shard (so `cli.py percentiles` is instant
+    later), computes the merged statistics of the cell and checks how
+    precisely the runs determine its metrics.
+
+    Args:
+        paths: Shard files of the cell
+        config: Campaign configuration (timeout, merge policy)
+
+    Returns:
+        Dictionary with stats (one-row DataFrame of aggregate_stats) and
+        convergence (output of precision_status)
+    """
+    from benchmark_converge import precision_status
+    from benchmark_dataset import BenchmarkDataset
+
+    for path in paths:
+        load_histogram(str(path))
+    dataset = BenchmarkDataset([str(p) for p in paths], timeout_ms=float(config['timeout']) * 1000,
+                               merge_policy=config['merge'])
+    return {
+        'stats': dataset.aggregate(),
+        'convergence': precision_status(dataset.df[['iteration', 'status', 'time_ms']]),
+    }
+
+
+def write_matrix(analyzed: Dict, path: Path):
+    """Write the statistics of the analyzed cells as one tidy CSV."""
+    frames = [result['stats'] for _, result in sorted(analyzed.items())]
+    pd.concat(frames, ignore_index=True).to_csv(path, index=False)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Capacity Planner
+
+This module answers "what is the largest lottery we can run within our latency
+SLO?" per scenario, on top of BenchmarkComparer's scaling and survival analysis.
+
+An SLO is a set of upper limits, e.g. {'p99': 30000, 'timeout_rate': 0.005}
+(latencies in ms). For every candidate size each metric is predicted with a
+one-sided upper bound at the requested confidence:
+  - p50/p95/p99: upper prediction bound of the selected scaling model
+  - timeout_rate: upper delta-method bound of the censored log-normal AFT model
+
+A size is feasible when every upper bound is within its limit. The maximum safe
+size is the largest size below which every size is feasible.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+
+from benchmark_scaling import predict_intervals
+from benchmark_survival import predict_timeout_probabilities
+
+
+# SLO key -> metric name used by BenchmarkComparer.analyze_size_scaling
+LATENCY_METRICS = {'p50': 'median', 'p95': 'p95', 'p99': 'p99'}
+
+DEFAULT_SIZES = [5, 10, 20, 30, 50, 75, 100, 150, 200, 250, 300, 400, 500]
+
+
+def upper_bounds(
+    comparer,
+    scenario: str,
+    sizes: Sequence[int],
+    slo: Dict[str, float],
+    confidence: float = 0.90
+) -> pd.DataFrame:
+    """
+    Predict one-sided upper bounds of every SLO metric at many sizes.
+
+    Args:
+        comparer: BenchmarkComparer holding the scenario's files
+        scenario: Scenario to evaluate
+        sizes: Candidate sizes
+        slo: Metric limits (p50/p95/p99 in ms, timeout_rate as a fraction)
+        confidence: One-sided confidence of the upper bounds
+
+    Returns:
+        DataFrame with one row per size and one upper-bound column per SLO metric
+    """
+    unknown = set(slo) - set(LATENCY_METRICS) - {'timeout_rate'}
+    if unknown:
+        raise ValueError(f"Unknown SLO metric(s): {sorted(unknown)}")
+
+    sizes = np.asarray(sizes, dtype=float)
+    two_sided = 2 * confidence - 1  # upper end of this interval is the one-sided bound
+    bounds = pd.DataFrame({'size': sizes.astype(int)})
+
+    latency_keys = [key for key in slo if key in LATENCY_METRICS]
+    if latency_keys:
+        scaling = comparer.analyze_size_scaling(scenario)
+        if 'models' not in scaling:
+            raise ValueError(f"Need at least 3 sizes of '{scenario}' to extrapolate latency")
+        for key in latency_keys:
+            fit = scaling['models'][LATENCY_METRICS[key]]['candidates'][0]
+            _, _, upper = predict_intervals(fit, sizes, two_sided)
+            bounds[key] = upper
+
+    if 'timeout_rate' in slo:
+        survival = comparer.analyze_survival(scenario)
+        predicted = predict_timeout_probabilities(
+            survival['fit'], sizes, survival['timeout_ms'], two_sided
+        )
+        bounds['timeout_rate'] = predicted['upper']
+
+    return bounds
+
+
+def plan_capacity(
+    comparer,
+    slo: Dict[str, float],
+    sizes: Optional[Sequence[int]] = None,
+    confidence: float = 0.90,
+    scenarios: Optional[List[str]] = None
+) -> Dict:
+    """
+    Find the maximum safe size per scenario and build a feasibility matrix.
+
+    Args:
+        comparer: BenchmarkComparer holding the benchmark files
+        slo: Metric limits (p50/p95/p99 in ms, timeout_rate as a fraction)
+        sizes: Sizes for the feasibility matrix (default: DEFAULT_SIZES plus observed sizes)
+        confidence: One-sided confidence of the upper bounds
+        scenarios: Scenarios to evaluate (default: all found)
+
+    Returns:
+        Dictionary with per-scenario results and a tidy feasibility matrix
+        (one row per scenario and size)
+    """
+    if not slo:
+        raise ValueError("SLO must define at least one metric limit")
+
+    if scenarios is None:
+        scenarios = comparer.catalog.scenarios
+
+    observed = {scenario: comparer.catalog.sizes(scenario) for scenario in scenarios}
+    grid = sorted(set(sizes or DEFAULT_SIZES) | {s for values in observed.values() for s in values})
+
+    results = {}
+    matrix = []
+    for scenario in scenarios:
+        # The search starts at the smallest benchmarked size: below it the fit is extrapolated
+        smallest, largest = min(observed[scenario]), max(observed[scenario])
+        search = np.arange(smallest, max(grid) + 1)
+        try:
+            bounds = upper_bounds(comparer, scenario, np.union1d(search, grid), slo, confidence)
+        except ValueError as e:
+            results[scenario] = {'max_safe_size': None, 'error': str(e)}
+            continue
+
+        violations = pd.DataFrame({key: bounds[key] > limit for key, limit in slo.items()})
+        violations.index = bounds['size'].to_numpy()
+        within = violations.loc[search]
+        feasible = ~within.any(axis=1).to_numpy()
+
+        # Largest size such that every smaller benchmarked-range size is feasible too
+        first_bad = np.argmin(feasible) if not feasible.all() else len(feasible)
+        max_safe = int(search[first_bad - 1]) if first_bad > 0 else None
+        limiting = (within.iloc[first_bad][within.iloc[first_bad]].index.tolist()
+                    if first_bad < len(feasible) else [])
+
+        results[scenario] = {
+            'max_safe_size': max_safe,
+            'limited_by': limiting,
+            'beyond_search_range': bool(first_bad == len(feasible)),
+            'min_observed_size': smallest,
+            'max_observed_size': largest,
+            'extrapolated': bool(max_safe is not None and max_safe > largest),
+        }
+
+        by_size = bounds.set_index('size')
+        for size in grid:
+            # Below the benchmarked range only the (extrapolated) bounds of the size itself count
+            feasible_size = (size <= (max_safe or 0) if size >= smallest
+                             else not violations.loc[size].any())
+            row = {'scenario': scenario, 'size': size,
+                   'feasible': bool(feasible_size),
+                   'observed': size in observed[scenario],
+                   'extrapolated': bool(size < smallest or size > largest)}
+            for key in slo:
+                row[f'{key}_upper'] = float(by_size.at[size, key])
+            matrix.append(row)
+
+    return {
+        'slo': dict(slo),
+        'confidence': confidence,
+        'scenarios': results,
+        'matrix': pd.DataFrame(matrix),
+    }
+
+
+def feasibility_table(matrix: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pivot the tidy feasibility matrix into size x scenario cells for publishing.
+
+    Cells read 'ok' or 'NO', marked with '*' where the size was extrapolated
+    outside the benchmarked sizes (below the smallest or beyond the largest).
+    """
+    if matrix.empty:
+        return pd.DataFrame()
+
+    cells = matrix['feasible'].map({True: 'ok', False: 'NO'}) + np.where(matrix['extrapolated'], '*', '')
+
+    table = matrix.assign(cell=cells).pivot(index='size', columns='scenario', values='cell')
+    table.columns.name = None
+    return table
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Catalog
+
+This module resolves the scenario and size of benchmark files without loading
+them into DataFrames, and provides the bounded caches BenchmarkComparer uses to load
+per-file analyzers and per-slice datasets lazily.
+
+`php artisan benchmark:glpk` names its output glpk_<scenario>_<size>.csv
+(and benchmark:glpk:retry appends _retry), so the filename is enough in
+the common case. Files that do not follow the convention are resolved from
+their header and first data row.
+
+An index of row counts, iteration range and status counts per file is built
+on demand (not by BenchmarkCatalog, which only needs names and headers). It
+is filled by a regex scan over the memory-mapped bytes, so listing a large
+corpus needs neither pandas nor the files in memory. The commands persist it
+in the user cache (DEFAULT_INDEX_DIR, never the benchmark directory) and
+refresh it by modification time; without a cache directory nothing is
+written.
+"""
+
+import csv
+import json
+import mmap
+import os
+import re
+from collections import Counter, OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+
+FILENAME_PATTERN = re.compile(r'^glpk_(?P<scenario>[a-z]+)_(?P<size>\d+)(?:_(?P<tag>.+))?$')
+
+# Resident frames kept by BenchmarkComparer's caches
+DEFAULT_MAX_RESIDENT = 8
+
+CACHE_DIR = '.benchmark_cache'
+INDEX_FILE = 'catalog.json'
+INDEX_VERSION = 2
+
+# Where the commands persist the index (never inside the benchmark directory)
+DEFAULT_INDEX_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'benchmark_analysis'
+
+# Leading fields of a data row: size,scenario,iteration,time_ms,status,...
+# (none of them can contain commas or quotes, unlike error/spec/result)
+ROW_PATTERN = re.compile(rb'^\d+,[^,\r\n]*,(\d+),[^,\r\n]*,([A-Z]+)(?:,|\r?$)', re.MULTILINE)
+
+
+def resolve_file(path: str) -> Dict:
+    """
+    Resolve a benchmark file's scenario and size.
+
+    Args:
+        path: Path to a benchmark CSV file
+
+    Returns:
+        Dictionary with path, scenario, size, tag (e.g. 'retry', or None)
+        and source ('filename' or 'header')
+    """
+    path = Path(path)
+    match = FILENAME_PATTERN.match(path.stem)
+    if match:
+        return {
+            'path': path,
+            'scenario': match.group('scenario'),
+            'size': int(match.group('size')),
+            'tag': match.group('tag'),
+            'source': 'filename',
+        }
+
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        row = next(reader, None)
+
+    if not header or not row:
+        raise ValueError(f"{path.name}: cannot resolve scenario and size from an empty file")
+
+    first = dict(zip(header, row))
+    missing = [col for col in ('scenario', 'size') if col not in first]
+    if missing:
+        raise ValueError(f"{path.name}: missing required columns: {missing}")
+
+    return {
+        'path': path,
+        'scenario': first['scenario'],
+        'size': int(first['size']),
+        'tag': None,
+        'source': 'header',
+    }
+
+
+def scan_file(path: str) -> Dict:
+    """
+    Summarize a benchmark file from a single scan of its bytes.
+
+    The file is memory-mapped rather than read, so only the pages being
+    scanned are resident.
+
+    Args:
+        path: Path to a benchmark CSV file
+
+    Returns:
+        Dictionary with file, scenario, size, tag, rows, iteration_min,
+        iteration_max, status_counts, bytes and mtime_ns
+    """
+    path = Path(path)
+    stat = path.stat()
+
+    rows = 0
+    iteration_min = iteration_max = None
+    statuses = Counter()
+    if stat.st_size:
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for match in ROW_PATTERN.finditer(data):
+                iteration = int(match.group(1))
+                rows += 1
+                iteration_min = iteration if iteration_min is None else min(iteration_min, iteration)
+                iteration_max = iteration if iteration_max is None else max(iteration_max, iteration)
+                statuses[match.group(2).decode()] += 1
+
+    entry = resolve_file(path) if rows or FILENAME_PATTERN.match(path.stem) else {
+        'scenario': None, 'size': None, 'tag': None, 'source': None
+    }
+
+    return {
+        'file': path.name,
+        'scenario': entry['scenario'],
+        'size': entry['size'],
+        'tag': entry['tag'],
+        'rows': rows,
+        'iteration_min': iteration_min,
+        'iteration_max': iteration_max,
+        'status_counts': dict(sorted(statuses.items())),
+        'bytes': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }
+
+
+def load_index(csv_paths: List[str], refresh: bool = False, cache_dir: Optional[str] = None) -> List[Dict]:
+    """
+    Get index entries for benchmark files, rescanning only changed files.
+
+    With a cache directory, entries are persisted in <cache_dir>/catalog.json
+    (keyed by absolute path) and reused while the file's size and
+    modification time are unchanged. Without one, every file is scanned and
+    nothing is written.
+
+    Args:
+        csv_paths: Paths to benchmark CSV files
+        refresh: Rescan every file regardless of the persisted index
+        cache_dir: Directory of the persisted index (None: do not persist)
+
+    Returns:
+        List of entries (see scan_file) with an added 'path', in input order
+    """
+    index_path = Path(cache_dir) / INDEX_FILE if cache_dir else None
+    cached = {} if refresh or index_path is None else _read_index(index_path)
+    changed = False
+
+    entries = []
+    for path in map(Path, csv_paths):
+        key = str(path.resolve())
+        stat = path.stat()
+        entry = cached.get(key)
+        if not entry or entry['mtime_ns'] != stat.st_mtime_ns or entry['bytes'] != stat.st_size:
+            entry = scan_file(path)
+            cached[key] = entry
+            changed = True
+        entries.append(dict(entry, path=path))
+
+    if changed and index_path is not None:
+        _write_index(index_path, cached)
+    return entries
+
+
+def index_directory(
+    benchmark_dir: str,
+    pattern: str = 'glpk_*.csv',
+    refresh: bool = False,
+    cache_dir: Optional[str] = None
+) -> List[Dict]:
+    """Index every benchmark file in a directory (sorted by filename)."""
+    return load_index(sorted(Path(benchmark_dir).glob(pattern)), refresh=refresh, cache_dir=cache_dir)
+
+
+def _read_index(index_path: Path) -> Dict:
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return index.get('files', {}) if index.get('version') == INDEX_VERSION else {}
+
+
+def _write_index(index_path: Path, files: Dict):
+    # The index is only a cache: an unwritable cache directory just means rescanning
+    try:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = index_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': INDEX_VERSION, 'files': files}, f, indent=1)
+        tmp_path.replace(index_path)
+    except OSError:
+        pass
+
+
+class BenchmarkCatalog:
+    """
+    Files by scenario and size.
+
+    Only filenames (or, for other names, the header and first row) are read
+    when the catalog is built; the row index is scanned on first use.
+    """
+
+    def __init__(self, csv_paths: List[str], cache_dir: Optional[str] = DEFAULT_INDEX_DIR):
+        """
+        Resolve every file.
+
+        Args:
+            csv_paths: Paths to benchmark CSV files
+            cache_dir: Directory of the persisted index used by index()
+                (None: scan without persisting)
+        """
+        entries, unresolved = [], []
+        for path in csv_paths:
+            try:
+                entries.append(dict(resolve_file(path), file=Path(path).name))
+            except (OSError, ValueError):
+                unresolved.append(Path(path).name)
+        if unresolved:
+            raise ValueError(f"Cannot resolve scenario and size of: {', '.join(unresolved)}")
+
+        self.entries = sorted(entries, key=lambda e: (e['scenario'], e['size'], e['path'].name))
+        self.cache_dir = cache_dir
+        self._index = None
+
+    def index(self) -> List[Dict]:
+        """Index entries (see scan_file) of the catalog's files, scanned on first call."""
+        if self._index is None:
+            self._index = load_index([e['path'] for e in self.entries], cache_dir=self.cache_dir)
+        return self._index
+
+    def paths(self, scenario: Optional[str] = None, size: Optional[int] = None) -> List[Path]:
+        """Paths of the files matching a scenario and/or size."""
+        return [
+            e['path'] for e in self.entries
+            if (scenario is None or e['scenario'] == scenario) and (size is None or e['size'] == size)
+        ]
+
+    @property
+    def scenarios(self) -> List[str]:
+        """Scenarios present in the catalog (sorted)."""
+        return sorted({e['scenario'] for e in self.entries})
+
+    def sizes(self, scenario: Optional[str] = None) -> List[int]:
+        """Sizes present in the catalog (sorted), optionally for one scenario."""
+        return sorted({e['size'] for e in self.entries if scenario is None or e['scenario'] == scenario})
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class LRUCache:
+    """
+    Least-recently-used cache that builds missing values with a loader.
+
+    At most `maxsize` values are resident; the least recently used one is
+    dropped when a new value is loaded.
+    """
+
+    def __init__(self, loader: Callable, maxsize: int = DEFAULT_MAX_RESIDENT):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.loader = loader
+        self.maxsize = maxsize
+        self._values = OrderedDict()
+
+    def get(self, key):
+        """Return the cached value for key, loading it if needed."""
+        if key in self._values:
+            self._values.move_to_end(key)
+            return self._values[key]
+
+        value = self.loader(key)
+        self._values[key] = value
+        if len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+        return value
+
+    def __contains__(self, key) -> bool:
+        return key in self._values
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def clear(self):
+        """Drop every resident value."""
+        self._values.clear()
+
+
+class LazyAnalyzers:
+    """
+    Read-only mapping path -> BenchmarkAnalyzer that loads on access.
+
+    Iterating over values() visits every file but keeps at most the cache's
+    maxsize analyzers (and their DataFrames) in memory.
+    """
+
+    def __init__(self, paths: List[Path], loader: Callable, maxsize: int = DEFAULT_MAX_RESIDENT):
+        self._paths = list(paths)
+        self._cache = LRUCache(loader, maxsize)
+
+    def __getitem__(self, path):
+        path = Path(path)
+        if path not in self._paths:
+            raise KeyError(path)
+        return self._cache.get(path)
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def keys(self) -> List[Path]:
+        return list(self._paths)
+
+    def values(self) -> Iterator:
+        return (self[path] for path in self._paths)
+
+    def items(self) -> Iterator:
+        return ((path, self[path]) for path in self._paths)
+
+    @property
+    def resident(self) -> int:
+        """Number of analyzers currently held in memory."""
+        return len(self._cache)
@@ -14,6 +14,15 @@ import seaborn as sns
 from typing import List, Dict, Optional
 from pathlib import Path
 from benchmark_stats import BenchmarkAnalyzer
+from benchmark_dataset import BenchmarkDataset
+from benchmark_catalog import DEFAULT_MAX_RESIDENT, BenchmarkCatalog, LazyAnalyzers, LRUCache
+from benchmark_survival import (
+    fit_lognormal_aft, infer_timeout_ms, predict_aft_percentile,
+    predict_timeout_probability, survival_data
+)
+from benchmark_scaling import (
+    SCALING_METRICS, evaluate_model, predict_with_interval, select_scaling_model
+)
 
 
 class BenchmarkComparer:
@@ -23,148 +32,219 @@ class BenchmarkComparer:
     Enables analysis of size scaling, scenario comparison, and performance trends.
     """
 
-    def __init__(self, csv_paths: List[str]):
+    def __init__(
+        self,
+        csv_paths: List[str],
+        timeout_ms: Optional[float] = None,
+        max_resident: int = DEFAULT_MAX_RESIDENT,
+        merge_policy: Optional[str] = None
+    ):
         """
         Initialize comparer with multiple benchmark CSV files.
 
+        Files are indexed by scenario and size from their names; their rows
+        are only read when an analysis needs them.
+
         Args:
             csv_paths: List of paths to benchmark CSV files
+            timeout_ms: Solver timeout the benchmarks ran with (inferred if None)
+            max_resident: Maximum number of loaded analyzers and datasets kept in memory
+            merge_policy: Merge shards and retry files of the same (scenario, size)
+                with this retry policy ('first', 'last', 'best'); by default
+                every file's rows are pooled as-is
         """
-        self.csv_paths = [Path(p) for p in csv_paths]
-        self.analyzers = {path: BenchmarkAnalyzer(str(path)) for path in self.csv_paths}
-
-    def compare_all(self) -> pd.DataFrame:
+        self.catalog = BenchmarkCatalog(csv_paths)
+        self.csv_paths = self.catalog.paths()
+        self.timeout_ms = timeout_ms
+        self.merge_policy = merge_policy
+        self.analyzers = LazyAnalyzers(
+            self.csv_paths,
+            lambda path: BenchmarkAnalyzer(str(path), timeout_ms=timeout_ms),
+            max_resident
+        )
+        self._datasets = LRUCache(self._load_dataset, max_resident)
+
+    def _load_dataset(self, key) -> BenchmarkDataset:
+        scenario, size = key
+        paths = self.catalog.paths(scenario=scenario, size=size)
+        if not paths:
+            what = ' and '.join(f"{name}: {value}" for name, value in
+                                (('scenario', scenario), ('size', size)) if value is not None)
+            raise ValueError(f"No files found for {what}")
+        return BenchmarkDataset([str(p) for p in paths], timeout_ms=self.timeout_ms,
+                                merge_policy=self.merge_policy)
+
+    def dataset(self, scenario: Optional[str] = None, size: Optional[int] = None) -> BenchmarkDataset:
         """
-        Generate comprehensive comparison across all files.
+        Get the dataset of one scenario and/or size, loading only those files.
+
+        Args:
+            scenario: Scenario to load (all if None)
+            size: Size to load (all if None)
 
         Returns:
-            DataFrame with comparative statistics for all files
+            BenchmarkDataset of the matching files (cached, LRU-bounded)
         """
-        results = []
-
-        for path, analyzer in self.analyzers.items():
-            stats = analyzer.compute_stats()
+        return self._datasets.get((scenario, size))
 
-            # Add file metadata
-            stats['file'] = path.name
-            stats['size'] = analyzer.df['size'].iloc[0]
-            stats['scenario'] = analyzer.df['scenario'].iloc[0]
+    def compare_all(self) -> pd.DataFrame:
+        """
+        Generate comprehensive comparison across all files.
 
-            results.append(stats)
+        Scenarios are loaded one at a time, so memory stays bounded by the
+        largest scenario rather than the whole corpus.
 
-        df = pd.DataFrame(results)
-        return df.sort_values(['scenario', 'size'])
+        Returns:
+            DataFrame with comparative statistics per (scenario, size)
+        """
+        return pd.concat(
+            [self.dataset(scenario=scenario).stats() for scenario in self.catalog.scenarios],
+            ignore_index=True
+        )
 
-    def analyze_size_scaling(self, scenario: str = 'random') -> Dict:
+    def analyze_size_scaling(self, scenario: str = 'random', criterion: str = 'aicc') -> Dict:
         """
         Analyze how performance scales with problem size.
 
+        Fits power-law, exponential, polynomial and n·log n models to the mean,
+        median, P95 and P99 times and selects the best model per metric.
+
         Args:
             scenario: Scenario type to analyze
+            criterion: Model selection criterion ('aicc' or 'loocv')
 
         Returns:
             Dictionary with scaling analysis
         """
-        # Filter to specific scenario
-        scenario_analyzers = {
-            path: analyzer for path, analyzer in self.analyzers.items()
-            if analyzer.df['scenario'].iloc[0] == scenario
+        cells = self.dataset(scenario=scenario).stats()
+
+        sizes = [int(size) for size in cells['size']]
+        metric_times = {metric: cells[f'time_{metric}'].tolist() for metric in SCALING_METRICS}
+
+        scaling = {
+            'scenario': scenario,
+            'sizes': sizes,
+            'mean_times': metric_times['mean'],
+            'median_times': metric_times['median'],
+            'p95_times': metric_times['p95'],
+            'p99_times': metric_times['p99'],
+            'max_times': cells['time_max'].tolist(),
+            'success_rates': cells['success_rate'].tolist(),
+            'timeout_rates': cells['timeout_rate'].tolist(),
         }
 
-        if not scenario_analyzers:
-            raise ValueError(f"No files found for scenario: {scenario}")
-
-        sizes = []
-        means = []
-        medians = []
-        maxes = []
-        success_rates = []
-        timeout_rates = []
-
-        for path in sorted(scenario_analyzers.keys(),
-                          key=lambda p: scenario_analyzers[p].df['size'].iloc[0]):
-            analyzer = scenario_analyzers[path]
-            stats = analyzer.compute_stats()
-
-            sizes.append(analyzer.df['size'].iloc[0])
-            means.append(stats['time_mean'])
-            medians.append(stats['time_median'])
-            maxes.append(stats['time_max'])
-            success_rates.append(stats['success_rate'])
-            timeout_rates.append(stats['timeout_rate'])        # Fit polynomial for scaling prediction
+        # Fit and select scaling models per metric
         if len(sizes) >= 3:
-            # Fit quadratic model: time = a*size^2 + b*size + c
-            coeffs = np.polyfit(sizes, means, 2)
-
-            return {
-                'scenario': scenario,
-                'sizes': sizes,
-                'mean_times': means,
-                'median_times': medians,
-                'max_times': maxes,
-                'success_rates': success_rates,
-                'timeout_rates': timeout_rates,
-                'poly_coeffs': coeffs.tolist(),
-                'scaling_order': 'quadratic' if abs(coeffs[0]) > 0.01 else 'linear'
-            }
-        else:
-            return {
-                'scenario': scenario,
-                'sizes': sizes,
-                'mean_times': means,
-                'median_times': medians,
-                'max_times': maxes,
-                'success_rates': success_rates,
-                'timeout_rates': timeout_rates,
+            scaling['models'] = {
+                metric: select_scaling_model(sizes, metric_times[metric], criterion=criterion)
+                for metric in SCALING_METRICS
             }
+            scaling['scaling_order'] = scaling['models']['median']['best']
+
+        return scaling
 
-    def predict_time(self, size: int, scenario: str = 'random') -> Dict[str, float]:
+    def predict_time(
+        self,
+        size: int,
+        scenario: str = 'random',
+        confidence: float = 0.90,
+        criterion: str = 'aicc'
+    ) -> Dict:
         """
         Predict execution time for a given problem size.
 
         Args:
             size: Problem size (NxN)
             scenario: Scenario type
+            confidence: Coverage of the prediction intervals
+            criterion: Model selection criterion ('aicc' or 'loocv')
 
         Returns:
-            Dictionary with predicted metrics
+            Dictionary with predicted metrics and prediction intervals; the
+            timeout rate and its interval are None (with the reason in
+            timeout_rate_note) when no survival model can be fitted
         """
-        scaling = self.analyze_size_scaling(scenario)
+        scaling = self.analyze_size_scaling(scenario, criterion=criterion)
 
-        if 'poly_coeffs' not in scaling:
+        if 'models' not in scaling:
             raise ValueError("Need at least 3 data points for prediction")
 
-        coeffs = scaling['poly_coeffs']
-        predicted_mean = coeffs[0] * size**2 + coeffs[1] * size + coeffs[2]
-
-        # Estimate timeout rate using logistic regression on existing data
-        if len(scaling['sizes']) >= 2:
-            # Simple linear extrapolation for timeout rate
-            sizes = np.array(scaling['sizes'])
-            timeout_rates = np.array(scaling['timeout_rates'])
-
-            if len(sizes) >= 2 and timeout_rates[-1] > 0:
-                # Fit linear model in log space for exponential growth
-                log_rates = np.log(timeout_rates[timeout_rates > 0] + 1e-6)
-                size_subset = sizes[timeout_rates > 0]
-
-                if len(size_subset) >= 2:
-                    slope = (log_rates[-1] - log_rates[0]) / (size_subset[-1] - size_subset[0])
-                    intercept = log_rates[0] - slope * size_subset[0]
-                    predicted_timeout_rate = min(1.0, np.exp(slope * size + intercept))
-                else:
-                    predicted_timeout_rate = timeout_rates[-1]
-            else:
-                predicted_timeout_rate = 0.0
-        else:
-            predicted_timeout_rate = 0.0
+        intervals = {}
+        for metric, selection in scaling['models'].items():
+            fit = selection['candidates'][0]
+            value, lower, upper = predict_with_interval(fit, size, confidence)
+            intervals[metric] = {
+                'model': fit['model'],
+                'value': value,
+                'lower': lower,
+                'upper': upper,
+            }
+
+        # Timeout probability from the censored log-normal survival model. Without
+        # a fit (too few solved runs, often because most runs time out) it is unknown, not 0
+        timeout = {'probability': None, 'lower': None, 'upper': None}
+        note = None
+        try:
+            survival = self.analyze_survival(scenario)
+            timeout = predict_timeout_probability(
+                survival['fit'], size, survival['timeout_ms'], confidence
+            )
+        except ValueError as e:
+            note = str(e)
 
         return {
             'size': size,
-            'predicted_mean_time': predicted_mean,
-            'predicted_timeout_rate': predicted_timeout_rate,
+            'confidence': confidence,
+            'predicted_mean_time': intervals['mean']['value'],
+            'predicted_median_time': intervals['median']['value'],
+            'predicted_p95_time': intervals['p95']['value'],
+            'predicted_p99_time': intervals['p99']['value'],
+            'intervals': intervals,
+            'predicted_timeout_rate': timeout['probability'],
+            'timeout_rate_interval': None if note else [timeout['lower'], timeout['upper']],
+            'timeout_rate_note': note,
             'prediction_based_on': f"{len(scaling['sizes'])} data points",
-            'model': 'quadratic' if coeffs[0] > 0.01 else 'linear'
+            'model': scaling['scaling_order']
+        }
+
+    def analyze_survival(self, scenario: str = 'random') -> Dict:
+        """
+        Fit a censored log-normal survival model of solve time across sizes.
+
+        TIMEOUT rows are right-censored at the configured timeout, so the fit
+        uses everything the benchmark learned about slow instances.
+
+        Args:
+            scenario: Scenario type to analyze
+
+        Returns:
+            Dictionary with the AFT fit, the timeout it was censored at, and
+            observed vs. fitted timeout rates per size
+        """
+        df = self.dataset(scenario=scenario).df
+
+        timeout_ms = self.timeout_ms if self.timeout_ms is not None else infer_timeout_ms(df)
+
+        durations, events = survival_data(df, timeout_ms)
+        sizes = df.loc[df['status'].isin(['SUCCESS', 'TIMEOUT']), 'size'].to_numpy()
+        fit = fit_lognormal_aft(sizes, durations, events)
+
+        per_size = []
+        for size in sorted(df['size'].unique()):
+            size_df = df[df['size'] == size]
+            per_size.append({
+                'size': int(size),
+                'observed_timeout_rate': float((size_df['status'] == 'TIMEOUT').mean()),
+                'fitted_timeout_rate': predict_timeout_probability(fit, size, timeout_ms)['probability'],
+                'fitted_p50': predict_aft_percentile(fit, size, 0.50),
+                'fitted_p99': predict_aft_percentile(fit, size, 0.99),
+            })
+
+        return {
+            'scenario': scenario,
+            'timeout_ms': timeout_ms,
+            'fit': fit,
+            'per_size': per_size,
         }
 
     def plot_scaling_analysis(
@@ -189,11 +269,12 @@ class BenchmarkComparer:
         ax = axes[0, 0]
         ax.plot(scaling['sizes'], scaling['mean_times'], 'o-', linewidth=2, markersize=8)
 
-        # Add polynomial fit if available
-        if 'poly_coeffs' in scaling:
+        # Add selected model fit if available
+        if 'models' in scaling:
+            fit = scaling['models']['mean']['candidates'][0]
             x_smooth = np.linspace(min(scaling['sizes']), max(scaling['sizes']), 100)
-            y_smooth = np.polyval(scaling['poly_coeffs'], x_smooth)
-            ax.plot(x_smooth, y_smooth, '--', alpha=0.5, label='Polynomial fit')
+            y_smooth = evaluate_model(fit, x_smooth)
+            ax.plot(x_smooth, y_smooth, '--', alpha=0.5, label=f"{fit['model']} fit")
             ax.legend()
 
         ax.set_xlabel('Problem Size (NxN)', fontsize=11)
@@ -205,6 +286,15 @@ class BenchmarkComparer:
         ax = axes[0, 1]
         ax.plot(scaling['sizes'], scaling['median_times'], 'o-',
                 linewidth=2, markersize=8, color='green')
+
+        if 'models' in scaling:
+            fit = scaling['models']['median']['candidates'][0]
+            x_smooth = np.linspace(min(scaling['sizes']), max(scaling['sizes']), 100)
+            bands = np.array([predict_with_interval(fit, x) for x in x_smooth])
+            ax.plot(x_smooth, bands[:, 0], '--', color='green', alpha=0.5, label=f"{fit['model']} fit")
+            ax.fill_between(x_smooth, bands[:, 1], bands[:, 2], color='green', alpha=0.15,
+                            label='90% prediction interval')
+            ax.legend()
         ax.set_xlabel('Problem Size (NxN)', fontsize=11)
         ax.set_ylabel('Median Time (ms)', fontsize=11)
         ax.set_title('Median Execution Time Scaling', fontweight='bold')
@@ -252,20 +342,9 @@ class BenchmarkComparer:
         Returns:
             Dictionary with comparative statistics for all scenarios
         """
-        size_analyzers = {
-            path: analyzer for path, analyzer in self.analyzers.items()
-            if analyzer.df['size'].iloc[0] == size
-        }
+        cells = self.dataset(size=size).stats()
 
-        if not size_analyzers:
-            raise ValueError(f"No files found for size: {size}")
-
-        results = []
-        for path, analyzer in sorted(size_analyzers.items()):
-            stats = analyzer.compute_stats()
-            stats['file'] = path.name
-            stats['scenario'] = analyzer.df['scenario'].iloc[0]
-            results.append(stats)
+        results = cells.drop(columns=['size']).to_dict('records')
 
         return {
             'size': size,
@@ -287,33 +366,14 @@ class BenchmarkComparer:
             save_path: Path to save figure (optional)
             show: Whether to display the plot
         """
-        # Filter to specific size
-        size_analyzers = {
-            path: analyzer for path, analyzer in self.analyzers.items()
-            if analyzer.df['size'].iloc[0] == size
-        }
+        cells = self.dataset(size=size).stats()
 
-        if not size_analyzers:
-            raise ValueError(f"No files found for size: {size}")
-
-        scenarios = []
-        means = []
-        medians = []
-        stds = []
-        success_rates = []
-        timeout_rates = []
-        max_times = []
-
-        for path, analyzer in sorted(size_analyzers.items()):
-            stats = analyzer.compute_stats()
-            scenario_name = analyzer.df['scenario'].iloc[0]
-            scenarios.append(scenario_name)
-            means.append(stats['time_mean'])
-            medians.append(stats['time_median'])
-            stds.append(stats['time_std'])
-            success_rates.append(stats['success_rate'] * 100)
-            timeout_rates.append(stats['timeout_rate'] * 100)
-            max_times.append(stats['time_max'])
+        scenarios = [str(s) for s in cells['scenario']]
+        means = cells['time_mean'].tolist()
+        medians = cells['time_median'].tolist()
+        success_rates = (cells['success_rate'] * 100).tolist()
+        timeout_rates = (cells['timeout_rate'] * 100).tolist()
+        max_times = cells['time_max'].tolist()
 
         x = np.arange(len(scenarios))
         width = 0.35
@@ -394,14 +454,19 @@ if __name__ == '__main__':
         print(f"Sizes analyzed: {scaling['sizes']}")
         print(f"Mean times: {[f'{t:.1f}ms' for t in scaling['mean_times']]}")
 
-        if 'poly_coeffs' in scaling:
-            print(f"\nScaling model: {scaling['scaling_order']}")
+        if 'models' in scaling:
+            print(f"\nScaling model (median): {scaling['scaling_order']}")
 
             # Predict for next size
             next_size = max(scaling['sizes']) + 5
             prediction = comparer.predict_time(next_size, 'random')
-            print(f"\nPrediction for {next_size}x{next_size}:")
-            print(f"  Mean time: {prediction['predicted_mean_time']:.1f}ms")
-            print(f"  Timeout rate: {prediction['predicted_timeout_rate']:.2%}")
+            print(f"\nPrediction for {next_size}x{next_size} ({prediction['confidence']:.0%} intervals):")
+            for metric, interval in prediction['intervals'].items():
+                print(f"  {metric:>6}: {interval['value']:.1f}ms "
+                      f"[{interval['lower']:.1f}, {interval['upper']:.1f}] ({interval['model']})")
+            if prediction['predicted_timeout_rate'] is None:
+                print(f"  Timeout rate: n/a ({prediction['timeout_rate_note']})")
+            else:
+                print(f"  Timeout rate: {prediction['predicted_timeout_rate']:.2%}")
     except ValueError as e:
         print(f"Scaling analysis not available: {e}")
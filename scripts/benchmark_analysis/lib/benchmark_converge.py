@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Convergence (Sequential Stopping)
+
+Answers "has this benchmark run enough iterations yet?" while it is still
+writing its CSV, and "how many iterations will I need?" before it starts.
+
+Precision of each metric is the half-width of its confidence interval
+relative to the estimate:
+
+  - median / p95 / p99: Kaplan-Meier percentile (benchmark_survival) with
+    timeouts censored at the solver timeout, so a stretch of timeouts does
+    not make the benchmark look faster; the interval is the distribution-
+    free order-statistic interval read off the same curve, with the
+    effective sample size, so autocorrelated runs do not stop the benchmark
+    early. A percentile beyond the timeouts has no upper bound yet.
+  - timeout_rate: Wilson interval; as rates near 0 cannot reach a relative
+    precision, the target half-width is max(target * rate, rate_tolerance)
+
+Checking a growing file again and again would stop early by chance (each
+look is another chance for a narrow interval). The metrics are therefore
+only evaluated at scheduled looks, on a doubling schedule of the run count
+from min_runs: look k uses exactly the first min_runs * 2^(k - 1) runs (in
+iteration order) and alpha / (k (k + 1)), which sums to alpha over all
+looks. Checking between two scheduled looks repeats the last look on the
+same runs, so the overall miss rate stays below 1 - confidence however
+often the file is checked; the price is that a benchmark can only stop at
+a scheduled run count.
+
+The power calculator (runs_to_detect) sizes a comparison of two benchmark
+runs: the iterations per side for a two-sided test of a relative change in
+a percentile (asymptotic variance of the sample quantile, density of log
+time from a kernel estimate on pilot data) or in the timeout rate.
+"""
+
+import math
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from benchmark_series import effective_sample_size
+from benchmark_survival import infer_timeout_ms, kaplan_meier, km_percentile, survival_data
+
+
+METRICS = ('median', 'p95', 'p99', 'timeout_rate')
+DEFAULT_METRICS = ('median', 'p95', 'timeout_rate')
+QUANTILES = {'median': 0.5, 'p95': 0.95, 'p99': 0.99}
+
+DEFAULT_MIN_RUNS = 30
+
+# Absolute timeout-rate half-width that always counts as precise enough
+RATE_TOLERANCE = 0.005
+
+# Exit codes of 'cli.py converge' for wrapper scripts (1 is an error)
+EXIT_CONVERGED = 0
+EXIT_NOT_CONVERGED = 3
+
+
+def load_progress(csv_path: str) -> pd.DataFrame:
+    """
+    Complete rows of a benchmark CSV that may still be written.
+
+    A partially written last line (no time or status yet) is dropped.
+
+    Returns:
+        DataFrame with iteration, status and time_ms in iteration order
+    """
+    df = pd.read_csv(csv_path, usecols=['iteration', 'status', 'time_ms'])
+    df['time_ms'] = pd.to_numeric(df['time_ms'], errors='coerce')
+    df = df.dropna(subset=['iteration', 'status', 'time_ms'])
+    return df.sort_values('iteration', kind='stable').reset_index(drop=True)
+
+
+def look_number(runs: int, min_runs: int = DEFAULT_MIN_RUNS) -> int:
+    """Index of the last scheduled look reached on the doubling schedule from min_runs (1-based)."""
+    return max(1, int(math.floor(math.log2(max(runs, 1) / max(min_runs, 1)))) + 1)
+
+
+def look_runs(look: int, min_runs: int = DEFAULT_MIN_RUNS) -> int:
+    """Run count at which scheduled look k is evaluated."""
+    return max(min_runs, 1) * 2 ** (look - 1)
+
+
+def sequential_confidence(confidence: float, look: int) -> float:
+    """Per-look confidence spending alpha / (k (k + 1)) at look k."""
+    return 1 - (1 - confidence) / (look * (look + 1))
+
+
+def wilson_interval(successes: int, n: float, confidence: float = 0.95) -> Dict:
+    """
+    Wilson score interval of a proportion.
+
+    Args:
+        successes: Number of events
+        n: Number of trials (may be an effective sample size)
+        confidence: Two-sided coverage
+
+    Returns:
+        Dictionary with estimate, lower and upper
+    """
+    if n <= 0:
+        return {'estimate': float('nan'), 'lower': 0.0, 'upper': 1.0}
+    p = successes / n
+    z = stats.norm.ppf(0.5 + confidence / 2)
+    center = (p + z * z / (2 * n)) / (1 + z * z / n)
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+    return {'estimate': p, 'lower': float(max(center - half, 0.0)), 'upper': float(min(center + half, 1.0))}
+
+
+def km_quantile_ci(
+    durations: np.ndarray,
+    events: np.ndarray,
+    q: float,
+    confidence: float = 0.95,
+    ess: Optional[float] = None
+) -> Tuple[float, float, float]:
+    """
+    Censoring-aware percentile with a distribution-free interval.
+
+    The order-statistic interval (normal approximation of the binomial,
+    effective sample size in place of n) is read off the Kaplan-Meier curve
+    instead of the solved times, so censored runs count as slower than the
+    point they were censored at.
+
+    Returns:
+        (estimate, lower, upper); the estimate is NaN and the upper bound
+        infinite when the curve does not reach the percentile (bound)
+    """
+    if len(durations) == 0:
+        return float('nan'), float('nan'), float('nan')
+    km = kaplan_meier(durations, events)
+    ess = min(ess or len(durations), len(durations))
+    half = stats.norm.ppf(0.5 + confidence / 2) * math.sqrt(q * (1 - q) / ess)
+    estimate, lower, upper = (km_percentile(km, p) for p in (q, max(q - half, 0.0), min(q + half, 1.0)))
+    return (float('nan') if estimate is None else estimate,
+            float('nan') if lower is None else lower,
+            float('inf') if upper is None else upper)
+
+
+def precision_status(
+    df: pd.DataFrame,
+    target: float = 0.05,
+    confidence: float = 0.95,
+    metrics: Sequence[str] = DEFAULT_METRICS,
+    min_runs: int = DEFAULT_MIN_RUNS,
+    rate_tolerance: float = RATE_TOLERANCE,
+    timeout_ms: Optional[float] = None
+) -> Dict:
+    """
+    How precisely the runs up to the last scheduled look estimate each metric.
+
+    Args:
+        df: Benchmark rows (iteration, status, time_ms)
+        target: Target relative half-width of the confidence intervals
+        confidence: Overall confidence across all looks
+        metrics: Metrics to check (see METRICS)
+        min_runs: Runs before any metric can converge (first look)
+        rate_tolerance: Absolute timeout-rate half-width that is always enough
+        timeout_ms: Solver timeout the timeouts are censored at (default:
+            inferred from the TIMEOUT rows)
+
+    Returns:
+        Dictionary with runs (all rows), evaluated (runs of the look; all
+        rows before min_runs), next_look (run count of the next look),
+        solved, ess, look, the per-look confidence, 'metrics' (per metric:
+        estimate, lower, upper, precision, target, converged and
+        runs_needed, the projected total runs to converge, rounded up to a
+        scheduled look), 'converged' (all metrics) and runs_needed (the
+        largest projection)
+    """
+    unknown = set(metrics) - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metric(s): {sorted(unknown)}")
+
+    df = df.sort_values('iteration', kind='stable')
+    total = len(df)
+    look = look_number(total, min_runs)
+    if total >= min_runs:
+        df = df.iloc[:look_runs(look, min_runs)]
+    runs = len(df)
+    level = sequential_confidence(confidence, look)
+
+    durations, events = survival_data(df, timeout_ms if timeout_ms is not None else infer_timeout_ms(df))
+    solved = int(events.sum())
+    positive = durations > 0
+    ess = effective_sample_size(np.log(durations[positive])) if positive.sum() > 1 else float(positive.sum())
+
+    results = {}
+    for metric in metrics:
+        if metric == 'timeout_rate':
+            indicator = (df['status'] == 'TIMEOUT').to_numpy(dtype=float)
+            timeouts = int(indicator.sum())
+            n_eff = effective_sample_size(indicator) if 0 < timeouts < runs else float(runs)
+            interval = wilson_interval(timeouts / runs * n_eff if runs else 0, n_eff, level)
+            interval['estimate'] = timeouts / runs if runs else float('nan')
+            precision = (interval['upper'] - interval['lower']) / 2
+            goal = max(target * interval['estimate'], rate_tolerance) if runs else rate_tolerance
+        else:
+            estimate, lower, upper = km_quantile_ci(durations, events, QUANTILES[metric], level, ess)
+            interval = {'estimate': estimate, 'lower': lower, 'upper': upper}
+            precision = max(upper - estimate, estimate - lower) / estimate if estimate > 0 else float('inf')
+            goal = target
+
+        precision = float(precision)
+        converged = bool(runs >= min_runs and precision <= goal)
+        if converged:
+            needed = runs
+        elif math.isfinite(precision) and precision > 0 and runs:
+            # Half-widths shrink with 1 / sqrt(runs); only scheduled looks can stop
+            projected = max(runs * (precision / goal) ** 2, min_runs)
+            needed = look_runs(max(1, math.ceil(math.log2(projected / max(min_runs, 1))) + 1), min_runs)
+        else:
+            needed = None
+        results[metric] = {**interval, 'precision': precision, 'target': goal,
+                           'converged': converged, 'runs_needed': needed}
+
+    needed = [r['runs_needed'] for r in results.values()]
+    return {
+        'runs': total,
+        'evaluated': runs,
+        'next_look': look_runs(look + 1 if total >= min_runs else 1, min_runs),
+        'solved': solved,
+        'ess': ess,
+        'look': look,
+        'confidence': level,
+        'metrics': results,
+        'converged': all(r['converged'] for r in results.values()),
+        'runs_needed': None if any(n is None for n in needed) else max(needed, default=runs),
+    }
+
+
+def runs_to_detect(
+    df: pd.DataFrame,
+    change: float = 0.05,
+    metric: str = 'p95',
+    confidence: float = 0.95,
+    power: float = 0.8
+) -> Dict:
+    """
+    Iterations per benchmark run needed to detect a relative change.
+
+    Two runs (e.g. before and after a solver change) of n iterations each
+    are compared with a two-sided test. Pilot data supplies the spread.
+
+    Args:
+        df: Pilot benchmark rows (iteration, status, time_ms)
+        change: Relative change to detect (0.05 = 5%)
+        metric: 'median', 'p95', 'p99' or 'timeout_rate'
+        confidence: 1 - significance level of the test
+        power: Probability of detecting a change of that size
+
+    Returns:
+        Dictionary with metric, change, estimate (pilot value), runs_per_side
+        (None if the pilot data cannot size it, e.g. no timeouts) and the
+        pilot runs
+    """
+    if metric not in METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+    z = stats.norm.ppf(0.5 + confidence / 2) + stats.norm.ppf(power)
+    runs = len(df)
+    result = {'metric': metric, 'change': change, 'confidence': confidence, 'power': power,
+              'pilot_runs': runs, 'estimate': None, 'runs_per_side': None}
+    if runs == 0:
+        return result
+
+    if metric == 'timeout_rate':
+        p1 = float((df['status'] == 'TIMEOUT').mean())
+        p2 = min(p1 * (1 + change), 1.0)
+        result['estimate'] = p1
+        if 0 < p1 < p2:
+            z_alpha, z_beta = stats.norm.ppf(0.5 + confidence / 2), stats.norm.ppf(power)
+            pooled = (p1 + p2) / 2
+            n = (z_alpha * math.sqrt(2 * pooled * (1 - pooled))
+                 + z_beta * math.sqrt(p1 * (1 - p1) + p2 * (1 - p2))) ** 2 / (p2 - p1) ** 2
+            result['runs_per_side'] = int(math.ceil(n))
+        return result
+
+    df = df.sort_values('iteration', kind='stable')
+    log_times = np.log(df.loc[(df['status'] == 'SUCCESS') & (df['time_ms'] > 0), 'time_ms'].to_numpy(dtype=float))
+    if len(log_times) < 10 or np.ptp(log_times) == 0:
+        return result
+
+    q = QUANTILES[metric]
+    log_quantile = float(np.quantile(log_times, q))
+    density = float(stats.gaussian_kde(log_times)(log_quantile)[0])
+    result['estimate'] = float(np.exp(log_quantile))
+
+    # Var(log sample quantile) = q (1 - q) / (n g^2), g = density of log time
+    solved_needed = 2 * z * z * q * (1 - q) / (density ** 2 * math.log1p(change) ** 2)
+    inflation = len(log_times) / effective_sample_size(log_times)
+    solved_share = len(log_times) / runs
+    result['runs_per_side'] = int(math.ceil(solved_needed * inflation / solved_share))
+    return result
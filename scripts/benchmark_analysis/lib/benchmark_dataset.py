@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Dataset
+
+This module loads many benchmark CSV files into one compact columnar frame
+(categorical scenario/status/file, integer size and iteration) so that
+multi-file comparisons are a single grouped aggregation instead of one
+BenchmarkAnalyzer and one compute_stats() call per file.
+
+With a merge policy, shards and retry files of the same (scenario, size) are
+read as one merged benchmark (see benchmark_shards) without writing a copy.
+Without one, shards are pooled as they are, but a retry file is left out when
+the files it retried are loaded too: its rows repeat runs of those files and
+would be counted twice.
+"""
+
+import pandas as pd
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from benchmark_matrix import aggregate_stats
+from benchmark_shards import PROVENANCE_COLUMNS, group_shards, is_retry_file, load_merged
+
+
+REQUIRED_COLUMNS = ['size', 'scenario', 'iteration', 'time_ms', 'status']
+
+DTYPES = {'size': 'int32', 'iteration': 'int32', 'time_ms': 'float64'}
+
+
+class BenchmarkDataset:
+    """
+    Concatenated rows of multiple GLPK benchmark files.
+
+    Each row keeps the name of the file it came from in the 'file' column.
+    Aggregations are cached per grouping.
+    """
+
+    def __init__(
+        self,
+        csv_paths: List[str],
+        timeout_ms: Optional[float] = None,
+        columns: Optional[List[str]] = None,
+        merge_policy: Optional[str] = None
+    ):
+        """
+        Load benchmark CSV files into one frame.
+
+        Args:
+            csv_paths: Paths to benchmark CSV files
+            timeout_ms: Solver timeout the benchmarks ran with (censoring point
+                for the Kaplan-Meier percentiles)
+            columns: Extra CSV columns to keep besides the required ones
+                (e.g. ['error', 'spec']); the default keeps only what the
+                statistics need
+            merge_policy: If set ('first', 'last' or 'best'), shards and retry
+                files of the same (scenario, size) are merged into one logical
+                benchmark with that retry policy (see benchmark_shards). If
+                None, retry files of a cell whose regular shards are loaded
+                too are skipped (listed in excluded_retries)
+        """
+        if not csv_paths:
+            raise ValueError("No benchmark files given")
+
+        self.csv_paths = [Path(p) for p in csv_paths]
+        self.timeout_ms = timeout_ms
+        self.merge_policy = merge_policy
+        self.excluded_retries = [] if merge_policy else self._retries_with_originals()
+        self.df = self._load(REQUIRED_COLUMNS + [c for c in (columns or []) if c not in REQUIRED_COLUMNS])
+        self._aggregates = {}
+
+    def _retries_with_originals(self) -> List[Path]:
+        """Retry files whose (scenario, size) also has a regular shard among the inputs."""
+        if not any(is_retry_file(p) for p in self.csv_paths):
+            return []
+        excluded = []
+        for paths in group_shards([str(p) for p in self.csv_paths]).values():
+            if not all(is_retry_file(p) for p in paths):
+                excluded += [p for p in paths if is_retry_file(p)]
+        return excluded
+
+    def _load(self, columns: List[str]) -> pd.DataFrame:
+        """Read every file and concatenate with compact dtypes."""
+        if self.merge_policy:
+            return self._load_merged(columns)
+
+        frames = []
+        for path in self.csv_paths:
+            if path in self.excluded_retries:
+                continue
+            frame = pd.read_csv(path, usecols=lambda c: c in columns,
+                                dtype={c: t for c, t in DTYPES.items() if c in columns})
+            missing = [col for col in columns if col not in frame.columns]
+            if missing:
+                raise ValueError(f"{path.name}: missing required columns: {missing}")
+            frame['file'] = path.name
+            frames.append(frame)
+
+        return self._compact(pd.concat(frames, ignore_index=True))
+
+    def _load_merged(self, columns: List[str]) -> pd.DataFrame:
+        """Merge the shards of every (scenario, size) cell and concatenate."""
+        frames = []
+        for paths in group_shards([str(p) for p in self.csv_paths]).values():
+            frame = load_merged([str(p) for p in paths], self.merge_policy)
+            frame = frame[columns + PROVENANCE_COLUMNS].astype({c: t for c, t in DTYPES.items() if c in columns})
+            frame['file'] = '+'.join(p.name for p in paths)
+            frames.append(frame)
+
+        df = self._compact(pd.concat(frames, ignore_index=True))
+        df['source'] = pd.Categorical(df['source'])
+        return df
+
+    @staticmethod
+    def _compact(df: pd.DataFrame) -> pd.DataFrame:
+        """Store the repeated string columns as categoricals."""
+        for col in ('scenario', 'status', 'file'):
+            df[col] = pd.Categorical(df[col], categories=sorted(df[col].unique()))
+        return df
+
+    @property
+    def scenarios(self) -> List[str]:
+        """Scenarios present in the dataset (sorted)."""
+        return [str(s) for s in self.df['scenario'].unique().sort_values()]
+
+    def sizes(self, scenario: Optional[str] = None) -> List[int]:
+        """Sizes present in the dataset (sorted), optionally for one scenario."""
+        return sorted(int(s) for s in self.select(scenario=scenario)['size'].unique())
+
+    def select(self, scenario: Optional[str] = None, size: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get the rows of one scenario and/or size.
+
+        Args:
+            scenario: Scenario to keep (all if None)
+            size: Size to keep (all if None)
+
+        Returns:
+            DataFrame of matching rows
+        """
+        mask = pd.Series(True, index=self.df.index)
+        if scenario is not None:
+            mask &= self.df['scenario'] == scenario
+        if size is not None:
+            mask &= self.df['size'] == size
+        return self.df[mask]
+
+    def aggregate(self, by: Sequence[str] = ('scenario', 'size')) -> pd.DataFrame:
+        """
+        Compute every compute_stats() metric per group in one grouped pass.
+
+        Args:
+            by: Grouping columns
+
+        Returns:
+            Tidy DataFrame with one row per group (see aggregate_stats)
+        """
+        key = tuple(by)
+        if key not in self._aggregates:
+            self._aggregates[key] = aggregate_stats(self.df, by=key, timeout_ms=self.timeout_ms)
+        return self._aggregates[key].copy()
+
+    def stats(self, scenario: Optional[str] = None, size: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get per-(scenario, size) statistics, optionally filtered.
+
+        Args:
+            scenario: Scenario to keep (all if None)
+            size: Size to keep (all if None)
+
+        Returns:
+            DataFrame with one row per cell, sorted by scenario and size
+        """
+        cells = self.aggregate()
+        if scenario is not None:
+            cells = cells[cells['scenario'] == scenario]
+        if size is not None:
+            cells = cells[cells['size'] == size]
+        return cells.reset_index(drop=True)
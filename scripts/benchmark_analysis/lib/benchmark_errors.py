@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Error Signature Analysis
+
+BenchmarkGlpkBase keeps the first 100 characters of each exception message
+in the error column. This module turns those messages into signatures by
+masking the parts that differ between occurrences of the same failure:
+
+  - file system paths          -> <path>
+  - UUIDs, hex ids and hashes  -> <id>
+  - numbers (pids, seconds...) -> <n>
+
+A message cut at the 100-character limit ends at a point that depends on
+the length of its variable parts, so its signature is cut again at a fixed
+length of the normalized text (on a word boundary). Truncation at different
+points then does not split a signature.
+
+Signatures are grouped by a short hash in a single pass over the rows, with
+each distinct raw message normalized once, so the cost is linear in the
+corpus size.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+
+# BenchmarkGlpkBase::recordResult() keeps substr($error, 0, 100)
+ERROR_MAX_LENGTH = 100
+
+# Normalized length kept for truncated messages
+TRUNCATED_SIGNATURE_LENGTH = 72
+
+DEFAULT_STATUSES = ('FAILED',)
+
+_PATH = re.compile(r'(?:[A-Za-z]:)?(?:[/\\][\w.\-~]+)+[/\\]?')
+_UUID = re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b')
+_HEX = re.compile(r'\b(?:0x[0-9a-fA-F]+|(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{8,})\b')
+_NUMBER = re.compile(r'\d+(?:\.\d+)?(?:[eE][-+]?\d+)?')
+_SPACE = re.compile(r'\s+')
+
+
+def normalize_error(message: str) -> str:
+    """
+    Signature text of an error message.
+
+    Args:
+        message: Raw (possibly truncated) error message
+
+    Returns:
+        Message with paths, ids and numbers masked and whitespace collapsed;
+        truncated messages end in '…'
+    """
+    truncated = len(message) >= ERROR_MAX_LENGTH
+    message = message.strip()
+    if truncated and ' ' in message:
+        message = message.rsplit(' ', 1)[0]
+    message = _PATH.sub('<path>', message)
+    message = _UUID.sub('<id>', message)
+    message = _HEX.sub('<id>', message)
+    message = _NUMBER.sub('<n>', message)
+    message = _SPACE.sub(' ', message)
+    if truncated:
+        if len(message) > TRUNCATED_SIGNATURE_LENGTH:
+            message = message[:TRUNCATED_SIGNATURE_LENGTH + 1].rsplit(' ', 1)[0]
+        message += ' …'
+    return message
+
+
+def signature_id(signature: str) -> str:
+    """Short stable hash of a signature text."""
+    return hashlib.blake2b(signature.encode('utf-8'), digest_size=6).hexdigest()
+
+
+def error_signatures(df: pd.DataFrame, statuses: Optional[Sequence[str]] = DEFAULT_STATUSES) -> pd.DataFrame:
+    """
+    Cluster the error messages of benchmark rows into signatures.
+
+    Args:
+        df: Benchmark rows with size, iteration, status and error columns
+            (scenario and file are used when present)
+        statuses: Statuses to include (None: every row with an error)
+
+    Returns:
+        DataFrame sorted by count with signature_id, signature, count, share
+        (of the included error rows), statuses, first_iteration,
+        last_iteration, sizes ({size: count}), scenarios, files and an
+        example raw message
+    """
+    rows = df[df['error'].fillna('').astype(str).str.strip() != ''] if 'error' in df else df.iloc[0:0]
+    if statuses is not None:
+        rows = rows[rows['status'].isin(statuses)]
+
+    columns = ['signature_id', 'signature', 'count', 'share', 'statuses', 'first_iteration',
+               'last_iteration', 'sizes', 'scenarios', 'files', 'example']
+    if rows.empty:
+        return pd.DataFrame(columns=columns)
+
+    normalized: Dict[str, str] = {}
+    signatures: Dict[str, Dict] = {}
+    scenarios = rows['scenario'] if 'scenario' in rows else [None] * len(rows)
+    files = rows['file'] if 'file' in rows else [None] * len(rows)
+
+    for message, status, size, iteration, scenario, file in zip(
+            rows['error'].astype(str), rows['status'], rows['size'], rows['iteration'], scenarios, files):
+        if message not in normalized:
+            normalized[message] = normalize_error(message)
+        text = normalized[message]
+        key = signature_id(text)
+
+        entry = signatures.get(key)
+        if entry is None:
+            entry = signatures[key] = {
+                'signature_id': key, 'signature': text, 'count': 0, 'statuses': {},
+                'first_iteration': int(iteration), 'last_iteration': int(iteration),
+                'sizes': {}, 'scenarios': {}, 'files': {}, 'example': message.strip(),
+            }
+        entry['count'] += 1
+        entry['statuses'][status] = entry['statuses'].get(status, 0) + 1
+        entry['first_iteration'] = min(entry['first_iteration'], int(iteration))
+        entry['last_iteration'] = max(entry['last_iteration'], int(iteration))
+        entry['sizes'][int(size)] = entry['sizes'].get(int(size), 0) + 1
+        if scenario is not None:
+            entry['scenarios'][scenario] = entry['scenarios'].get(scenario, 0) + 1
+        if file is not None:
+            entry['files'][file] = entry['files'].get(file, 0) + 1
+
+    result = pd.DataFrame(list(signatures.values()))
+    result['share'] = result['count'] / len(rows)
+    result['sizes'] = result['sizes'].map(lambda sizes: dict(sorted(sizes.items())))
+    return result.sort_values(['count', 'signature'], ascending=[False, True])[columns].reset_index(drop=True)
+
+
+def corpus_error_signatures(
+    csv_paths: Iterable[str],
+    statuses: Optional[Sequence[str]] = DEFAULT_STATUSES
+) -> pd.DataFrame:
+    """
+    Error signatures across benchmark files.
+
+    The spec and result columns are never read, and only error rows are
+    kept in memory.
+
+    Args:
+        csv_paths: Paths to benchmark CSV files
+        statuses: Statuses to include (None: every row with an error)
+
+    Returns:
+        Same as error_signatures(), with per-file counts
+    """
+    frames: List[pd.DataFrame] = []
+    for path in map(Path, csv_paths):
+        df = pd.read_csv(path, usecols=['size', 'scenario', 'iteration', 'status', 'error'],
+                         dtype={'error': str}, keep_default_na=False)
+        df = df[df['error'].str.strip() != '']
+        if statuses is not None:
+            df = df[df['status'].isin(statuses)]
+        frames.append(df.assign(file=path.name))
+
+    if not frames:
+        raise ValueError("No benchmark files given")
+    return error_signatures(pd.concat(frames, ignore_index=True), statuses)
+
+
+def signature_size_table(signatures: pd.DataFrame) -> pd.DataFrame:
+    """Signature x size count table from the sizes column of error_signatures()."""
+    table = pd.DataFrame(list(signatures['sizes']), index=signatures['signature_id']).fillna(0).astype(int)
+    return table.reindex(sorted(table.columns), axis=1)
+
+
+def signatures_to_records(signatures: pd.DataFrame) -> List[Dict]:
+    """JSON-serializable records of error_signatures() output."""
+    records = signatures.to_dict('records')
+    for record in records:
+        record['sizes'] = {str(size): count for size, count in record['sizes'].items()}
+    return records
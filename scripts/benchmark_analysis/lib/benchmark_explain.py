@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Instance Difficulty Analysis
+
+Within one size and scenario, solve times vary by orders of magnitude. This
+module relates that variation to the instance features of benchmark_spec.
+It fits two gradient-boosted stump models (benchmark_boost):
+
+  - log(time_ms) of solved runs, centered per (scenario, size) so the model
+    explains variation within a cell rather than the size effect
+  - the probability that a run times out (SUCCESS vs TIMEOUT rows)
+
+For each feature it reports:
+  - gain importance (share of split gain in the final model)
+  - permutation importance (out-of-fold loss of R^2 or AUC when the feature
+    is shuffled)
+  - partial dependence over the feature's 5th-95th percentile range, and the
+    effect of moving from its 10th to its 90th percentile (time ratio,
+    timeout-probability change)
+
+Result features (pick ranks) are excluded by default: they only exist for
+solved runs and describe the answer, not the instance.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional, Sequence
+
+from benchmark_boost import StumpBooster, kfold_indices, log_loss, r2_score, roc_auc
+from benchmark_spec import SPEC_FEATURES
+
+
+MIN_ROWS = 30
+MIN_CLASS_ROWS = 5
+
+
+def usable_features(df: pd.DataFrame, features: Sequence[str]) -> List[str]:
+    """Features that vary within the rows (constant or all-NaN columns carry no signal)."""
+    return [f for f in features if df[f].notna().any() and df[f].nunique(dropna=True) > 1]
+
+
+def _permutation_importance(model, X, y, score, rng) -> np.ndarray:
+    """Drop in score when each column is shuffled."""
+    base = score(y, model.predict(X))
+    drops = np.zeros(X.shape[1])
+    for j in range(X.shape[1]):
+        shuffled = X.copy()
+        shuffled[:, j] = rng.permutation(shuffled[:, j])
+        drops[j] = base - score(y, model.predict(shuffled))
+    return drops
+
+
+def fit_target(
+    X: np.ndarray,
+    y: np.ndarray,
+    features: List[str],
+    loss: str,
+    folds: int = 5,
+    n_rounds: int = 300,
+    grid_points: int = 9,
+    seed: int = 0
+) -> Dict:
+    """
+    Cross-validate and fit one target, with importances and partial dependence.
+
+    Args:
+        X: Feature matrix
+        y: Target (centered log time, or 0/1 timed out)
+        features: Feature names (columns of X)
+        loss: 'squared' or 'logistic'
+        folds: Cross-validation folds
+        n_rounds: Boosting rounds
+        grid_points: Partial-dependence grid size
+        seed: Seed for folds and permutations
+
+    Returns:
+        Dictionary with model, cv metrics and a per-feature DataFrame
+        ('importance'), plus partial-dependence grids ('partial_dependence')
+    """
+    rng = np.random.default_rng(seed)
+    logistic = loss == 'logistic'
+    out_of_fold = np.zeros(len(y))
+    permutation = np.zeros(len(features))
+
+    def score(truth, predicted):
+        return (roc_auc(truth, predicted) or 0.5) if logistic else r2_score(truth, predicted)
+
+    for test in kfold_indices(len(y), folds, seed):
+        train = np.setdiff1d(np.arange(len(y)), test)
+        model = StumpBooster(loss, n_rounds=n_rounds).fit(X[train], y[train], features)
+        out_of_fold[test] = model.predict(X[test])
+        permutation += _permutation_importance(model, X[test], y[test], score, rng) / folds
+
+    model = StumpBooster(loss, n_rounds=n_rounds).fit(X, y, features)
+    cv = {'auc': roc_auc(y, out_of_fold), 'log_loss': log_loss(y, out_of_fold),
+          'base_log_loss': log_loss(y, np.full(len(y), y.mean())), 'rate': float(y.mean())} if logistic else {
+          'r2': r2_score(y, out_of_fold), 'std': float(np.std(y))}
+
+    rows = []
+    grids = {}
+    for j, name in enumerate(features):
+        column = X[:, j][np.isfinite(X[:, j])]
+        grid = np.unique(np.quantile(column, np.linspace(0.05, 0.95, grid_points)))
+        grids[name] = (grid, model.partial_dependence(X, j, grid))
+
+        low, high = model.partial_dependence(X, j, np.quantile(column, [0.1, 0.9]))
+        rows.append({
+            'feature': name,
+            'gain': model.importances_[name],
+            'permutation': float(permutation[j]),
+            'p10': float(np.quantile(column, 0.1)),
+            'p90': float(np.quantile(column, 0.9)),
+            # Time: factor on solve time; timeout: change in probability
+            'effect': float(high - low) if logistic else float(np.exp(high - low)),
+        })
+
+    importance = pd.DataFrame(rows).sort_values('permutation', ascending=False, kind='stable')
+    return {'model': model, 'cv': cv, 'rows': len(y), 'importance': importance.reset_index(drop=True),
+            'partial_dependence': grids}
+
+
+def explain(
+    df: pd.DataFrame,
+    features: Optional[Sequence[str]] = None,
+    folds: int = 5,
+    n_rounds: int = 300,
+    grid_points: int = 9,
+    seed: int = 0
+) -> Dict:
+    """
+    Relate solve time and timeouts to instance features.
+
+    Args:
+        df: Rows with benchmark and feature columns (see feature_frame)
+        features: Feature columns to use (default: SPEC_FEATURES)
+        folds: Cross-validation folds
+        n_rounds: Boosting rounds
+        grid_points: Partial-dependence grid size
+        seed: Seed for folds and permutations
+
+    Returns:
+        Dictionary with 'time' and 'timeout' results (see fit_target), each
+        None with a 'skipped' reason when the rows cannot support the model
+    """
+    features = usable_features(df, list(features or SPEC_FEATURES))
+    if not features:
+        raise ValueError("No feature varies across the selected runs")
+
+    results = {'features': features, 'skipped': {}}
+
+    solved = df[(df['status'] == 'SUCCESS') & (df['time_ms'] > 0)]
+    if len(solved) >= MIN_ROWS:
+        log_time = np.log(solved['time_ms'].to_numpy(dtype=float))
+        cell_mean = solved.assign(log_time=log_time).groupby(
+            ['scenario', 'size'], observed=True)['log_time'].transform('mean').to_numpy()
+        results['time'] = fit_target(solved[features].to_numpy(dtype=float), log_time - cell_mean,
+                                     features, 'squared', folds, n_rounds, grid_points, seed)
+    else:
+        results['time'] = None
+        results['skipped']['time'] = f"{len(solved)} solved runs (need {MIN_ROWS})"
+
+    decided = df[df['status'].isin(['SUCCESS', 'TIMEOUT'])]
+    timed_out = (decided['status'] == 'TIMEOUT').to_numpy(dtype=float)
+    if min(timed_out.sum(), len(timed_out) - timed_out.sum()) >= MIN_CLASS_ROWS:
+        results['timeout'] = fit_target(decided[features].to_numpy(dtype=float), timed_out,
+                                        features, 'logistic', folds, n_rounds, grid_points, seed)
+    else:
+        results['timeout'] = None
+        results['skipped']['timeout'] = (f"{int(timed_out.sum())} timeouts in {len(timed_out)} runs "
+                                         f"(need {MIN_CLASS_ROWS} of each outcome)")
+
+    return results
+
+
+def plot_partial_dependence(results: Dict, top: int = 4, save_path: Optional[str] = None, show: bool = True):
+    """
+    Plot partial dependence of the most important features.
+
+    Args:
+        results: Output of explain()
+        top: Features per target (by permutation importance)
+        save_path: Save figure to this path
+        show: Display the figure
+    """
+    import matplotlib.pyplot as plt
+
+    targets = [(key, label) for key, label in (('time', 'solve time factor'), ('timeout', 'P(timeout)'))
+               if results.get(key)]
+    if not targets:
+        raise ValueError("Nothing to plot: no model was fitted")
+
+    fig, axes = plt.subplots(len(targets), top, figsize=(4 * top, 3.2 * len(targets)), squeeze=False)
+    for row, (key, label) in enumerate(targets):
+        result = results[key]
+        names = result['importance']['feature'].head(top).tolist()
+        for col in range(top):
+            ax = axes[row][col]
+            if col >= len(names):
+                ax.axis('off')
+                continue
+            grid, values = result['partial_dependence'][names[col]]
+            if key == 'time':
+                values = np.exp(values - values.mean())
+            ax.plot(grid, values, marker='o')
+            ax.set_xlabel(names[col])
+            ax.set_ylabel(label)
+            ax.grid(True, alpha=0.3)
+
+    fig.suptitle('Partial dependence (time factor relative to the average instance)')
+    fig.tight_layout()
+
+    if save_path:
+        fig.savefig(save_path, dpi=150, bbox_inches='tight')
+    if show:
+        plt.show()
+    plt.close(fig)
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Feature Store
+
+This module decodes the spec and result JSON columns of benchmark files into
+the numeric features of benchmark_spec and caches them, so later analyses
+join on features instead of re-parsing megabytes of JSON per run.
+
+Decoding runs in a process pool (orjson when installed). Each distinct spec
+string is parsed once per file, together with the results of every run that
+used it. The output is a columnar store per CSV file,
+<benchmark dir>/.benchmark_cache/features/<stem>.npz. It holds one array per
+feature, aligned row for row with the CSV, plus the iteration and spec hash
+of each row, so rows can be joined by position or by spec hash. Stores are
+rebuilt when the CSV's size or modification time changes.
+"""
+
+import csv
+import os
+import sys
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from benchmark_catalog import CACHE_DIR
+from benchmark_spec import RESULT_FEATURES, SPEC_FEATURES, decode_spec
+
+
+FEATURES_DIR = 'features'
+FEATURES_VERSION = 1
+
+# Below this many rows, starting worker processes costs more than it saves
+PARALLEL_MIN_ROWS = 2000
+
+BENCHMARK_COLUMNS = ['size', 'scenario', 'iteration', 'time_ms', 'status']
+
+
+def _decode_batch(batch: List) -> List:
+    """Decode a batch of (spec JSON, [result JSON, ...]) pairs in a worker."""
+    return [decode_spec(spec_json, results) for spec_json, results in batch]
+
+
+def _read_json_columns(csv_path: Path):
+    """Read iteration, spec and result of every row, grouping rows by spec string."""
+    # Spec strings of large sizes exceed the csv module's default field limit
+    csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+    iterations = []
+    groups = OrderedDict()
+    with open(csv_path, newline='') as f:
+        reader = csv.DictReader(f)
+        for row_idx, row in enumerate(reader):
+            iterations.append(int(row['iteration']))
+            rows, results = groups.setdefault(row.get('spec') or '', ([], []))
+            rows.append(row_idx)
+            results.append(row.get('result') or '')
+    return np.asarray(iterations, dtype=np.int32), groups
+
+
+def extract_features(csv_path: str, executor: Optional[Executor] = None) -> Dict[str, np.ndarray]:
+    """
+    Decode a benchmark file's spec and result columns into feature arrays.
+
+    Args:
+        csv_path: Path to a benchmark CSV file
+        executor: Pool to decode in (decodes in-process if None)
+
+    Returns:
+        Dictionary of row-aligned arrays: iteration, spec_hash and one array
+        per SPEC_FEATURES and RESULT_FEATURES entry
+    """
+    iterations, groups = _read_json_columns(Path(csv_path))
+    items = [(spec_json, results) for spec_json, (_, results) in groups.items()]
+
+    if executor is None:
+        decoded = _decode_batch(items)
+    else:
+        size = max(1, len(items) // (4 * (os.cpu_count() or 1)))
+        batches = [items[i:i + size] for i in range(0, len(items), size)]
+        decoded = [item for batch in executor.map(_decode_batch, batches) for item in batch]
+
+    n_rows = len(iterations)
+    hashes = np.empty(n_rows, dtype='U16')
+    spec_values = np.full((n_rows, len(SPEC_FEATURES)), np.nan)
+    result_values = np.full((n_rows, len(RESULT_FEATURES)), np.nan)
+    for (rows, _), (digest, spec, results) in zip(groups.values(), decoded):
+        hashes[rows] = digest
+        spec_values[rows] = spec
+        result_values[rows] = results
+
+    features = {'iteration': iterations, 'spec_hash': hashes}
+    features.update(zip(SPEC_FEATURES, spec_values.T))
+    features.update(zip(RESULT_FEATURES, result_values.T))
+    return features
+
+
+def _store_path(csv_path: Path) -> Path:
+    return csv_path.parent / CACHE_DIR / FEATURES_DIR / f'{csv_path.stem}.npz'
+
+
+def _read_store(csv_path: Path) -> Optional[Dict[str, np.ndarray]]:
+    """Cached features of a file, or None if missing or stale."""
+    stat = csv_path.stat()
+    try:
+        with np.load(_store_path(csv_path)) as store:
+            version, size, mtime_ns = store['_meta'].tolist()
+            if (version, size, mtime_ns) != (FEATURES_VERSION, stat.st_size, stat.st_mtime_ns):
+                return None
+            return {key: store[key] for key in store.files if key != '_meta'}
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_store(csv_path: Path, features: Dict[str, np.ndarray]):
+    # The store is only a cache: read-only benchmark directories just decode every time
+    stat = csv_path.stat()
+    meta = np.array([FEATURES_VERSION, stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+    store_path = _store_path(csv_path)
+    try:
+        store_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = store_path.with_suffix('.tmp.npz')
+        np.savez(tmp_path, _meta=meta, **features)
+        tmp_path.replace(store_path)
+    except OSError:
+        pass
+
+
+def load_features(
+    csv_paths: List[str],
+    refresh: bool = False,
+    workers: Optional[int] = None
+) -> Dict[Path, Dict[str, np.ndarray]]:
+    """
+    Get the feature arrays of benchmark files, decoding only changed files.
+
+    Args:
+        csv_paths: Paths to benchmark CSV files
+        refresh: Decode every file regardless of the store
+        workers: Worker processes for decoding (default: CPU count; 1 = in-process)
+
+    Returns:
+        Ordered dictionary path -> feature arrays (see extract_features)
+    """
+    paths = [Path(p) for p in csv_paths]
+    features = OrderedDict((path, None if refresh else _read_store(path)) for path in paths)
+    stale = [path for path, arrays in features.items() if arrays is None]
+
+    workers = workers or os.cpu_count() or 1
+    stale_bytes = sum(path.stat().st_size for path in stale)
+    # ~1 KB per row is a conservative lower bound for rows with spec JSON
+    parallel = workers > 1 and stale_bytes > PARALLEL_MIN_ROWS * 1024
+
+    executor = ProcessPoolExecutor(max_workers=workers) if parallel else None
+    try:
+        for path in stale:
+            features[path] = extract_features(path, executor)
+            _write_store(path, features[path])
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return features
+
+
+def feature_frame(
+    csv_paths: List[str],
+    refresh: bool = False,
+    workers: Optional[int] = None
+) -> pd.DataFrame:
+    """
+    Benchmark rows joined with their spec and result features.
+
+    Args:
+        csv_paths: Paths to benchmark CSV files
+        refresh: Decode every file regardless of the store
+        workers: Worker processes for decoding
+
+    Returns:
+        DataFrame with file, size, scenario, iteration, time_ms, status,
+        spec_hash and every feature column, one row per CSV row
+    """
+    frames = []
+    for path, features in load_features(csv_paths, refresh, workers).items():
+        rows = pd.read_csv(path, usecols=BENCHMARK_COLUMNS)
+        if len(rows) != len(features['iteration']) or not np.array_equal(rows['iteration'], features['iteration']):
+            raise ValueError(f"{path.name}: feature store does not match the file, rerun with refresh")
+
+        frame = rows.assign(**{key: values for key, values in features.items() if key != 'iteration'})
+        frame.insert(0, 'file', path.name)
+        frames.append(frame)
+
+    df = pd.concat(frames, ignore_index=True)
+    df['file'] = pd.Categorical(df['file'])
+    return df
@@ -0,0 +1,325 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Latency Histograms
+
+This module provides a compact, mergeable summary of a benchmark file's solve
+times: an HDR-style log-linear histogram of SUCCESS times in microseconds,
+plus exact status counts, count, sum, min and max.
+
+Buckets have a relative width of at most 10^-digits (digits = significant
+decimal digits), so any percentile of the summary is within that relative
+error of the exact value. Summaries of different files, shards or hosts are
+merged by adding bucket counts, which gives percentiles of the union without
+shipping or concatenating raw rows.
+
+Summaries are persisted as JSON in <benchmark dir>/.benchmark_cache/hdr/ and
+rebuilt only when the CSV's size or modification time changes.
+"""
+
+import csv
+import json
+import socket
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from benchmark_catalog import CACHE_DIR, resolve_file
+
+
+HDR_DIR = 'hdr'
+HDR_VERSION = 1
+DEFAULT_DIGITS = 3
+
+# Rows buffered before they are recorded while a CSV is streamed
+CHUNK_ROWS = 65536
+
+
+class LatencyHistogram:
+    """
+    Log-linear latency histogram with a fixed number of significant digits.
+
+    Values are recorded as integer microseconds. Values below the sub-bucket
+    count are stored exactly; above it each power of two is split into
+    `half` linear sub-buckets.
+    """
+
+    def __init__(self, digits: int = DEFAULT_DIGITS):
+        """
+        Create an empty histogram.
+
+        Args:
+            digits: Significant decimal digits kept (1-5)
+        """
+        if not 1 <= digits <= 5:
+            raise ValueError("digits must be between 1 and 5")
+
+        self.digits = digits
+        self.sub_bucket_bits = int(np.ceil(np.log2(2 * 10**digits)))
+        self.half = 1 << (self.sub_bucket_bits - 1)
+        self.counts: Dict[int, int] = {}
+        self.status_counts: Dict[str, int] = {}
+        self.total = 0
+        self.sum_us = 0
+        self.min_us: Optional[int] = None
+        self.max_us: Optional[int] = None
+        self.sources: List[Dict] = []
+
+    def _index(self, values: np.ndarray) -> np.ndarray:
+        """Bucket index of each value (int64 microseconds)."""
+        bit_length = np.frexp(values.astype(float))[1]
+        shift = np.maximum(bit_length - self.sub_bucket_bits, 0)
+        return shift * self.half + (values >> shift)
+
+    def _bounds(self, index: np.ndarray):
+        """Lowest and highest value (microseconds) of each bucket."""
+        index = np.asarray(index, dtype=np.int64)
+        shift = np.maximum(index // self.half - 1, 0)
+        sub = index - shift * self.half
+        return sub << shift, ((sub + 1) << shift) - 1
+
+    def record(self, times_ms: Sequence[float]):
+        """
+        Record successful solve times.
+
+        Args:
+            times_ms: Solve times in milliseconds
+        """
+        values = np.rint(np.asarray(times_ms, dtype=float) * 1000).astype(np.int64)
+        values = np.maximum(values, 0)
+        if values.size == 0:
+            return
+
+        indices, counts = np.unique(self._index(values), return_counts=True)
+        for index, count in zip(indices.tolist(), counts.tolist()):
+            self.counts[index] = self.counts.get(index, 0) + count
+
+        self.total += int(values.size)
+        self.sum_us += int(values.sum())
+        low, high = int(values.min()), int(values.max())
+        self.min_us = low if self.min_us is None else min(self.min_us, low)
+        self.max_us = high if self.max_us is None else max(self.max_us, high)
+
+    def add_statuses(self, statuses: Iterable[str]):
+        """Count run statuses (all rows, not only recorded times)."""
+        for status in statuses:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def merge(self, other: 'LatencyHistogram') -> 'LatencyHistogram':
+        """
+        Add another histogram's counts into this one.
+
+        Args:
+            other: Histogram with the same number of significant digits
+
+        Returns:
+            self
+        """
+        if other.digits != self.digits:
+            raise ValueError(f"Cannot merge histograms with {other.digits} and {self.digits} digits")
+
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        for status, count in other.status_counts.items():
+            self.status_counts[status] = self.status_counts.get(status, 0) + count
+
+        self.total += other.total
+        self.sum_us += other.sum_us
+        if other.min_us is not None:
+            self.min_us = other.min_us if self.min_us is None else min(self.min_us, other.min_us)
+            self.max_us = other.max_us if self.max_us is None else max(self.max_us, other.max_us)
+        self.sources.extend(other.sources)
+        return self
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Value (ms) at a percentile of the recorded times.
+
+        Returns the highest value equivalent to the bucket holding the
+        percentile (capped at the recorded maximum), or None if empty.
+        """
+        return self.percentiles([q])[0]
+
+    def percentiles(self, qs: Sequence[float]) -> List[Optional[float]]:
+        """Vectorized percentile() over several percentiles (0-100)."""
+        if self.total == 0:
+            return [None for _ in qs]
+
+        indices = np.array(sorted(self.counts), dtype=np.int64)
+        cumulative = np.cumsum([self.counts[i] for i in indices.tolist()])
+        ranks = np.maximum(np.ceil(np.asarray(qs, dtype=float) / 100 * self.total), 1)
+        positions = np.searchsorted(cumulative, ranks)
+        _, upper = self._bounds(indices[np.minimum(positions, len(indices) - 1)])
+
+        return [min(int(u), self.max_us) / 1000 for u in upper]
+
+    def summary(self, qs: Sequence[float] = (50, 90, 95, 99, 99.9)) -> Dict:
+        """Count, mean, min/max, status rates and percentiles as a dictionary."""
+        runs = sum(self.status_counts.values())
+        stats = {
+            'count': self.total,
+            'total_runs': runs,
+            'time_mean': self.sum_us / self.total / 1000 if self.total else None,
+            'time_min': self.min_us / 1000 if self.min_us is not None else None,
+            'time_max': self.max_us / 1000 if self.max_us is not None else None,
+        }
+        for q, value in zip(qs, self.percentiles(qs)):
+            stats[f"time_p{q:g}".replace('.', '_')] = value
+        for status in ('SUCCESS', 'TIMEOUT', 'FAILED', 'INFEASIBLE'):
+            stats[f'{status.lower()}_rate'] = self.status_counts.get(status, 0) / runs if runs else 0.0
+        return stats
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable representation (sparse bucket counts)."""
+        indices = sorted(self.counts)
+        return {
+            'version': HDR_VERSION,
+            'digits': self.digits,
+            'unit': 'us',
+            'total': self.total,
+            'sum': self.sum_us,
+            'min': self.min_us,
+            'max': self.max_us,
+            'status_counts': dict(sorted(self.status_counts.items())),
+            'sources': self.sources,
+            'indices': indices,
+            'counts': [self.counts[i] for i in indices],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LatencyHistogram':
+        """Rebuild a histogram from to_dict() output."""
+        if data.get('version') != HDR_VERSION:
+            raise ValueError(f"Unsupported histogram version: {data.get('version')}")
+
+        hist = cls(data['digits'])
+        hist.counts = dict(zip(data['indices'], data['counts']))
+        hist.status_counts = dict(data['status_counts'])
+        hist.total = data['total']
+        hist.sum_us = data['sum']
+        hist.min_us = data['min']
+        hist.max_us = data['max']
+        hist.sources = list(data.get('sources', []))
+        return hist
+
+    def save(self, path: str):
+        """Write the histogram as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+
+    @classmethod
+    def load(cls, path: str) -> 'LatencyHistogram':
+        """Read a histogram written by save()."""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def histogram_from_csv(csv_path: str, digits: int = DEFAULT_DIGITS) -> LatencyHistogram:
+    """
+    Build a histogram from a benchmark CSV in one streamed pass.
+
+    Rows are parsed with the csv module (quoted multi-line error fields are
+    one row) and recorded every CHUNK_ROWS rows, so memory does not grow
+    with the file. Rows without a status or time (a half-written last line)
+    are skipped.
+
+    Args:
+        csv_path: Path to a benchmark CSV file
+        digits: Significant decimal digits
+
+    Returns:
+        LatencyHistogram of SUCCESS times with status counts and provenance
+    """
+    path = Path(csv_path)
+    hist = LatencyHistogram(digits)
+    rows = 0
+
+    with open(path, newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        if 'time_ms' in header and 'status' in header:
+            time_col, status_col = header.index('time_ms'), header.index('status')
+            times, statuses = [], []
+            for row in reader:
+                try:
+                    status, time_ms = row[status_col], float(row[time_col])
+                except (IndexError, ValueError):
+                    continue
+                if not status:
+                    continue
+                statuses.append(status)
+                if status == 'SUCCESS':
+                    times.append(time_ms)
+                if len(statuses) >= CHUNK_ROWS:
+                    hist.record(times)
+                    hist.add_statuses(statuses)
+                    rows += len(statuses)
+                    times, statuses = [], []
+            hist.record(times)
+            hist.add_statuses(statuses)
+            rows += len(statuses)
+
+    stat = path.stat()
+    entry = resolve_file(path) if rows else {'scenario': None, 'size': None}
+    hist.sources = [{
+        'file': path.name,
+        'scenario': entry['scenario'],
+        'size': entry['size'],
+        'host': socket.gethostname(),
+        'bytes': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+    }]
+    return hist
+
+
+def load_histogram(csv_path: str, digits: int = DEFAULT_DIGITS, refresh: bool = False) -> LatencyHistogram:
+    """
+    Get a file's histogram from the cache, rebuilding it if the file changed.
+
+    Args:
+        csv_path: Path to a benchmark CSV file
+        digits: Significant decimal digits
+        refresh: Rebuild regardless of the cache
+
+    Returns:
+        LatencyHistogram of the file
+    """
+    path = Path(csv_path)
+    cache_path = path.parent / CACHE_DIR / HDR_DIR / f'{path.stem}.d{digits}.json'
+    stat = path.stat()
+
+    if not refresh:
+        try:
+            hist = LatencyHistogram.load(cache_path)
+            source = hist.sources[0]
+            if source['bytes'] == stat.st_size and source['mtime_ns'] == stat.st_mtime_ns:
+                return hist
+        except (OSError, ValueError, KeyError, IndexError):
+            pass
+
+    hist = histogram_from_csv(path, digits)
+    # The cache is optional: read-only benchmark directories just rebuild every time
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        hist.save(cache_path)
+    except OSError:
+        pass
+    return hist
+
+
+def merge_histograms(histograms: Iterable[LatencyHistogram]) -> LatencyHistogram:
+    """
+    Merge histograms of files, shards or hosts into one.
+
+    Returns:
+        New LatencyHistogram with the combined counts and sources
+    """
+    histograms = list(histograms)
+    if not histograms:
+        raise ValueError("No histograms to merge")
+
+    merged = LatencyHistogram(histograms[0].digits)
+    for hist in histograms:
+        merged.merge(hist)
+    return merged
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Matrix Aggregation
+
+This module computes every statistic of BenchmarkAnalyzer.compute_stats for
+every (scenario, size) cell of a benchmark corpus in one grouped pass over the
+concatenated rows, instead of building one analyzer per file and slicing the
+corpus again per scenario and per size.
+
+The result is a tidy table (one row per cell, one column per metric) that can
+be exported directly or pivoted into size x scenario heatmaps.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import List, Optional, Sequence
+
+from benchmark_survival import km_percentiles
+
+
+STATUSES = ['SUCCESS', 'TIMEOUT', 'FAILED', 'INFEASIBLE']
+
+QUANTILES = {'time_p25': 0.25, 'time_p50': 0.50, 'time_p75': 0.75,
+             'time_p90': 0.90, 'time_p95': 0.95, 'time_p99': 0.99}
+
+# Metrics rendered as heatmaps: column -> (title, is a time in ms)
+HEATMAP_METRICS = {
+    'time_p50': ('P50 (ms)', True),
+    'time_p95': ('P95 (ms)', True),
+    'time_p99': ('P99 (ms)', True),
+    'timeout_rate': ('Timeout rate', False),
+    'time_cv': ('CV', False),
+}
+
+
+def aggregate_stats(
+    df: pd.DataFrame,
+    by: Sequence[str] = ('scenario', 'size'),
+    timeout_ms: Optional[float] = None
+) -> pd.DataFrame:
+    """
+    Compute compute_stats() metrics for every group in one grouped pass.
+
+    Args:
+        df: Concatenated benchmark rows
+        by: Grouping columns
+        timeout_ms: Censoring point for the Kaplan-Meier percentiles
+
+    Returns:
+        DataFrame with the grouping columns followed by one column per metric
+        (same names and semantics as BenchmarkAnalyzer.compute_stats)
+    """
+    by = list(by)
+    groups = df.groupby(by, observed=True, sort=True)
+
+    # Status counts and rates over all runs
+    counts = (df.groupby(by + ['status'], observed=True).size()
+              .unstack('status', fill_value=0)
+              .reindex(columns=STATUSES, fill_value=0))
+    total = counts.sum(axis=1)
+
+    # Time statistics over successful runs only
+    successful = df[df['status'] == 'SUCCESS']
+    keys = [successful[col] for col in by]
+    times = successful['time_ms'].groupby(keys, observed=True)
+
+    stats = times.agg(['mean', 'median', 'std', 'min', 'max'])
+    stats.columns = ['time_mean', 'time_median', 'time_std', 'time_min', 'time_max']
+    quantiles = times.quantile(list(QUANTILES.values())).unstack(-1)
+    quantiles.columns = list(QUANTILES.keys())
+
+    # Biased central moments (same as scipy.stats.skew / kurtosis defaults)
+    centered = successful['time_ms'] - times.transform('mean')
+    m2 = (centered**2).groupby(keys, observed=True).mean()
+    m3 = (centered**3).groupby(keys, observed=True).mean()
+    m4 = (centered**4).groupby(keys, observed=True).mean()
+
+    result = pd.DataFrame(index=counts.index)
+    result = result.join(stats).join(quantiles)
+
+    for status in STATUSES:
+        result[f'{status.lower()}_rate'] = counts[status] / total
+    result['total_runs'] = total
+    for status in STATUSES:
+        result[f'{status.lower()}_count'] = counts[status]
+
+    result['time_cv'] = np.where(result['time_mean'] > 0, result['time_std'] / result['time_mean'], 0.0)
+    result['time_iqr'] = result['time_p75'] - result['time_p25']
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result['time_skewness'] = m3 / m2**1.5
+        result['time_kurtosis'] = m4 / m2**2 - 3.0
+
+    # Censoring-aware percentiles need a sorted pass per group
+    km = pd.DataFrame.from_dict(
+        {key: km_percentiles(group, timeout_ms) for key, group in groups},
+        orient='index'
+    )
+    km.index = result.index
+    result = result.join(km.astype(object).where(km.notna(), None))
+
+    if 'file' in df.columns:
+        result['file'] = groups['file'].agg(lambda files: ', '.join(sorted(set(files))))
+
+    return result.reset_index()
+
+
+def matrix_pivot(matrix: pd.DataFrame, metric: str) -> pd.DataFrame:
+    """Pivot one metric of the tidy matrix into sizes (rows) x scenarios (columns)."""
+    table = matrix.pivot(index='size', columns='scenario', values=metric).sort_index()
+    table.columns = table.columns.astype(str)
+    table.columns.name = None
+    return table
+
+
+def plot_matrix_heatmaps(
+    matrix: pd.DataFrame,
+    metrics: Optional[List[str]] = None,
+    save_path: Optional[str] = None,
+    show: bool = True
+):
+    """
+    Plot annotated size x scenario heatmaps, one panel per metric.
+
+    Time metrics use a logarithmic color scale so that fast and slow cells
+    stay distinguishable; rates are annotated as percentages.
+
+    Args:
+        matrix: Tidy matrix from aggregate_stats
+        metrics: Columns to plot (default: HEATMAP_METRICS)
+        save_path: Path to save figure (optional)
+        show: Whether to display the plot
+    """
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from matplotlib.colors import LogNorm
+
+    metrics = metrics or list(HEATMAP_METRICS)
+    cols = min(len(metrics), 3)
+    rows = int(np.ceil(len(metrics) / cols))
+    n_sizes = matrix['size'].nunique()
+    n_scenarios = matrix['scenario'].nunique()
+
+    fig, axes = plt.subplots(rows, cols, figsize=(cols * (2 + 1.3 * n_scenarios), rows * (1.5 + 0.5 * n_sizes)),
+                             squeeze=False)
+
+    for ax, metric in zip(axes.flat, metrics):
+        title, is_time = HEATMAP_METRICS.get(metric, (metric, metric.startswith('time_')))
+        table = matrix_pivot(matrix, metric)
+
+        if metric.endswith('_rate'):
+            annot = table.apply(lambda col: col.map(lambda v: '' if pd.isna(v) else f'{v * 100:.1f}%'))
+            sns.heatmap(table, ax=ax, annot=annot, fmt='', cmap='Reds', vmin=0)
+        elif is_time:
+            positive = table.where(table > 0)
+            norm = LogNorm(vmin=positive.min().min(), vmax=positive.max().max()) if positive.notna().any().any() else None
+            sns.heatmap(positive, ax=ax, annot=table, fmt='.0f', cmap='viridis', norm=norm)
+        else:
+            sns.heatmap(table, ax=ax, annot=True, fmt='.2f', cmap='magma_r')
+
+        ax.set_title(title, fontweight='bold')
+        ax.set_xlabel('Scenario', fontsize=11)
+        ax.set_ylabel('Problem Size (NxN)', fontsize=11)
+
+    for ax in list(axes.flat)[len(metrics):]:
+        ax.axis('off')
+
+    plt.suptitle('GLPK Benchmark Matrix (size x scenario)', fontsize=14, fontweight='bold', y=1.00)
+    plt.tight_layout()
+
+    if save_path:
+        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+
+    if show:
+        plt.show()
+    else:
+        plt.close()
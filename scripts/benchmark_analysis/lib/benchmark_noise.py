@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Measurement Noise Analysis
+
+Generators sometimes produce the same lottery spec more than once (always
+for the identical and opposite scenarios, by chance at small sizes). Runs of
+the same spec differ only by measurement noise, so the spec-hash index of all
+benchmark files yields a free noise estimate.
+
+Per size, log(time_ms) of solved runs is split with a one-way random-effects
+ANOVA into:
+
+  - within-spec variance (repeats of the same instance: measurement noise)
+  - between-spec variance (different instances: instance difficulty)
+
+The noise floor of a size is the within-spec spread: its CV and the time
+ratio that 95% of repeat pairs stay within (exp(1.96 * sqrt(2) * sd_within)).
+diff_benchmarks() and the outlier detection use it so that changes smaller
+than run-to-run noise are not reported.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+
+from benchmark_dataset import BenchmarkDataset
+from benchmark_series import effective_sample_size
+
+
+Z_95 = 1.959964
+
+
+def spec_index(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per distinct spec across benchmark files.
+
+    Args:
+        df: Output of benchmark_features.feature_frame() (needs file, size,
+            scenario, iteration, time_ms, status and spec_hash)
+
+    Returns:
+        DataFrame sorted by run count with spec_hash, size, runs, solved,
+        files, scenarios, first file and iteration, median/min/max time and
+        log-time standard deviation of the solved repeats
+    """
+    df = df.assign(log_time=np.log(df['time_ms'].clip(lower=1e-6)))
+    solved = df['status'] == 'SUCCESS'
+
+    index = df.groupby('spec_hash', sort=False).agg(
+        size=('size', 'first'),
+        runs=('iteration', 'size'),
+        files=('file', 'nunique'),
+        scenarios=('scenario', lambda s: ','.join(sorted(map(str, s.unique())))),
+        first_file=('file', 'first'),
+        first_iteration=('iteration', 'first'),
+    )
+    times = df[solved].groupby('spec_hash', sort=False).agg(
+        solved=('time_ms', 'size'),
+        time_median=('time_ms', 'median'),
+        time_min=('time_ms', 'min'),
+        time_max=('time_ms', 'max'),
+        log_sd=('log_time', 'std'),
+    )
+    index = index.join(times)
+    index['solved'] = index['solved'].fillna(0).astype(int)
+    return index.reset_index().sort_values(['runs', 'spec_hash'], ascending=[False, True]).reset_index(drop=True)
+
+
+def duplicate_specs(index: pd.DataFrame) -> pd.DataFrame:
+    """Specs of spec_index() that ran more than once."""
+    return index[index['runs'] > 1].reset_index(drop=True)
+
+
+def _components(log_time: np.ndarray, groups: np.ndarray) -> Dict:
+    """One-way random-effects ANOVA of log time by spec."""
+    codes, counts = np.unique(groups, return_inverse=True, return_counts=True)[1:]
+    k, n = len(counts), len(log_time)
+    means = np.bincount(codes, weights=log_time) / counts
+    ss_within = float(np.sum((log_time - means[codes]) ** 2))
+    df_within = n - k
+
+    result = {
+        'specs': int(k),
+        'repeated_specs': int(np.sum(counts > 1)),
+        'repeat_runs': int(counts[counts > 1].sum()),
+        'sd_within': None, 'sd_between': None, 'icc': None,
+        'noise_cv': None, 'noise_ratio': None,
+    }
+    if df_within < 1:
+        return result
+
+    ms_within = ss_within / df_within
+    sd_within = float(np.sqrt(ms_within))
+    result.update({
+        'sd_within': sd_within,
+        'noise_cv': float(np.sqrt(np.expm1(ms_within))),
+        'noise_ratio': float(np.exp(Z_95 * np.sqrt(2) * sd_within)),
+    })
+    if k > 1:
+        ms_between = float(np.sum(counts * (means - log_time.mean()) ** 2)) / (k - 1)
+        n0 = (n - np.sum(counts ** 2) / n) / (k - 1)
+        var_between = max((ms_between - ms_within) / n0, 0.0)
+        result['sd_between'] = float(np.sqrt(var_between))
+        total = var_between + ms_within
+        result['icc'] = float(var_between / total) if total > 0 else None
+    return result
+
+
+def noise_floor(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Measurement noise per size from repeats of identical specs.
+
+    Args:
+        df: Output of benchmark_features.feature_frame()
+
+    Returns:
+        DataFrame with one row per size: solved runs, specs, repeated specs
+        and their runs, sd of log time within specs (noise) and between
+        specs (instances), intra-class correlation (share of variance due to
+        the instance), noise CV and the 95% repeat time ratio. Sizes without
+        repeats have no noise estimate (None).
+    """
+    solved = df[(df['status'] == 'SUCCESS') & (df['time_ms'] > 0)]
+    rows = []
+    for size, group in solved.groupby('size', sort=True):
+        row = {'size': int(size), 'runs': len(group)}
+        row.update(_components(np.log(group['time_ms'].to_numpy(dtype=float)), group['spec_hash'].to_numpy()))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def noise_ratio_for(floor: pd.DataFrame, size: int) -> Optional[float]:
+    """
+    95% repeat time ratio for a size.
+
+    Uses the nearest size with a noise estimate when the size itself has no
+    repeats (the log-time noise varies little with size).
+
+    Returns:
+        Ratio (>= 1), or None if no size has repeats
+    """
+    known = floor.dropna(subset=['noise_ratio'])
+    if known.empty:
+        return None
+    nearest = (known['size'] - size).abs().idxmin()
+    return float(known.loc[nearest, 'noise_ratio'])
+
+
+def load_noise_floor(csv_paths: List[str], workers: Optional[int] = None) -> pd.DataFrame:
+    """Noise floor of benchmark files (spec hashes come from the feature store)."""
+    from benchmark_features import feature_frame
+
+    return noise_floor(feature_frame(csv_paths, workers=workers))
+
+
+def _log_times(rows: pd.DataFrame) -> pd.Series:
+    """log(time_ms) of solved runs in iteration order."""
+    solved = rows[(rows['status'] == 'SUCCESS') & (rows['time_ms'] > 0)].sort_values('iteration', kind='stable')
+    return np.log(solved['time_ms'].astype(float)).reset_index(drop=True)
+
+
+def diff_benchmarks(
+    base_paths: List[str],
+    new_paths: List[str],
+    floor: Optional[pd.DataFrame] = None,
+    merge_policy: str = 'first'
+) -> pd.DataFrame:
+    """
+    Compare two sets of benchmark files cell by cell.
+
+    The change of a cell is the ratio of geometric mean solve times (new /
+    base). It counts as a change only if it is statistically significant
+    (outside 1.96 standard errors of the log-mean difference, with effective
+    sample sizes so autocorrelated runs do not overstate precision) and
+    larger than the noise floor of the size (the one-run repeat sd of log
+    time).
+
+    Args:
+        base_paths: Baseline benchmark files
+        new_paths: Benchmark files to compare with the baseline
+        floor: Output of noise_floor() (default: no noise floor)
+        merge_policy: How shards and retry files are merged per cell
+
+    Returns:
+        DataFrame per (scenario, size) present in both sets: runs, effective
+        sample sizes, median times, timeout rates, time ratio, significance
+        band, noise band and verdict ('slower', 'faster' or 'noise')
+    """
+    sides = {}
+    for name, paths in (('base', base_paths), ('new', new_paths)):
+        df = BenchmarkDataset(paths, merge_policy=merge_policy).df
+        sides[name] = {key: group for key, group in df.groupby(['scenario', 'size'], observed=True)}
+
+    rows = []
+    for key in sorted(set(sides['base']) & set(sides['new'])):
+        scenario, size = key
+        base, new = sides['base'][key], sides['new'][key]
+        base_times, new_times = _log_times(base), _log_times(new)
+
+        row = {
+            'scenario': scenario, 'size': int(size),
+            'base_runs': len(base), 'new_runs': len(new),
+            'base_median': float(np.exp(base_times.median())) if len(base_times) else None,
+            'new_median': float(np.exp(new_times.median())) if len(new_times) else None,
+            'base_timeout_rate': float((base['status'] == 'TIMEOUT').mean()),
+            'new_timeout_rate': float((new['status'] == 'TIMEOUT').mean()),
+            'base_ess': effective_sample_size(base_times) if len(base_times) else 0.0,
+            'new_ess': effective_sample_size(new_times) if len(new_times) else 0.0,
+            'ratio': None, 'significance_ratio': None, 'noise_ratio': None, 'verdict': 'n/a',
+        }
+        if len(base_times) > 1 and len(new_times) > 1:
+            change = float(new_times.mean() - base_times.mean())
+            # Correlated consecutive runs carry less information than their count
+            se = float(np.sqrt(base_times.var() / effective_sample_size(base_times)
+                               + new_times.var() / effective_sample_size(new_times)))
+            sd_within = None
+            if floor is not None:
+                ratio = noise_ratio_for(floor, int(size))
+                sd_within = np.log(ratio) / (Z_95 * np.sqrt(2)) if ratio else None
+
+            row['ratio'] = float(np.exp(change))
+            row['significance_ratio'] = float(np.exp(Z_95 * se))
+            row['noise_ratio'] = float(np.exp(sd_within)) if sd_within is not None else None
+            band = max(Z_95 * se, sd_within or 0.0)
+            row['verdict'] = 'noise' if abs(change) <= band else ('slower' if change > 0 else 'faster')
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Outlier Detection
+
+Solve times are heavy-tailed, so mean/sd and even IQR fences computed on raw
+milliseconds flag most of the slow tail. Methods, each giving a signed score
+per solved run (positive = slower than expected):
+
+  - iqr:     distance beyond the quartiles in IQR units (Tukey fences)
+  - zscore:  (x - mean) / sd
+  - mad:     robust z, 0.6745 * (x - median) / MAD (Iglewicz-Hoaglin)
+  - rolling: robust z of the residual from a centered sliding-window median
+             along iteration, so a run is judged against its neighbours
+             (drift, warm-up and slow phases are not outliers)
+
+Every method can run on log(time_ms), where the solve times are roughly
+symmetric and a 'k times slower' run scores the same at any size.
+
+With a grouping (e.g. scenario and size) all statistics are computed in one
+grouped pass over the concatenated rows of many files.
+"""
+
+from typing import Dict, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+METHODS = ('iqr', 'zscore', 'mad', 'rolling')
+
+# Default |score| above which a run is an outlier
+DEFAULT_THRESHOLDS = {'iqr': 1.5, 'zscore': 3.0, 'mad': 3.5, 'rolling': 3.5}
+
+# Runs in the sliding window of the rolling detector
+DEFAULT_WINDOW = 51
+
+# MAD of a normal distribution in units of its sd (Phi^-1(0.75))
+MAD_SCALE = 0.6745
+
+# Mean absolute deviation of a normal distribution in units of its sd
+MEAN_AD_SCALE = 0.797885
+
+# Rows per sliding-window block (bounds the window view memory)
+CHUNK_ROWS = 65536
+
+
+def rolling_median(x: np.ndarray, window: int = DEFAULT_WINDOW) -> np.ndarray:
+    """
+    Centered sliding-window median.
+
+    The ends are padded by reflection so every point has a full window.
+
+    Args:
+        x: Series in iteration order
+        window: Window length (made odd, capped at the series length)
+
+    Returns:
+        Array of the same length as x
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    window = min(window | 1, n if n % 2 else n - 1)
+    if window < 3:
+        return np.full(n, np.median(x) if n else np.nan)
+
+    half = window // 2
+    padded = np.pad(x, half, mode='reflect')
+    result = np.empty(n)
+    for start in range(0, n, CHUNK_ROWS):
+        stop = min(start + CHUNK_ROWS, n)
+        result[start:stop] = np.median(sliding_window_view(padded[start:stop + 2 * half], window), axis=1)
+    return result
+
+
+def _robust_scale(deviation: pd.Series, codes: np.ndarray) -> np.ndarray:
+    """Per-group sd estimate from the MAD (mean absolute deviation if MAD is 0)."""
+    grouped = deviation.abs().groupby(codes)
+    scale = grouped.transform('median').to_numpy() / MAD_SCALE
+    fallback = grouped.transform('mean').to_numpy() / MEAN_AD_SCALE
+    return np.where(scale > 0, scale, fallback)
+
+
+def _ratio(numerator: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """numerator / scale, 0 where the scale is 0 and the numerator too."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        score = numerator / scale
+    return np.where(numerator == 0, 0.0, score)
+
+
+def outlier_scores(
+    df: pd.DataFrame,
+    method: str = 'iqr',
+    log_space: bool = False,
+    window: int = DEFAULT_WINDOW,
+    by: Optional[Sequence[str]] = None
+) -> pd.DataFrame:
+    """
+    Score the solved runs of benchmark rows.
+
+    Args:
+        df: Benchmark rows (iteration, status, time_ms and the by columns)
+        method: One of METHODS
+        log_space: Score log(time_ms) instead of time_ms
+        window: Sliding-window length for the rolling method
+        by: Columns grouping runs that are compared with each other (e.g.
+            ['scenario', 'size']); default: all rows form one group
+
+    Returns:
+        Solved rows in iteration order (per group) with outlier_score and
+        expected_ms (the center the score is measured from)
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method: {method}")
+
+    solved = df[df['status'] == 'SUCCESS']
+    if log_space:
+        solved = solved[solved['time_ms'] > 0]
+    keys = list(by or [])
+    solved = solved.sort_values(keys + ['iteration'], kind='stable')
+    codes = (solved.groupby(keys, sort=False, observed=True).ngroup().to_numpy()
+             if keys else np.zeros(len(solved), dtype=int))
+
+    values = solved['time_ms'].astype(float)
+    if log_space:
+        values = np.log(values)
+    values = values.reset_index(drop=True)
+    grouped = values.groupby(codes)
+
+    if method == 'iqr':
+        q1 = grouped.transform('quantile', 0.25).to_numpy()
+        q3 = grouped.transform('quantile', 0.75).to_numpy()
+        x = values.to_numpy()
+        beyond = np.where(x > q3, x - q3, np.where(x < q1, x - q1, 0.0))
+        score = _ratio(beyond, q3 - q1)
+        center = grouped.transform('median').to_numpy()
+    elif method == 'zscore':
+        center = grouped.transform('mean').to_numpy()
+        score = _ratio(values.to_numpy() - center, grouped.transform('std', ddof=0).to_numpy())
+    elif method == 'mad':
+        center = grouped.transform('median').to_numpy()
+        deviation = values - center
+        score = _ratio(deviation.to_numpy(), _robust_scale(deviation, codes))
+    else:
+        center = np.empty(len(values))
+        x = values.to_numpy()
+        for code in np.unique(codes):
+            rows = codes == code
+            center[rows] = rolling_median(x[rows], window)
+        residual = values - center
+        score = _ratio(residual.to_numpy(), _robust_scale(residual, codes))
+
+    return solved.assign(
+        outlier_score=score,
+        expected_ms=np.exp(center) if log_space else center,
+    )
+
+
+def detect_outliers(
+    df: pd.DataFrame,
+    method: str = 'iqr',
+    threshold: Optional[float] = None,
+    log_space: bool = False,
+    window: int = DEFAULT_WINDOW,
+    by: Optional[Sequence[str]] = None,
+    noise_ratio: Optional[Union[float, Dict[int, float]]] = None
+) -> pd.DataFrame:
+    """
+    Outlier runs of benchmark rows.
+
+    Args:
+        df: Benchmark rows
+        method: One of METHODS
+        threshold: |score| above which a run is an outlier (default:
+            DEFAULT_THRESHOLDS of the method)
+        log_space: Detect on log(time_ms)
+        window: Sliding-window length for the rolling method
+        by: Grouping columns (see outlier_scores)
+        noise_ratio: Measurement noise floor as a time ratio, or per size;
+            runs within expected / ratio and expected * ratio are never
+            outliers
+
+    Returns:
+        Outlier rows with outlier_score and expected_ms, slowest first
+    """
+    threshold = DEFAULT_THRESHOLDS[method] if threshold is None else threshold
+    scored = outlier_scores(df, method, log_space, window, by)
+    outliers = scored[np.abs(scored['outlier_score']) > threshold]
+
+    if noise_ratio is not None:
+        ratio = (outliers['size'].map(noise_ratio).astype(float).fillna(1.0)
+                 if isinstance(noise_ratio, dict) else noise_ratio)
+        expected = outliers['expected_ms']
+        outliers = outliers[(outliers['time_ms'] > expected * ratio) | (outliers['time_ms'] < expected / ratio)]
+
+    return outliers.sort_values('time_ms', ascending=False)
+
+
+def method_agreement(
+    df: pd.DataFrame,
+    methods: Sequence[str] = METHODS,
+    thresholds: Optional[Dict[str, float]] = None,
+    log_space: bool = False,
+    window: int = DEFAULT_WINDOW,
+    by: Optional[Sequence[str]] = None
+) -> Dict:
+    """
+    Compare the runs flagged by several methods.
+
+    Args:
+        df: Benchmark rows
+        methods: Methods to compare
+        thresholds: Per-method thresholds (default: DEFAULT_THRESHOLDS)
+        log_space: Detect on log(time_ms)
+        window: Sliding-window length for the rolling method
+        by: Grouping columns (see outlier_scores)
+
+    Returns:
+        Dictionary with flags (solved rows x methods, boolean), counts per
+        method, jaccard (method x method overlap of the flagged sets: shared
+        / either, 1 if both are empty), and the number of runs flagged by
+        any, a majority and all of the methods
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    flags = None
+    for method in methods:
+        scored = outlier_scores(df, method, log_space, window, by)
+        flagged = np.abs(scored['outlier_score']) > thresholds[method]
+        if flags is None:
+            flags = pd.DataFrame(index=scored.index)
+        flags[method] = flagged.reindex(flags.index, fill_value=False)
+
+    matrix = flags.to_numpy()
+    shared = matrix.T.astype(int) @ matrix.astype(int)
+    counts = np.diag(shared)
+    either = counts[:, None] + counts[None, :] - shared
+    with np.errstate(divide='ignore', invalid='ignore'):
+        jaccard = np.where(either > 0, shared / either, 1.0)
+
+    votes = matrix.sum(axis=1)
+    return {
+        'flags': flags,
+        'counts': dict(zip(methods, counts.tolist())),
+        'jaccard': pd.DataFrame(jaccard, index=list(methods), columns=list(methods)),
+        'any': int(np.sum(votes > 0)),
+        'majority': int(np.sum(votes > len(methods) / 2)),
+        'all': int(np.sum(votes == len(methods))),
+    }
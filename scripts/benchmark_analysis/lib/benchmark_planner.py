@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Scaling Experiment Planner
+
+Chooses the next benchmarks to run so that the scaling prediction at a
+target size gets as precise as possible for the compute spent.
+
+The selected scaling model of a metric (see benchmark_scaling) is a least
+squares fit on one point per benchmarked size. Each point is uncertain for
+two reasons:
+
+  - model misfit: the residual variance of the fit, not reduced by more
+    iterations
+  - sampling: the per-size metric comes from r solved runs; on the log
+    scale Var(log quantile) = q (1 - q) s^2 / (r phi(z_q)^2) for log times
+    with sd s (log-normal approximation)
+
+With these as weights, the variance of the predicted metric at the target
+size is x*' A^-1 x*, A = sum of x x' / v over the sizes. A candidate
+benchmark (scenario, size, iterations) either adds a size or lowers the
+sampling variance of an existing one; its value is the reduction of that
+variance (relative to the predicted value) and its cost the expected wall
+time of its runs (predicted mean time capped at the timeout, plus a per-run
+overhead). Candidates are picked greedily by reduction per second until the
+budget is spent.
+
+The plan assumes the currently selected model stays the best one; re-plan
+after running it. Its commands continue the iteration numbers of the files
+already benchmarked at a size (--first-iteration), so the new shard's runs
+never share an iteration with existing ones.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from scipy import stats
+
+from benchmark_capacity import DEFAULT_SIZES
+from benchmark_catalog import load_index
+from benchmark_scaling import SCALING_MODELS, evaluate_model
+from benchmark_survival import infer_timeout_ms
+
+
+PLAN_METRICS = {'mean': None, 'median': 0.5, 'p95': 0.95, 'p99': 0.99}
+
+DEFAULT_ITERATIONS = (25, 50, 100, 200)
+
+# Seconds per run besides the solve (spec generation, model build, CSV write)
+DEFAULT_OVERHEAD_S = 1.0
+
+# Share of the residual variance always attributed to model misfit
+MIN_MISFIT_SHARE = 0.1
+
+
+def _sampling_factor(q: Optional[float]) -> float:
+    """Var(log metric) * runs / sd(log time)^2 for a log-normal sample."""
+    if q is None:
+        return 1.0
+    z = stats.norm.ppf(q)
+    return q * (1 - q) / stats.norm.pdf(z) ** 2
+
+
+def _model_state(comparer, scenario: str, metric: str) -> Dict:
+    """Fit, per-size data and variance components of one scenario."""
+    scaling = comparer.analyze_size_scaling(scenario)
+    if 'models' not in scaling:
+        raise ValueError(f"Need at least 3 sizes of '{scenario}' to plan experiments")
+
+    df = comparer.dataset(scenario=scenario).df
+    solved = df[(df['status'] == 'SUCCESS') & (df['time_ms'] > 0)]
+    per_size = solved.assign(log_time=np.log(solved['time_ms'].astype(float))).groupby('size', observed=True)
+    sizes = np.asarray(scaling['sizes'], dtype=float)
+    log_sd = per_size['log_time'].std().reindex(scaling['sizes']).fillna(0.0).to_numpy()
+    runs = per_size.size().reindex(scaling['sizes']).fillna(0).to_numpy(dtype=float)
+    success = np.asarray(scaling['success_rates'], dtype=float)
+
+    fit = scaling['models'][metric]['candidates'][0]
+    build, log_space = SCALING_MODELS[fit['model']]
+    factor = _sampling_factor(PLAN_METRICS[metric])
+
+    state = {
+        'scenario': scenario,
+        'fit': fit,
+        'build': build,
+        'log_space': log_space,
+        'factor': factor,
+        'sizes': sizes,
+        'benchmarked_sizes': sizes,
+        'log_sd': log_sd,
+        'success': success,
+        'runs': runs,
+        'mean_fit': scaling['models']['mean']['candidates'][0],
+        'timeout_ms': comparer.timeout_ms if comparer.timeout_ms is not None else infer_timeout_ms(df),
+    }
+    sampling = np.array([_sampling_variance(state, s, r) for s, r in zip(sizes, runs)])
+    state['misfit'] = max(fit['sigma'] ** 2 - float(sampling.mean()), MIN_MISFIT_SHARE * fit['sigma'] ** 2)
+    state['variances'] = state['misfit'] + sampling
+    return state
+
+
+def _interp(state: Dict, key: str, size: float) -> float:
+    """Per-size quantity at any size, linear in log size, flat outside the data."""
+    return float(np.interp(np.log(size), np.log(state['benchmarked_sizes']), state[key]))
+
+
+def _sampling_variance(state: Dict, size: float, runs: float) -> float:
+    """Sampling variance of the metric at a size in the model's fitting space."""
+    solved = runs * max(_interp(state, 'success', size), 1e-3)
+    variance = state['factor'] * _interp(state, 'log_sd', size) ** 2 / max(solved, 1.0)
+    if not state['log_space']:
+        variance *= float(evaluate_model(state['fit'], [size])[0]) ** 2
+    return variance
+
+
+def _relative_variance(state: Dict, sizes: np.ndarray, variances: np.ndarray, target: float) -> float:
+    """Variance of the predicted metric at the target size, relative to the prediction."""
+    X = state['build'](np.asarray(sizes, dtype=float))
+    information = X.T @ (X / variances[:, None])
+    x0 = state['build'](np.array([float(target)]))[0]
+    variance = float(x0 @ np.linalg.pinv(information) @ x0)
+    if not state['log_space']:
+        variance /= max(float(evaluate_model(state['fit'], [target])[0]), 1e-9) ** 2
+    return variance
+
+
+def _with_runs(state: Dict, size: float, iterations: int):
+    """Sizes and point variances after adding iterations at a size."""
+    sizes, runs = state['sizes'], state['runs']
+    match = np.flatnonzero(sizes == size)
+    if match.size:
+        runs = runs.copy()
+        runs[match[0]] += iterations
+        variances = state['variances'].copy()
+        variances[match[0]] = state['misfit'] + _sampling_variance(state, size, runs[match[0]])
+        return sizes, runs, variances
+    variance = state['misfit'] + _sampling_variance(state, size, iterations)
+    return (np.append(sizes, size), np.append(runs, iterations), np.append(state['variances'], variance))
+
+
+def run_cost_s(state: Dict, size: float, overhead_s: float = DEFAULT_OVERHEAD_S) -> float:
+    """Expected wall time of one run at a size (s)."""
+    mean_ms = float(evaluate_model(state['mean_fit'], [size])[0])
+    return min(max(mean_ms, 0.0), state['timeout_ms']) / 1000 + overhead_s
+
+
+def precision_at(variance: float, confidence: float) -> float:
+    """Relative half-width (+/-) of a confidence interval from a relative variance."""
+    return math.expm1(stats.norm.ppf(0.5 + confidence / 2) * math.sqrt(max(variance, 0.0)))
+
+
+def plan_experiments(
+    comparer,
+    target_size: int,
+    budget_s: float,
+    scenarios: Optional[Sequence[str]] = None,
+    metric: str = 'p95',
+    sizes: Optional[Sequence[int]] = None,
+    iterations: Sequence[int] = DEFAULT_ITERATIONS,
+    overhead_s: float = DEFAULT_OVERHEAD_S,
+    confidence: float = 0.90
+) -> Dict:
+    """
+    Recommend the benchmarks that most improve the prediction at a target size.
+
+    Args:
+        comparer: BenchmarkComparer holding the benchmarked files
+        target_size: Size whose prediction should get more precise
+        budget_s: Compute budget (wall seconds of benchmark runs)
+        scenarios: Scenarios to plan (default: all with at least 3 sizes)
+        metric: Predicted metric ('mean', 'median', 'p95' or 'p99')
+        sizes: Candidate sizes (default: benchmarked sizes and the standard
+            grid up to the target size, plus the target)
+        iterations: Iteration counts a single benchmark may use
+        overhead_s: Seconds per run besides the solve
+        confidence: Coverage of the reported precision
+
+    Returns:
+        Dictionary with the target, budget and spent seconds, per-scenario
+        model and precision before/after, the runs in pick order and the
+        commands (one per scenario and size, iterations summed, numbered
+        from first_iteration after the size's existing runs)
+    """
+    if metric not in PLAN_METRICS:
+        raise ValueError(f"Unknown metric: {metric}")
+
+    states = {}
+    skipped = {}
+    for scenario in scenarios or comparer.catalog.scenarios:
+        try:
+            states[scenario] = _model_state(comparer, scenario, metric)
+        except ValueError as e:
+            skipped[scenario] = str(e)
+    if not states:
+        raise ValueError("No scenario has enough sizes to plan: " + '; '.join(skipped.values()))
+
+    grid = sorted({int(s) for s in (sizes or DEFAULT_SIZES) if s <= target_size} | {int(target_size)})
+    current = {scenario: _relative_variance(state, state['sizes'], state['variances'], target_size)
+               for scenario, state in states.items()}
+    before = dict(current)
+
+    runs: List[Dict] = []
+    spent = 0.0
+    while True:
+        best = None
+        for scenario, state in states.items():
+            candidate_sizes = sorted(set(grid) | {int(s) for s in state['sizes']}) if sizes is None else grid
+            for size in candidate_sizes:
+                cost_per_run = run_cost_s(state, size, overhead_s)
+                for count in iterations:
+                    cost = cost_per_run * count
+                    if spent + cost > budget_s:
+                        continue
+                    new_sizes, _, variances = _with_runs(state, float(size), count)
+                    variance = _relative_variance(state, new_sizes, variances, target_size)
+                    gain = current[scenario] - variance
+                    if gain > 0 and (best is None or gain / cost > best['value']):
+                        best = {'value': gain / cost, 'scenario': scenario, 'size': size,
+                                'iterations': count, 'cost_s': cost, 'variance': variance}
+        if best is None:
+            break
+
+        state = states[best['scenario']]
+        state['sizes'], state['runs'], state['variances'] = _with_runs(state, float(best['size']), best['iterations'])
+        current[best['scenario']] = best['variance']
+        spent += best['cost_s']
+        runs.append({key: best[key] for key in ('scenario', 'size', 'iterations', 'cost_s')})
+
+    commands = {}
+    for run in runs:
+        key = (run['scenario'], run['size'])
+        entry = commands.setdefault(key, {'scenario': run['scenario'], 'size': run['size'],
+                                          'iterations': 0, 'cost_s': 0.0})
+        entry['iterations'] += run['iterations']
+        entry['cost_s'] += run['cost_s']
+    for entry in commands.values():
+        timeout_s = max(1, int(round(states[entry['scenario']]['timeout_ms'] / 1000)))
+        existing = load_index(comparer.catalog.paths(scenario=entry['scenario'], size=entry['size']),
+                              cache_dir=comparer.catalog.cache_dir)
+        entry['first_iteration'] = max((e['iteration_max'] or 0 for e in existing), default=0) + 1
+        entry['command'] = artisan_command(entry['scenario'], entry['size'], entry['iterations'], timeout_s,
+                                           entry['first_iteration'])
+
+    return {
+        'target_size': int(target_size),
+        'metric': metric,
+        'confidence': confidence,
+        'budget_s': float(budget_s),
+        'spent_s': spent,
+        'scenarios': {
+            scenario: {
+                'model': state['fit']['model'],
+                'precision_before': precision_at(before[scenario], confidence),
+                'precision_after': precision_at(current[scenario], confidence),
+            }
+            for scenario, state in states.items()
+        },
+        'skipped': skipped,
+        'runs': runs,
+        'commands': list(commands.values()),
+    }
+
+
+def artisan_command(scenario: str, size: int, iterations: int, timeout_s: int, first_iteration: int = 1) -> str:
+    """benchmark:glpk invocation writing a '_plan' shard next to the existing files."""
+    command = (f"php artisan benchmark:glpk storage/benchmarks/glpk_{scenario}_{size}_plan.csv "
+               f"--size={size} --scenario={scenario} --iterations={iterations} --timeout={timeout_s}")
+    if first_iteration > 1:
+        command += f" --first-iteration={first_iteration}"
+    return command
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Solution Quality Analysis
+
+The result column holds the solver's picks ({family_id: unit_id}). This
+module scores each solved run against its spec:
+
+  - satisfaction per family: 1 for its first choice, 0 for its last ranked
+    unit (and for no pick), linear in the preference rank in between
+  - per run: mean satisfaction, worst-off family (minimum satisfaction),
+    Gini coefficient of satisfaction, mean and worst pick rank, share of
+    families with their first choice, unassigned families (no pick) and
+    unlisted picks (a unit outside the family's preference list; scored
+    like no pick)
+
+Scoring is vectorized. Runs are decoded into padded (runs x families x
+preferences) unit-id matrices in chunks, and the rank of every pick comes
+from one broadcast comparison. Specs shared by many runs are decoded once,
+and large inputs are scored in a process pool chunk by chunk.
+
+quality_tradeoff() and plot_quality_tradeoff() relate quality to time_ms per
+scenario and size, with the Pareto frontier (no other run is both faster and
+better). Files of the same cell, e.g. two solver variants, are compared side
+by side.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from benchmark_features import PARALLEL_MIN_ROWS
+from benchmark_spec import loads
+
+
+QUALITY_METRICS = ['satisfaction_mean', 'satisfaction_min', 'satisfaction_gini',
+                   'rank_mean', 'rank_max', 'first_choice_share', 'unassigned', 'unlisted']
+
+# Metrics where lower is better (the Pareto frontier flips them)
+LOWER_IS_BETTER = {'satisfaction_gini', 'rank_mean', 'rank_max', 'unassigned', 'unlisted'}
+
+CHUNK_ROWS = 4096
+
+
+def _decode(specs: Sequence[str], results: Sequence[str]):
+    """Preference lists (unit ids) and picks, aligned by family, per run."""
+    decoded_specs = {}
+    preferences, picks = [], []
+    for spec_json, result_json in zip(specs, results):
+        if spec_json not in decoded_specs:
+            spec = loads(spec_json) if spec_json else {}
+            prefs = spec.get('preferences', spec.get('families')) or {}
+            decoded_specs[spec_json] = (list(prefs.keys()), list(prefs.values())) if isinstance(prefs, dict) else (
+                [str(i) for i in range(len(prefs))], list(prefs))
+        families, lists = decoded_specs[spec_json]
+
+        result = loads(result_json) if result_json else {}
+        if not isinstance(result, dict):
+            result = {}
+        preferences.append(lists)
+        picks.append([result.get(family, -2) for family in families])
+    return preferences, picks
+
+
+def _score_chunk(preferences: List, picks: List) -> np.ndarray:
+    """QUALITY_METRICS for a chunk of runs (rows)."""
+    n = len(preferences)
+    families = max((len(lists) for lists in preferences), default=0)
+    width = max((len(prefs) for lists in preferences for prefs in lists), default=0)
+    scores = np.full((n, len(QUALITY_METRICS)), np.nan)
+    if families == 0 or width == 0:
+        return scores
+
+    matrix = np.full((n, families, width), -1, dtype=np.int64)
+    chosen = np.full((n, families), -2, dtype=np.int64)
+    present = np.zeros((n, families), dtype=bool)
+    for i, (lists, run_picks) in enumerate(zip(preferences, picks)):
+        if len(lists) == families and all(len(prefs) == width for prefs in lists):
+            matrix[i] = lists
+        else:
+            for j, prefs in enumerate(lists):
+                matrix[i, j, :len(prefs)] = prefs
+        chosen[i, :len(run_picks)] = [p if isinstance(p, int) else -2 for p in run_picks]
+        present[i, :len(lists)] = True
+
+    lengths = (matrix >= 0).sum(axis=2)
+    hits = matrix == chosen[:, :, None]
+    found = hits.any(axis=2) & present
+    rank = np.where(found, hits.argmax(axis=2) + 1, lengths + 1).astype(float)
+
+    span = np.maximum(lengths - 1, 1)
+    satisfaction = np.where(found, 1.0 - (rank - 1) / span, 0.0)
+    satisfaction = np.where(present, satisfaction, np.nan)
+    rank = np.where(present, rank, np.nan)
+    counts = present.sum(axis=1)
+
+    # Gini over each run's families (NaN padding sorts last and is dropped by the weights)
+    ordered = np.sort(satisfaction, axis=1)
+    index = np.arange(1, families + 1)
+    weights = np.where(index[None, :] <= counts[:, None], 2 * index[None, :] - counts[:, None] - 1, 0)
+    totals = np.nansum(satisfaction, axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        gini = np.where(totals > 0, np.nansum(weights * np.nan_to_num(ordered), axis=1) / (counts * totals), 0.0)
+        scores[:, 0] = totals / counts
+    scores[:, 1] = np.nanmin(np.where(present, satisfaction, np.inf), axis=1)
+    scores[:, 2] = gini
+    scores[:, 3] = np.nanmean(rank, axis=1)
+    scores[:, 4] = np.nanmax(rank, axis=1)
+    scores[:, 5] = (found & (rank == 1)).sum(axis=1) / counts
+    scores[:, 6] = (present & (chosen == -2)).sum(axis=1)
+    scores[:, 7] = (present & ~found & (chosen != -2)).sum(axis=1)
+    return scores
+
+
+def _score_batch(specs: Sequence[str], results: Sequence[str]) -> np.ndarray:
+    return _score_chunk(*_decode(specs, results))
+
+
+def score_results(
+    specs: Sequence[str],
+    results: Sequence[str],
+    executor: Optional[Executor] = None
+) -> pd.DataFrame:
+    """
+    Score solver picks against their specs.
+
+    Args:
+        specs: Spec JSON strings
+        results: Result JSON strings (same order)
+        executor: Pool to score chunks in (scores in-process if None)
+
+    Returns:
+        DataFrame with one row per run and the QUALITY_METRICS columns
+    """
+    starts = range(0, len(specs), CHUNK_ROWS)
+    spec_chunks = [specs[start:start + CHUNK_ROWS] for start in starts]
+    result_chunks = [results[start:start + CHUNK_ROWS] for start in starts]
+    blocks = list((executor.map if executor else map)(_score_batch, spec_chunks, result_chunks))
+    values = np.vstack(blocks) if blocks else np.empty((0, len(QUALITY_METRICS)))
+    return pd.DataFrame(values, columns=QUALITY_METRICS)
+
+
+def quality_frame(csv_paths: List[str], workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Score every solved run of benchmark files.
+
+    Args:
+        csv_paths: Paths to benchmark CSV files
+        workers: Worker processes for scoring (default: CPU count; 1 = in-process)
+
+    Returns:
+        DataFrame with file, size, scenario, iteration, time_ms and the
+        QUALITY_METRICS columns for SUCCESS rows with a result
+    """
+    paths = [Path(p) for p in csv_paths]
+    if not paths:
+        raise ValueError("No benchmark files given")
+
+    workers = workers or os.cpu_count() or 1
+    # ~1 KB per row is a conservative lower bound for rows with spec JSON
+    parallel = workers > 1 and sum(path.stat().st_size for path in paths) > PARALLEL_MIN_ROWS * 1024
+
+    frames = []
+    executor = ProcessPoolExecutor(max_workers=workers) if parallel else None
+    try:
+        for path in paths:
+            df = pd.read_csv(path, usecols=['size', 'scenario', 'iteration', 'time_ms', 'status', 'spec', 'result'],
+                             dtype={'spec': str, 'result': str}, keep_default_na=False)
+            df = df[(df['status'] == 'SUCCESS') & (df['result'] != '')]
+            scores = score_results(df['spec'].tolist(), df['result'].tolist(), executor)
+            frame = df.drop(columns=['spec', 'result', 'status']).reset_index(drop=True)
+            frame.insert(0, 'file', path.name)
+            frames.append(pd.concat([frame, scores], axis=1))
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return pd.concat(frames, ignore_index=True)
+
+
+def pareto_frontier(time_ms: np.ndarray, quality: np.ndarray, higher_is_better: bool = True) -> np.ndarray:
+    """
+    Mask of runs on the time/quality Pareto frontier.
+
+    A run is on the frontier if no faster (or equally fast) run has better quality.
+    """
+    time_ms = np.asarray(time_ms, dtype=float)
+    quality = np.asarray(quality, dtype=float) * (1 if higher_is_better else -1)
+    order = np.lexsort((-quality, time_ms))
+    best_before = np.maximum.accumulate(np.concatenate(([-np.inf], quality[order][:-1])))
+    mask = np.zeros(len(time_ms), dtype=bool)
+    mask[order] = quality[order] > best_before
+    return mask
+
+
+def quality_tradeoff(df: pd.DataFrame, metric: str = 'satisfaction_mean') -> pd.DataFrame:
+    """
+    Quality and its relation to solve time per scenario, size and file.
+
+    Args:
+        df: Output of quality_frame()
+        metric: Quality metric for the correlation and the frontier
+
+    Returns:
+        DataFrame with runs, mean of each quality metric, Spearman correlation
+        of time and the metric, frontier size and the median time of the
+        frontier runs
+    """
+    rows = []
+    higher = metric not in LOWER_IS_BETTER
+    for (scenario, size, file), group in df.groupby(['scenario', 'size', 'file'], observed=True, sort=True):
+        frontier = pareto_frontier(group['time_ms'], group[metric], higher)
+        row = {'scenario': scenario, 'size': size, 'file': file, 'runs': len(group)}
+        row.update({m: float(group[m].mean()) for m in QUALITY_METRICS})
+        row['worst_off_min'] = float(group['satisfaction_min'].min())
+        row['time_quality_spearman'] = (float(group['time_ms'].rank().corr(group[metric].rank()))
+                                        if len(group) > 2 and group[metric].nunique() > 1 else None)
+        row['frontier_runs'] = int(frontier.sum())
+        row['frontier_time_median'] = float(group.loc[frontier, 'time_ms'].median())
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def plot_quality_tradeoff(
+    df: pd.DataFrame,
+    metric: str = 'satisfaction_mean',
+    save_path: Optional[str] = None,
+    show: bool = True
+):
+    """
+    Scatter quality against time_ms per scenario and size with Pareto frontiers.
+
+    Args:
+        df: Output of quality_frame()
+        metric: Quality metric on the y axis
+        save_path: Save figure to this path
+        show: Display the figure
+    """
+    import matplotlib.pyplot as plt
+
+    cells = sorted(df.groupby(['scenario', 'size'], observed=True).groups)
+    cols = min(4, len(cells))
+    rows = int(np.ceil(len(cells) / cols))
+    fig, axes = plt.subplots(rows, cols, figsize=(4.5 * cols, 3.6 * rows), squeeze=False)
+    higher = metric not in LOWER_IS_BETTER
+
+    for ax, (scenario, size) in zip(axes.flat, cells):
+        cell = df[(df['scenario'] == scenario) & (df['size'] == size)]
+        for file, group in cell.groupby('file', observed=True):
+            points = ax.scatter(group['time_ms'], group[metric], s=8, alpha=0.4, label=file)
+            frontier = group[pareto_frontier(group['time_ms'], group[metric], higher)].sort_values('time_ms')
+            ax.step(frontier['time_ms'], frontier[metric], where='post', color=points.get_facecolor()[0],
+                    alpha=1.0, linewidth=1.5)
+        ax.set_xscale('log')
+        ax.set_title(f'{size}x{size} {scenario}')
+        ax.set_xlabel('time_ms (log)')
+        ax.set_ylabel(metric)
+        ax.grid(True, alpha=0.3)
+        if cell['file'].nunique() > 1:
+            ax.legend(fontsize=7)
+
+    for ax in list(axes.flat)[len(cells):]:
+        ax.axis('off')
+
+    fig.suptitle(f'{metric} vs solve time (lines: Pareto frontier)')
+    fig.tight_layout()
+
+    if save_path:
+        fig.savefig(save_path, dpi=150, bbox_inches='tight')
+    if show:
+        plt.show()
+    plt.close(fig)
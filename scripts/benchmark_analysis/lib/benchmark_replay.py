@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Replay
+
+Takes the slowest or timed-out specs of a benchmark file and re-runs each of
+them on its own, through the application's solver (`php artisan
+benchmark:glpk:replay`, one fresh process per spec), a number of times:
+
+  - The variance of the repeats tells whether the recorded run was a slow
+    instance (the repeats are as slow) or a one-off (every repeat is
+    faster), and whether a timeout is deterministic or flaky.
+  - An extra solve before the repeats keeps the GLPK model/data files it
+    solved, numbered in solve order, with a glpsol.sh repeating the exact
+    solver calls, so the instance can be profiled offline with glpsol. The
+    file copies slow that solve down, so it is not one of the timed repeats.
+
+Layout of the output directory (one folder per replayed spec):
+
+    <output_dir>/<file stem>_it<iteration>/
+        spec.json     spec as recorded in the benchmark file
+        runs.csv      repeats (benchmark CSV format, original iteration)
+        replay.log    output of the artisan command
+        model/        NN_phase1_*.mod, NN_data_*.dat, ..., glpsol.sh
+    <output_dir>/replay_summary.csv
+
+Repeats accumulate in runs.csv when a spec is replayed again; the model
+files are replaced.
+
+Commands run in the current directory (the project root for artisan).
+"""
+
+import math
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from benchmark_noise import Z_95
+from benchmark_spec import spec_hash
+from benchmark_survival import infer_timeout_ms
+
+
+DEFAULT_COMMAND = ('php', 'artisan', 'benchmark:glpk:replay')
+
+# Which runs of a file are candidates for a replay
+SELECTIONS = {
+    'any': None,
+    'slowest': ('SUCCESS',),
+    'timeouts': ('TIMEOUT',),
+    'failed': ('TIMEOUT', 'FAILED', 'INFEASIBLE'),
+}
+
+DEFAULT_OUTPUT_DIR = 'storage/benchmarks/replay'
+SUMMARY_FILE = 'replay_summary.csv'
+
+
+def select_specs(csv_path: str, top: int = 10, select: str = 'any') -> pd.DataFrame:
+    """
+    The slowest distinct specs of a benchmark file.
+
+    Args:
+        csv_path: Benchmark CSV with a spec column
+        top: Number of specs to return
+        select: Runs to consider (see SELECTIONS): 'any' run, 'slowest'
+            solved runs, 'timeouts' or all 'failed' runs
+
+    Returns:
+        DataFrame sorted by time (slowest first) with size, scenario,
+        iteration, time_ms, status, spec, spec_hash and label (folder name
+        of the replay); a spec that ran several times appears once, with
+        its slowest run
+    """
+    if select not in SELECTIONS:
+        raise ValueError(f"Unknown selection: {select} (expected one of {', '.join(SELECTIONS)})")
+
+    df = pd.read_csv(csv_path, usecols=['size', 'scenario', 'iteration', 'time_ms', 'status', 'spec'],
+                     dtype={'spec': str})
+    df = df[df['spec'].notna() & (df['spec'] != '')]
+    if SELECTIONS[select]:
+        df = df[df['status'].isin(SELECTIONS[select])]
+    if df.empty:
+        raise ValueError(f"No {select} runs with a recorded spec in {Path(csv_path).name}")
+
+    df = df.assign(spec_hash=df['spec'].map(spec_hash))
+    df = df.sort_values('time_ms', ascending=False, kind='stable').drop_duplicates('spec_hash').head(top)
+    stem = Path(csv_path).stem
+    return df.assign(label=[f"{stem}_it{i}" for i in df['iteration']]).reset_index(drop=True)
+
+
+def solver_timeout_s(csv_path: str) -> int:
+    """Solver timeout (whole seconds) a benchmark file ran with (inferred from its timeouts)."""
+    df = pd.read_csv(csv_path, usecols=['time_ms', 'status'])
+    return max(1, int(round(infer_timeout_ms(df) / 1000)))
+
+
+def replay_command(
+    entry: Dict,
+    folder: Path,
+    iterations: int,
+    timeout_s: int,
+    dump: bool = True,
+    command: Sequence[str] = DEFAULT_COMMAND
+) -> List[str]:
+    """benchmark:glpk:replay argv for one selected spec (a row of select_specs)."""
+    argv = list(command) + [
+        str(folder / 'spec.json'), str(folder / 'runs.csv'),
+        f"--size={int(entry['size'])}", f"--scenario={entry['scenario']}",
+        f"--iteration={int(entry['iteration'])}", f"--iterations={iterations}", f"--timeout={timeout_s}",
+    ]
+    if dump:
+        argv.append(f"--dump={folder / 'model'}")
+    return argv
+
+
+def replay_spec(
+    entry: Dict,
+    output_dir: str,
+    iterations: int,
+    timeout_s: int,
+    dump: bool = True,
+    command: Sequence[str] = DEFAULT_COMMAND
+) -> Dict:
+    """
+    Re-run one selected spec in its own process.
+
+    Args:
+        entry: Row of select_specs()
+        output_dir: Replay output directory (a folder per spec is created)
+        iterations: Repeats of the spec
+        timeout_s: Solver timeout per repeat (s)
+        dump: Keep the GLPK model/data files (from an extra, unrecorded solve)
+        command: Command prefix running benchmark:glpk:replay
+
+    Returns:
+        replay_variance() of the repeats, plus label, folder, exit code and
+        the model folder (None without dump)
+    """
+    folder = Path(output_dir) / entry['label']
+    folder.mkdir(parents=True, exist_ok=True)
+    (folder / 'spec.json').write_text(entry['spec'])
+    if dump and (folder / 'model').is_dir():
+        shutil.rmtree(folder / 'model')
+
+    # Generous wall limit: every solve may run into the PHP failsafe (1.2 x timeout)
+    solves = iterations + (1 if dump else 0)
+    with open(folder / 'replay.log', 'a') as log:
+        process = subprocess.run(replay_command(entry, folder, iterations, timeout_s, dump, command),
+                                 stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+                                 timeout=solves * (timeout_s * 1.2 + 30) + 60)
+
+    runs = pd.read_csv(folder / 'runs.csv') if (folder / 'runs.csv').exists() else pd.DataFrame(
+        columns=['time_ms', 'status'])
+    result = replay_variance(runs, float(entry['time_ms']), entry['status'])
+    result.update(label=entry['label'], folder=folder, exit_code=process.returncode,
+                  model=folder / 'model' if dump and (folder / 'model').is_dir() else None)
+    return result
+
+
+def replay_variance(runs: pd.DataFrame, original_ms: float, original_status: str) -> Dict:
+    """
+    Variance of the repeats of one spec and how the original run compares.
+
+    Args:
+        runs: Repeat rows (time_ms, status)
+        original_ms: Time of the recorded run
+        original_status: Status of the recorded run
+
+    Returns:
+        Dictionary with runs, solved, timeouts, time_min/median/max of the
+        solved repeats, cv, log_sd, noise_ratio (95% repeat time ratio, as
+        in benchmark_noise), the original time and status, ratio (median /
+        original) and verdict:
+          always times out / flaky timeout / solves now (original timed out)
+          slow instance (a repeat was as slow as the original)
+          one-off (every repeat was faster than the original)
+    """
+    times = runs.loc[runs['status'] == 'SUCCESS', 'time_ms'].to_numpy(dtype=float)
+    timeouts = int((runs['status'] == 'TIMEOUT').sum())
+    log_sd = float(np.std(np.log(times[times > 0]), ddof=1)) if np.sum(times > 0) > 1 else None
+
+    result = {
+        'runs': len(runs), 'solved': len(times), 'timeouts': timeouts,
+        'time_min': float(times.min()) if len(times) else None,
+        'time_median': float(np.median(times)) if len(times) else None,
+        'time_max': float(times.max()) if len(times) else None,
+        'cv': float(times.std(ddof=1) / times.mean()) if len(times) > 1 and times.mean() > 0 else None,
+        'log_sd': log_sd,
+        'noise_ratio': math.exp(Z_95 * math.sqrt(2) * log_sd) if log_sd is not None else None,
+        'original_ms': original_ms, 'original_status': original_status,
+        'ratio': float(np.median(times)) / original_ms if len(times) and original_ms > 0 else None,
+    }
+
+    if len(runs) == 0:
+        verdict = 'n/a'
+    elif timeouts == len(runs):
+        verdict = 'always times out'
+    elif timeouts:
+        verdict = 'flaky timeout'
+    elif original_status == 'TIMEOUT':
+        verdict = 'solves now'
+    elif len(times) and result['time_max'] >= original_ms:
+        verdict = 'slow instance'
+    else:
+        verdict = 'one-off'
+    result['verdict'] = verdict
+    return result
+
+
+def write_summary(results: List[Dict], output_dir: str, source: Optional[str] = None) -> Path:
+    """
+    Add replay results to the summary CSV of the output directory.
+
+    Rows of specs replayed again are replaced.
+
+    Returns:
+        Path of the summary CSV
+    """
+    path = Path(output_dir) / SUMMARY_FILE
+    df = pd.DataFrame(results).drop(columns=['folder'], errors='ignore').assign(source=source)
+    df = df[['label', 'source'] + [c for c in df.columns if c not in ('label', 'source')]]
+    if path.exists():
+        previous = pd.read_csv(path)
+        df = pd.concat([previous[~previous['label'].isin(df['label'])], df], ignore_index=True)
+    df.to_csv(path, index=False)
+    return path
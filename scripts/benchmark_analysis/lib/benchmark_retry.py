@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Retry Analysis
+
+`benchmark:glpk:retry` re-runs the FAILED, TIMEOUT and INFEASIBLE runs of a
+benchmark file into <name>_retry.csv, keeping each run's iteration number
+and spec and repeating it --iterations times. compute_stats() only sees the
+first attempt; this module links every retry row back to its original run by
+(iteration, spec hash) and answers what retrying actually buys:
+
+  - effective success rate: share of runs solved by any attempt, and by at
+    most k retries for every retry budget k
+  - expected total time per run including retries (attempts stop at the
+    first success)
+  - per-run classification of failed runs:
+      solved-on-retry:       every retry succeeded
+      flaky:                 some retries succeeded, some did not
+      deterministic-timeout: every attempt timed out
+      deterministic-failure: no attempt succeeded (FAILED/INFEASIBLE involved)
+      not-retried:           no retry rows for the run
+  - latency added by the retry path: time spent in failed attempts before
+    the successful one, and end-to-end percentiles with and without retries
+
+compare_with_timeout() sets this against the alternative of raising the
+timeout, using the censoring-aware TimeoutPlanner on the original runs.
+"""
+
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from benchmark_shards import group_shards, is_retry_file, load_merged
+from benchmark_spec import spec_hash
+from benchmark_timeout_plan import TimeoutPlanner, recommend_timeout
+
+
+RETRY_CLASSES = ['solved-on-retry', 'flaky', 'deterministic-timeout', 'deterministic-failure', 'not-retried']
+
+KEY = ['iteration', 'spec_hash']
+
+
+def load_retry_pairs(csv_paths: List[str]) -> 'OrderedDict[Tuple[str, int], Tuple[pd.DataFrame, pd.DataFrame]]':
+    """
+    Load original and retry rows per (scenario, size).
+
+    Regular shards of a cell are merged (policy 'first') into the original
+    runs; rows of its _retry files are kept as they are, one row per attempt.
+
+    Args:
+        csv_paths: Benchmark CSV files, originals and their _retry files
+
+    Returns:
+        Ordered dictionary (scenario, size) -> (original rows, retry rows)
+    """
+    pairs = OrderedDict()
+    for key, paths in group_shards(csv_paths).items():
+        originals = [str(p) for p in paths if not is_retry_file(p)]
+        retries = [str(p) for p in paths if is_retry_file(p)]
+        if not originals:
+            raise ValueError(f"No original benchmark file for retries of {key[0]} size {key[1]}")
+
+        original = load_merged(originals, 'first')
+        retry = (pd.concat([pd.read_csv(p, keep_default_na=False) for p in retries], ignore_index=True)
+                 if retries else original.iloc[0:0])
+        pairs[key] = (original, retry)
+    return pairs
+
+
+def link_attempts(original: pd.DataFrame, retries: pd.DataFrame) -> Tuple[pd.DataFrame, int]:
+    """
+    Link retry rows to their original runs.
+
+    Args:
+        original: Rows of the original benchmark (one per run)
+        retries: Rows of the retry output (one per retry attempt)
+
+    Returns:
+        Tuple of (one row per attempt with run key and attempt number,
+        where 1 is the original attempt; number of retry rows that matched
+        no original run)
+    """
+    columns = ['iteration', 'time_ms', 'status', 'spec']
+    first = original[columns].copy()
+    first['attempt'] = 1
+
+    later = retries[columns].copy()
+    later['spec_hash'] = later['spec'].map(spec_hash)
+    first['spec_hash'] = first['spec'].map(spec_hash)
+
+    known = pd.MultiIndex.from_frame(first[KEY])
+    matched = pd.MultiIndex.from_frame(later[KEY]).isin(known)
+    later = later[matched].copy()
+    # Retry files list attempts in run order; appended reruns keep counting up
+    later['attempt'] = later.groupby(KEY, sort=False).cumcount() + 2
+
+    attempts = pd.concat([first, later], ignore_index=True).drop(columns='spec')
+    attempts = attempts.sort_values(KEY + ['attempt'], kind='stable').reset_index(drop=True)
+    attempts['time_ms'] = attempts['time_ms'].astype(float)
+    return attempts, int((~matched).sum())
+
+
+def classify_runs(attempts: pd.DataFrame) -> pd.DataFrame:
+    """
+    Summarize and classify each run's attempts.
+
+    Args:
+        attempts: Output of link_attempts()
+
+    Returns:
+        DataFrame with one row per run: iteration, spec_hash, first_status,
+        first_time_ms, retries, retry_successes, solved_attempt (attempt
+        number of the first success, NaN if never solved), time_to_success_ms,
+        successful_time_ms, total_time_ms and class ('success' for runs solved
+        on the first attempt)
+    """
+    df = attempts.copy()
+    df['success'] = df['status'] == 'SUCCESS'
+    df['elapsed_ms'] = df.groupby(KEY, sort=False)['time_ms'].cumsum()
+    grouped = df.groupby(KEY, sort=False)
+
+    runs = grouped.agg(
+        first_status=('status', 'first'),
+        first_time_ms=('time_ms', 'first'),
+        attempts=('attempt', 'max'),
+        successes=('success', 'sum'),
+        timeouts=('status', lambda s: int((s == 'TIMEOUT').sum())),
+        total_time_ms=('time_ms', 'sum'),
+    )
+    runs['retries'] = runs['attempts'] - 1
+    runs['retry_successes'] = runs['successes'] - (runs['first_status'] == 'SUCCESS')
+
+    solved = df[df['success']].groupby(KEY, sort=False).first()
+    runs['solved_attempt'] = solved['attempt'].reindex(runs.index)
+    runs['time_to_success_ms'] = solved['elapsed_ms'].reindex(runs.index)
+    runs['successful_time_ms'] = solved['time_ms'].reindex(runs.index)
+
+    runs['class'] = np.select(
+        [
+            runs['first_status'] == 'SUCCESS',
+            runs['retries'] == 0,
+            runs['retry_successes'] == runs['retries'],
+            runs['retry_successes'] > 0,
+            runs['timeouts'] == runs['attempts'],
+        ],
+        ['success', 'not-retried', 'solved-on-retry', 'flaky', 'deterministic-timeout'],
+        default='deterministic-failure',
+    )
+
+    return runs.drop(columns=['successes', 'timeouts']).reset_index()
+
+
+def retry_budgets(attempts: pd.DataFrame, max_retries: Optional[int] = None) -> pd.DataFrame:
+    """
+    Effective success rate and expected time per run for each retry budget.
+
+    A run with budget k stops at its first success or after k retries,
+    whichever comes first. Runs with fewer recorded retries than k use the
+    attempts that exist, so budgets beyond the retry --iterations are
+    lower bounds on success.
+
+    Args:
+        attempts: Output of link_attempts()
+        max_retries: Largest budget to evaluate (default: most retries recorded)
+
+    Returns:
+        DataFrame with retries, success_rate, expected_time_ms and
+        expected_attempts per budget
+    """
+    elapsed = attempts.groupby(KEY, sort=False)['time_ms'].cumsum()
+    wide_time = attempts.assign(elapsed=elapsed).pivot_table(
+        index=KEY, columns='attempt', values='elapsed', aggfunc='first')
+    wide_success = attempts.assign(success=attempts['status'] == 'SUCCESS').pivot_table(
+        index=KEY, columns='attempt', values='success', aggfunc='first', fill_value=False)
+
+    n_attempts = wide_time.notna().sum(axis=1).to_numpy()
+    solved = wide_success.to_numpy(dtype=bool)
+    first_success = np.where(solved.any(axis=1), solved.argmax(axis=1) + 1, np.iinfo(np.int64).max)
+    times = wide_time.to_numpy(dtype=float)
+
+    highest = wide_time.shape[1] - 1 if max_retries is None else max_retries
+    rows = []
+    for k in range(highest + 1):
+        stop = np.minimum(np.minimum(first_success, k + 1), n_attempts)
+        rows.append({
+            'retries': k,
+            'success_rate': float((first_success <= k + 1).mean()),
+            'expected_time_ms': float(times[np.arange(len(times)), np.minimum(stop, times.shape[1]) - 1].mean()),
+            'expected_attempts': float(stop.mean()),
+        })
+    return pd.DataFrame(rows)
+
+
+def retry_summary(runs: pd.DataFrame) -> Dict:
+    """
+    Headline retry metrics of classified runs.
+
+    Args:
+        runs: Output of classify_runs()
+
+    Returns:
+        Dictionary with run counts, first-attempt and effective success
+        rates, retry success rate, class counts and retry-path latency
+    """
+    total = len(runs)
+    failed = runs[runs['first_status'] != 'SUCCESS']
+    retried = failed[failed['retries'] > 0]
+    via_retry = runs[runs['solved_attempt'] > 1]
+
+    first_ok = runs.loc[runs['first_status'] == 'SUCCESS', 'first_time_ms']
+    end_to_end = runs['time_to_success_ms'].dropna()
+    added = via_retry['time_to_success_ms'] - via_retry['successful_time_ms']
+
+    def pct(values: pd.Series, q: float) -> Optional[float]:
+        return float(np.percentile(values, q)) if len(values) else None
+
+    summary = {
+        'total_runs': total,
+        'first_attempt_success_rate': float((runs['first_status'] == 'SUCCESS').mean()) if total else 0.0,
+        'effective_success_rate': float(runs['solved_attempt'].notna().mean()) if total else 0.0,
+        'failed_runs': len(failed),
+        'retried_runs': len(retried),
+        'retry_attempts': int(retried['retries'].sum()),
+        # Per-attempt success of retries; compare with the first-attempt rate
+        # to see whether failures are independent or stick to their spec
+        'retry_success_rate': (float(retried['retry_successes'].sum() / retried['retries'].sum())
+                               if len(retried) else None),
+        'solved_via_retry': len(via_retry),
+        'added_latency_mean_ms': float(added.mean()) if len(added) else None,
+        'added_latency_p50_ms': pct(added, 50),
+        'added_latency_p95_ms': pct(added, 95),
+    }
+    for name in RETRY_CLASSES:
+        summary[name.replace('-', '_')] = int((runs['class'] == name).sum())
+    for q in (50, 95, 99):
+        summary[f'first_attempt_p{q}_ms'] = pct(first_ok, q)
+        summary[f'with_retries_p{q}_ms'] = pct(end_to_end, q)
+    return summary
+
+
+def compare_with_timeout(original: pd.DataFrame, budgets: pd.DataFrame, timeout_ms: float,
+                         max_factor: float = 4.0, steps: int = 2000) -> List[Dict]:
+    """
+    Set each retry budget against raising the timeout to the same success rate.
+
+    Args:
+        original: Rows of the original benchmark
+        budgets: Output of retry_budgets()
+        timeout_ms: Timeout the original benchmark ran with
+        max_factor: Largest timeout considered, as a multiple of timeout_ms
+        steps: Number of candidate timeouts
+
+    Returns:
+        One dictionary per retry budget with the budget's success rate and
+        expected time, and the smallest timeout (no retries) reaching the
+        same success rate with its expected time (None if not reachable)
+    """
+    planner = TimeoutPlanner(original, timeout_ms)
+    plan = planner.sweep(np.linspace(timeout_ms * 0.01, timeout_ms * max_factor, steps), retries=())
+
+    rows = []
+    for budget in budgets.to_dict('records'):
+        best = recommend_timeout(plan, budget['success_rate'])
+        rows.append({
+            'retries': budget['retries'],
+            'success_rate': budget['success_rate'],
+            'expected_time_ms': budget['expected_time_ms'],
+            'timeout_ms': best['timeout_ms'] if best else None,
+            'timeout_expected_time_ms': best['expected_time_ms'] if best else None,
+            'timeout_extrapolated': bool(best['extrapolated']) if best else None,
+        })
+    return rows
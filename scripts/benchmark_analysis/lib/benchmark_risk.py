@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Timeout Risk Model
+
+Predicts, before GLPK is invoked, the probability that a lottery spec times
+out, so production can route risky specs straight to a cheaper strategy.
+
+Training (train_risk_model, numpy):
+  - logistic boosted stumps (benchmark_boost) on the spec features of every
+    SUCCESS/TIMEOUT run of the benchmark files
+  - k-fold cross-validation; out-of-fold scores give the evaluation report
+    (AUC, log loss, Brier score, calibration by decile, precision/recall at
+    the decision threshold) and fit a Platt calibration (sigmoid(a * score + b))
+  - final model on all runs, exported as a small JSON artifact: per feature
+    the bin edges and the additive log-odds table
+
+Inference (RiskModel) only uses the standard library and benchmark_spec: a
+spec is turned into features and every feature into a bisect lookup. It does
+not import numpy, pandas or matplotlib.
+"""
+
+import json
+import math
+from bisect import bisect_right
+from typing import Dict, List, Optional, Sequence
+
+from benchmark_spec import SPEC_FEATURES, loads, spec_features
+
+
+RISK_MODEL_VERSION = 1
+
+
+class RiskModel:
+    """
+    Calibrated timeout-risk model loaded from a JSON artifact.
+    """
+
+    def __init__(self, artifact: Dict):
+        """
+        Build the model from an artifact dictionary.
+
+        Args:
+            artifact: Output of train_risk_model()
+        """
+        if artifact.get('version') != RISK_MODEL_VERSION:
+            raise ValueError(f"Unsupported risk model version: {artifact.get('version')}")
+
+        self.artifact = artifact
+        self.intercept = artifact['model']['intercept']
+        self.tables = [(f['name'], f['edges'], f['shape']) for f in artifact['model']['features']]
+        self.calibration = artifact['calibration']
+        self.threshold = artifact['threshold']
+        # Positions of the model's features in SPEC_FEATURES
+        self._positions = [SPEC_FEATURES.index(name) for name, _, _ in self.tables]
+
+    @classmethod
+    def load(cls, path: str) -> 'RiskModel':
+        """Read a model saved by save_risk_model()."""
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def _contributions(self, values: List[float]) -> List[float]:
+        """Log-odds contribution of every model feature (NaN goes to the first bin)."""
+        return [
+            shape[0 if value != value else bisect_right(edges, value)]
+            for (_, edges, shape), value in zip(self.tables, (values[i] for i in self._positions))
+        ]
+
+    def predict_features(self, values: List[float]) -> float:
+        """Calibrated timeout probability from SPEC_FEATURES values."""
+        score = self.intercept + sum(self._contributions(values))
+        z = self.calibration['a'] * score + self.calibration['b']
+        return 1.0 / (1.0 + math.exp(-z)) if z > -700 else 0.0
+
+    def predict(self, spec: Dict) -> float:
+        """Calibrated timeout probability of a decoded spec."""
+        return self.predict_features(spec_features(spec))
+
+    def predict_json(self, spec_json: str) -> float:
+        """Calibrated timeout probability of a spec JSON string."""
+        return self.predict(loads(spec_json))
+
+    def explain(self, spec: Dict, top: int = 3) -> List[Dict]:
+        """
+        Features that push a spec's risk up or down the most.
+
+        Returns:
+            List of {'feature', 'value', 'contribution'} (log-odds), by absolute contribution
+        """
+        values = spec_features(spec)
+        rows = [
+            {'feature': name, 'value': values[i], 'contribution': c}
+            for (name, _, _), i, c in zip(self.tables, self._positions, self._contributions(values))
+        ]
+        return sorted(rows, key=lambda r: -abs(r['contribution']))[:top]
+
+
+def _platt(scores, labels) -> Dict[str, float]:
+    """Fit sigmoid(a * score + b) to labels by Newton's method."""
+    import numpy as np
+
+    # Platt's target smoothing keeps the fit finite on separable data
+    positives, negatives = labels.sum(), len(labels) - labels.sum()
+    target = np.where(labels > 0, (positives + 1) / (positives + 2), 1 / (negatives + 2))
+    a, b = 1.0, 0.0
+    for _ in range(50):
+        p = 1.0 / (1.0 + np.exp(-(a * scores + b)))
+        w = np.maximum(p * (1 - p), 1e-12)
+        grad = np.array([np.sum((p - target) * scores), np.sum(p - target)])
+        hess = np.array([[np.sum(w * scores * scores), np.sum(w * scores)],
+                         [np.sum(w * scores), np.sum(w)]]) + np.eye(2) * 1e-9
+        step = np.linalg.solve(hess, grad)
+        a, b = a - step[0], b - step[1]
+        if np.abs(step).max() < 1e-10:
+            break
+    return {'a': float(a), 'b': float(b)}
+
+
+def train_risk_model(
+    df,
+    features: Optional[Sequence[str]] = None,
+    folds: int = 5,
+    n_rounds: int = 300,
+    threshold: Optional[float] = None,
+    seed: int = 0
+) -> Dict:
+    """
+    Train and cross-validate a timeout-risk model.
+
+    Args:
+        df: Rows with status and SPEC_FEATURES columns (see feature_frame)
+        features: Features to use (default: every SPEC_FEATURES column that varies)
+        folds: Cross-validation folds
+        n_rounds: Boosting rounds
+        threshold: Decision threshold on the calibrated probability
+            (default: the one maximizing out-of-fold F1)
+        seed: Seed for the folds
+
+    Returns:
+        Model artifact dictionary (JSON-serializable) with an 'evaluation' report
+    """
+    import numpy as np
+
+    from benchmark_boost import StumpBooster, kfold_indices, log_loss, roc_auc
+    from benchmark_explain import usable_features
+
+    decided = df[df['status'].isin(['SUCCESS', 'TIMEOUT'])]
+    names = usable_features(decided, list(features or SPEC_FEATURES))
+    unknown = [name for name in names if name not in SPEC_FEATURES]
+    if unknown:
+        raise ValueError(f"Not spec features (unavailable before solving): {', '.join(unknown)}")
+
+    X = decided[names].to_numpy(dtype=float)
+    y = (decided['status'] == 'TIMEOUT').to_numpy(dtype=float)
+    if min(y.sum(), len(y) - y.sum()) < folds:
+        raise ValueError(f"Need at least {folds} timeouts and {folds} solved runs, "
+                         f"got {int(y.sum())} of {len(y)} runs")
+
+    scores = np.zeros(len(y))
+    for test in kfold_indices(len(y), folds, seed):
+        train = np.setdiff1d(np.arange(len(y)), test)
+        scores[test] = StumpBooster('logistic', n_rounds=n_rounds).fit(X[train], y[train]).decision_function(X[test])
+
+    calibration = _platt(scores, y)
+    probabilities = 1.0 / (1.0 + np.exp(-(calibration['a'] * scores + calibration['b'])))
+
+    if threshold is None:
+        candidates = np.unique(np.round(probabilities, 4))
+        f1 = [2 * np.sum((probabilities >= t) & (y > 0)) / (np.sum(probabilities >= t) + y.sum())
+              for t in candidates]
+        threshold = float(candidates[int(np.argmax(f1))])
+
+    flagged = probabilities >= threshold
+    deciles = np.array_split(np.argsort(probabilities, kind='stable'), 10)
+    evaluation = {
+        'folds': folds,
+        'runs': int(len(y)),
+        'timeouts': int(y.sum()),
+        'auc': roc_auc(y, probabilities),
+        'log_loss': log_loss(y, probabilities),
+        'base_log_loss': log_loss(y, np.full(len(y), y.mean())),
+        'brier': float(np.mean((probabilities - y) ** 2)),
+        'precision': float(y[flagged].mean()) if flagged.any() else None,
+        'recall': float(flagged[y > 0].mean()),
+        'flagged_rate': float(flagged.mean()),
+        'calibration': [
+            {'predicted': float(probabilities[idx].mean()), 'observed': float(y[idx].mean()), 'runs': int(len(idx))}
+            for idx in deciles if len(idx)
+        ],
+    }
+
+    model = StumpBooster('logistic', n_rounds=n_rounds).fit(X, y, names)
+    return {
+        'version': RISK_MODEL_VERSION,
+        'target': 'TIMEOUT',
+        'model': model.to_dict(),
+        'calibration': calibration,
+        'threshold': threshold,
+        'trained_on': {
+            'files': sorted(str(f) for f in decided['file'].unique()) if 'file' in decided else [],
+            'scenarios': sorted(str(s) for s in decided['scenario'].unique()),
+            'sizes': sorted(int(s) for s in decided['size'].unique()),
+        },
+        'evaluation': evaluation,
+    }
+
+
+def save_risk_model(artifact: Dict, path: str):
+    """Write a model artifact as JSON."""
+    with open(path, 'w') as f:
+        json.dump(artifact, f, separators=(',', ':'))
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Scaling Models
+
+This module fits candidate growth models (linear, quadratic, n·log n, power-law,
+exponential) to per-size benchmark metrics, selects the best one with AICc or
+leave-one-out cross-validation, and produces prediction intervals for unseen sizes.
+
+All models are ordinary least squares fits on a transformed design. Models fitted
+in log-time space (power-law, exponential) and in time space (polynomials, n·log n)
+are made comparable by scoring every likelihood on the log-time scale (the
+Jacobian term sum(log y) is added to time-space likelihoods).
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+# name -> (design builder, fitted on log(time)?)
+SCALING_MODELS = {
+    'linear': (lambda n: np.column_stack([np.ones_like(n), n]), False),
+    'quadratic': (lambda n: np.column_stack([np.ones_like(n), n, n**2]), False),
+    'nlogn': (lambda n: np.column_stack([np.ones_like(n), n * np.log(n)]), False),
+    'power': (lambda n: np.column_stack([np.ones_like(n), np.log(n)]), True),
+    'exponential': (lambda n: np.column_stack([np.ones_like(n), n]), True),
+}
+
+SCALING_METRICS = ['mean', 'median', 'p95', 'p99']
+
+
+def fit_scaling_model(name: str, sizes: Sequence[float], values: Sequence[float]) -> Dict:
+    """
+    Fit one scaling model to per-size metric values.
+
+    Args:
+        name: Model name (see SCALING_MODELS)
+        sizes: Problem sizes (N for an NxN lottery)
+        values: Metric value per size (ms)
+
+    Returns:
+        Dictionary with coefficients, information criteria and the data needed
+        to compute prediction intervals (JSON-serializable)
+    """
+    if name not in SCALING_MODELS:
+        raise ValueError(f"Unknown scaling model: {name}")
+
+    build, log_space = SCALING_MODELS[name]
+    n = np.asarray(sizes, dtype=float)
+    y = np.asarray(values, dtype=float)
+
+    X = build(n)
+    k = X.shape[1]
+    if len(n) < k + 1:
+        raise ValueError(f"Model '{name}' needs at least {k + 1} sizes, got {len(n)}")
+
+    target = np.log(y) if log_space else y
+    coeffs, _, _, _ = np.linalg.lstsq(X, target, rcond=None)
+    residuals = target - X @ coeffs
+    rss = float(residuals @ residuals)
+    m = len(n)
+    dof = m - k
+
+    # Gaussian log-likelihood at the MLE variance, moved to the log-time scale
+    sigma2_mle = max(rss / m, 1e-300)
+    loglik = -0.5 * m * (np.log(2 * np.pi * sigma2_mle) + 1)
+    if not log_space:
+        loglik += float(np.sum(np.log(y)))
+
+    n_params = k + 1  # coefficients + residual variance
+    aic = 2 * n_params - 2 * loglik
+    if m - n_params - 1 > 0:
+        aicc = aic + 2 * n_params * (n_params + 1) / (m - n_params - 1)
+    else:
+        # Correction undefined: too few sizes for this many parameters
+        aicc = np.inf
+
+    xtx_inv = np.linalg.pinv(X.T @ X)
+
+    # Leave-one-out residuals via the hat matrix, scored in log-time space
+    hat = np.einsum('ij,jk,ik->i', X, xtx_inv, X)
+    loo_pred = target - residuals / np.clip(1 - hat, 1e-12, None)
+    if log_space:
+        loo_log_err = np.log(y) - loo_pred
+    else:
+        with np.errstate(invalid='ignore', divide='ignore'):
+            loo_log_err = np.where(loo_pred > 0, np.log(y) - np.log(loo_pred), np.inf)
+    loocv_rmse = float(np.sqrt(np.mean(loo_log_err**2)))
+
+    return {
+        'model': name,
+        'log_space': log_space,
+        'coeffs': coeffs.tolist(),
+        'sigma': float(np.sqrt(rss / dof)),
+        'dof': dof,
+        'xtx_inv': xtx_inv.tolist(),
+        'aic': float(aic),
+        'aicc': float(aicc),
+        'loocv_rmse': loocv_rmse,
+    }
+
+
+def select_scaling_model(
+    sizes: Sequence[float],
+    values: Sequence[float],
+    criterion: str = 'aicc',
+    models: Optional[List[str]] = None
+) -> Dict:
+    """
+    Fit every applicable model and select the best one.
+
+    Args:
+        sizes: Problem sizes
+        values: Metric value per size (ms)
+        criterion: 'aicc' (small-sample AIC) or 'loocv' (leave-one-out RMSE of log time)
+        models: Candidate model names (default: all models that fit the data)
+
+    Returns:
+        Dictionary with the best model name, the criterion, and all candidate
+        fits sorted best-first
+    """
+    if criterion not in ('aicc', 'loocv'):
+        raise ValueError(f"Unknown criterion: {criterion}")
+
+    values = np.asarray(values, dtype=float)
+    sizes = np.asarray(sizes, dtype=float)
+    valid = np.isfinite(values) & (values > 0)
+    sizes, values = sizes[valid], values[valid]
+
+    candidates = []
+    for name in models or SCALING_MODELS:
+        try:
+            candidates.append(fit_scaling_model(name, sizes, values))
+        except ValueError:
+            continue
+
+    if not candidates:
+        raise ValueError(f"Not enough sizes to fit a scaling model ({len(sizes)} usable)")
+
+    # Ties (e.g. AICc undefined for every candidate) are broken by plain AIC
+    key = 'aicc' if criterion == 'aicc' else 'loocv_rmse'
+    candidates.sort(key=lambda c: (c[key], c['aic']))
+
+    return {
+        'best': candidates[0]['model'],
+        'criterion': criterion,
+        'candidates': candidates,
+    }
+
+
+def predict_with_interval(fit: Dict, size: float, confidence: float = 0.90) -> Tuple[float, float, float]:
+    """
+    Predict a metric at a given size with a two-sided prediction interval.
+
+    Args:
+        fit: Model fit as returned by fit_scaling_model
+        size: Problem size to predict
+        confidence: Interval coverage (e.g. 0.90)
+
+    Returns:
+        Tuple of (prediction, lower bound, upper bound) in ms
+    """
+    value, lower, upper = predict_intervals(fit, [size], confidence)
+    return float(value[0]), float(lower[0]), float(upper[0])
+
+
+def predict_intervals(
+    fit: Dict,
+    sizes: Sequence[float],
+    confidence: float = 0.90
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Vectorized predict_with_interval over many sizes.
+
+    Returns:
+        Tuple of arrays (prediction, lower bound, upper bound) in ms
+    """
+    from scipy import stats as scipy_stats
+
+    build, log_space = SCALING_MODELS[fit['model']]
+    X0 = build(np.asarray(sizes, dtype=float))
+    xtx_inv = np.asarray(fit['xtx_inv'])
+
+    center = X0 @ np.asarray(fit['coeffs'])
+    se = fit['sigma'] * np.sqrt(1 + np.einsum('ij,jk,ik->i', X0, xtx_inv, X0))
+    t = float(scipy_stats.t.ppf(0.5 + confidence / 2, fit['dof']))
+
+    lower, upper = center - t * se, center + t * se
+    if log_space:
+        return np.exp(center), np.exp(lower), np.exp(upper)
+
+    return center, np.maximum(lower, 0.0), upper
+
+
+def evaluate_model(fit: Dict, sizes: Sequence[float]) -> np.ndarray:
+    """Evaluate a fitted model's point prediction at many sizes."""
+    build, log_space = SCALING_MODELS[fit['model']]
+    pred = build(np.asarray(sizes, dtype=float)) @ np.asarray(fit['coeffs'])
+    return np.exp(pred) if log_space else pred
@@ -0,0 +1,421 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Iteration-Series Analysis
+
+Tools for benchmark measurements as a series over iterations: runs execute
+one after another on the same machine, so contention, cron jobs or warm-up
+show up as structure along the iteration axis.
+
+Timeout patterns (timeout_patterns) are tested against the null model that
+every run times out independently with the file's timeout rate (a Bernoulli,
+i.e. discrete Poisson, process):
+
+  - runs of consecutive timeouts: longest run vs its null distribution
+  - bursts: clusters of timeouts that a scan test finds too dense
+  - dispersion: timeout counts per block vs binomial variance
+  - periodicity: periodogram (FFT) of the indicator series, Fisher's g test
+  - independence of iteration order: Wald-Wolfowitz runs test and a trend test
+
+Timing independence (iid_diagnostics) checks the assumption behind every
+per-file statistic, that iterations are independent draws:
+
+  - ACF (FFT) and PACF (Durbin-Levinson) of log(time_ms) over iteration
+  - Ljung-Box test of the first autocorrelations
+  - effective sample size n / (1 + 2 * sum of autocorrelations), truncated
+    with Geyer's initial positive sequence; quantile_ci() uses it in place of
+    n so that intervals widen when consecutive runs are correlated
+
+Rolling quantiles (rolling_quantiles) keep the window as a sorted list,
+updated with one bisect insertion and removal per run, so every window
+costs O(log w) comparisons (plus a memmove) instead of a re-sort; the
+quantiles are read off by index.
+
+Everything else is vectorized with numpy; autocorrelations use the FFT.
+"""
+
+import bisect
+
+import numpy as np
+from scipy import stats
+from typing import Dict, Optional, Sequence, Tuple
+
+
+def autocorrelation(x: np.ndarray, max_lag: Optional[int] = None) -> np.ndarray:
+    """
+    Sample autocorrelation function via the FFT.
+
+    Args:
+        x: Series (evenly spaced)
+        max_lag: Largest lag (default: n - 1)
+
+    Returns:
+        Array acf[0..max_lag] with acf[0] = 1 (all zeros for a constant series)
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    max_lag = n - 1 if max_lag is None else min(max_lag, n - 1)
+    centered = x - x.mean()
+    size = 1 << int(np.ceil(np.log2(max(2 * n - 1, 1))))
+    spectrum = np.fft.rfft(centered, size)
+    acov = np.fft.irfft(spectrum * np.conj(spectrum), size)[:max_lag + 1]
+    return acov / acov[0] if acov[0] > 0 else np.zeros(max_lag + 1)
+
+
+def run_lengths(indicator: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Runs of consecutive True values.
+
+    Returns:
+        (start positions, lengths)
+    """
+    padded = np.concatenate(([0], np.asarray(indicator, dtype=np.int8), [0]))
+    edges = np.flatnonzero(np.diff(padded))
+    starts, ends = edges[::2], edges[1::2]
+    return starts, ends - starts
+
+
+def longest_run_p_value(n: int, p: float, length: int) -> float:
+    """
+    P(longest run of successes >= length) in n Bernoulli(p) trials.
+
+    Poisson approximation of the number of runs of at least that length
+    (accurate for small p**length).
+    """
+    if length <= 0:
+        return 1.0
+    expected = p ** length * (1 + (n - length) * (1 - p)) if n >= length else 0.0
+    return float(-np.expm1(-expected))
+
+
+def runs_test(indicator: np.ndarray) -> Dict:
+    """
+    Wald-Wolfowitz runs test of a binary sequence.
+
+    Too few runs mean clustering, too many mean alternation.
+
+    Returns:
+        Dictionary with runs, expected_runs, z and two-sided p_value
+        (None values if the sequence is constant)
+    """
+    x = np.asarray(indicator, dtype=bool)
+    n1 = int(x.sum())
+    n0 = len(x) - n1
+    runs = int(1 + np.count_nonzero(x[1:] != x[:-1])) if len(x) else 0
+    if n0 == 0 or n1 == 0:
+        return {'runs': runs, 'expected_runs': None, 'z': None, 'p_value': None}
+
+    n = n0 + n1
+    expected = 1 + 2 * n0 * n1 / n
+    variance = 2 * n0 * n1 * (2 * n0 * n1 - n) / (n * n * (n - 1)) if n > 1 else 0.0
+    z = (runs - expected) / np.sqrt(variance) if variance > 0 else 0.0
+    return {'runs': runs, 'expected_runs': float(expected), 'z': float(z),
+            'p_value': float(2 * stats.norm.sf(abs(z)))}
+
+
+def fisher_g_test(power: np.ndarray) -> Tuple[float, float]:
+    """
+    Fisher's test for a hidden periodicity.
+
+    Args:
+        power: Periodogram ordinates (without frequency 0)
+
+    Returns:
+        (g = largest share of total power, p-value under white noise). The
+        p-value is the first term of Fisher's series, an upper bound that is
+        accurate wherever it is small.
+    """
+    m = len(power)
+    total = power.sum()
+    if m < 2 or total <= 0:
+        return 0.0, 1.0
+    g = float(power.max() / total)
+    return g, float(min(1.0, m * np.exp((m - 1) * np.log1p(-min(g, 1 - 1e-15)))))
+
+
+def periodogram(x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Periodogram of a demeaned series via the real FFT.
+
+    Returns:
+        (periods in samples, power), excluding frequency 0
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    power = np.abs(np.fft.rfft(x - x.mean())) ** 2 / max(n, 1)
+    frequencies = np.fft.rfftfreq(n)
+    return 1.0 / frequencies[1:], power[1:]
+
+
+def timeout_patterns(
+    iterations: np.ndarray,
+    is_timeout: np.ndarray,
+    alpha: float = 0.05,
+    block: Optional[int] = None
+) -> Dict:
+    """
+    Test whether timeouts cluster in bursts, recur periodically or depend on
+    iteration order.
+
+    Args:
+        iterations: Iteration numbers of all runs
+        is_timeout: Whether each run timed out
+        alpha: Significance level for reporting bursts and the period
+        block: Block length (runs) for the dispersion test
+            (default: about 20 blocks, at least 10 runs each)
+
+    Returns:
+        JSON-serializable dictionary with 'runs' (longest run and its p-value),
+        'bursts' (significant clusters), 'dispersion', 'periodicity' and
+        'independence' (runs and trend tests). Tests are None when every or
+        no run timed out.
+    """
+    order = np.argsort(iterations, kind='stable')
+    iterations = np.asarray(iterations)[order]
+    x = np.asarray(is_timeout, dtype=bool)[order]
+    n, k = len(x), int(x.sum())
+    p = k / n if n else 0.0
+
+    result = {'runs_total': n, 'timeouts': k, 'rate': p, 'testable': 0 < k < n,
+              'runs': None, 'bursts': [], 'dispersion': None, 'periodicity': None, 'independence': None}
+    if not result['testable']:
+        return result
+
+    # Runs of consecutive timeouts
+    starts, lengths = run_lengths(x)
+    longest = int(lengths.max())
+    result['runs'] = {
+        'count': int(len(lengths)),
+        'mean_length': float(lengths.mean()),
+        'expected_mean_length': float(1 / (1 - p)),
+        'longest': longest,
+        'longest_at_iteration': int(iterations[starts[np.argmax(lengths)]]),
+        'longest_p_value': longest_run_p_value(n, p, longest),
+    }
+
+    # Bursts: link timeouts closer than the lower quartile of the null gap
+    # (geometric), then scan-test each cluster's density
+    positions = np.flatnonzero(x)
+    max_gap = max(1, int(np.ceil(np.log(0.75) / np.log1p(-p)))) if p < 1 else 1
+    breaks = np.flatnonzero(np.diff(positions) > max_gap) + 1
+    cluster_starts = np.concatenate(([0], breaks))
+    cluster_ends = np.concatenate((breaks, [len(positions)])) - 1
+    counts = cluster_ends - cluster_starts + 1
+    spans = positions[cluster_ends] - positions[cluster_starts] + 1
+    candidates = counts >= 2
+    p_values = np.ones(len(counts))
+    p_values[candidates] = np.minimum(
+        1.0, (n - spans[candidates] + 1) * stats.binom.sf(counts[candidates] - 1, spans[candidates], p))
+    for i in np.flatnonzero(candidates & (p_values < alpha)):
+        result['bursts'].append({
+            'first_iteration': int(iterations[positions[cluster_starts[i]]]),
+            'last_iteration': int(iterations[positions[cluster_ends[i]]]),
+            'timeouts': int(counts[i]),
+            'span': int(spans[i]),
+            'rate': float(counts[i] / spans[i]),
+            'p_value': float(p_values[i]),
+        })
+
+    # Dispersion of per-block counts vs the binomial null
+    block = block or max(10, n // 20)
+    blocks = n // block
+    if blocks >= 2:
+        block_counts = x[:blocks * block].reshape(blocks, block).sum(axis=1)
+        statistic = float(np.sum((block_counts - block * p) ** 2) / (block * p * (1 - p)))
+        result['dispersion'] = {
+            'block': int(block),
+            'blocks': int(blocks),
+            'index': float(block_counts.var(ddof=1) / (block * p * (1 - p))),
+            'p_value': float(stats.chi2.sf(statistic, blocks - 1)),
+        }
+
+    # Periodicity of the indicator series
+    periods, power = periodogram(x)
+    if len(power) >= 2:
+        g, g_p_value = fisher_g_test(power)
+        peak = float(periods[np.argmax(power)])
+        # A pulse train spreads its power over harmonics: the period is the
+        # shortest multiple of the peak's period whose autocorrelation is near the strongest
+        acf = autocorrelation(x, max_lag=n // 2)
+        lags = np.unique(np.rint(peak * np.arange(1, int(n // 2 / peak) + 1)).astype(int))
+        lags = lags[(lags >= 1) & (lags < len(acf))]
+        lag = int(lags[np.argmax(acf[lags] >= 0.75 * acf[lags].max())]) if len(lags) else int(round(peak))
+        result['periodicity'] = {
+            'period': float(lag) if len(lags) else peak,
+            'spectral_peak': peak,
+            'power_share': g,
+            'p_value': g_p_value,
+            'significant': g_p_value < alpha,
+            'acf_at_period': float(acf[lag]) if lag < len(acf) else None,
+        }
+
+    # Independence of iteration order: clustering/alternation and drift
+    trend_r = float(np.corrcoef(np.arange(n), x)[0, 1]) if n > 2 else 0.0
+    trend_z = trend_r * np.sqrt(n - 1)
+    result['independence'] = {
+        'runs_test': runs_test(x),
+        'trend_z': float(trend_z),
+        'trend_p_value': float(2 * stats.norm.sf(abs(trend_z))),
+    }
+    return result
+
+
+def partial_autocorrelation(x: np.ndarray, max_lag: int) -> np.ndarray:
+    """
+    Partial autocorrelation function (Durbin-Levinson recursion on the FFT ACF).
+
+    Returns:
+        Array pacf[0..max_lag] with pacf[0] = 1
+    """
+    acf = autocorrelation(x, max_lag)
+    max_lag = len(acf) - 1
+    pacf = np.zeros(max_lag + 1)
+    pacf[0] = 1.0
+    phi = np.zeros(0)
+    for k in range(1, max_lag + 1):
+        denominator = 1.0 - np.dot(phi, acf[1:k])
+        value = (acf[k] - np.dot(phi, acf[k - 1:0:-1])) / denominator if denominator > 1e-12 else 0.0
+        phi = np.concatenate((phi - value * phi[::-1], [value]))
+        pacf[k] = value
+    return pacf
+
+
+def ljung_box(x: np.ndarray, lags: int = 20) -> Dict:
+    """
+    Ljung-Box test that the first autocorrelations are all zero.
+
+    Returns:
+        Dictionary with lags, statistic Q and p_value (chi-square, lags dof)
+    """
+    n = len(x)
+    lags = min(lags, n - 1)
+    if lags < 1:
+        return {'lags': 0, 'statistic': None, 'p_value': None}
+    acf = autocorrelation(x, lags)[1:]
+    statistic = float(n * (n + 2) * np.sum(acf ** 2 / (n - np.arange(1, lags + 1))))
+    return {'lags': int(lags), 'statistic': statistic, 'p_value': float(stats.chi2.sf(statistic, lags))}
+
+
+def effective_sample_size(x: np.ndarray) -> float:
+    """
+    Effective number of independent observations of an autocorrelated series.
+
+    n / (1 + 2 * sum(acf)), summing autocorrelations in pairs while the pair
+    sums stay positive (Geyer's initial positive sequence). Capped at n, so
+    negatively correlated series are treated as independent.
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if n < 4:
+        return float(n)
+    acf = autocorrelation(x)
+    pairs = acf[:2 * (n // 2)].reshape(-1, 2).sum(axis=1)
+    negative = np.flatnonzero(pairs <= 0)
+    positive = pairs[:negative[0]] if len(negative) else pairs
+    tau = -1.0 + 2.0 * positive.sum()
+    return float(np.clip(n / max(tau, 1.0), 1.0, n))
+
+
+def quantile_ci(
+    values: np.ndarray,
+    q: float,
+    confidence: float = 0.95,
+    ess: Optional[float] = None
+) -> Tuple[float, float, float]:
+    """
+    Distribution-free confidence interval of a quantile.
+
+    Order-statistic interval from the normal approximation of the binomial,
+    with the effective sample size in place of n when given.
+
+    Returns:
+        (estimate, lower, upper)
+    """
+    values = np.sort(np.asarray(values, dtype=float))
+    n = len(values)
+    if n == 0:
+        return float('nan'), float('nan'), float('nan')
+    ess = min(ess or n, n)
+    half = stats.norm.ppf(0.5 + confidence / 2) * np.sqrt(q * (1 - q) / ess)
+    estimate, lower, upper = np.quantile(values, [q, max(q - half, 0.0), min(q + half, 1.0)])
+    return float(estimate), float(lower), float(upper)
+
+
+def iid_diagnostics(x: np.ndarray, lags: int = 20) -> Dict:
+    """
+    Autocorrelation diagnostics of a measurement series.
+
+    Args:
+        x: Series in iteration order (e.g. log(time_ms) of solved runs)
+        lags: Lags for the Ljung-Box test
+
+    Returns:
+        Dictionary with n, acf_lag1, Ljung-Box lags, statistic and p-value, effective sample size and its ratio to n, and 'independent'
+        (Ljung-Box p >= 0.05)
+    """
+    x = np.asarray(x, dtype=float)
+    n = len(x)
+    if n < 4:
+        return {'n': n, 'acf_lag1': None, 'ljung_box_lags': 0, 'ljung_box_statistic': None,
+                'ljung_box_p_value': None, 'ess': float(n), 'ess_ratio': 1.0, 'independent': None}
+    acf = autocorrelation(x, 1)
+    test = ljung_box(x, lags)
+    ess = effective_sample_size(x)
+    return {
+        'n': n,
+        'acf_lag1': float(acf[1]),
+        'ljung_box_lags': test['lags'],
+        'ljung_box_statistic': test['statistic'],
+        'ljung_box_p_value': test['p_value'],
+        'ess': ess,
+        'ess_ratio': ess / n,
+        'independent': test['p_value'] >= 0.05,
+    }
+
+
+def rolling_quantiles(
+    x: np.ndarray,
+    window: int,
+    qs: Sequence[float] = (0.5, 0.95, 0.99),
+    min_periods: Optional[int] = None
+) -> np.ndarray:
+    """
+    Quantiles of a trailing sliding window.
+
+    Same values as pandas rolling(window).quantile(q) (linear interpolation)
+    for all quantiles in one pass over a sorted window.
+
+    Args:
+        x: Series in iteration order
+        window: Window length (runs)
+        qs: Quantiles in [0, 1]
+        min_periods: Runs needed for a value (default: window); earlier
+            windows are NaN
+
+    Returns:
+        Array of shape (len(x), len(qs))
+    """
+    values = np.asarray(x, dtype=float).tolist()
+    n = len(values)
+    min_periods = window if min_periods is None else max(1, min_periods)
+
+    def positions(m):
+        return [(int(q * (m - 1)), q * (m - 1) - int(q * (m - 1))) for q in qs]
+
+    full = positions(window)
+    sorted_window = []
+    flat = []
+    append, insort, bisect_left = flat.append, bisect.insort, bisect.bisect_left
+    nan_row = [np.nan] * len(qs)
+    for i, value in enumerate(values):
+        insort(sorted_window, value)
+        if i >= window:
+            del sorted_window[bisect_left(sorted_window, values[i - window])]
+        m = len(sorted_window)
+        if m < min_periods:
+            flat.extend(nan_row)
+            continue
+        for lo, frac in (full if m == window else positions(m)):
+            low = sorted_window[lo]
+            append(low + (sorted_window[lo + 1] - low) * frac if frac else low)
+    return np.array(flat, dtype=float).reshape(n, len(qs))
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Shard Merging
+
+Big campaigns are split across machines or processes, each writing its own
+CSV for the same (scenario, size), and `benchmark:glpk:retry` writes
+<name>_retry.csv next to the original, re-running failed specs under their
+original iteration number. This module combines such shards into one logical
+benchmark:
+
+  - Streaming k-way merge by iteration (heapq.merge). Files that restart
+    their iteration numbers, as appended reruns do, are split into sorted
+    segments first (one pass records the offset of each segment).
+  - Every row of a regular shard or appended segment is a run of its own,
+    even when iteration and spec repeat (identical and opposite scenarios
+    solve the same spec every time, and each worker counts from 1). Only a
+    row repeated verbatim in another regular shard - same iteration, spec
+    hash, time and status, as when workers overlap on an iteration range or
+    a shard was copied - is a duplicate of the run and collapsed.
+  - Rows of retry files are further attempts of the run with the same
+    (iteration, spec hash); a retry without such a run is kept as a run.
+    Each run is reduced to one row with a retry policy:
+      first: the original attempt (what the benchmark itself measured)
+      last:  the most recent attempt (latest retry)
+      best:  a SUCCESS if any attempt solved it (fastest), else the fastest failure
+  - Provenance columns record where the kept row came from:
+      source (file), attempts (rows collapsed), retry (1 if from a retry file)
+
+Shards are identified by filename: glpk_<scenario>_<size>[_<tag>].csv, where
+a tag containing 'retry' marks retry output and any other tag (e.g. a worker
+name) marks a regular shard.
+"""
+
+import csv
+import heapq
+import itertools
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from benchmark_catalog import resolve_file
+from benchmark_spec import spec_hash
+
+
+COLUMNS = ['size', 'scenario', 'iteration', 'time_ms', 'status', 'error', 'spec', 'result']
+PROVENANCE_COLUMNS = ['source', 'attempts', 'retry']
+POLICIES = ('first', 'last', 'best')
+
+# Rows read per open of a segment
+SEGMENT_CHUNK_ROWS = 4096
+
+
+def is_retry_file(path: str) -> bool:
+    """Whether a file is `benchmark:glpk:retry` output (by filename tag)."""
+    tag = resolve_file(path)['tag'] if Path(path).stem.startswith('glpk_') else None
+    return bool(tag and 'retry' in tag)
+
+
+def group_shards(csv_paths: List[str]) -> Dict[Tuple[str, int], List[Path]]:
+    """
+    Group shard files by (scenario, size), regular shards before retry files.
+
+    Args:
+        csv_paths: Paths to benchmark CSV files
+
+    Returns:
+        Ordered dictionary (scenario, size) -> list of paths
+    """
+    groups = OrderedDict()
+    for path in sorted(map(Path, csv_paths), key=lambda p: (is_retry_file(p), p.name)):
+        entry = resolve_file(path)
+        groups.setdefault((entry['scenario'], entry['size']), []).append(path)
+    return OrderedDict(sorted(groups.items()))
+
+
+def _segments(path: Path) -> Tuple[List[str], List[Tuple[int, int, int]]]:
+    """
+    Header and segments of a file in which iteration numbers never decrease.
+
+    Returns:
+        (fieldnames, [(file offset, first row index, row count), ...])
+    """
+    bounds = []
+    with open(path, newline='') as f:
+        # readline() keeps tell() usable; csv pulls exactly the lines of one record
+        lines = iter(f.readline, '')
+        reader = csv.reader(lines)
+        fieldnames = next(reader, [])
+        column = fieldnames.index('iteration') if 'iteration' in fieldnames else 2
+        offset = f.tell()
+        previous = None
+        count = 0
+        for row in reader:
+            iteration = int(row[column])
+            if previous is None or iteration < previous:
+                bounds.append([offset, count, 0])
+            bounds[-1][2] += 1
+            previous = iteration
+            count += 1
+            offset = f.tell()
+    return fieldnames, [tuple(b) for b in bounds]
+
+
+def _tagged(path: Path, fieldnames: List[str], shard_order: int, retry: bool,
+            offset: int, first: int, rows: int) -> Iterator[Tuple]:
+    """Rows of one segment as (iteration, shard order, row index, file, retry, row)."""
+    index = first
+    stop = first + rows
+    while index < stop:
+        # Reopen per chunk so files with many segments do not hold one descriptor each
+        with open(path, newline='') as f:
+            f.seek(offset)
+            reader = csv.DictReader(iter(f.readline, ''), fieldnames=fieldnames)
+            chunk = list(itertools.islice(reader, min(SEGMENT_CHUNK_ROWS, stop - index)))
+            offset = f.tell()
+        if not chunk:
+            return
+        for row in chunk:
+            yield int(row['iteration']), shard_order, index, path.name, retry, row
+            index += 1
+
+
+def _streams(paths: List[Path]) -> List[Iterator]:
+    """One iteration-sorted stream per file segment, tagged with ordering keys."""
+    streams = []
+    for shard_order, path in enumerate(paths):
+        retry = is_retry_file(path)
+        fieldnames, segments = _segments(path)
+        for offset, first, rows in segments:
+            streams.append(_tagged(path, fieldnames, shard_order, retry, offset, first, rows))
+    return streams
+
+
+def _choose(attempts: List[Tuple], policy: str) -> Tuple:
+    """Pick one attempt of a run according to the retry policy."""
+    if policy == 'first':
+        return attempts[0]
+    if policy == 'last':
+        return attempts[-1]
+    return min(attempts, key=lambda a: (a[5]['status'] != 'SUCCESS', float(a[5]['time_ms'])))
+
+
+def merge_shards(
+    csv_paths: List[str],
+    policy: str = 'first',
+    stats: Optional[Dict] = None
+) -> Iterator[Dict]:
+    """
+    Stream the merged rows of shards of one logical benchmark.
+
+    Args:
+        csv_paths: Shard files (regular and retry) of the same scenario and size
+        policy: Retry policy: 'first', 'last' or 'best'
+        stats: Optional dictionary updated with rows_in, rows_out,
+            duplicates (rows repeated in another regular shard),
+            retry_attempts (retry rows attached to a run) and retried (runs
+            with a retry) counters
+
+    Yields:
+        Row dictionaries (CSV columns plus provenance columns) in iteration order
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown retry policy: {policy} (expected one of {', '.join(POLICIES)})")
+
+    # Regular shards first so 'first' means the original attempt
+    paths = sorted(map(Path, csv_paths), key=lambda p: (is_retry_file(p), p.name))
+    counters = stats if stats is not None else {}
+    for key in ('rows_in', 'rows_out', 'duplicates', 'retry_attempts', 'retried'):
+        counters.setdefault(key, 0)
+
+    merged = heapq.merge(*_streams(paths), key=lambda item: item[:3])
+    for _, group in itertools.groupby(merged, key=lambda item: item[0]):
+        runs = []
+        originals = {}
+        recorded = {}
+        for item in group:
+            row = item[5]
+            counters['rows_in'] += 1
+            # Rows without a spec cannot be matched to other attempts
+            key = spec_hash(row['spec']) if row.get('spec') else (item[3], item[2])
+            if item[4]:
+                if key in originals:
+                    originals[key].append(item)
+                    counters['retry_attempts'] += 1
+                    continue
+            else:
+                # The same measurement in another regular shard is one run, not two
+                same = recorded.get((key, row['time_ms'], row['status']))
+                if same is not None and item[3] not in {a[3] for a in same}:
+                    same.append(item)
+                    counters['duplicates'] += 1
+                    continue
+            runs.append([item])
+            # Retries attach to the first run of their spec in this iteration
+            originals.setdefault(key, runs[-1])
+            if not item[4]:
+                recorded.setdefault((key, row['time_ms'], row['status']), runs[-1])
+
+        for attempts in runs:
+            chosen = _choose(attempts, policy)
+            counters['rows_out'] += 1
+            counters['retried'] += int(any(a[4] for a in attempts))
+
+            row = {col: chosen[5].get(col, '') for col in COLUMNS}
+            row.update(source=chosen[3], attempts=len(attempts), retry=int(chosen[4]))
+            yield row
+
+
+def load_merged(csv_paths: List[str], policy: str = 'first') -> pd.DataFrame:
+    """
+    Load the merged view of shards as a DataFrame (no merged copy on disk).
+
+    Args:
+        csv_paths: Shard files of the same scenario and size
+        policy: Retry policy: 'first', 'last' or 'best'
+
+    Returns:
+        DataFrame with the benchmark columns plus provenance columns
+    """
+    df = pd.DataFrame(list(merge_shards(csv_paths, policy)), columns=COLUMNS + PROVENANCE_COLUMNS)
+    return df.astype({'size': 'int64', 'iteration': 'int64', 'time_ms': 'float64',
+                      'attempts': 'int64', 'retry': 'int64'})
+
+
+def write_merged(csv_paths: List[str], output_path: str, policy: str = 'first') -> Dict:
+    """
+    Write the merged shards to a CSV file, streaming row by row.
+
+    Args:
+        csv_paths: Shard files of the same scenario and size
+        output_path: Destination CSV
+        policy: Retry policy: 'first', 'last' or 'best'
+
+    Returns:
+        Merge counters (rows_in, rows_out, duplicates, retry_attempts, retried)
+    """
+    stats = {}
+    with open(output_path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS + PROVENANCE_COLUMNS)
+        writer.writeheader()
+        for row in merge_shards(csv_paths, policy, stats):
+            writer.writerow(row)
+    return stats
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Lottery Spec Features
+
+`BenchmarkGlpkBase::recordResult` writes the lottery spec of every run as
+JSON ({"units": [unit_id, ...], "preferences": {family_id: [unit_id, ...]}},
+each preference list ordered from most to least wanted) and, for solved runs,
+the solver's picks ({family_id: unit_id}). This module turns them into a
+fixed set of numeric features.
+
+Spec features:
+  units, families, family_unit_ratio
+  pref_density            preference entries / (families x units)
+  short_list_share        families that did not rank every unit
+  first_choice_entropy    entropy of first choices / log(units) (0 = all want one unit)
+  first_choice_max_share  largest share of families with the same first choice
+  first_choice_conflicts  families whose first choice someone else also wants first
+  top_entropy             same as first_choice_entropy over each family's top fifth
+  rank_agreement          1 - mean variance of a unit's rank across families,
+                          relative to random rankings (1 = everyone agrees)
+  duplicate_list_share    1 - distinct preference lists / families
+  largest_tie_share       largest group of families with identical lists / families
+
+Result features (NaN without picks):
+  picks_assigned          assigned families / families
+  pick_rank_mean          mean 1-based rank of the picked unit in the family's list
+  pick_rank_max           worst rank any family got
+  pick_first_share        families that got their first choice
+
+The module only uses the standard library (and orjson when installed) so it
+can run in worker processes and in latency-sensitive callers without pandas.
+"""
+
+import hashlib
+import math
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import orjson
+
+    def loads(text: str):
+        """Decode a JSON string (orjson)."""
+        return orjson.loads(text)
+except ImportError:
+    import json
+
+    def loads(text: str):
+        """Decode a JSON string (standard library fallback)."""
+        return json.loads(text)
+
+
+SPEC_FEATURES = [
+    'units', 'families', 'family_unit_ratio', 'pref_density', 'short_list_share',
+    'first_choice_entropy', 'first_choice_max_share', 'first_choice_conflicts', 'top_entropy',
+    'rank_agreement', 'duplicate_list_share', 'largest_tie_share',
+]
+
+RESULT_FEATURES = ['picks_assigned', 'pick_rank_mean', 'pick_rank_max', 'pick_first_share']
+
+NAN = float('nan')
+
+
+def spec_hash(spec: str) -> str:
+    """Short stable hash of a spec JSON string."""
+    return hashlib.sha1(spec.encode()).hexdigest()[:16]
+
+
+def _normalized_entropy(counts: Counter, categories: int) -> float:
+    """Shannon entropy of counts divided by log(categories)."""
+    total = sum(counts.values())
+    if total == 0 or categories <= 1:
+        return 0.0
+    entropy = -sum(c / total * math.log(c / total) for c in counts.values())
+    return max(entropy, 0.0) / math.log(categories)
+
+
+def spec_features(spec: Dict) -> List[float]:
+    """
+    Compute the spec features of a decoded spec.
+
+    Args:
+        spec: Decoded spec JSON with 'units' and 'preferences' (or the older 'families')
+
+    Returns:
+        Feature values in SPEC_FEATURES order
+    """
+    units = spec.get('units') or []
+    preferences = spec.get('preferences', spec.get('families')) or {}
+    lists = list(preferences.values()) if isinstance(preferences, dict) else list(preferences)
+
+    n_units = len(units)
+    n_families = len(lists)
+    if n_units == 0 or n_families == 0:
+        return [float(n_units), float(n_families)] + [NAN] * (len(SPEC_FEATURES) - 2)
+
+    entries = sum(len(prefs) for prefs in lists)
+    first = Counter(prefs[0] for prefs in lists if prefs)
+    top = Counter(unit for prefs in lists for unit in prefs[:max(1, math.ceil(len(prefs) / 5))])
+
+    # Rank variance per unit; a unit listed twice keeps its first rank and
+    # unranked units count as ranked after the whole list. Only rank sums need
+    # a pass over the lists: the sum of squared ranks of a list of length L
+    # is closed-form.
+    known = set(units)
+    ranked_lists = lists
+    if not all(len(ranked) == len(prefs) and known.issuperset(ranked)
+               for prefs, ranked in ((prefs, set(prefs)) for prefs in lists)):
+        ranked_lists = [list(dict.fromkeys(unit for unit in prefs if unit in known)) for prefs in lists]
+    sums = dict.fromkeys(units, 0)
+    squares = 0
+    for prefs in ranked_lists:
+        length = len(prefs)
+        for rank, unit in enumerate(prefs):
+            sums[unit] += rank
+        if length < n_units:
+            for unit in known.difference(prefs):
+                sums[unit] += length
+        squares += (length - 1) * length * (2 * length - 1) // 6 + (n_units - length) * length * length
+    mean_variance = (squares / n_families - sum((v / n_families) ** 2 for v in sums.values())) / n_units
+    uniform = (n_units * n_units - 1) / 12
+    agreement = 1.0 - mean_variance / uniform if uniform > 0 else 1.0
+
+    groups = Counter(tuple(prefs) for prefs in lists)
+
+    return [
+        float(n_units),
+        float(n_families),
+        n_families / n_units,
+        entries / (n_families * n_units),
+        sum(len(prefs) < n_units for prefs in lists) / n_families,
+        _normalized_entropy(first, n_units),
+        max(first.values()) / n_families if first else NAN,
+        sum(c for c in first.values() if c > 1) / n_families,
+        _normalized_entropy(top, n_units),
+        agreement,
+        1.0 - len(groups) / n_families,
+        max(groups.values()) / n_families,
+    ]
+
+
+def result_features(spec: Dict, result: Optional[Dict]) -> List[float]:
+    """
+    Compute the pick-assignment features of a run.
+
+    Args:
+        spec: Decoded spec JSON
+        result: Decoded result JSON (family_id -> unit_id), or None
+
+    Returns:
+        Feature values in RESULT_FEATURES order (NaN without a result)
+    """
+    preferences = spec.get('preferences', spec.get('families')) or {}
+    if not result or not isinstance(result, dict) or not isinstance(preferences, dict) or not preferences:
+        return [NAN] * len(RESULT_FEATURES)
+
+    ranks = []
+    for family, unit in result.items():
+        prefs = preferences.get(str(family), preferences.get(family, []))
+        ranks.append(prefs.index(unit) + 1 if unit in prefs else len(prefs) + 1)
+
+    if not ranks:
+        return [0.0, NAN, NAN, NAN]
+    return [
+        len(ranks) / len(preferences),
+        sum(ranks) / len(ranks),
+        float(max(ranks)),
+        sum(rank == 1 for rank in ranks) / len(ranks),
+    ]
+
+
+def decode_spec(spec_json: str, results: List[str]) -> Tuple[str, List[float], List[List[float]]]:
+    """
+    Decode one spec and the results of every run that used it.
+
+    Args:
+        spec_json: Spec JSON string from the CSV
+        results: Result JSON strings (empty for unsolved runs)
+
+    Returns:
+        Tuple of (spec hash, spec features, result features per run)
+    """
+    try:
+        spec = loads(spec_json) if spec_json else {}
+    except ValueError:
+        spec = {}
+    if not isinstance(spec, dict):
+        spec = {}
+
+    decoded = []
+    for result_json in results:
+        try:
+            result = loads(result_json) if result_json else None
+        except ValueError:
+            result = None
+        decoded.append(result_features(spec, result))
+
+    return spec_hash(spec_json) if spec_json else '', spec_features(spec), decoded
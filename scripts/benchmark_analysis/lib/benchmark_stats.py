@@ -10,10 +10,18 @@ success rates, and timeout analysis.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from pathlib import Path
 import json
 
+from benchmark_errors import DEFAULT_STATUSES, error_signatures
+from benchmark_outliers import DEFAULT_WINDOW, detect_outliers
+from benchmark_series import (
+    effective_sample_size, iid_diagnostics, quantile_ci, rolling_quantiles, timeout_patterns,
+)
+from benchmark_survival import infer_timeout_ms, km_percentiles
+from benchmark_dataset import BenchmarkDataset
+
 
 class BenchmarkAnalyzer:
     """
@@ -23,15 +31,19 @@ class BenchmarkAnalyzer:
     time distributions, success rates, timeout patterns, and outlier detection.
     """
 
-    def __init__(self, csv_path: str):
+    def __init__(self, csv_path: str, timeout_ms: Optional[float] = None, df: Optional[pd.DataFrame] = None):
         """
         Initialize analyzer with a benchmark CSV file.
 
         Args:
             csv_path: Path to the benchmark CSV file
+            timeout_ms: Solver timeout the benchmark ran with (censoring point for
+                TIMEOUT rows). If None, each timeout is censored at its measured time.
+            df: Rows of the file when already loaded (the file is not read again)
         """
         self.csv_path = Path(csv_path)
-        self.df = pd.read_csv(csv_path)
+        self.timeout_ms = timeout_ms
+        self.df = pd.read_csv(csv_path) if df is None else df
         self._validate_data()
 
     def _validate_data(self):
@@ -54,6 +66,9 @@ class BenchmarkAnalyzer:
                 - time_max: Maximum time (ms)
                 - time_p25, time_p50, time_p75: Quartiles
                 - time_p90, time_p95, time_p99: High percentiles
+                - time_km_p50, time_km_p90, time_km_p95, time_km_p99: Censoring-aware
+                  (Kaplan-Meier) percentiles treating TIMEOUT rows as right-censored;
+                  None when the survival curve never drops that low
                 - success_rate: Proportion of successful runs
                 - timeout_rate: Proportion of timeouts
                 - failed_rate: Proportion of failures
@@ -103,6 +118,9 @@ class BenchmarkAnalyzer:
         # Interquartile range
         stats['time_iqr'] = stats['time_p75'] - stats['time_p25']
 
+        # Censoring-aware percentiles (TIMEOUT rows count as "at least timeout")
+        stats.update(km_percentiles(self.df, self.timeout_ms))
+
         # Skewness (if scipy available)
         try:
             from scipy import stats as scipy_stats
@@ -122,7 +140,10 @@ class BenchmarkAnalyzer:
                 - timeout_iterations: List of iterations that timed out
                 - timeout_count: Total number of timeouts
                 - first_timeout: Iteration number of first timeout
-                - timeout_clustering: Analysis of temporal clustering
+                - timeout_gaps_*: Gaps between consecutive timeouts
+                - patterns: Bursts, longest run, dispersion, periodicity and
+                  independence tests against independent timeouts (see
+                  benchmark_series.timeout_patterns)
         """
         timeouts = self.df[self.df['status'] == 'TIMEOUT']
         timeout_iters = sorted(timeouts['iteration'].tolist())
@@ -141,39 +162,114 @@ class BenchmarkAnalyzer:
             result['timeout_gaps_min'] = int(np.min(gaps))
             result['timeout_gaps_max'] = int(np.max(gaps))
 
+        if timeout_iters:
+            result['patterns'] = timeout_patterns(
+                self.df['iteration'].to_numpy(), (self.df['status'] == 'TIMEOUT').to_numpy())
+
         return result
 
-    def detect_outliers(self, method: str = 'iqr', threshold: float = 1.5) -> pd.DataFrame:
+    def solved_log_times(self) -> np.ndarray:
+        """log(time_ms) of solved runs in iteration order."""
+        solved = self.df[(self.df['status'] == 'SUCCESS') & (self.df['time_ms'] > 0)]
+        return np.log(solved.sort_values('iteration', kind='stable')['time_ms'].to_numpy(dtype=float))
+
+    def rolling_quantiles(self, window: int = 100, qs: Sequence[float] = (0.5, 0.95, 0.99)) -> pd.DataFrame:
         """
-        Detect outlier execution times.
+        Percentiles of run times over a trailing window of iterations.
+
+        Timeouts stay in the window at the solver timeout (censored), so a
+        stretch of timeouts raises the bands instead of dropping out of them;
+        a percentile at the timeout means at least that slow. Failed and
+        infeasible runs are left out.
 
         Args:
-            method: Detection method ('iqr' or 'zscore')
-            threshold: Threshold for outlier detection (1.5 for IQR, 3 for zscore)
+            window: Window length (solved and timed-out runs)
+            qs: Quantiles (0.95 = P95)
 
         Returns:
-            DataFrame of outlier rows
+            DataFrame indexed by iteration with one column per quantile
+            (p50, p95, p99, ...); the first window - 1 rows are NaN
         """
-        successful = self.df[self.df['status'] == 'SUCCESS'].copy()
-        times = successful['time_ms']
+        timed = self.df[self.df['status'].isin(['SUCCESS', 'TIMEOUT'])].sort_values('iteration', kind='stable')
+        times = timed['time_ms'].to_numpy(dtype=float)
+        timeouts = (timed['status'] == 'TIMEOUT').to_numpy()
+        if timeouts.any():
+            # Only timed-out runs are set to the limit; solved times are kept as recorded
+            times = np.where(timeouts, self.timeout_ms or infer_timeout_ms(self.df), times)
+        bands = rolling_quantiles(times, window, qs)
+        return pd.DataFrame(bands, index=pd.Index(timed['iteration'].to_numpy(), name='iteration'),
+                            columns=[f"p{q * 100:g}" for q in qs])
+
+    def independence_diagnostics(self, lags: int = 20) -> Dict:
+        """
+        Check that consecutive iterations are independent.
 
-        if method == 'iqr':
-            q1 = times.quantile(0.25)
-            q3 = times.quantile(0.75)
-            iqr = q3 - q1
-            lower = q1 - threshold * iqr
-            upper = q3 + threshold * iqr
-            outliers = successful[(times < lower) | (times > upper)]
+        Computed on log(time_ms) of solved runs in iteration order.
 
-        elif method == 'zscore':
-            from scipy import stats
-            z_scores = np.abs(stats.zscore(times))
-            outliers = successful[z_scores > threshold]
+        Args:
+            lags: Lags for the Ljung-Box test
 
-        else:
-            raise ValueError(f"Unknown method: {method}")
+        Returns:
+            Dictionary with lag-1 autocorrelation, Ljung-Box statistic and
+            p-value, effective sample size and its ratio to the run count
+            (see benchmark_series.iid_diagnostics)
+        """
+        return iid_diagnostics(self.solved_log_times(), lags)
+
+    def percentile_ci(self, q: float = 0.5, confidence: float = 0.95, autocorrelation: bool = True) -> Dict:
+        """
+        Distribution-free confidence interval of a percentile of solved-run times.
+
+        Args:
+            q: Quantile (0.5 = median, 0.95 = P95)
+            confidence: Interval coverage
+            autocorrelation: Use the effective sample size instead of the run
+                count, widening the interval when iterations are correlated
 
-        return outliers.sort_values('time_ms', ascending=False)
+        Returns:
+            Dictionary with value, lower, upper (ms), n and the sample size used
+        """
+        log_times = self.solved_log_times()
+        ess = effective_sample_size(log_times) if autocorrelation and len(log_times) else len(log_times)
+        value, lower, upper = quantile_ci(np.exp(log_times), q, confidence, ess)
+        return {'q': q, 'value': value, 'lower': lower, 'upper': upper,
+                'confidence': confidence, 'n': len(log_times), 'ess': float(ess)}
+
+    def error_signatures(self, statuses: Optional[Tuple[str, ...]] = DEFAULT_STATUSES) -> pd.DataFrame:
+        """
+        Cluster error messages into normalized signatures.
+
+        Args:
+            statuses: Statuses to include (default FAILED; None for every row with an error)
+
+        Returns:
+            DataFrame with one row per signature: count, share, statuses,
+            first/last iteration, per-size counts and an example message
+            (see benchmark_errors.error_signatures)
+        """
+        return error_signatures(self.df, statuses)
+
+    def detect_outliers(self, method: str = 'iqr', threshold: Optional[float] = None,
+                        noise_ratio: Optional[float] = None, log_space: bool = False,
+                        window: int = DEFAULT_WINDOW) -> pd.DataFrame:
+        """
+        Detect outlier execution times.
+
+        Args:
+            method: Detection method ('iqr', 'zscore', 'mad' or 'rolling', see
+                benchmark_outliers)
+            threshold: Threshold for outlier detection (default 1.5 for IQR,
+                3 for zscore, 3.5 for mad and rolling)
+            noise_ratio: Measurement noise floor as a time ratio (see
+                benchmark_noise.noise_floor); runs within expected / ratio and
+                expected * ratio are never outliers
+            log_space: Detect on log(time_ms)
+            window: Sliding-window length (runs) for the rolling method
+
+        Returns:
+            DataFrame of outlier rows with outlier_score and expected_ms
+        """
+        return detect_outliers(self.df, method, threshold, log_space, window, noise_ratio=noise_ratio)
 
     def get_time_distribution(self, bins: int = 50) -> Tuple[np.ndarray, np.ndarray]:
         """
@@ -224,6 +320,12 @@ Percentiles (ms):
   P95:         {stats['time_p95']:>12.2f}
   P99:         {stats['time_p99']:>12.2f}
 
+Censoring-aware Percentiles (ms, timeouts as censored):
+  KM P50:      {_format_ms(stats['time_km_p50']):>12}
+  KM P90:      {_format_ms(stats['time_km_p90']):>12}
+  KM P95:      {_format_ms(stats['time_km_p95']):>12}
+  KM P99:      {_format_ms(stats['time_km_p99']):>12}
+
 Status Breakdown:
   SUCCESS:     {stats['success_count']:>6} ({stats['success_rate']:>6.2%})
   TIMEOUT:     {stats['timeout_count']:>6} ({stats['timeout_rate']:>6.2%})
@@ -231,6 +333,21 @@ Status Breakdown:
   INFEASIBLE:  {stats['infeasible_count']:>6} ({stats['infeasible_rate']:>6.2%})
 """
 
+        # Independence of iterations and intervals that account for it
+        diagnostics = self.independence_diagnostics()
+        if diagnostics['ljung_box_p_value'] is not None:
+            verdict = 'independent' if diagnostics['independent'] else 'AUTOCORRELATED'
+            summary += f"""
+Iteration Independence (log time of solved runs):
+  Lag-1 ACF:   {diagnostics['acf_lag1']:>12.3f}
+  Ljung-Box:   {diagnostics['ljung_box_p_value']:>12.3g}  (p, {diagnostics['ljung_box_lags']} lags: {verdict})
+  Effective n: {diagnostics['ess']:>12.0f}  ({diagnostics['ess_ratio']:.0%} of {diagnostics['n']})
+"""
+            for q in (0.5, 0.95):
+                ci = self.percentile_ci(q)
+                summary += (f"  P{q * 100:.0f} 95% CI:  {ci['lower']:>10.2f} - {ci['upper']:.2f} ms "
+                            f"(effective n {ci['ess']:.0f})\n")
+
         # Add timeout analysis if any exist
         if stats['timeout_count'] > 0:
             timeout_info = self.analyze_timeouts()
@@ -243,6 +360,7 @@ Timeout Analysis:
                 summary += f"""  Mean gap between timeouts: {timeout_info['timeout_gaps_mean']:.1f}
   Median gap: {timeout_info['timeout_gaps_median']:.1f}
 """
+            summary += format_timeout_patterns(timeout_info.get('patterns'))
 
         return summary
 
@@ -258,31 +376,55 @@ Timeout Analysis:
         timeouts.to_csv(output_path, index=False)
 
 
-def compare_sizes(csv_paths: List[str]) -> pd.DataFrame:
+def format_timeout_patterns(patterns: Optional[Dict]) -> str:
+    """Burst, periodicity and independence lines for the summary text."""
+    if not patterns or not patterns['testable']:
+        return ""
+
+    runs = patterns['runs']
+    lines = [f"  Longest timeout run: {runs['longest']} at iteration {runs['longest_at_iteration']} "
+             f"(p={runs['longest_p_value']:.3g} if independent)"]
+    if patterns['bursts']:
+        lines.append(f"  Bursts: {len(patterns['bursts'])} ("
+                     + ', '.join(f"{b['first_iteration']}-{b['last_iteration']}: {b['timeouts']}"
+                                 for b in patterns['bursts'][:5])
+                     + (', ...' if len(patterns['bursts']) > 5 else '') + ")")
+    else:
+        lines.append("  Bursts: none")
+    if patterns['dispersion']:
+        dispersion = patterns['dispersion']
+        lines.append(f"  Dispersion index: {dispersion['index']:.2f} per {dispersion['block']} runs "
+                     f"(p={dispersion['p_value']:.3g})")
+    if patterns['periodicity']:
+        periodicity = patterns['periodicity']
+        verdict = 'periodic' if periodicity['significant'] else 'no significant period'
+        lines.append(f"  Periodicity: {verdict}, strongest period {periodicity['period']:.1f} runs "
+                     f"(p={periodicity['p_value']:.3g})")
+    runs_test = patterns['independence']['runs_test']
+    lines.append(f"  Order independence: runs test p={runs_test['p_value']:.3g}, "
+                 f"trend p={patterns['independence']['trend_p_value']:.3g}")
+    return '\n'.join(lines) + '\n'
+
+
+def _format_ms(value: Optional[float]) -> str:
+    """Format a possibly-undefined time for the summary text."""
+    return f"{value:.2f}" if value is not None else "> timeout"
+
+
+def compare_sizes(csv_paths: List[str], merge_policy: Optional[str] = None) -> pd.DataFrame:
     """
     Compare statistics across multiple benchmark files (typically different sizes).
 
     Args:
         csv_paths: List of paths to benchmark CSV files
+        merge_policy: Merge shards/retry files per (scenario, size) with this
+            retry policy ('first', 'last', 'best'); None pools all rows
 
     Returns:
-        DataFrame with comparative statistics
+        DataFrame with comparative statistics, one row per (scenario, size)
     """
-    results = []
-
-    for path in csv_paths:
-        analyzer = BenchmarkAnalyzer(path)
-        stats = analyzer.compute_stats()
-
-        # Add identifiers
-        stats['file'] = Path(path).name
-        stats['size'] = analyzer.df['size'].iloc[0]
-        stats['scenario'] = analyzer.df['scenario'].iloc[0]
-
-        results.append(stats)
-
-    df = pd.DataFrame(results)
-    return df.sort_values('size')
+    df = BenchmarkDataset(csv_paths, merge_policy=merge_policy).stats()
+    return df.sort_values('size', kind='stable')
 
 
 if __name__ == '__main__':
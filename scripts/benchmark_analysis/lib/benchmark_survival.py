@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Benchmark Survival Analysis
+
+This module treats solver time as a time-to-event ("time to solve") and TIMEOUT
+rows as right-censored observations: we know the solver needed *at least* the
+timeout, not how long it would really have taken. Dropping those rows (as plain
+percentiles do) biases every statistic low exactly when the solver struggles.
+
+Provides:
+  - Kaplan-Meier estimate of the time-to-solve distribution
+  - Censoring-aware percentiles
+  - A log-normal accelerated failure time (AFT) model across sizes,
+    log(T) = b0 + b1*log(size) + sigma*eps, used to predict timeout
+    probabilities and percentiles at unseen sizes
+
+FAILED and INFEASIBLE rows are excluded: they end for reasons unrelated to
+solve time (competing events), so they are neither solves nor censored solves.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence, Tuple
+
+
+# Default of `php artisan benchmark:glpk --timeout` (seconds)
+DEFAULT_TIMEOUT_MS = 30_000.0
+
+
+def infer_timeout_ms(df: pd.DataFrame) -> float:
+    """
+    Infer the configured solver timeout from benchmark rows.
+
+    The CSV does not record the timeout, but TIMEOUT rows end right after it
+    expires, so their median wall time is a good estimate. Falls back to the
+    benchmark command's default when the file has no timeouts.
+    """
+    timeouts = df.loc[df['status'] == 'TIMEOUT', 'time_ms']
+    if timeouts.empty:
+        return DEFAULT_TIMEOUT_MS
+    return float(timeouts.median())
+
+
+def survival_data(df: pd.DataFrame, timeout_ms: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Extract (duration, event) pairs from benchmark rows.
+
+    Args:
+        df: Benchmark rows
+        timeout_ms: Configured timeout; TIMEOUT rows are censored here.
+            If None, each TIMEOUT row is censored at its own measured time.
+
+    Returns:
+        Tuple of (durations in ms, event indicator: 1=solved, 0=censored)
+    """
+    rows = df[df['status'].isin(['SUCCESS', 'TIMEOUT'])]
+    events = (rows['status'] == 'SUCCESS').to_numpy(dtype=np.int8)
+    durations = rows['time_ms'].to_numpy(dtype=float).copy()
+
+    if timeout_ms is not None:
+        durations[events == 0] = timeout_ms
+
+    return durations, events
+
+
+def kaplan_meier(durations: Sequence[float], events: Sequence[int]) -> pd.DataFrame:
+    """
+    Kaplan-Meier estimate of the survival function S(t) = P(T > t).
+
+    Args:
+        durations: Observed times (ms)
+        events: 1 where the solve was observed, 0 where censored
+
+    Returns:
+        DataFrame with one row per distinct time: time, at_risk, events,
+        censored, survival and Greenwood standard error
+    """
+    durations = np.asarray(durations, dtype=float)
+    events = np.asarray(events, dtype=np.int64)
+
+    times, inverse = np.unique(durations, return_inverse=True)
+    observed = np.bincount(inverse, weights=events, minlength=len(times))
+    removed = np.bincount(inverse, minlength=len(times)).astype(float)
+    at_risk = len(durations) - np.concatenate(([0.0], np.cumsum(removed)[:-1]))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        survival = np.cumprod(1.0 - observed / at_risk)
+        greenwood = np.cumsum(np.where(at_risk > observed,
+                                       observed / (at_risk * (at_risk - observed)), 0.0))
+
+    return pd.DataFrame({
+        'time': times,
+        'at_risk': at_risk.astype(int),
+        'events': observed.astype(int),
+        'censored': (removed - observed).astype(int),
+        'survival': survival,
+        'std_err': survival * np.sqrt(greenwood),
+    })
+
+
+def km_percentile(km: pd.DataFrame, q: float) -> Optional[float]:
+    """
+    Censoring-aware percentile: smallest time t with S(t) <= 1 - q.
+
+    Returns None when the estimate never drops that far, i.e. more than
+    (1 - q) of runs were still unsolved when they were censored.
+    """
+    reached = km['time'][km['survival'] <= 1.0 - q + 1e-12]
+    if reached.empty:
+        return None
+    return float(reached.iloc[0])
+
+
+def km_percentiles(
+    df: pd.DataFrame,
+    timeout_ms: Optional[float] = None,
+    percentiles: Sequence[int] = (50, 90, 95, 99)
+) -> Dict[str, Optional[float]]:
+    """
+    Compute censoring-aware percentiles for benchmark rows.
+
+    Returns:
+        Dictionary with time_km_p50, time_km_p90, ... (None if not reached)
+    """
+    durations, events = survival_data(df, timeout_ms)
+    if len(durations) == 0:
+        return {f'time_km_p{p}': None for p in percentiles}
+
+    km = kaplan_meier(durations, events)
+    return {f'time_km_p{p}': km_percentile(km, p / 100) for p in percentiles}
+
+
+def fit_lognormal(durations: Sequence[float], events: Sequence[int]) -> Dict[str, float]:
+    """
+    Fit a censored log-normal distribution to the runs of a single size.
+
+    Args:
+        durations: Observed times (ms)
+        events: 1 where solved, 0 where censored
+
+    Returns:
+        Dictionary with mu and sigma of log(T)
+    """
+    from scipy import optimize
+    from scipy.special import log_ndtr
+
+    y = np.log(np.asarray(durations, dtype=float))
+    d = np.asarray(events, dtype=bool)
+
+    if d.sum() < 2:
+        raise ValueError("Need at least two solved runs to fit a survival model")
+
+    def negloglik(params):
+        mu, log_sigma = params
+        z = (y - mu) / np.exp(log_sigma)
+        return -((-0.5 * z[d]**2 - log_sigma).sum() + log_ndtr(-z[~d]).sum())
+
+    start = np.array([y[d].mean(), np.log(max(y[d].std(), 1e-3))])
+    result = optimize.minimize(negloglik, start, method='BFGS')
+
+    return {'mu': float(result.x[0]), 'sigma': float(np.exp(result.x[1]))}
+
+
+def fit_lognormal_aft(
+    sizes: Sequence[float],
+    durations: Sequence[float],
+    events: Sequence[int]
+) -> Dict:
+    """
+    Fit a log-normal AFT model log(T) = b0 + b1*log(size) + sigma*eps by
+    maximum likelihood, with right-censored observations.
+
+    Args:
+        sizes: Problem size of each observation
+        durations: Observed times (ms)
+        events: 1 where solved, 0 where censored
+
+    Returns:
+        Dictionary with coefficients, sigma and the parameter covariance
+        (for b0, b1, log(sigma)) used for delta-method intervals
+    """
+    from scipy import optimize
+    from scipy.special import log_ndtr
+
+    x = np.log(np.asarray(sizes, dtype=float))
+    y = np.log(np.asarray(durations, dtype=float))
+    d = np.asarray(events, dtype=bool)
+
+    if d.sum() < 2 or len(np.unique(x)) < 2:
+        raise ValueError("Need solved runs at two or more sizes to fit a survival model")
+
+    def negloglik(params):
+        b0, b1, log_sigma = params
+        sigma = np.exp(log_sigma)
+        z = (y - b0 - b1 * x) / sigma
+        ll_event = -0.5 * z[d]**2 - log_sigma - 0.5 * np.log(2 * np.pi)
+        ll_censored = log_ndtr(-z[~d])
+        return -(ll_event.sum() + ll_censored.sum())
+
+    # Start from OLS on the solved runs
+    b1, b0 = np.polyfit(x[d], y[d], 1)
+    start = np.array([b0, b1, np.log(max(np.std(y[d]), 1e-3))])
+    result = optimize.minimize(negloglik, start, method='BFGS')
+    cov = np.linalg.pinv(_numerical_hessian(negloglik, result.x))
+
+    return {
+        'coeffs': result.x[:2].tolist(),
+        'sigma': float(np.exp(result.x[2])),
+        'cov': cov.tolist(),
+        'log_likelihood': float(-result.fun),
+        'n_observations': int(len(y)),
+        'n_censored': int((~d).sum()),
+        'converged': bool(result.success),
+    }
+
+
+def _numerical_hessian(f, x: np.ndarray, step: float = 1e-4) -> np.ndarray:
+    """Central finite-difference Hessian of a scalar function."""
+    k = len(x)
+    hessian = np.empty((k, k))
+    eye = np.eye(k) * step
+    for i in range(k):
+        for j in range(i, k):
+            value = (f(x + eye[i] + eye[j]) - f(x + eye[i] - eye[j])
+                     - f(x - eye[i] + eye[j]) + f(x - eye[i] - eye[j])) / (4 * step**2)
+            hessian[i, j] = hessian[j, i] = value
+    return hessian
+
+
+def predict_timeout_probability(
+    fit: Dict,
+    size: float,
+    timeout_ms: float,
+    confidence: float = 0.90
+) -> Dict[str, float]:
+    """
+    Predict P(T > timeout) at a size from a fitted AFT model.
+
+    Returns:
+        Dictionary with the probability and a delta-method confidence interval
+    """
+    arrays = predict_timeout_probabilities(fit, [size], timeout_ms, confidence)
+    return {key: float(values[0]) for key, values in arrays.items()}
+
+
+def predict_timeout_probabilities(
+    fit: Dict,
+    sizes: Sequence[float],
+    timeout_ms: float,
+    confidence: float = 0.90
+) -> Dict[str, np.ndarray]:
+    """
+    Vectorized predict_timeout_probability over many sizes.
+
+    Returns:
+        Dictionary of arrays: probability, lower, upper
+    """
+    from scipy import stats as scipy_stats
+
+    b0, b1 = fit['coeffs']
+    sigma = fit['sigma']
+    log_size = np.log(np.asarray(sizes, dtype=float))
+    z = (np.log(timeout_ms) - b0 - b1 * log_size) / sigma
+
+    # Gradient of z w.r.t. (b0, b1, log sigma), one column per size
+    grad = np.stack([np.full_like(z, -1.0 / sigma), -log_size / sigma, -z])
+    variance = np.einsum('in,ij,jn->n', grad, np.asarray(fit['cov']), grad)
+    se = np.sqrt(np.maximum(variance, 0.0))
+    crit = float(scipy_stats.norm.ppf(0.5 + confidence / 2))
+
+    return {
+        'probability': scipy_stats.norm.sf(z),
+        'lower': scipy_stats.norm.sf(z + crit * se),
+        'upper': scipy_stats.norm.sf(z - crit * se),
+    }
+
+
+def predict_aft_percentile(fit: Dict, size: float, q: float) -> float:
+    """Predict the q-quantile of solve time (ms) at a size from a fitted AFT model."""
+    from scipy import stats as scipy_stats
+
+    b0, b1 = fit['coeffs']
+    return float(np.exp(b0 + b1 * np.log(size) + fit['sigma'] * scipy_stats.norm.ppf(q)))
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+GLPK Timeout Budget Planner
+
+This module simulates solver timeout settings against the empirical,
+censoring-aware time-to-solve distribution of a benchmark file and recommends
+the smallest timeout that reaches a target success rate.
+
+For every candidate timeout t it computes:
+  - success rate: P(T <= t), scaled by the share of runs that did not FAIL
+  - expected wall time of one attempt: E[min(T, t)] = integral of S(u) du over [0, t]
+  - independent retries (k extra attempts at the same timeout, as with
+    `benchmark:glpk:retry --iterations=k`): success 1 - S(t)^(k+1), time
+    E[min(T, t)] * (1 - S(t)^(k+1)) / (1 - S(t))
+  - escalating retry (one retry at escalation*t, as with
+    `benchmark:glpk:retry --timeout=...`) assuming the instance is equally hard
+    on retry: success P(T <= escalation*t), time E[min(T, escalation*t)] + t*S(t)
+
+Up to the timeout the benchmark ran with, S(t) is the Kaplan-Meier estimate.
+Beyond it the tail is extrapolated with a censored log-normal fit and rows are
+flagged as `extrapolated`.
+
+All computations are vectorized over the candidate timeouts.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence
+
+from benchmark_survival import fit_lognormal, kaplan_meier, survival_data
+
+
+class TimeoutPlanner:
+    """
+    Timeout sweep for one benchmark (size, scenario) sample.
+    """
+
+    def __init__(self, df: pd.DataFrame, timeout_ms: float):
+        """
+        Initialize planner from benchmark rows.
+
+        Args:
+            df: Benchmark rows of one size and scenario
+            timeout_ms: Timeout the benchmark ran with (censoring point)
+        """
+        self.timeout_ms = float(timeout_ms)
+        self.other_failure_rate = float(df['status'].isin(['FAILED', 'INFEASIBLE']).mean())
+
+        durations, events = survival_data(df, timeout_ms)
+        if events.sum() == 0:
+            raise ValueError("No solved runs to build a time distribution from")
+
+        km = kaplan_meier(durations, events)
+        self._km_times = km['time'].to_numpy()
+        self._km_survival = km['survival'].to_numpy()
+
+        # Area under S(u) from 0 up to each KM time (S = 1 before the first one)
+        widths = np.diff(np.concatenate(([0.0], self._km_times)))
+        levels = np.concatenate(([1.0], self._km_survival[:-1]))
+        self._km_area = np.cumsum(widths * levels)
+
+        try:
+            self._tail = fit_lognormal(durations, events)
+        except ValueError:
+            self._tail = None
+
+    def survival(self, t: np.ndarray) -> np.ndarray:
+        """P(T > t) for an array of times (ms)."""
+        t = np.asarray(t, dtype=float)
+        idx = np.searchsorted(self._km_times, t, side='right')
+        s = np.concatenate(([1.0], self._km_survival))[idx]
+
+        beyond = t > self.timeout_ms
+        if beyond.any():
+            s_edge = self._survival_at_edge()
+            if self._tail is not None:
+                s[beyond] = s_edge * self._lognormal_sf(t[beyond]) / self._lognormal_sf(self.timeout_ms)
+            else:
+                s[beyond] = s_edge
+        return s
+
+    def expected_time(self, t: np.ndarray) -> np.ndarray:
+        """E[min(T, t)] for an array of times (ms)."""
+        t = np.asarray(t, dtype=float)
+        clipped = np.minimum(t, self.timeout_ms)
+
+        idx = np.searchsorted(self._km_times, clipped, side='right')
+        area = np.concatenate(([0.0], self._km_area))[idx]
+        start = np.concatenate(([0.0], self._km_times))[idx]
+        level = np.concatenate(([1.0], self._km_survival))[idx]
+        area = area + level * (clipped - start)
+
+        beyond = t > self.timeout_ms
+        if beyond.any():
+            s_edge = self._survival_at_edge()
+            if self._tail is not None:
+                scale = s_edge / self._lognormal_sf(self.timeout_ms)
+                tail_area = (self._lognormal_partial(t[beyond])
+                             - self._lognormal_partial(np.array([self.timeout_ms])))
+                area[beyond] += scale * tail_area
+            else:
+                area[beyond] += s_edge * (t[beyond] - self.timeout_ms)
+        return area
+
+    def sweep(
+        self,
+        candidates_ms: Sequence[float],
+        retries: Sequence[int] = (1, 2),
+        escalation: float = 2.0
+    ) -> pd.DataFrame:
+        """
+        Evaluate every candidate timeout.
+
+        Args:
+            candidates_ms: Candidate timeouts (ms)
+            retries: Numbers of extra same-timeout attempts to evaluate
+            escalation: Timeout multiplier for the escalating retry strategy
+
+        Returns:
+            DataFrame with one row per candidate timeout
+        """
+        t = np.sort(np.asarray(candidates_ms, dtype=float))
+        keep = 1.0 - self.other_failure_rate
+
+        s = self.survival(t)
+        expected = self.expected_time(t)
+
+        plan = pd.DataFrame({
+            'timeout_ms': t,
+            'extrapolated': t > self.timeout_ms,
+            'success_rate': keep * (1.0 - s),
+            'expected_time_ms': expected,
+        })
+
+        for k in retries:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                attempts = np.where(s < 1.0, (1.0 - s**(k + 1)) / (1.0 - s), k + 1)
+            plan[f'success_rate_retry{k}'] = keep * (1.0 - s**(k + 1))
+            plan[f'expected_time_retry{k}_ms'] = expected * attempts
+
+        escalated = t * escalation
+        plan['success_rate_escalate'] = keep * (1.0 - self.survival(escalated))
+        plan['expected_time_escalate_ms'] = self.expected_time(escalated) + t * s
+
+        return plan
+
+    def _survival_at_edge(self) -> float:
+        """KM survival at the benchmark's own timeout."""
+        idx = np.searchsorted(self._km_times, self.timeout_ms, side='right')
+        return float(np.concatenate(([1.0], self._km_survival))[idx])
+
+    def _lognormal_sf(self, t):
+        from scipy import stats as scipy_stats
+        return scipy_stats.norm.sf((np.log(t) - self._tail['mu']) / self._tail['sigma'])
+
+    def _lognormal_partial(self, t: np.ndarray) -> np.ndarray:
+        """E[min(T, t)] under the fitted log-normal."""
+        from scipy import stats as scipy_stats
+        mu, sigma = self._tail['mu'], self._tail['sigma']
+        log_t = np.log(t)
+        return (np.exp(mu + sigma**2 / 2) * scipy_stats.norm.cdf((log_t - mu - sigma**2) / sigma)
+                + t * scipy_stats.norm.sf((log_t - mu) / sigma))
+
+
+def recommend_timeout(plan: pd.DataFrame, target: float, column: str = 'success_rate') -> Optional[Dict]:
+    """
+    Find the smallest candidate timeout meeting a target success rate.
+
+    Args:
+        plan: Sweep as returned by TimeoutPlanner.sweep
+        target: Required success rate (e.g. 0.995)
+        column: Success-rate column of the strategy to evaluate
+
+    Returns:
+        The matching plan row as a dictionary, or None if no candidate meets it
+    """
+    meets = plan[plan[column] >= target]
+    if meets.empty:
+        return None
+    return meets.iloc[0].to_dict()
@@ -11,11 +11,16 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
-from typing import Optional, List, Tuple
+from typing import Optional, List, Sequence, Tuple
 from pathlib import Path
 from benchmark_stats import BenchmarkAnalyzer
 
 
+def _analyzer(source) -> BenchmarkAnalyzer:
+    """Analyzer of a CSV path, or the given analyzer (its file is not read again)."""
+    return source if isinstance(source, BenchmarkAnalyzer) else BenchmarkAnalyzer(str(source))
+
+
 class BenchmarkVisualizer:
     """
     Visualizer for GLPK benchmark data.
@@ -23,15 +28,21 @@ class BenchmarkVisualizer:
     Provides various chart types for analyzing solver performance patterns.
     """
 
-    def __init__(self, csv_path: str, style: str = 'seaborn-v0_8-darkgrid'):
+    def __init__(
+        self,
+        csv_path: str,
+        style: str = 'seaborn-v0_8-darkgrid',
+        analyzer: Optional[BenchmarkAnalyzer] = None
+    ):
         """
         Initialize visualizer with a benchmark CSV file.
 
         Args:
             csv_path: Path to the benchmark CSV file
             style: Matplotlib style to use
+            analyzer: Analyzer of the file when already loaded (reused, not re-read)
         """
-        self.analyzer = BenchmarkAnalyzer(csv_path)
+        self.analyzer = analyzer or BenchmarkAnalyzer(csv_path)
         self.df = self.analyzer.df
 
         # Set plot style
@@ -153,14 +164,19 @@ class BenchmarkVisualizer:
     def plot_time_series(
         self,
         rolling_window: int = 100,
+        quantiles: Optional[Sequence[float]] = (0.5, 0.95, 0.99),
         save_path: Optional[str] = None,
         show: bool = True
     ):
         """
         Plot execution time over iterations (time series).
 
+        Besides the rolling mean, rolling percentile bands over the same
+        window show how the tail (P95/P99) moves, which the mean hides.
+
         Args:
-            rolling_window: Window size for rolling average
+            rolling_window: Window size for rolling average and percentiles
+            quantiles: Rolling percentiles to draw (None or empty: mean only)
             save_path: Path to save figure (optional)
             show: Whether to display the plot
         """
@@ -177,6 +193,14 @@ class BenchmarkVisualizer:
         ax.plot(rolling_mean.index, rolling_mean.values,
                color='red', linewidth=2, label=f'Rolling mean ({rolling_window} runs)')
 
+        # Rolling percentile bands, shaded between the lowest and highest
+        if quantiles:
+            bands = self.analyzer.rolling_quantiles(rolling_window, sorted(quantiles))
+            ax.fill_between(bands.index, bands.iloc[:, 0], bands.iloc[:, -1], color='purple', alpha=0.12)
+            for column, style in zip(bands.columns, ['-', '--', ':', '-.'] * len(bands.columns)):
+                ax.plot(bands.index, bands[column], color='purple', linestyle=style, linewidth=1.5,
+                        label=f'Rolling {column.upper()} ({rolling_window} runs, timeouts at the limit)')
+
         # Mark timeouts
         timeouts = self.df[self.df['status'] == 'TIMEOUT']
         if not timeouts.empty:
@@ -203,6 +227,147 @@ class BenchmarkVisualizer:
         else:
             plt.close()
 
+    def plot_timeout_raster(
+        self,
+        row_length: Optional[int] = None,
+        save_path: Optional[str] = None,
+        show: bool = True
+    ):
+        """
+        Plot timeouts as a raster: iterations wrapped into rows of equal length.
+
+        Bursts show up as dense patches and periodic timeouts as vertical
+        stripes when the row length matches the period. A side panel shows
+        the autocorrelation of the timeout indicator with the 95% band of
+        independent runs.
+
+        Args:
+            row_length: Runs per row (default: the detected period if
+                significant, else about sqrt(runs) rounded to 10)
+            save_path: Path to save figure (optional)
+            show: Whether to display the plot
+        """
+        from benchmark_series import autocorrelation
+
+        ordered = self.df.sort_values('iteration', kind='stable')
+        indicator = (ordered['status'] == 'TIMEOUT').to_numpy()
+        n = len(indicator)
+        patterns = self.analyzer.analyze_timeouts().get('patterns') or {}
+        periodicity = patterns.get('periodicity')
+
+        if row_length is None:
+            if periodicity and periodicity['significant'] and periodicity['period'] >= 2:
+                row_length = int(round(periodicity['period']))
+            else:
+                row_length = max(10, int(round(np.sqrt(n) / 10)) * 10)
+        rows = int(np.ceil(n / row_length))
+        grid = np.full(rows * row_length, np.nan)
+        grid[:n] = indicator
+        grid = grid.reshape(rows, row_length)
+
+        fig, (ax, ax_acf) = plt.subplots(1, 2, figsize=(14, 6), gridspec_kw={'width_ratios': [3, 1]})
+        cmap = plt.get_cmap('Greys').copy()
+        cmap.set_bad('white')
+        ax.imshow(np.ma.masked_invalid(grid), aspect='auto', cmap=cmap, vmin=0, vmax=1,
+                  interpolation='nearest', extent=(0, row_length, rows, 0))
+
+        for burst in patterns.get('bursts', []):
+            first = int(np.searchsorted(ordered['iteration'].to_numpy(), burst['first_iteration']))
+            last = first + burst['span'] - 1
+            for row in range(first // row_length, last // row_length + 1):
+                start = max(first, row * row_length) - row * row_length
+                stop = min(last, (row + 1) * row_length - 1) - row * row_length + 1
+                ax.add_patch(plt.Rectangle((start, row), stop - start, 1, fill=False,
+                                           edgecolor='red', linewidth=1.5))
+
+        first_iteration = int(ordered['iteration'].iloc[0]) if n else 0
+        ax.set_xlabel(f'Run within row (row = {row_length} runs)', fontsize=12)
+        ax.set_ylabel(f'Row (starts at iteration {first_iteration} + row x {row_length})', fontsize=12)
+        title = f'Timeout Raster ({self.df["size"].iloc[0]}x{self.df["size"].iloc[0]}, {self.df["scenario"].iloc[0]})'
+        if patterns.get('bursts'):
+            title += f' - {len(patterns["bursts"])} burst(s) in red'
+        ax.set_title(title, fontsize=14, fontweight='bold')
+
+        max_lag = min(n - 1, max(2 * row_length, 50))
+        acf = autocorrelation(indicator, max_lag=max_lag) if n > 1 else np.zeros(1)
+        ax_acf.bar(np.arange(1, len(acf)), acf[1:], width=1.0, color='steelblue')
+        band = 1.96 / np.sqrt(max(n, 1))
+        ax_acf.axhspan(-band, band, color='gray', alpha=0.3, label='95% band (independent)')
+        if periodicity:
+            ax_acf.axvline(periodicity['period'], color='red', linestyle='--', alpha=0.7,
+                           label=f"period {periodicity['period']:.0f} (p={periodicity['p_value']:.2g})")
+        ax_acf.set_xlabel('Lag (runs)', fontsize=12)
+        ax_acf.set_ylabel('Autocorrelation of timeouts', fontsize=12)
+        ax_acf.legend(fontsize=8)
+        ax_acf.grid(True, alpha=0.3)
+
+        plt.tight_layout()
+
+        if save_path:
+            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+
+        if show:
+            plt.show()
+        else:
+            plt.close()
+
+    def plot_autocorrelation(
+        self,
+        max_lag: int = 50,
+        save_path: Optional[str] = None,
+        show: bool = True
+    ):
+        """
+        Plot the ACF and PACF of solved-run times over iterations.
+
+        Computed on log(time_ms) in iteration order. Bars outside the gray
+        95% band of independent runs mean consecutive runs are correlated
+        (warm caches, thermal throttling, noisy neighbours), so the runs
+        carry less information than their count.
+
+        Args:
+            max_lag: Largest lag to plot
+            save_path: Path to save figure (optional)
+            show: Whether to display the plot
+        """
+        from benchmark_series import autocorrelation, partial_autocorrelation
+
+        log_times = self.analyzer.solved_log_times()
+        n = len(log_times)
+        max_lag = max(1, min(max_lag, n - 2))
+        diagnostics = self.analyzer.independence_diagnostics()
+        lags = np.arange(1, max_lag + 1)
+        band = 1.96 / np.sqrt(max(n, 1))
+
+        fig, axes = plt.subplots(2, 1, figsize=(14, 8), sharex=True)
+        for ax, values, label in (
+            (axes[0], autocorrelation(log_times, max_lag)[1:], 'ACF'),
+            (axes[1], partial_autocorrelation(log_times, max_lag)[1:], 'PACF'),
+        ):
+            ax.bar(lags, values, width=0.6, color=np.where(np.abs(values) > band, 'red', 'steelblue'))
+            ax.axhspan(-band, band, color='gray', alpha=0.3, label='95% band (independent)')
+            ax.axhline(0, color='black', linewidth=0.8)
+            ax.set_ylabel(f'{label} of log time', fontsize=12)
+            ax.legend(fontsize=9)
+            ax.grid(True, alpha=0.3)
+        axes[1].set_xlabel('Lag (iterations)', fontsize=12)
+
+        title = f'Autocorrelation ({self.df["size"].iloc[0]}x{self.df["size"].iloc[0]}, {self.df["scenario"].iloc[0]})'
+        if diagnostics['ljung_box_p_value'] is not None:
+            title += (f" - Ljung-Box p={diagnostics['ljung_box_p_value']:.2g}, "
+                      f"effective n {diagnostics['ess']:.0f} of {n}")
+        axes[0].set_title(title, fontsize=14, fontweight='bold')
+
+        plt.tight_layout()
+
+        if save_path:
+            plt.savefig(save_path, dpi=300, bbox_inches='tight')
+
+        if show:
+            plt.show()
+        else:
+            plt.close()
+
     def _extract_numeric_size(self, label: str) -> Tuple[int, int, str]:
         """
         Extract numeric size from label for natural sorting.
@@ -228,7 +393,7 @@ class BenchmarkVisualizer:
         Plot box plot comparison across different sizes or scenarios.
 
         Args:
-            other_files: List of other CSV files to compare (optional)
+            other_files: Other CSV files (or their BenchmarkAnalyzers) to compare (optional)
             save_path: Path to save figure (optional)
             show: Whether to display the plot
         """
@@ -243,8 +408,8 @@ class BenchmarkVisualizer:
 
         # Add other files if provided
         if other_files:
-            for file_path in other_files:
-                analyzer = BenchmarkAnalyzer(file_path)
+            for source in other_files:
+                analyzer = _analyzer(source)
                 df = analyzer.df[analyzer.df['status'] == 'SUCCESS'].copy()
                 df['label'] = f"{df['size'].iloc[0]}x{df['size'].iloc[0]} ({df['scenario'].iloc[0]})"
                 df['size_numeric'] = df['size'].iloc[0]
@@ -289,7 +454,7 @@ class BenchmarkVisualizer:
         Plot box plot comparison with logarithmic scale (better for wide ranges).
 
         Args:
-            other_files: List of other CSV files to compare (optional)
+            other_files: Other CSV files (or their BenchmarkAnalyzers) to compare (optional)
             save_path: Path to save figure (optional)
             show: Whether to display the plot
         """
@@ -304,8 +469,8 @@ class BenchmarkVisualizer:
 
         # Add other files if provided
         if other_files:
-            for file_path in other_files:
-                analyzer = BenchmarkAnalyzer(file_path)
+            for source in other_files:
+                analyzer = _analyzer(source)
                 df = analyzer.df[analyzer.df['status'] == 'SUCCESS'].copy()
                 df['label'] = f"{df['size'].iloc[0]}x{df['size'].iloc[0]} ({df['scenario'].iloc[0]})"
                 df['size_numeric'] = df['size'].iloc[0]
@@ -410,16 +575,14 @@ class BenchmarkVisualizer:
         Compare percentiles across multiple benchmark files.
 
         Args:
-            other_files: List of CSV files to compare
+            other_files: CSV files (or their BenchmarkAnalyzers) to compare
             percentiles: List of percentiles to plot
             save_path: Path to save figure (optional)
             show: Whether to display the plot
         """
-        all_files = [self.analyzer.csv_path] + [Path(f) for f in other_files]
         data = []
 
-        for file_path in all_files:
-            analyzer = BenchmarkAnalyzer(str(file_path))
+        for analyzer in [self.analyzer] + [_analyzer(source) for source in other_files]:
             successful = analyzer.df[analyzer.df['status'] == 'SUCCESS']
             size = analyzer.df['size'].iloc[0]
 
@@ -471,16 +634,14 @@ class BenchmarkVisualizer:
         Compare percentiles across multiple benchmark files with logarithmic scale.
 
         Args:
-            other_files: List of CSV files to compare
+            other_files: CSV files (or their BenchmarkAnalyzers) to compare
             percentiles: List of percentiles to plot
             save_path: Path to save figure (optional)
             show: Whether to display the plot
         """
-        all_files = [self.analyzer.csv_path] + [Path(f) for f in other_files]
         data = []
 
-        for file_path in all_files:
-            analyzer = BenchmarkAnalyzer(str(file_path))
+        for analyzer in [self.analyzer] + [_analyzer(source) for source in other_files]:
             successful = analyzer.df[analyzer.df['status'] == 'SUCCESS']
             size = analyzer.df['size'].iloc[0]
 
@@ -577,8 +738,16 @@ class BenchmarkVisualizer:
             show=False
         )
 
-        # Comparison plots if other files provided
+        # Autocorrelation
+        print("  - ACF/PACF over iterations...")
+        self.plot_autocorrelation(
+            save_path=str(output_path / 'autocorrelation.png'),
+            show=False
+        )
+
+        # Comparison plots if other files provided (each file loaded once for both)
         if other_files:
+            other_files = [_analyzer(source) for source in other_files]
             print("  - Box plot comparison...")
             self.plot_box_comparison(
                 other_files=other_files,
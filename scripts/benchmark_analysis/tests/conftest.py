@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Shared fixtures for the benchmark analysis tests.
+"""
+
+import csv
+import json
+
+import pytest
+
+COLUMNS = ['size', 'scenario', 'iteration', 'time_ms', 'status', 'error', 'spec', 'result']
+
+
+@pytest.fixture
+def write_benchmark():
+    """
+    Writer of benchmark CSV files in the format of BenchmarkGlpkBase.
+
+    The returned function takes the path, the rows and the columns the rows
+    give (default: iteration, time_ms, status, spec); keyword arguments set
+    the other columns for every row (default: size 10, scenario 'random',
+    SUCCESS, everything else empty). Rows may also be dicts of columns.
+    Specs and results that are not strings are written as compact JSON, and
+    fields are quoted like the csv module does.
+    """
+    def write(path, rows, columns=('iteration', 'time_ms', 'status', 'spec'), **defaults):
+        base = {'size': 10, 'scenario': 'random', 'status': 'SUCCESS', **defaults}
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for row in rows:
+                values = {**base, **(row if isinstance(row, dict) else dict(zip(columns, row)))}
+                for column in ('spec', 'result'):
+                    if values.get(column) is not None and not isinstance(values[column], str):
+                        values[column] = json.dumps(values[column], separators=(',', ':'))
+                writer.writerow(['' if values.get(c) is None else values[c] for c in COLUMNS])
+        return path
+    return write
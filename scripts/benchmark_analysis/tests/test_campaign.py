@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for the benchmark campaign orchestrator.
+
+A small Python script stands in for `php artisan benchmark:glpk`: it appends
+rows to the shard it is given, like BenchmarkGlpkBase does. Its spec repeats
+across runs and shards (like the identical scenario) and its timeouts carry a
+multi-line error message.
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_campaign import Campaign, ShardTail, expand_jobs, load_campaign
+from benchmark_dataset import BenchmarkDataset
+
+FAKE_BENCHMARK = r'''
+import csv, json, os, random, sys, time
+path = sys.argv[1]
+opts = dict(a[2:].split('=', 1) for a in sys.argv[2:])
+hang = os.path.join(os.path.dirname(path), 'hang_once')
+new = not os.path.exists(path)
+spec = json.dumps({'units': [1, 2], 'preferences': {'1': [1, 2], '2': [2, 1]}})
+with open(path, 'a', newline='') as f:
+    writer = csv.writer(f)
+    if new:
+        writer.writerow(['size', 'scenario', 'iteration', 'time_ms', 'status', 'error', 'spec', 'result'])
+    for i in range(1, int(opts['iterations']) + 1):
+        if i == 3 and os.path.exists(hang):
+            os.remove(hang)
+            time.sleep(60)
+        status = 'TIMEOUT' if random.random() < 0.1 else 'SUCCESS'
+        error = 'Solver timed out\nafter 1s' if status == 'TIMEOUT' else ''
+        writer.writerow([opts['size'], opts['scenario'], i, f'{random.lognormvariate(3, 0.3):.3f}',
+                         status, error, spec, ''])
+        f.flush()
+'''
+
+
+def _config(tmp_path, **overrides):
+    script = tmp_path / 'fake_benchmark.py'
+    script.write_text(FAKE_BENCHMARK)
+    matrix = {
+        'name': 'Test Run',
+        'scenarios': ['random', 'realistic'],
+        'sizes': [5, 10],
+        'iterations': {'default': 40, 10: 21},
+        'shards': 2,
+        'concurrency': 2,
+        'timeout': 1,
+        'output_dir': str(tmp_path / 'out'),
+        'command': [sys.executable, str(script)],
+        **overrides,
+    }
+    path = tmp_path / 'matrix.json'
+    path.write_text(json.dumps(matrix))
+    return load_campaign(str(path))
+
+
+def test_expand_jobs_splits_cells_into_shards(tmp_path):
+    """Iterations are split over the shards, largest size first, one file per job."""
+    config = _config(tmp_path)
+    jobs = expand_jobs(config)
+
+    assert config['name'] == 'test-run'
+    assert len(jobs) == 8
+    assert [job['size'] for job in jobs[:4]] == [10] * 4
+    assert [job['iterations'] for job in jobs if job['scenario'] == 'random' and job['size'] == 10] == [11, 10]
+    assert jobs[0]['path'].name == 'glpk_random_10_test-run_w1.csv'
+    assert len({job['path'] for job in jobs}) == len(jobs)
+
+
+def test_campaign_runs_restarts_hung_jobs_and_resumes(tmp_path):
+    """Every shard gets its iterations, a hung job is restarted, completed cells are analyzed."""
+    config = _config(tmp_path, stall_timeout=2, concurrency=3)
+    (tmp_path / 'out').mkdir()
+    (tmp_path / 'out' / 'hang_once').touch()
+    events = []
+
+    result = Campaign(config, on_event=events.append, poll_s=0.1, progress_s=0.5).run()
+
+    assert result['done'] == 8 and result['failed'] == 0
+    kinds = [event['event'] for event in events]
+    assert kinds.count('kill') == 1 and kinds.count('restart') == 1
+    assert kinds.count('cell') == 4 and 'progress' in kinds
+    for job in expand_jobs(config):
+        with open(job['path'], newline='') as f:
+            rows = list(csv.reader(f))
+        assert rows[0][0] == 'size' and len(rows) == job['iterations'] + 1
+
+    # Repeated specs and restarted iteration numbers survive the merge
+    for scenario in config['scenarios']:
+        for size in config['sizes']:
+            paths = [str(job['path']) for job in expand_jobs(config)
+                     if job['scenario'] == scenario and job['size'] == size]
+            merged = BenchmarkDataset(paths, merge_policy='first').df
+            assert len(merged) == config['iterations'][size]
+
+    matrix = result['matrix'].read_text().splitlines()
+    assert len(matrix) == 5
+    assert sum(event['convergence']['runs'] for event in events
+               if event['event'] == 'cell') == 2 * (40 + 21)
+
+    # A second run finds every shard complete and starts nothing
+    events.clear()
+    Campaign(config, on_event=events.append, poll_s=0.1).run()
+    assert 'start' not in [event['event'] for event in events]
+
+
+def test_shard_tail_reads_complete_records(tmp_path):
+    """A quoted multi-line error counts once, a half-written row waits for its newline."""
+    path = tmp_path / 'shard.csv'
+    tail = ShardTail(path)
+    assert tail.read() == []
+
+    path.write_text('size,scenario,iteration,time_ms,status,error,spec,result\n'
+                    '5,random,1,12.5,SUCCESS,,,\n'
+                    '5,random,2,1000,TIMEOUT,"Solver timed out\n1000,SUCCESS')
+    assert tail.read() == [('SUCCESS', '12.5')]
+
+    with open(path, 'a') as f:
+        f.write('",,\n5,random,3,14')
+    assert tail.read() == [('TIMEOUT', '1000')]
+    with open(path, 'a') as f:
+        f.write('.0,SUCCESS,,,\n')
+    assert tail.read() == [('SUCCESS', '14.0')]
+    assert tail.rows == 3
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for the benchmark catalog and the lazy comparer.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_catalog import CACHE_DIR, LRUCache, load_index, resolve_file
+from benchmark_compare import BenchmarkComparer
+
+def test_resolve_from_filename_and_header(tmp_path, write_benchmark):
+    """Conventional names are parsed; other names fall back to the first row."""
+    named = tmp_path / 'glpk_random_50_retry.csv'
+    other = tmp_path / 'nightly.csv'
+    write_benchmark(named, [(1, 10.0), (2, 12.0), (3, 11.0)], columns=('iteration', 'time_ms'), size=50)
+    write_benchmark(other, [(1, 10.0), (2, 12.0), (3, 11.0)], columns=('iteration', 'time_ms'), size=20,
+                    scenario='opposite')
+
+    entry = resolve_file(named)
+    assert (entry['scenario'], entry['size'], entry['tag'], entry['source']) == ('random', 50, 'retry', 'filename')
+
+    entry = resolve_file(other)
+    assert (entry['scenario'], entry['size'], entry['source']) == ('opposite', 20, 'header')
+
+
+def test_lru_cache_bounds_resident_values():
+    """Only maxsize values stay resident, the least recently used is evicted."""
+    loads = []
+    cache = LRUCache(lambda key: loads.append(key) or key * 2, maxsize=2)
+
+    cache.get(1)
+    cache.get(2)
+    cache.get(1)
+    cache.get(3)
+
+    assert 1 in cache and 3 in cache and 2 not in cache
+    assert loads == [1, 2, 3]
+
+
+def test_comparer_loads_only_requested_scenario(tmp_path, write_benchmark):
+    """Scaling analysis of one scenario never reads the other scenario's files."""
+    for size in (5, 10, 20):
+        write_benchmark(tmp_path / f'glpk_random_{size}.csv', [(1, size), (2, size * 1.1), (3, size * 0.9)],
+                        columns=('iteration', 'time_ms'), size=size)
+    (tmp_path / 'glpk_opposite_5.csv').write_text('not,a,benchmark\n')  # would fail if parsed
+
+    comparer = BenchmarkComparer(sorted(str(p) for p in tmp_path.glob('glpk_*.csv')))
+    scaling = comparer.analyze_size_scaling('random')
+
+    assert scaling['sizes'] == [5, 10, 20]
+    assert comparer.analyzers.resident == 0
+    assert comparer.catalog._index is None and not (tmp_path / CACHE_DIR).exists()
+
+
+def test_index_counts_rows_and_refreshes_on_change(tmp_path, write_benchmark):
+    """The index counts statuses without pandas, persists only in its cache dir and rescans modified files."""
+    path = tmp_path / 'glpk_random_10.csv'
+    write_benchmark(path, [(3, 5.0, 'SUCCESS', '', {'units': [1, 2]}, {'1': 2}),
+                           (4, 30000.1, 'TIMEOUT', 'Solver timed out, giving up', None, None),
+                           (5, 1.0, 'FAILED', 'boom', None, None)],
+                    columns=('iteration', 'time_ms', 'status', 'error', 'spec', 'result'))
+
+    cache_dir = tmp_path / 'cache'
+    entry = load_index([str(path)], cache_dir=cache_dir)[0]
+    assert (entry['rows'], entry['iteration_min'], entry['iteration_max']) == (3, 3, 5)
+    assert entry['status_counts'] == {'FAILED': 1, 'SUCCESS': 1, 'TIMEOUT': 1}
+    assert (cache_dir / 'catalog.json').exists() and not (tmp_path / CACHE_DIR).exists()
+
+    with open(path, 'a') as f:
+        f.write('10,random,6,7.0,SUCCESS,,,\n')
+
+    assert load_index([str(path)], cache_dir=cache_dir)[0]['rows'] == 4
+    assert load_index([str(path)])[0]['rows'] == 4
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for sequential convergence checks and the power calculator.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_converge import (
+    look_number, look_runs, load_progress, precision_status, runs_to_detect, sequential_confidence, wilson_interval,
+)
+
+
+def _runs(n, timeout_rate=0.02, seed=0):
+    rng = np.random.default_rng(seed)
+    status = np.where(rng.uniform(size=n) < timeout_rate, 'TIMEOUT', 'SUCCESS')
+    return pd.DataFrame({'iteration': np.arange(1, n + 1), 'status': status,
+                         'time_ms': rng.lognormal(mean=4, sigma=0.5, size=n)})
+
+
+def test_alpha_spending_and_wilson_interval():
+    """Looks double from min_runs, later looks are stricter, Wilson covers 0 events."""
+    assert [look_number(n, 30) for n in (10, 30, 59, 60, 240)] == [1, 1, 1, 2, 4]
+    assert [look_runs(k, 30) for k in (1, 2, 4)] == [30, 60, 240]
+    assert sequential_confidence(0.95, 1) == pytest.approx(0.975)
+    assert sequential_confidence(0.95, 3) > sequential_confidence(0.95, 2)
+    interval = wilson_interval(0, 100, 0.95)
+    assert interval['lower'] == pytest.approx(0) and 0.03 < interval['upper'] < 0.04
+
+
+def test_precision_converges_with_more_runs_and_projection_is_consistent():
+    """Few runs need more; the projection from few runs roughly matches where it converges."""
+    few = precision_status(_runs(200), target=0.05)
+    assert not few['converged'] and few['metrics']['median']['runs_needed'] > 200
+
+    many = precision_status(_runs(20000), target=0.05, rate_tolerance=0.005)
+    assert many['metrics']['median']['converged'] and many['metrics']['p95']['converged']
+    assert many['metrics']['median']['precision'] < few['metrics']['median']['precision']
+    assert few['metrics']['median']['runs_needed'] < 20000
+
+
+def test_power_calculator_and_partial_rows(tmp_path):
+    """Smaller changes and higher quantiles need more runs; a torn last line is dropped."""
+    pilot = _runs(3000, timeout_rate=0.05)
+    p95 = runs_to_detect(pilot, 0.05, 'p95')['runs_per_side']
+    assert runs_to_detect(pilot, 0.05, 'median')['runs_per_side'] < p95
+    assert runs_to_detect(pilot, 0.10, 'p95')['runs_per_side'] < p95
+    assert runs_to_detect(pilot, 0.5, 'timeout_rate')['runs_per_side'] > 0
+    assert runs_to_detect(_runs(300, timeout_rate=0), 0.5, 'timeout_rate')['runs_per_side'] is None
+
+    path = tmp_path / 'growing.csv'
+    path.write_text('size,scenario,iteration,time_ms,status,error,spec,result\n'
+                    '30,random,1,12.5,SUCCESS,,{},{}\n30,random,2,13')
+    assert len(load_progress(str(path))) == 1
+
+
+def test_checks_between_looks_repeat_the_scheduled_look():
+    """Runs past the last scheduled look are not evaluated until the next one."""
+    df = _runs(1000)
+    at_look = precision_status(df.iloc[:960])
+    between = precision_status(df)
+    assert between['look'] == at_look['look'] == 6
+    assert between['evaluated'] == 960 and between['runs'] == 1000 and between['next_look'] == 1920
+    assert between['metrics'] == at_look['metrics']
+    needed = between['metrics']['p95']['runs_needed']
+    assert needed is None or needed in [look_runs(k, 30) for k in range(1, 20)]
+
+
+def test_percentiles_treat_timeouts_as_censored():
+    """A block of timeouts raises the median instead of being dropped."""
+    df = _runs(400, timeout_rate=0)
+    df.loc[df.index[100:300], ['status', 'time_ms']] = ['TIMEOUT', 10000.0]
+    status = precision_status(df, metrics=('median', 'p95'), timeout_ms=10000.0, min_runs=25)
+    solved_median = float(np.median(df.loc[df['status'] == 'SUCCESS', 'time_ms']))
+    assert status['metrics']['median']['estimate'] > solved_median
+    assert np.isnan(status['metrics']['p95']['estimate']) and status['metrics']['p95']['upper'] == np.inf
+    assert not status['metrics']['p95']['converged'] and status['runs_needed'] is None
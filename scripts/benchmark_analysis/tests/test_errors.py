@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for error signature clustering.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_errors import error_signatures, normalize_error, signature_size_table
+
+
+def test_normalize_masks_variable_parts_and_truncation():
+    """Paths, pids and ids are masked; messages cut at 100 characters still match."""
+    assert (normalize_error('GLPK execution failed: /tmp/glpk_ab/model.mod:12: syntax error (pid 4411)')
+            == 'GLPK execution failed: <path>:<n>: syntax error (pid <n>)')
+    assert normalize_error('lock 550e8400-e29b-41d4-a716-446655440000 held') == 'lock <id> held'
+
+    long_message = "Process execution exceeded PHP failsafe timeout after {} seconds. GLPK's internal timeout may have failed."
+    cut_a, cut_b = long_message.format(5)[:100], long_message.format(120)[:100]
+    assert cut_a != cut_b
+    assert normalize_error(cut_a) == normalize_error(cut_b)
+
+
+def test_signatures_count_iterations_and_sizes():
+    """Rows with the same normalized message form one signature; other statuses are excluded."""
+    df = pd.DataFrame({
+        'size': [10, 20, 20, 50, 50],
+        'iteration': [3, 1, 9, 4, 5],
+        'status': ['FAILED', 'FAILED', 'FAILED', 'FAILED', 'TIMEOUT'],
+        'error': ['failed (pid 1)', 'failed (pid 22)', 'No assignments found in GLPK solution file.',
+                  'failed (pid 333)', 'GLPK timeout after 0.6 seconds (pid 7)'],
+    })
+    signatures = error_signatures(df)
+
+    assert signatures['count'].tolist() == [3, 1]
+    top = signatures.iloc[0]
+    assert top['signature'] == 'failed (pid <n>)'
+    assert (top['first_iteration'], top['last_iteration']) == (1, 4)
+    assert top['sizes'] == {10: 1, 20: 1, 50: 1}
+    assert signature_size_table(signatures).loc[top['signature_id']].tolist() == [1, 1, 1]
+    assert len(error_signatures(df, statuses=None)) == 3
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for the boosted stump model and the instance difficulty analysis.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_boost import StumpBooster, roc_auc
+from benchmark_explain import explain
+
+
+def test_booster_is_additive_and_fits_steps():
+    """A step in one feature is learned; the other feature gets no gain."""
+    rng = np.random.default_rng(0)
+    X = rng.uniform(size=(500, 2))
+    y = np.where(X[:, 0] > 0.5, 2.0, 0.0)
+
+    model = StumpBooster(n_rounds=200).fit(X, y, ['step', 'noise'])
+    assert model.importances_['step'] > 0.99
+    assert model.partial_dependence(X, 0, np.array([0.2, 0.8])) == pytest.approx([0.0, 2.0], abs=0.05)
+
+
+def test_roc_auc_handles_ties():
+    """Tied scores count half."""
+    assert roc_auc(np.array([0, 1, 0, 1]), np.array([0.1, 0.9, 0.5, 0.5])) == 0.875
+    assert roc_auc(np.array([1, 1]), np.array([0.1, 0.2])) is None
+
+
+def test_explain_ranks_the_driving_feature():
+    """Time and timeouts driven by rank agreement put it first."""
+    rng = np.random.default_rng(1)
+    n = 400
+    agreement = rng.uniform(size=n)
+    df = pd.DataFrame({
+        'scenario': 'random', 'size': 20,
+        'rank_agreement': agreement,
+        'top_entropy': rng.uniform(size=n),
+        'units': 20.0,
+    })
+    df['time_ms'] = np.exp(3 * agreement + rng.normal(0, 0.3, n))
+    df['status'] = np.where(df['time_ms'] > 8, 'TIMEOUT', 'SUCCESS')
+
+    results = explain(df, features=['rank_agreement', 'top_entropy', 'units'])
+    assert results['features'] == ['rank_agreement', 'top_entropy']
+    assert results['time']['importance']['feature'][0] == 'rank_agreement'
+    assert results['time']['cv']['r2'] > 0.5
+    assert results['timeout']['importance']['feature'][0] == 'rank_agreement'
+    assert results['timeout']['cv']['auc'] > 0.9
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for spec feature decoding and the feature store.
+"""
+
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_catalog import CACHE_DIR
+from benchmark_features import extract_features, feature_frame
+from benchmark_spec import SPEC_FEATURES, result_features, spec_features
+
+UNITS = [1001, 1002, 1003, 1004]
+
+
+def _spec(lists):
+    return {'units': UNITS, 'preferences': {str(i): prefs for i, prefs in enumerate(lists, 1)}}
+
+
+def test_spec_features_identical_and_opposite():
+    """Identical lists are fully tied and agree; opposite lists split in two groups."""
+    identical = dict(zip(SPEC_FEATURES, spec_features(_spec([UNITS] * 4))))
+    assert identical['first_choice_entropy'] == 0.0
+    assert identical['rank_agreement'] == pytest.approx(1.0)
+    assert identical['largest_tie_share'] == 1.0
+
+    opposite = dict(zip(SPEC_FEATURES, spec_features(_spec([UNITS, UNITS, UNITS[::-1], UNITS[::-1]]))))
+    assert opposite['first_choice_max_share'] == 0.5
+    assert opposite['duplicate_list_share'] == 0.5
+    assert opposite['pref_density'] == 1.0
+
+
+def test_spec_features_rank_duplicates_at_first_occurrence():
+    """A unit listed twice keeps its first rank; unknown units are not ranked."""
+    def agreement(lists):
+        return dict(zip(SPEC_FEATURES, spec_features(_spec(lists))))['rank_agreement']
+
+    lists = [[1001, 1002, 1003], [1003, 1001, 1004, 1002], [1002, 1004]]
+    repeated = [[1001, 1002, 1001, 1003], [1003, 1001, 9999, 1004, 1002, 1003], [1002, 1004, 1002]]
+    assert agreement(repeated) == pytest.approx(agreement(lists))
+
+    # Direct computation: per unit variance of its rank, unranked after the list
+    ranks = [[prefs.index(u) if u in prefs else len(prefs) for prefs in lists] for u in UNITS]
+    variance = np.mean([np.var(r) for r in ranks])
+    assert agreement(lists) == pytest.approx(1 - variance / ((len(UNITS) ** 2 - 1) / 12))
+
+
+def test_result_features_rank_picks():
+    """Pick ranks are 1-based positions in the family's preference list."""
+    spec = _spec([UNITS, UNITS[::-1]])
+    picks_assigned, rank_mean, rank_max, first_share = result_features(spec, {'1': 1001, '2': 1003})
+    assert (picks_assigned, rank_mean, rank_max, first_share) == (1.0, 1.5, 2.0, 0.5)
+    assert np.isnan(result_features(spec, None)).all()
+
+
+def test_feature_store_is_row_aligned_and_cached(tmp_path, write_benchmark):
+    """Rows sharing a spec get the same features; the store is reused and parallel decoding matches."""
+    path = tmp_path / 'glpk_random_4.csv'
+    shared = _spec([UNITS] * 4)
+    specs = [(shared, {'1': 1001}), (_spec([UNITS, UNITS[::-1]] * 2), None), (shared, None)]
+    write_benchmark(path, [(i, i * 10.0, spec, result) for i, (spec, result) in enumerate(specs, 1)],
+                    columns=('iteration', 'time_ms', 'spec', 'result'), size=4)
+
+    df = feature_frame([str(path)], workers=1)
+    assert list(df['iteration']) == [1, 2, 3]
+    assert df['spec_hash'][0] == df['spec_hash'][2] != df['spec_hash'][1]
+    assert df['pick_rank_mean'][0] == 1.0 and np.isnan(df['pick_rank_mean'][2])
+    assert (tmp_path / CACHE_DIR / 'features' / 'glpk_random_4.npz').exists()
+
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = extract_features(str(path), executor)
+    assert np.allclose(parallel['rank_agreement'], df['rank_agreement'])
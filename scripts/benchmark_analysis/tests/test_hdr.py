@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for mergeable latency histograms.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+import benchmark_hdr
+from benchmark_hdr import LatencyHistogram, histogram_from_csv, load_histogram, merge_histograms
+
+
+def test_percentiles_within_relative_error():
+    """Percentiles stay within 10^-digits of the exact values over a wide range."""
+    rng = np.random.default_rng(0)
+    times = rng.lognormal(3, 2, 20000)
+    hist = LatencyHistogram(digits=2)
+    hist.record(times)
+
+    qs = [1, 50, 90, 99, 99.9]
+    exact = np.percentile(np.rint(times * 1000) / 1000, qs, method='inverted_cdf')
+    approx = np.array(hist.percentiles(qs))
+
+    assert np.all(np.abs(approx - exact) / exact <= 0.01)
+
+
+def test_merge_equals_histogram_of_union():
+    """Merging shard histograms gives the same buckets as recording everything once."""
+    rng = np.random.default_rng(1)
+    times = rng.lognormal(4, 1, 3000)
+    shards = [LatencyHistogram(), LatencyHistogram(), LatencyHistogram()]
+    for shard, chunk in zip(shards, np.array_split(times, 3)):
+        shard.record(chunk)
+    whole = LatencyHistogram()
+    whole.record(times)
+
+    merged = merge_histograms(LatencyHistogram.from_dict(s.to_dict()) for s in shards)
+
+    assert merged.counts == whole.counts
+    assert merged.percentiles([50, 99]) == whole.percentiles([50, 99])
+
+
+def test_file_histogram_counts_statuses(tmp_path):
+    """CSV summaries count every status but only record SUCCESS times."""
+    path = tmp_path / 'glpk_random_10.csv'
+    path.write_text(
+        'size,scenario,iteration,time_ms,status,error,spec,result\n'
+        '10,random,1,12.5,SUCCESS,,,\n'
+        '10,random,2,30001.0,TIMEOUT,"Solver timed out, giving up",,\n'
+        '10,random,3,14.0,SUCCESS,,,\n'
+    )
+
+    hist = load_histogram(str(path))
+
+    assert hist.total == 2
+    assert hist.status_counts == {'SUCCESS': 2, 'TIMEOUT': 1}
+    assert hist.percentile(100) == 14.0
+    assert hist.sources[0]['scenario'] == 'random' and hist.sources[0]['size'] == 10
+
+
+def test_file_histogram_streams_in_chunks(tmp_path, monkeypatch):
+    """Chunked reading gives the same summary; multi-line errors and torn rows do not count as runs."""
+    monkeypatch.setattr(benchmark_hdr, 'CHUNK_ROWS', 2)
+    path = tmp_path / 'glpk_random_10.csv'
+    path.write_text(
+        'size,scenario,iteration,time_ms,status,error,spec,result\n'
+        + ''.join(f'10,random,{i},{i}.5,SUCCESS,,,\n' for i in range(1, 6))
+        + '10,random,6,30001.0,TIMEOUT,"Solver timed out\n10,random,7,1.0,SUCCESS",,\n'
+        '10,random,8,9'
+    )
+
+    hist = histogram_from_csv(str(path))
+
+    assert hist.total == 5
+    assert hist.status_counts == {'SUCCESS': 5, 'TIMEOUT': 1}
+    assert hist.percentile(100) == 5.5
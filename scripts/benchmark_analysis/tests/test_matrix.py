@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for the one-pass (scenario, size) benchmark matrix.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_dataset import BenchmarkDataset
+from benchmark_matrix import matrix_pivot
+from benchmark_stats import BenchmarkAnalyzer
+
+
+def _write_benchmark(path, scenario, size, seed):
+    rng = np.random.default_rng(seed)
+    times = rng.lognormal(np.log(size), 0.5, 60)
+    status = np.where(times > 2.5 * size, 'TIMEOUT', 'SUCCESS')
+    status[:2] = 'FAILED'
+    pd.DataFrame({
+        'size': size, 'scenario': scenario, 'iteration': np.arange(1, 61),
+        'time_ms': times, 'status': status, 'error': '', 'spec': '', 'result': '',
+    }).to_csv(path, index=False)
+
+
+def test_matrix_matches_compute_stats(tmp_path):
+    """Every cell equals compute_stats() of the corresponding file."""
+    paths = []
+    for i, (scenario, size) in enumerate([('random', 5), ('random', 10), ('identical', 5)]):
+        path = tmp_path / f'glpk_{scenario}_{size}.csv'
+        _write_benchmark(path, scenario, size, i)
+        paths.append(str(path))
+
+    matrix = BenchmarkDataset(paths).aggregate().set_index(['scenario', 'size'])
+
+    for path in paths:
+        analyzer = BenchmarkAnalyzer(path)
+        expected = analyzer.compute_stats()
+        cell = matrix.loc[(analyzer.df['scenario'].iloc[0], analyzer.df['size'].iloc[0])]
+        for key, value in expected.items():
+            if value is None:
+                assert cell[key] is None or pd.isna(cell[key]), key
+            else:
+                assert np.isclose(cell[key], value), key
+
+
+def test_matrix_pivot_shape(tmp_path):
+    """Pivoting yields sizes as rows and scenarios as columns, with gaps as NaN."""
+    paths = []
+    for i, (scenario, size) in enumerate([('random', 5), ('random', 10), ('identical', 5)]):
+        path = tmp_path / f'glpk_{scenario}_{size}.csv'
+        _write_benchmark(path, scenario, size, i)
+        paths.append(str(path))
+
+    table = matrix_pivot(BenchmarkDataset(paths).aggregate(), 'time_p95')
+
+    assert list(table.index) == [5, 10]
+    assert list(table.columns) == ['identical', 'random']
+    assert np.isnan(table.loc[10, 'identical'])
+
+
+def test_dataset_is_compact_and_filterable(tmp_path):
+    """Scenario is categorical, size an integer, and stats() filters cells."""
+    paths = []
+    for i, (scenario, size) in enumerate([('random', 5), ('random', 10), ('identical', 5)]):
+        path = tmp_path / f'glpk_{scenario}_{size}.csv'
+        _write_benchmark(path, scenario, size, i)
+        paths.append(str(path))
+
+    dataset = BenchmarkDataset(paths)
+
+    assert isinstance(dataset.df['scenario'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_integer_dtype(dataset.df['size'])
+    assert dataset.scenarios == ['identical', 'random']
+    assert dataset.sizes('random') == [5, 10]
+    assert list(dataset.stats(size=5)['scenario']) == ['identical', 'random']
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for the spec index and measurement noise floor.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_noise import Z_95, diff_benchmarks, duplicate_specs, noise_floor, noise_ratio_for, spec_index
+
+
+def _runs(seed=0, specs=300, repeats=4, sd_within=0.1, sd_between=0.5):
+    rng = np.random.default_rng(seed)
+    difficulty = rng.normal(3, sd_between, specs)
+    spec = np.repeat(np.arange(specs), repeats)
+    return pd.DataFrame({
+        'file': 'glpk_random_20.csv', 'scenario': 'random', 'size': 20,
+        'iteration': np.arange(len(spec)) + 1, 'status': 'SUCCESS',
+        'spec_hash': [f'{s:016x}' for s in spec],
+        'time_ms': np.exp(difficulty[spec] + rng.normal(0, sd_within, len(spec))),
+    })
+
+
+def test_noise_floor_separates_repeat_and_instance_variance():
+    """Within-spec sd recovers the noise and between-spec sd the instance spread."""
+    floor = noise_floor(_runs()).iloc[0]
+    assert floor['repeated_specs'] == 300
+    assert floor['sd_within'] == pytest.approx(0.1, rel=0.1)
+    assert floor['sd_between'] == pytest.approx(0.5, rel=0.15)
+    assert floor['icc'] > 0.9
+    assert floor['noise_ratio'] == pytest.approx(np.exp(Z_95 * np.sqrt(2) * floor['sd_within']), rel=1e-3)
+
+    assert noise_ratio_for(noise_floor(_runs()).assign(size=50), 20) == floor['noise_ratio']
+    assert noise_floor(_runs(repeats=1)).iloc[0]['noise_ratio'] is None
+
+
+def test_spec_index_lists_duplicates():
+    """Every spec run twice or more is a duplicate."""
+    index = spec_index(_runs(specs=5, repeats=3).iloc[:13])
+    assert index['runs'].tolist() == [3, 3, 3, 3, 1]
+    assert len(duplicate_specs(index)) == 4
+
+
+def test_diff_ignores_changes_below_the_noise_floor(tmp_path):
+    """A 10% slowdown is significant with 400 runs but below a 25% noise floor."""
+    rng = np.random.default_rng(2)
+    for name, factor in (('base', 1.0), ('new', 1.1)):
+        pd.DataFrame({
+            'size': 20, 'scenario': 'random', 'iteration': np.arange(400) + 1,
+            'time_ms': factor * np.exp(rng.normal(3, 0.05, 400)), 'status': 'SUCCESS',
+        }).to_csv(tmp_path / f'{name}.csv', index=False)
+
+    base, new = [str(tmp_path / 'base.csv')], [str(tmp_path / 'new.csv')]
+    assert diff_benchmarks(base, new)['verdict'].tolist() == ['slower']
+
+    floor = pd.DataFrame({'size': [20], 'noise_ratio': [np.exp(Z_95 * np.sqrt(2) * np.log(1.25))]})
+    result = diff_benchmarks(base, new, floor).iloc[0]
+    assert result['verdict'] == 'noise'
+    assert result['ratio'] == pytest.approx(1.1, rel=0.02)
+    assert result['noise_ratio'] == pytest.approx(1.25)
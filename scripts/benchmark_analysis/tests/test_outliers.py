@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for robust, log-space, rolling and grouped outlier detection.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_outliers import detect_outliers, method_agreement, outlier_scores, rolling_median
+
+
+def _runs(times, **columns):
+    return pd.DataFrame({'iteration': np.arange(1, len(times) + 1), 'status': 'SUCCESS',
+                         'time_ms': times, 'size': 30, 'scenario': 'random', **columns})
+
+
+def test_rolling_median_matches_pandas():
+    """Sliding-window median equals the centered pandas rolling median away from the ends."""
+    x = np.random.default_rng(0).lognormal(size=500)
+    expected = pd.Series(x).rolling(21, center=True).median().to_numpy()
+    assert rolling_median(x, 21)[10:-10] == pytest.approx(expected[10:-10])
+    assert rolling_median(x[:4], 21) == pytest.approx(rolling_median(x[:4], 3))
+    assert rolling_median(x[:2], 21) == pytest.approx(np.full(2, np.median(x[:2])))
+
+
+def test_log_mad_does_not_flag_the_lognormal_tail():
+    """Raw z-score flags the heavy tail; robust z in log space flags only the injected run."""
+    times = np.random.default_rng(1).lognormal(mean=4, sigma=0.6, size=2000)
+    times[700] = times.max() * 20
+    df = _runs(times)
+    assert len(detect_outliers(df, 'iqr')) > 50
+    flagged = detect_outliers(df, 'mad', log_space=True)
+    assert flagged['iteration'].iloc[0] == 701 and len(flagged) <= 3
+
+    zscore = outlier_scores(df, 'zscore')['outlier_score']
+    centered = (times - times.mean()) / times.std()
+    assert zscore.to_numpy() == pytest.approx(centered)
+
+
+def test_rolling_detector_follows_drift_and_groups_are_separate():
+    """A slow phase is no outlier for the rolling method; groups do not mix."""
+    rng = np.random.default_rng(2)
+    times = np.r_[rng.normal(100, 2, 300), rng.normal(200, 4, 300)]
+    times[450] = 260
+    df = _runs(times)
+    assert detect_outliers(df, 'rolling', log_space=True)['iteration'].tolist() == [451]
+    assert 451 not in detect_outliers(df, 'mad', log_space=True)['iteration'].tolist()
+
+    both = pd.concat([df, _runs(times * 10, size=50)], ignore_index=True)
+    grouped = detect_outliers(both, 'rolling', log_space=True, by=['scenario', 'size'])
+    assert sorted(grouped['size'].tolist()) == [30, 50]
+
+    agreement = method_agreement(df, ['mad', 'rolling'], log_space=True)
+    assert agreement['counts']['rolling'] == 1 and agreement['all'] <= 1
+    assert agreement['jaccard'].loc['mad', 'mad'] == 1.0
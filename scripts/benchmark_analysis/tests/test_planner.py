@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for the scaling experiment planner.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_compare import BenchmarkComparer
+from benchmark_planner import plan_experiments
+
+def _comparer(tmp_path, write_benchmark, sizes=(5, 10, 20, 30), runs=100):
+    rng = np.random.default_rng(0)
+    for size in sizes:
+        times = 0.5 * size ** 2 * rng.lognormal(sigma=0.4, size=runs)
+        write_benchmark(tmp_path / f'glpk_random_{size}.csv', [(i, f'{t:.3f}') for i, t in enumerate(times, 1)],
+                        columns=('iteration', 'time_ms'), size=size)
+    return BenchmarkComparer(sorted(str(p) for p in tmp_path.glob('glpk_*.csv')), timeout_ms=30000)
+
+
+def test_plan_stays_within_budget_and_improves_precision(tmp_path, write_benchmark):
+    """Picked runs fit the budget, shrink the interval and favour sizes near the target."""
+    result = plan_experiments(_comparer(tmp_path, write_benchmark), target_size=100, budget_s=600, overhead_s=0.5)
+
+    assert 0 < result['spent_s'] <= 600
+    scenario = result['scenarios']['random']
+    assert scenario['model'] == 'power'
+    assert scenario['precision_after'] < scenario['precision_before']
+    assert max(c['size'] for c in result['commands']) > 30
+    assert sum(c['cost_s'] for c in result['commands']) == sum(r['cost_s'] for r in result['runs'])
+
+
+def test_plan_commands_are_runnable_invocations(tmp_path, write_benchmark):
+    """One benchmark:glpk command per scenario and size, writing a _plan shard with fresh iterations."""
+    result = plan_experiments(_comparer(tmp_path, write_benchmark), target_size=50, budget_s=300, sizes=[20, 50],
+                              iterations=[50])
+    commands = result['commands']
+    assert commands and len({(c['scenario'], c['size']) for c in commands}) == len(commands)
+    for command in commands:
+        assert command['iterations'] % 50 == 0
+        # Benchmarked sizes continue after their 100 runs, new sizes start at 1
+        assert command['first_iteration'] == (101 if command['size'] == 20 else 1)
+        assert command['command'] == (
+            f"php artisan benchmark:glpk storage/benchmarks/glpk_random_{command['size']}_plan.csv "
+            f"--size={command['size']} --scenario=random --iterations={command['iterations']} --timeout=30"
+            + (f" --first-iteration={command['first_iteration']}" if command['size'] == 20 else '')
+        )
+    assert plan_experiments(_comparer(tmp_path, write_benchmark), target_size=50, budget_s=0.1)['commands'] == []
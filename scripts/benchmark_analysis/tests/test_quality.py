@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for solution quality scoring.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_quality import pareto_frontier, score_results
+
+
+def test_scores_satisfaction_worst_off_and_gini():
+    """Picks at ranks 1, 2 and none give satisfaction 1, 0.5, 0."""
+    spec = json.dumps({'units': [1, 2, 3], 'preferences': {'1': [1, 2, 3], '2': [1, 2, 3], '3': [3, 2]}})
+    scores = score_results([spec, spec], [json.dumps({'1': 1, '2': 2}), json.dumps({'1': 1, '2': 2, '3': 3})])
+
+    first = scores.iloc[0]
+    assert first['satisfaction_mean'] == pytest.approx(0.5)
+    assert first['satisfaction_min'] == 0.0
+    assert first['satisfaction_gini'] == pytest.approx(4 / 9)
+    assert first['rank_max'] == 3 and first['unassigned'] == 1 and first['unlisted'] == 0
+    assert scores.iloc[1]['satisfaction_mean'] == pytest.approx(5 / 6)
+    assert scores.iloc[1]['first_choice_share'] == pytest.approx(2 / 3)
+
+
+def test_picks_outside_the_list_are_unlisted_not_unassigned():
+    """A pick the family did not rank scores like no pick but is counted apart."""
+    spec = json.dumps({'units': [1, 2, 3], 'preferences': {'1': [1, 2], '2': [2, 1]}})
+    scores = score_results([spec], [json.dumps({'1': 3})]).iloc[0]
+    assert (scores['unassigned'], scores['unlisted']) == (1, 1)
+    assert scores['satisfaction_mean'] == 0.0
+
+
+def test_pareto_frontier_keeps_undominated_runs():
+    """Only runs better than every faster run are on the frontier."""
+    time_ms = np.array([1.0, 2.0, 3.0, 4.0, 4.0])
+    quality = np.array([0.2, 0.1, 0.5, 0.5, 0.9])
+    assert pareto_frontier(time_ms, quality).tolist() == [True, False, True, False, True]
+    assert pareto_frontier(time_ms, quality, higher_is_better=False).tolist() == [True, True, False, False, False]
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for replaying slow benchmark specs.
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_replay import replay_variance, select_specs
+
+def _spec(n):
+    return {'units': [1], 'preferences': {'1': [n]}}
+
+
+def test_select_specs_picks_slowest_distinct_specs(tmp_path, write_benchmark):
+    """Slowest first, a repeated spec once (its slowest run), rows without spec skipped."""
+    path = tmp_path / 'glpk_random_30.csv'
+    rows = [(1, 50.0, 'SUCCESS', _spec(1)), (2, 900.0, 'SUCCESS', _spec(2)), (3, 1000.0, 'TIMEOUT', _spec(3)),
+            (4, 950.0, 'SUCCESS', _spec(2)), (5, 5000.0, 'SUCCESS', '')]
+    write_benchmark(path, rows, size=30)
+
+    specs = select_specs(str(path), top=5)
+    assert specs['iteration'].tolist() == [3, 4, 1]
+    assert specs['label'].tolist()[0] == 'glpk_random_30_it3'
+
+    solved = select_specs(str(path), top=1, select='slowest')
+    assert solved['iteration'].tolist() == [4]
+    assert select_specs(str(path), select='timeouts')['iteration'].tolist() == [3]
+
+
+def test_replay_variance_verdicts():
+    """Repeats classify the original run."""
+    def runs(*pairs):
+        return pd.DataFrame(pairs, columns=['time_ms', 'status'])
+
+    slow = replay_variance(runs((800, 'SUCCESS'), (1000, 'SUCCESS'), (1200, 'SUCCESS')), 1100, 'SUCCESS')
+    assert slow['verdict'] == 'slow instance'
+    assert slow['time_median'] == 1000 and slow['ratio'] == 1000 / 1100
+    assert slow['noise_ratio'] > 1
+
+    assert replay_variance(runs((100, 'SUCCESS'), (120, 'SUCCESS')), 1100, 'SUCCESS')['verdict'] == 'one-off'
+    assert replay_variance(runs((30000, 'TIMEOUT'), (30000, 'TIMEOUT')), 30000, 'TIMEOUT')['verdict'] == 'always times out'
+    assert replay_variance(runs((30000, 'TIMEOUT'), (900, 'SUCCESS')), 30000, 'TIMEOUT')['verdict'] == 'flaky timeout'
+    assert replay_variance(runs((900, 'SUCCESS')), 30000, 'TIMEOUT')['verdict'] == 'solves now'
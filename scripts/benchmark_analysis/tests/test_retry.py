@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for retry-aware success and flakiness analysis.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_retry import classify_runs, link_attempts, load_retry_pairs, retry_budgets, retry_summary
+
+@pytest.fixture
+def attempts(tmp_path, write_benchmark):
+    write_benchmark(tmp_path / 'glpk_random_10.csv', [
+        (1, 10.0, 'SUCCESS', 'a'),
+        (2, 100.0, 'TIMEOUT', 'b'),
+        (3, 100.0, 'TIMEOUT', 'c'),
+        (4, 100.0, 'TIMEOUT', 'd'),
+    ])
+    # Two retries per failed run, plus a row from an unrelated spec
+    write_benchmark(tmp_path / 'glpk_random_10_retry.csv', [
+        (2, 20.0, 'SUCCESS', 'b'), (2, 30.0, 'SUCCESS', 'b'),
+        (3, 100.0, 'TIMEOUT', 'c'), (3, 40.0, 'SUCCESS', 'c'),
+        (4, 100.0, 'TIMEOUT', 'd'), (4, 100.0, 'TIMEOUT', 'd'),
+        (4, 5.0, 'SUCCESS', 'other'),
+    ])
+    (original, retries), = load_retry_pairs(sorted(str(p) for p in tmp_path.glob('*.csv'))).values()
+    linked, unmatched = link_attempts(original, retries)
+    assert unmatched == 1
+    return linked
+
+
+def test_classify_runs(attempts):
+    """Failed runs are classified by the outcome of their retries."""
+    runs = classify_runs(attempts).set_index('iteration')
+
+    assert runs['class'].to_dict() == {1: 'success', 2: 'solved-on-retry', 3: 'flaky', 4: 'deterministic-timeout'}
+    assert runs.loc[3, 'solved_attempt'] == 3
+    assert runs.loc[3, 'time_to_success_ms'] == 240.0
+
+
+def test_retry_budgets_stop_at_first_success(attempts):
+    """Each budget counts attempts up to the first success only."""
+    budgets = retry_budgets(attempts).set_index('retries')
+
+    assert list(budgets['success_rate']) == [0.25, 0.5, 0.75]
+    # Budget 2: 10 + (100 + 20) + (100 + 100 + 40) + (100 + 100 + 100)
+    assert budgets.loc[2, 'expected_time_ms'] == pytest.approx(670.0 / 4)
+    assert budgets.loc[2, 'expected_attempts'] == pytest.approx(9 / 4)
+
+
+def test_retry_summary(attempts):
+    """Effective success counts any attempt; added latency is the failed attempts' time."""
+    summary = retry_summary(classify_runs(attempts))
+
+    assert summary['first_attempt_success_rate'] == 0.25
+    assert summary['effective_success_rate'] == 0.75
+    assert summary['retry_success_rate'] == pytest.approx(3 / 6)
+    assert summary['solved_via_retry'] == 2
+    assert summary['added_latency_mean_ms'] == pytest.approx(150.0)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for the timeout risk model.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+LIB = Path(__file__).parent.parent / 'lib'
+sys.path.insert(0, str(LIB))
+
+from benchmark_risk import RiskModel, save_risk_model, train_risk_model
+from benchmark_spec import SPEC_FEATURES
+
+
+def _frame(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(rng.uniform(size=(n, len(SPEC_FEATURES))), columns=SPEC_FEATURES)
+    df['scenario'] = 'random'
+    df['size'] = 20
+    risk = 1 / (1 + np.exp(-(8 * df['largest_tie_share'] - 6)))
+    df['status'] = np.where(rng.uniform(size=n) < risk, 'TIMEOUT', 'SUCCESS')
+    return df
+
+
+def test_training_reports_and_round_trips(tmp_path):
+    """The artifact predicts the same after a JSON round trip and ranks risky specs higher."""
+    artifact = train_risk_model(_frame(), threshold=0.5)
+    report = artifact['evaluation']
+    assert report['auc'] > 0.8
+    assert report['log_loss'] < report['base_log_loss']
+    assert sum(c['runs'] for c in report['calibration']) == report['runs']
+
+    path = tmp_path / 'risk.json'
+    save_risk_model(artifact, path)
+    model = RiskModel.load(path)
+
+    low, high = [0.5] * len(SPEC_FEATURES), [0.5] * len(SPEC_FEATURES)
+    low[SPEC_FEATURES.index('largest_tie_share')] = 0.05
+    high[SPEC_FEATURES.index('largest_tie_share')] = 0.95
+    assert model.predict_features(low) < 0.2 < 0.6 < model.predict_features(high)
+    assert json.loads(path.read_text())['threshold'] == 0.5
+
+
+def test_inference_does_not_import_numpy_or_pandas(tmp_path):
+    """RiskModel predicts from a spec with the standard library only."""
+    path = tmp_path / 'risk.json'
+    save_risk_model(train_risk_model(_frame()), path)
+    spec = {'units': [1, 2, 3], 'preferences': {'1': [1, 2, 3], '2': [1, 2, 3], '3': [3, 2, 1]}}
+
+    code = (f"import sys; sys.path.insert(0, {str(LIB)!r})\n"
+            f"from benchmark_risk import RiskModel\n"
+            f"p = RiskModel.load({str(path)!r}).predict({spec!r})\n"
+            f"assert 0 <= p <= 1\n"
+            f"print(sorted(m for m in ('numpy', 'pandas', 'matplotlib') if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for scaling model selection and prediction intervals.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_compare import BenchmarkComparer
+from benchmark_scaling import predict_with_interval, select_scaling_model
+
+
+def test_selects_power_law_for_power_law_data():
+    """A noisy n^2.5 curve should be identified as a power law."""
+    rng = np.random.default_rng(0)
+    sizes = np.array([5, 10, 20, 30, 50, 75, 100])
+    values = 0.02 * sizes**2.5 * np.exp(rng.normal(0, 0.05, len(sizes)))
+
+    selection = select_scaling_model(sizes, values)
+
+    assert selection['best'] == 'power'
+    assert abs(selection['candidates'][0]['coeffs'][1] - 2.5) < 0.2
+
+
+def test_prediction_interval_brackets_prediction():
+    """Intervals are ordered and widen when extrapolating further."""
+    sizes = np.array([5, 10, 20, 30, 50])
+    values = 0.05 * sizes**2 * np.array([1.1, 0.9, 1.05, 0.95, 1.0])
+
+    fit = select_scaling_model(sizes, values)['candidates'][0]
+    value, lower, upper = predict_with_interval(fit, 100)
+    _, far_lower, far_upper = predict_with_interval(fit, 300)
+
+    assert lower < value < upper
+    assert far_upper - far_lower > upper - lower
+
+
+def test_needs_three_sizes():
+    """Two sizes cannot support any model with a residual variance."""
+    try:
+        select_scaling_model([10, 20], [1.0, 4.0])
+    except ValueError:
+        return
+    assert False, "Expected ValueError"
+
+
+def test_timeout_rate_is_unknown_without_survival_fit(tmp_path, monkeypatch):
+    """A failed survival fit leaves the timeout rate unknown instead of reporting 0%."""
+    rng = np.random.default_rng(0)
+    for size in (5, 10, 20, 30):
+        pd.DataFrame({
+            'size': size, 'scenario': 'random', 'iteration': np.arange(1, 41),
+            'time_ms': 0.5 * size**2 * rng.lognormal(sigma=0.3, size=40), 'status': 'SUCCESS',
+            'error': '', 'spec': '', 'result': '',
+        }).to_csv(tmp_path / f'glpk_random_{size}.csv', index=False)
+    comparer = BenchmarkComparer(sorted(str(p) for p in tmp_path.glob('*.csv')), timeout_ms=30000)
+    assert comparer.predict_time(40)['predicted_timeout_rate'] is not None
+
+    def no_fit(scenario):
+        raise ValueError("Need solved runs at two or more sizes to fit a survival model")
+    monkeypatch.setattr(comparer, 'analyze_survival', no_fit)
+
+    prediction = comparer.predict_time(40)
+    assert prediction['predicted_timeout_rate'] is None and prediction['timeout_rate_interval'] is None
+    assert 'two or more sizes' in prediction['timeout_rate_note']
+    assert prediction['predicted_median_time'] > 0
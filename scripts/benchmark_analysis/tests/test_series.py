@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for iteration-series analysis (timeout bursts and periodicity, timing
+independence).
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_stats import BenchmarkAnalyzer
+from benchmark_series import (
+    autocorrelation, effective_sample_size, iid_diagnostics, partial_autocorrelation,
+    quantile_ci, rolling_quantiles, run_lengths, runs_test, timeout_patterns,
+)
+
+
+def test_autocorrelation_matches_direct_formula():
+    """The FFT ACF equals the direct sum."""
+    x = np.random.default_rng(0).normal(size=300).cumsum()
+    centered = x - x.mean()
+    direct = [np.sum(centered[:len(x) - k] * centered[k:]) / np.sum(centered ** 2) for k in range(6)]
+    assert autocorrelation(x, 5) == pytest.approx(direct)
+
+
+def test_run_lengths_and_runs_test():
+    """Runs of True values and the runs test on a perfectly clustered sequence."""
+    starts, lengths = run_lengths(np.array([1, 1, 0, 1, 0, 0, 1, 1, 1], dtype=bool))
+    assert starts.tolist() == [0, 3, 6] and lengths.tolist() == [2, 1, 3]
+    assert runs_test(np.array([0] * 20 + [1] * 20))['p_value'] < 1e-6
+
+
+def test_timeout_patterns_find_bursts_and_periods():
+    """Independent timeouts pass; a burst and a period-50 pulse are detected."""
+    rng = np.random.default_rng(0)
+    iterations = np.arange(1, 2001)
+    independent = rng.uniform(size=2000) < 0.03
+    result = timeout_patterns(iterations, independent)
+    assert result['bursts'] == [] and not result['periodicity']['significant']
+    assert result['independence']['runs_test']['p_value'] > 0.01
+
+    bursty = independent.copy()
+    bursty[800:830] = True
+    burst = timeout_patterns(iterations, bursty)['bursts']
+    assert len(burst) == 1 and burst[0]['first_iteration'] <= 801 and burst[0]['last_iteration'] >= 830
+
+    periodic = (iterations % 50 == 0) | (rng.uniform(size=2000) < 0.005)
+    periodicity = timeout_patterns(iterations, periodic)['periodicity']
+    assert periodicity['significant'] and periodicity['period'] == 50
+
+    assert timeout_patterns(iterations, np.zeros(2000, dtype=bool))['testable'] is False
+
+
+def _ar1(phi, n, seed=0):
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(size=n)
+    x = np.empty(n)
+    x[0] = noise[0]
+    for i in range(1, n):
+        x[i] = phi * x[i - 1] + noise[i]
+    return x
+
+
+def test_ar1_pacf_ljung_box_and_effective_sample_size():
+    """AR(1): PACF cuts off after lag 1, Ljung-Box rejects, ESS ~ n(1-phi)/(1+phi)."""
+    x = _ar1(0.6, 5000)
+    pacf = partial_autocorrelation(x, 5)
+    assert pacf[1] == pytest.approx(0.6, abs=0.05)
+    assert np.all(np.abs(pacf[2:]) < 0.05)
+
+    diagnostics = iid_diagnostics(x)
+    assert not diagnostics['independent'] and diagnostics['ljung_box_p_value'] < 1e-6
+    assert effective_sample_size(x) == pytest.approx(5000 * 0.4 / 1.6, rel=0.2)
+
+    white = np.random.default_rng(1).normal(size=5000)
+    assert iid_diagnostics(white)['independent']
+    assert effective_sample_size(white) == pytest.approx(5000, rel=0.1)
+
+
+def test_quantile_ci_widens_with_smaller_effective_sample_size():
+    """Fewer effective runs give a wider interval around the same estimate."""
+    values = np.random.default_rng(0).lognormal(size=2000)
+    estimate, lower, upper = quantile_ci(values, 0.95)
+    estimate_ess, lower_ess, upper_ess = quantile_ci(values, 0.95, ess=500)
+    assert estimate == estimate_ess
+    assert lower_ess <= lower < estimate < upper <= upper_ess
+    assert upper_ess - lower_ess > upper - lower
+
+
+def test_rolling_quantiles_match_pandas():
+    """One sorted-window pass gives pandas' rolling quantiles, NaN before min_periods."""
+    x = np.random.default_rng(3).lognormal(size=3000)
+    bands = rolling_quantiles(x, 100, (0.5, 0.95, 0.99))
+    for column, q in enumerate((0.5, 0.95, 0.99)):
+        expected = pd.Series(x).rolling(100).quantile(q).to_numpy()
+        np.testing.assert_allclose(bands[:, column], expected)
+    early = rolling_quantiles(x[:50], 100, (0.9,), min_periods=10)[:, 0]
+    np.testing.assert_allclose(early, pd.Series(x[:50]).rolling(100, min_periods=10).quantile(0.9).to_numpy())
+
+
+def test_analyzer_bands_keep_timeouts_at_the_limit(tmp_path, write_benchmark):
+    """A stretch of timeouts raises the rolling bands to the timeout instead of vanishing."""
+    path = tmp_path / 'glpk_random_10.csv'
+    rows = [(i, 10.0 + i % 3, 'SUCCESS') for i in range(1, 41)]
+    rows[20:30] = [(i, 1000.4, 'TIMEOUT') for i in range(21, 31)]
+    write_benchmark(path, rows, columns=('iteration', 'time_ms', 'status'))
+
+    bands = BenchmarkAnalyzer(str(path), timeout_ms=1000.0).rolling_quantiles(10, (0.5,))
+    assert len(bands) == 40
+    assert bands.loc[30, 'p50'] == 1000.0
+    assert bands.loc[20, 'p50'] < 20
+
+
+def test_analyzer_bands_keep_slow_successes(tmp_path, write_benchmark):
+    """Without timeouts, solved runs above the default timeout are not capped."""
+    path = tmp_path / 'glpk_random_100.csv'
+    write_benchmark(path, [(i, 40000.0 + i * 100) for i in range(1, 31)], columns=('iteration', 'time_ms'), size=100)
+
+    bands = BenchmarkAnalyzer(str(path)).rolling_quantiles(10, (0.5, 0.99))
+    assert bands.loc[30, 'p50'] > 40000 and bands.loc[30, 'p99'] > 42500
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for shard merging and retry policies.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_dataset import BenchmarkDataset
+from benchmark_shards import group_shards, merge_shards
+
+
+def _shards(tmp_path, write_benchmark):
+    # Two workers overlapping on iteration 3, a retry of the iteration 2 timeout
+    write_benchmark(tmp_path / 'glpk_random_10_w1.csv', [(1, 5.0, 'SUCCESS', 'a'), (2, 60.0, 'TIMEOUT', 'b'),
+                                                (3, 7.0, 'SUCCESS', 'c')])
+    write_benchmark(tmp_path / 'glpk_random_10_w2.csv', [(3, 7.0, 'SUCCESS', 'c'), (4, 6.0, 'SUCCESS', 'd')])
+    write_benchmark(tmp_path / 'glpk_random_10_retry.csv', [(2, 60.0, 'TIMEOUT', 'b'), (2, 9.0, 'SUCCESS', 'b')])
+    return sorted(str(p) for p in tmp_path.glob('*.csv'))
+
+
+def test_merge_keeps_shard_runs_and_attaches_retries(tmp_path, write_benchmark):
+    """Regular shard rows are runs, the overlapping worker row counts once; retry rows become attempts."""
+    stats = {}
+    rows = list(merge_shards(_shards(tmp_path, write_benchmark), 'first', stats))
+
+    assert [int(r['iteration']) for r in rows] == [1, 2, 3, 4]
+    assert stats == {'rows_in': 7, 'rows_out': 4, 'duplicates': 1, 'retry_attempts': 2, 'retried': 1}
+    assert rows[1]['status'] == 'TIMEOUT' and rows[1]['source'] == 'glpk_random_10_w1.csv'
+    assert rows[1]['attempts'] == 3
+    assert (rows[2]['source'], rows[2]['attempts'], rows[2]['retry']) == ('glpk_random_10_w1.csv', 2, 0)
+
+
+def test_merge_keeps_repeated_specs(tmp_path, write_benchmark):
+    """Identical-scenario runs share one spec: reruns and worker shards with their own times are not collapsed."""
+    write_benchmark(tmp_path / 'glpk_identical_10.csv', [(i, 5.0, 'SUCCESS', 's') for i in range(1, 6)] * 2)
+    write_benchmark(tmp_path / 'glpk_identical_10_w2.csv', [(i, 5.0 + i / 10, 'SUCCESS', 's') for i in range(1, 6)])
+    write_benchmark(tmp_path / 'glpk_identical_10_retry.csv', [(3, 4.0, 'SUCCESS', 's')])
+    paths = sorted(str(p) for p in tmp_path.glob('*.csv'))
+
+    rows = list(merge_shards(paths[:1], 'first'))
+    assert len(rows) == 10
+    rows = list(merge_shards(paths, 'last'))
+    assert len(rows) == 15
+    assert sum(r['retry'] for r in rows) == 1 and sum(r['attempts'] for r in rows) == 16
+
+
+def test_retry_policies(tmp_path, write_benchmark):
+    """'last' keeps the latest attempt, 'best' the fastest success."""
+    paths = _shards(tmp_path, write_benchmark)
+
+    last = list(merge_shards(paths, 'last'))[1]
+    best = list(merge_shards(paths, 'best'))[1]
+    assert (last['status'], last['retry']) == ('SUCCESS', 1)
+    assert (best['time_ms'], best['source']) == ('9.0', 'glpk_random_10_retry.csv')
+
+
+def test_merge_handles_restarted_iterations(tmp_path, write_benchmark):
+    """An appended rerun restarting at iteration 1 is merged, not dropped."""
+    write_benchmark(tmp_path / 'glpk_random_10.csv', [(1, 5.0, 'SUCCESS', 'a'), (2, 6.0, 'SUCCESS', 'b'),
+                                             (1, 5.5, 'SUCCESS', 'x')])
+
+    rows = list(merge_shards([str(tmp_path / 'glpk_random_10.csv')]))
+    assert [(int(r['iteration']), r['spec']) for r in rows] == [(1, 'a'), (1, 'x'), (2, 'b')]
+
+
+def test_dataset_merge_policy(tmp_path, write_benchmark):
+    """The dataset reads the merged view as one (scenario, size) cell."""
+    paths = _shards(tmp_path, write_benchmark)
+    assert list(group_shards(paths)) == [('random', 10)]
+
+    pooled = BenchmarkDataset(paths)
+    merged = BenchmarkDataset(paths, merge_policy='best').stats()
+    assert [p.name for p in pooled.excluded_retries] == ['glpk_random_10_retry.csv']
+    assert pooled.stats()['total_runs'].iloc[0] == 5
+    assert len(BenchmarkDataset([p for p in paths if 'retry' in p]).df) == 2
+    assert merged['total_runs'].iloc[0] == 4
+    assert merged['success_rate'].iloc[0] == 1.0
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# Copilot - Pending review
+"""
+Tests for censoring-aware (survival) statistics.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+
+from benchmark_survival import (
+    fit_lognormal_aft, kaplan_meier, km_percentile, km_percentiles, predict_timeout_probability
+)
+
+
+def test_kaplan_meier_without_censoring_is_empirical_cdf():
+    """With no censoring, KM survival equals 1 - empirical CDF."""
+    km = kaplan_meier([1, 2, 3, 4], [1, 1, 1, 1])
+    assert np.allclose(km['survival'], [0.75, 0.5, 0.25, 0.0])
+    assert km_percentile(km, 0.5) == 2
+
+
+def test_censored_rows_push_percentiles_up():
+    """Timeouts count as 'at least timeout', so high percentiles are undefined."""
+    df = pd.DataFrame({
+        'time_ms': [10.0, 20.0, 30.0, 100.0, 100.0],
+        'status': ['SUCCESS', 'SUCCESS', 'SUCCESS', 'TIMEOUT', 'TIMEOUT'],
+    })
+    percentiles = km_percentiles(df, timeout_ms=100.0)
+
+    assert percentiles['time_km_p50'] == 30.0
+    assert percentiles['time_km_p90'] is None
+
+
+def test_aft_recovers_timeout_probability():
+    """The AFT fit predicts the true censored fraction at an unseen size."""
+    rng = np.random.default_rng(1)
+    sizes = np.repeat([10, 20, 40], 400)
+    times = np.exp(-3 + 2 * np.log(sizes) + rng.normal(0, 0.5, len(sizes)))
+    timeout = 300.0
+    events = (times < timeout).astype(int)
+    durations = np.minimum(times, timeout)
+
+    fit = fit_lognormal_aft(sizes, durations, events)
+    predicted = predict_timeout_probability(fit, 60, timeout)
+
+    # True P(T > 300) at size 60: log(300) vs -3 + 2*log(60)
+    z = (np.log(timeout) - (-3 + 2 * np.log(60))) / 0.5
+    from scipy import stats
+    assert abs(predicted['probability'] - stats.norm.sf(z)) < 0.05
+    assert predicted['lower'] <= predicted['probability'] <= predicted['upper']
+
+
+def test_timeout_planner_matches_empirical_expectation():
+    """E[min(T, t)] inside the observed range equals the empirical mean."""
+    from benchmark_timeout_plan import TimeoutPlanner, recommend_timeout
+
+    rng = np.random.default_rng(2)
+    times = np.exp(rng.normal(4, 0.6, 500))
+    status = np.where(times > 200, 'TIMEOUT', 'SUCCESS')
+    df = pd.DataFrame({'time_ms': np.minimum(times, 200.0), 'status': status})
+
+    planner = TimeoutPlanner(df, timeout_ms=200.0)
+    plan = planner.sweep(np.linspace(10, 800, 2000), retries=(1,))
+
+    assert np.isclose(planner.expected_time(np.array([100.0]))[0], np.minimum(times, 100).mean())
+    assert plan['success_rate'].is_monotonic_increasing
+    assert (plan['success_rate_retry1'] >= plan['success_rate']).all()
+
+    best = recommend_timeout(plan, 0.995)
+    assert best is not None and best['extrapolated']